@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Compare audio encoding profiles for transcription uploads.
+
+For every media file in a local corpus directory and every profile in
+subtitle_core.AUDIO_PROFILES this measures extraction time and upload size.
+With --api-key it also transcribes each encoding and reports the word error
+rate (WER) against a reference transcript: ``<name>.txt`` next to the media
+file if present, otherwise the FLAC transcript of the same file.
+
+Results are printed as JSON (and written to --output if given).
+
+Usage:
+    python benchmarks/audio_profiles.py corpus/ [--api-key KEY] [--output results.json]
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from subtitle_core import AUDIO_PROFILES, ElevenLabsSubtitleGenerator, extract_audio
+
+MEDIA_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.webm', '.mp3', '.wav', '.flac', '.m4a', '.aac', '.ogg'}
+
+
+def normalize_words(text: str) -> List[str]:
+    """Lowercase and strip punctuation so WER only counts word differences"""
+    return re.findall(r"[\w']+", text.lower())
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length"""
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    previous = list(range(len(hyp) + 1))
+    for i, ref_word in enumerate(ref, start=1):
+        current = [i] + [0] * len(hyp)
+        for j, hyp_word in enumerate(hyp, start=1):
+            current[j] = min(
+                previous[j] + 1,                                # deletion
+                current[j - 1] + 1,                             # insertion
+                previous[j - 1] + (ref_word != hyp_word),       # substitution
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def transcript_text(transcription: Dict) -> str:
+    return " ".join(w.get('text', '') for w in transcription.get('words', []) if w.get('type') == 'word')
+
+
+def benchmark_file(path: Path, generator: Optional[ElevenLabsSubtitleGenerator], repeat: int) -> Dict:
+    media_bytes = path.read_bytes()
+    results = {'file': path.name, 'input_bytes': len(media_bytes), 'profiles': {}}
+    transcripts = {}
+
+    for name in AUDIO_PROFILES:
+        timings = []
+        extracted = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            extracted = extract_audio(media_bytes, name)
+            timings.append(time.perf_counter() - start)
+        entry = {
+            'upload_bytes': len(extracted.audio),
+            'extract_seconds': min(timings),
+            'mime_type': extracted.mime_type,
+        }
+        if generator is not None:
+            start = time.perf_counter()
+            transcription = generator.create_transcription(
+                extracted.audio, filename=extracted.filename, mime_type=extracted.mime_type
+            )
+            entry['transcribe_seconds'] = time.perf_counter() - start
+            transcripts[name] = transcript_text(transcription)
+        results['profiles'][name] = entry
+
+    if transcripts:
+        reference_path = path.with_suffix('.txt')
+        if reference_path.exists():
+            reference, results['reference'] = reference_path.read_text(encoding='utf-8'), reference_path.name
+        else:
+            reference, results['reference'] = transcripts.get('flac', ''), 'flac transcript'
+        for name, text in transcripts.items():
+            results['profiles'][name]['wer'] = word_error_rate(reference, text)
+
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", help="Directory of media files (optionally with <name>.txt reference transcripts)")
+    parser.add_argument("--api-key", default=None, help="ElevenLabs API key; enables transcription and WER")
+    parser.add_argument("--repeat", type=int, default=3, help="Extraction runs per profile; the fastest is reported")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    files = sorted(p for p in Path(args.corpus).iterdir() if p.suffix.lower() in MEDIA_EXTENSIONS)
+    generator = ElevenLabsSubtitleGenerator(args.api_key) if args.api_key else None
+    report = {'profiles': {name: p.description for name, p in AUDIO_PROFILES.items()},
+              'files': [benchmark_file(path, generator, args.repeat) for path in files]}
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Measure the cold import time and resident memory of the FastAPI backend and
+the core subtitle library.
+
+Each target is imported in a fresh interpreter so results are not skewed by
+modules already loaded in this process. Results are printed as JSON.
+
+Usage:
+    python benchmarks/import_footprint.py [--repeat 5]
+"""
+
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO_ROOT / "subtitle-app" / "backend"
+
+TARGETS = {
+    "backend_worker": (BACKEND_DIR, "main"),
+    "core_library": (REPO_ROOT, "subtitle_core"),
+}
+
+PROBE = """
+import sys, time, resource
+start = time.perf_counter()
+__import__({module!r})
+elapsed = time.perf_counter() - start
+rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(elapsed, rss_kb, 'streamlit' in sys.modules, len(sys.modules))
+"""
+
+
+def measure(cwd: Path, module: str) -> dict:
+    """Import a module in a fresh interpreter and report time, peak RSS and module count"""
+    result = subprocess.run(
+        [sys.executable, "-W", "ignore", "-c", PROBE.format(module=module)],
+        cwd=cwd, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1] if result.stderr.strip() else "import failed"}
+    elapsed, rss_kb, streamlit_loaded, module_count = result.stdout.split()[-4:]
+    return {
+        "import_seconds": float(elapsed),
+        "peak_rss_mb": int(rss_kb) / 1024,
+        "streamlit_loaded": streamlit_loaded == "True",
+        "modules_loaded": int(module_count),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5, help="Fresh interpreters per target (default: 5)")
+    args = parser.parse_args()
+
+    report = {}
+    for name, (cwd, module) in TARGETS.items():
+        runs = [measure(cwd, module) for _ in range(args.repeat)]
+        ok = [run for run in runs if "error" not in run]
+        if not ok:
+            report[name] = runs[0]
+            continue
+        report[name] = {
+            "import_seconds_median": statistics.median(run["import_seconds"] for run in ok),
+            "peak_rss_mb_median": statistics.median(run["peak_rss_mb"] for run in ok),
+            "streamlit_loaded": ok[0]["streamlit_loaded"],
+            "modules_loaded": ok[0]["modules_loaded"],
+            "runs": len(ok),
+        }
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
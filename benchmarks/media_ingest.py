@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Compare separate audio extraction + OCR decoding with the single-pass MediaIngest.
+
+    separate      extract_audio() on the file's bytes, then VideoOCRProcessor
+                  decoding the video again with OpenCV
+    single_pass   one ffmpeg process demuxes the file, writing the audio and
+                  passing the video to a decoder that pipes sampled frames;
+                  OCR runs on a thread while the audio is already available
+
+For each mode the report gives the wall time, when the audio was ready for
+transcription, total CPU time (this process plus ffmpeg) and whether the
+OCR cues have the same texts as the separate run (timestamps may differ by
+less than a frame: ffmpeg samples exact multiples of the interval).
+
+Without a video the synthetic clip from ocr_scaling.py is used, with a tone
+as its audio track. The recognizer is Tesseract when installed, otherwise
+the CPU-bound stand-in.
+
+Results are printed as JSON (and written to --output if given).
+
+Usage:
+    python benchmarks/media_ingest.py [video.mp4] [--interval 1.0] [--profile speech_mp3] [--output results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ocr_scaling import default_recognizer, make_recognizer, synthetic_clip
+from subtitle_core import MediaIngest, VideoOCRProcessor, extract_audio, find_ffmpeg
+
+MODES = ("separate", "single_pass")
+
+
+def _cpu_seconds() -> float:
+    usage = os.times()
+    return usage.user + usage.system + usage.children_user + usage.children_system
+
+
+def synthetic_clip_with_audio(path: Path, seconds: int) -> Path:
+    video = synthetic_clip(path.with_name("silent.mp4"), seconds)
+    subprocess.run([find_ffmpeg(), '-y', '-i', str(video), '-f', 'lavfi', '-i', f"sine=frequency=440:duration={seconds}",
+                    '-c:v', 'copy', '-c:a', 'aac', '-b:a', '96k', '-shortest', str(path)],
+                   check=True, capture_output=True)
+    return path
+
+
+def run_separate(video: Path, args, recognizer) -> Dict:
+    started, cpu = time.perf_counter(), _cpu_seconds()
+    audio = extract_audio(video.read_bytes(), args.profile, allow_stream_copy=not args.no_stream_copy)
+    audio_ready = time.perf_counter() - started
+    processor = VideoOCRProcessor(interval=args.interval, recognizer=recognizer)
+    cues = processor.process_video_ocr(str(video))
+    return {"seconds": time.perf_counter() - started, "audio_ready_seconds": audio_ready,
+            "cpu_seconds": _cpu_seconds() - cpu, "audio": audio, "cues": cues}
+
+
+def run_single_pass(video: Path, args, recognizer) -> Dict:
+    started, cpu = time.perf_counter(), _cpu_seconds()
+    processor = VideoOCRProcessor(interval=args.interval, recognizer=recognizer)
+    with MediaIngest(video, args.profile, args.interval, allow_stream_copy=not args.no_stream_copy) as ingest, \
+            ThreadPoolExecutor(max_workers=1) as executor:
+        ocr = executor.submit(processor.process_frames, ingest.frames())
+        audio = ingest.audio()
+        audio_ready = time.perf_counter() - started
+        cues = ocr.result()
+    return {"seconds": time.perf_counter() - started, "audio_ready_seconds": audio_ready,
+            "cpu_seconds": _cpu_seconds() - cpu, "audio": audio, "cues": cues,
+            "spilled_bytes": ingest.stats['spilled_bytes']}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", nargs="?", default=None, help="Video to process (default: generated synthetic clip)")
+    parser.add_argument("--interval", type=float, default=1.0, help="OCR sampling interval in seconds (default: 1.0)")
+    parser.add_argument("--profile", default=None, help="Audio profile; without one suitable tracks are stream-copied (default: $AUDIO_PROFILE or legacy_mp3)")
+    parser.add_argument("--no-stream-copy", action="store_true", help="Always re-encode the audio track")
+    parser.add_argument("--seconds", type=int, default=120, help="Length of the synthetic clip (default: 120)")
+    parser.add_argument("--recognizer", choices=("tesseract", "synthetic"), default=None,
+                        help="OCR engine (default: tesseract if installed, else synthetic)")
+    parser.add_argument("--cost-ms", type=float, default=200.0,
+                        help="CPU milliseconds per megapixel for the synthetic recognizer (default: 200)")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    recognizer_name = args.recognizer or default_recognizer()
+    recognizer = make_recognizer(recognizer_name, args.cost_ms)
+
+    temp_dir = None
+    video = Path(args.video) if args.video else None
+    if video is None:
+        temp_dir = tempfile.mkdtemp(prefix="media-ingest-")
+        video = synthetic_clip_with_audio(Path(temp_dir) / "synthetic.mp4", args.seconds)
+    try:
+        runs = {"separate": run_separate(video, args, recognizer),
+                "single_pass": run_single_pass(video, args, recognizer)}
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    reference = [cue['text'] for cue in runs["separate"]["cues"]]
+    results = {}
+    for mode in MODES:
+        run = runs[mode]
+        results[mode] = {
+            "seconds": round(run["seconds"], 3),
+            "audio_ready_seconds": round(run["audio_ready_seconds"], 3),
+            "cpu_seconds": round(run["cpu_seconds"], 3),
+            "audio_profile": run["audio"].profile if run["audio"] else None,
+            "audio_bytes": len(run["audio"].audio) if run["audio"] else 0,
+            "cues": len(run["cues"]),
+            "same_cue_texts": [cue['text'] for cue in run["cues"]] == reference,
+        }
+        if "spilled_bytes" in run:
+            results[mode]["spilled_bytes"] = run["spilled_bytes"]
+
+    report = {
+        "video": args.video or f"synthetic ({args.seconds} s)",
+        "recognizer": recognizer_name,
+        "interval": args.interval,
+        "modes": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
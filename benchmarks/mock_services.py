@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+"""
+Local stand-ins for the external APIs the app calls, for offline benchmarks.
+
+One threaded HTTP server answers, under separate path prefixes:
+
+    /elevenlabs/v1/speech-to-text   ElevenLabs speech-to-text (synthetic transcript)
+    /google/m                       Google Translate mobile page (as used by deep-translator)
+    /libre/translate                LibreTranslate
+    /azure/translate                Azure Translator v3
+
+Point the app at it with the variables printed on start-up (ELEVENLABS_BASE_URL,
+GOOGLE_TRANSLATE_URL, LIBRETRANSLATE_URL, AZURE_TRANSLATOR_ENDPOINT). Each
+service can add latency, fail a fraction of requests with HTTP 500 and
+throttle above a request rate with HTTP 429. "Translations" are the source
+text prefixed with the target language code, e.g. ``es: hello``.
+
+Usage:
+    python benchmarks/mock_services.py [--port 8090] [--latency 0.05] [--error-rate 0.01] [--rate-limit 20]
+"""
+
+import sys
+import json
+import time
+import html
+import random
+import argparse
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, NamedTuple, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from synthetic import synthetic_transcription
+
+SERVICES = ("elevenlabs", "google", "libre", "azure")
+
+
+class ServiceBehaviour(NamedTuple):
+    latency: float = 0.0                # Seconds added to every request
+    jitter: float = 0.0                 # Extra uniform random delay, 0..jitter seconds
+    error_rate: float = 0.0             # Fraction of requests answered with HTTP 500
+    rate_limit: Optional[float] = None  # Requests per second before answering HTTP 429
+
+
+class _RateLimiter:
+    """Token bucket allowing ``rate`` requests per second (bursts of up to one second)"""
+
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens < 1:
+                return False
+            self.tokens -= 1
+            return True
+
+
+def mock_translation(text: str, target: str) -> str:
+    return f"{target}: {text}"
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "MockServices/1.0"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._dispatch("GET")
+
+    def do_POST(self):
+        self._dispatch("POST")
+
+    def _dispatch(self, method: str):
+        mock = self.server.mock
+        url = urlsplit(self.path)
+        query = parse_qs(url.query)
+        length = int(self.headers.get('Content-Length') or 0)
+        body = self.rfile.read(length) if length else b''
+
+        routes = {
+            ("POST", "/elevenlabs/v1/speech-to-text"): ("elevenlabs", self._speech_to_text),
+            ("GET", "/google/m"): ("google", self._google),
+            ("POST", "/libre/translate"): ("libre", self._libre),
+            ("POST", "/azure/translate"): ("azure", self._azure),
+        }
+        route = routes.get((method, url.path.rstrip('/') or '/'))
+        if route is None:
+            self._send(404, b'{"detail": "Not found"}')
+            return
+        service, handler = route
+
+        status = mock._admit(service)
+        if status == 429:
+            self._send(429, b'{"detail": "Too many requests"}', extra_headers={'Retry-After': '1'})
+        elif status == 500:
+            self._send(500, b'{"detail": "Injected failure"}')
+        else:
+            handler(query, body)
+
+    def _send(self, status: int, payload: bytes, content_type: str = 'application/json',
+              extra_headers: Dict[str, str] = None):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _speech_to_text(self, query, body):
+        if not self.headers.get('xi-api-key'):
+            self._send(401, b'{"detail": "Missing xi-api-key"}')
+            return
+        self._send(200, self.server.mock.transcription_body())
+
+    def _google(self, query, body):
+        text = query.get('q', [''])[0]
+        target = query.get('tl', ['en'])[0]
+        page = f'<html><body><div class="result-container">{html.escape(mock_translation(text, target))}</div></body></html>'
+        self._send(200, page.encode('utf-8'), content_type='text/html; charset=utf-8')
+
+    def _libre(self, query, body):
+        form = parse_qs(body.decode('utf-8'))
+        text = form.get('q', [''])[0]
+        target = form.get('target', ['en'])[0]
+        self._send(200, json.dumps({'translatedText': mock_translation(text, target)}).encode('utf-8'))
+
+    def _azure(self, query, body):
+        if not self.headers.get('Ocp-Apim-Subscription-Key'):
+            self._send(401, b'{"error": {"code": 401000, "message": "Missing key"}}')
+            return
+        target = query.get('to', ['en'])[0]
+        items = json.loads(body or b'[]')
+        result = [{'translations': [{'text': mock_translation(item.get('text', ''), target), 'to': target}]}
+                  for item in items]
+        self._send(200, json.dumps(result).encode('utf-8'))
+
+
+class MockServices:
+    """Run the mock ElevenLabs and translation APIs on a local port
+
+    Use as a context manager; ``environment()`` returns the variables that
+    point subtitle_core at this server. Set ``transcript_words`` to change the
+    size of the transcript returned by speech-to-text.
+    """
+
+    def __init__(self, behaviour: ServiceBehaviour = ServiceBehaviour(),
+                 behaviours: Dict[str, ServiceBehaviour] = None,
+                 transcript_words: int = 1000, host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        self.behaviours = {service: (behaviours or {}).get(service, behaviour) for service in SERVICES}
+        self.transcript_words = transcript_words
+        self.host = host
+        self.port = port
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+        self._limiters = {service: _RateLimiter(b.rate_limit) for service, b in self.behaviours.items() if b.rate_limit}
+        self._bodies = {}
+        self._stats_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.reset_stats()
+
+    def start(self) -> "MockServices":
+        self._server = ThreadingHTTPServer((self.host, self.port), _Handler)
+        self._server.daemon_threads = True
+        self._server.mock = self
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "MockServices":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def environment(self) -> Dict[str, str]:
+        return {
+            "ELEVENLABS_BASE_URL": f"{self.url}/elevenlabs",
+            "GOOGLE_TRANSLATE_URL": f"{self.url}/google/m",
+            "LIBRETRANSLATE_URL": f"{self.url}/libre/translate",
+            "AZURE_TRANSLATOR_ENDPOINT": f"{self.url}/azure",
+        }
+
+    def transcription_body(self) -> bytes:
+        """Encoded transcript for the current transcript_words (built once per size)"""
+        words = self.transcript_words
+        if words not in self._bodies:
+            self._bodies[words] = json.dumps(synthetic_transcription(words)).encode('utf-8')
+        return self._bodies[words]
+
+    def _admit(self, service: str) -> int:
+        """Apply latency, throttling and error injection; returns the HTTP status to answer with"""
+        behaviour = self.behaviours[service]
+        with self._random_lock:
+            delay = behaviour.latency + (self._random.uniform(0, behaviour.jitter) if behaviour.jitter else 0.0)
+            failed = behaviour.error_rate and self._random.random() < behaviour.error_rate
+        if delay:
+            time.sleep(delay)
+
+        limiter = self._limiters.get(service)
+        status = 200
+        if limiter is not None and not limiter.allow():
+            status = 429
+        elif failed:
+            status = 500
+        with self._stats_lock:
+            counts = self._stats[service]
+            counts['requests'] += 1
+            if status == 429:
+                counts['throttled'] += 1
+            elif status == 500:
+                counts['errors'] += 1
+        return status
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        with self._stats_lock:
+            return {service: dict(counts) for service, counts in self._stats.items()}
+
+    def reset_stats(self) -> None:
+        with self._stats_lock:
+            self._stats = {service: {'requests': 0, 'errors': 0, 'throttled': 0} for service in SERVICES}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8090)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every request (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail with 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Requests per second per service before 429")
+    parser.add_argument("--words", type=int, default=1000, help="Words in the speech-to-text transcript (default: 1000)")
+    args = parser.parse_args()
+
+    behaviour = ServiceBehaviour(args.latency, args.jitter, args.error_rate, args.rate_limit)
+    services = MockServices(behaviour, transcript_words=args.words, host=args.host, port=args.port).start()
+    for name, value in services.environment().items():
+        print(f"export {name}={value}")
+    print("# Any API key is accepted. Press Ctrl+C to stop.", flush=True)
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(json.dumps(services.stats(), indent=2))
+    finally:
+        services.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
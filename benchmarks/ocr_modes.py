@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Compare OCR strategies for accuracy and throughput on a local clip.
+
+Modes:
+
+    full      every sampled frame OCR'd in full (no change detection)
+    changed   only tiles that changed since the previous sample (default engine)
+    text      changed areas narrowed to detected text regions (text_regions=True)
+
+--sampling adds runs of each mode that decode fewer frames (OCR_SAMPLING_MODES:
+reference, predicted, keyframes), reported as e.g. "changed/keyframes".
+
+Accuracy is measured against the full-frame run: recall is the share of its
+cues found by a mode (same text, overlapping time), precision the share of a
+mode's cues that match one of its cues. Throughput is wall time, OCR calls
+and the share of frame pixels sent to OCR.
+
+Without a video the synthetic clip from ocr_scaling.py is used. The
+recognizer is Tesseract when installed, otherwise the CPU-bound stand-in.
+
+Results are printed as JSON (and written to --output if given).
+
+Usage:
+    python benchmarks/ocr_modes.py [video.mp4] [--modes full,changed,text] [--interval 1.0]
+                                   [--sampling all,keyframes] [--output results.json]
+"""
+
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from ocr_scaling import default_recognizer, make_recognizer, synthetic_clip
+from subtitle_core import OCR_SAMPLING_MODES, FrameChangeDetector, VideoOCRProcessor
+
+MODES = ("full", "changed", "text")
+
+
+def make_processor(mode: str, interval: float, recognizer, workers: int, sampling: str = "all") -> VideoOCRProcessor:
+    if mode == "full":
+        # A negative threshold marks every tile as changed
+        return VideoOCRProcessor(interval=interval, recognizer=recognizer, workers=workers, sampling=sampling,
+                                 detector=FrameChangeDetector(hash_threshold=-1), text_regions=False)
+    return VideoOCRProcessor(interval=interval, recognizer=recognizer, workers=workers, sampling=sampling,
+                             text_regions=mode == "text")
+
+
+def _key(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def _matches(cue: Dict, others: List[Dict]) -> bool:
+    return any(_key(cue['text']) == _key(other['text']) and cue['start'] < other['end'] and other['start'] < cue['end']
+               for other in others)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", nargs="?", default=None, help="Video to OCR (default: generated synthetic clip)")
+    parser.add_argument("--modes", default=",".join(MODES), help=f"Comma-separated subset of: {', '.join(MODES)}")
+    parser.add_argument("--interval", type=float, default=1.0, help="Sampling interval in seconds (default: 1.0)")
+    parser.add_argument("--sampling", default="all",
+                        help=f"Comma-separated frame sampling modes to run each mode with: {', '.join(OCR_SAMPLING_MODES)} "
+                             "(default: all)")
+    parser.add_argument("--workers", type=int, default=1, help="OCR worker processes (default: 1)")
+    parser.add_argument("--seconds", type=int, default=60, help="Length of the synthetic clip (default: 60)")
+    parser.add_argument("--recognizer", choices=("tesseract", "synthetic"), default=None,
+                        help="OCR engine (default: tesseract if installed, else synthetic)")
+    parser.add_argument("--cost-ms", type=float, default=200.0,
+                        help="CPU milliseconds per megapixel for the synthetic recognizer (default: 200)")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    modes = [name.strip() for name in args.modes.split(",") if name.strip()]
+    unknown = set(modes) - set(MODES)
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(sorted(unknown))}")
+    samplings = [name.strip() for name in args.sampling.split(",") if name.strip()]
+    unknown = set(samplings) - set(OCR_SAMPLING_MODES)
+    if unknown:
+        parser.error(f"unknown sampling modes: {', '.join(sorted(unknown))}")
+    runs_to_make = [(mode, sampling) for sampling in samplings for mode in modes]
+    recognizer_name = args.recognizer or default_recognizer()
+    recognizer = make_recognizer(recognizer_name, args.cost_ms)
+
+    temp_dir = None
+    video = Path(args.video) if args.video else None
+    if video is None:
+        temp_dir = tempfile.mkdtemp(prefix="ocr-modes-")
+        video = synthetic_clip(Path(temp_dir) / "synthetic.mp4", args.seconds)
+    try:
+        runs = {}
+        for mode, sampling in [("full", "all")] + [run for run in runs_to_make if run != ("full", "all")]:
+            processor = make_processor(mode, args.interval, recognizer, args.workers, sampling)
+            started = time.perf_counter()
+            cues = processor.process_video_ocr(str(video))
+            name = mode if sampling == "all" else f"{mode}/{sampling}"
+            runs[name] = {"seconds": time.perf_counter() - started, "cues": cues, "stats": processor.stats}
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    reference = runs["full"]["cues"]
+    results = {}
+    for mode, sampling in runs_to_make:
+        name = mode if sampling == "all" else f"{mode}/{sampling}"
+        run = runs[name]
+        cues, stats = run["cues"], run["stats"]
+        results[name] = {
+            "frames": stats["frames"],
+            "seconds": round(run["seconds"], 3),
+            "speedup": round(runs["full"]["seconds"] / run["seconds"], 2),
+            "cues": len(cues),
+            "ocr_calls": stats["ocr_regions"] - stats["reused_regions"],
+            "reused_regions": stats["reused_regions"],
+            "ocr_pixel_share": stats["ocr_pixel_share"],
+            "recall": round(sum(_matches(cue, cues) for cue in reference) / len(reference), 3) if reference else None,
+            "precision": round(sum(_matches(cue, reference) for cue in cues) / len(cues), 3) if cues else None,
+        }
+
+    report = {
+        "video": args.video or f"synthetic ({args.seconds} s)",
+        "recognizer": recognizer_name,
+        "interval": args.interval,
+        "frames": runs["full"]["stats"]["frames"],
+        "modes": results,
+    }
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Measure how OCR throughput scales with the number of worker processes.
+
+Runs VideoOCRProcessor over the same video with 1..N workers (OCRWorkerPool,
+frames passed through shared memory) and reports wall time, speedup over a
+single in-process worker and whether every run produced the same cues.
+
+Without a video a synthetic clip with changing captions is generated. The
+recognizer is Tesseract when it is installed; otherwise (or with
+--recognizer synthetic) a CPU-bound stand-in that reads the synthetic
+clip's captions by colour and burns --cost-ms per megapixel, so scaling can
+be measured on machines without Tesseract.
+
+Results are printed as JSON (and written to --output if given).
+
+Usage:
+    python benchmarks/ocr_scaling.py [video.mp4] [--workers 1,2,4,8] [--interval 0.5]
+                                     [--recognizer tesseract|synthetic] [--output results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from subtitle_core import OCRLine, TesseractRecognizer, VideoOCRProcessor
+
+# Caption text drawn by synthetic_clip, keyed by its BGR colour
+CAPTION_COLOURS = {
+    (0, 0, 255): "Welcome to the lecture",
+    (0, 255, 0): "Gradient descent",
+    (255, 0, 0): "Learning rate",
+    (0, 255, 255): "Momentum",
+    (255, 0, 255): "Questions?",
+}
+
+
+def synthetic_clip(path: Path, seconds: int = 120, fps: int = 25, size=(1280, 720)) -> Path:
+    """Write a clip with a slide title, timed captions and a moving object"""
+    import cv2
+    import numpy as np
+
+    width, height = size
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*'mp4v'), fps, size)
+    colours = list(CAPTION_COLOURS)
+    for index in range(seconds * fps):
+        t = index / fps
+        frame = np.full((height, width, 3), 40, np.uint8)
+        x = int(100 + (t * 60) % (width - 300))
+        cv2.rectangle(frame, (x, height // 3), (x + 120, height // 3 + 120), (200, 200, 200), -1)
+        title = colours[int(t // 20) % len(colours)]
+        cv2.putText(frame, CAPTION_COLOURS[title], (40, 80), cv2.FONT_HERSHEY_SIMPLEX, 1.5, title, 3)
+        if t % 4 < 3:
+            caption = colours[int(t // 4) % len(colours)]
+            cv2.putText(frame, CAPTION_COLOURS[caption], (width // 4, height - 60),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.2, caption, 3)
+        writer.write(frame)
+    writer.release()
+    return path
+
+
+class SyntheticRecognizer:
+    """Stand-in for Tesseract: finds CAPTION_COLOURS text and spends cost_ms per megapixel"""
+
+    def __init__(self, cost_ms: float = 200.0):
+        self.cost_ms = cost_ms
+
+    def __call__(self, image) -> List[OCRLine]:
+        import numpy as np
+
+        deadline = time.process_time() + self.cost_ms * image.shape[0] * image.shape[1] / 1e9
+        while time.process_time() < deadline:
+            pass
+
+        lines = []
+        pixels = image.astype(np.int16)
+        for colour, text in CAPTION_COLOURS.items():
+            mask = np.abs(pixels - np.array(colour, dtype=np.int16)).sum(axis=2) < 120
+            if mask.sum() > 50:
+                ys, xs = np.nonzero(mask)
+                box = (int(xs.min()), int(ys.min()), int(xs.max() - xs.min()), int(ys.max() - ys.min()))
+                lines.append(OCRLine(text, 90.0, box))
+        return lines
+
+
+def make_recognizer(name: str, cost_ms: float):
+    if name == "tesseract":
+        return TesseractRecognizer()
+    return SyntheticRecognizer(cost_ms)
+
+
+def default_recognizer() -> str:
+    try:
+        import pytesseract
+        pytesseract.get_tesseract_version()
+        return "tesseract"
+    except Exception:
+        return "synthetic"
+
+
+def run(video: Path, workers: int, interval: float, recognizer) -> Dict:
+    processor = VideoOCRProcessor(interval=interval, recognizer=recognizer, workers=workers)
+    started = time.perf_counter()
+    cues = processor.process_video_ocr(str(video))
+    elapsed = time.perf_counter() - started
+    return {"seconds": elapsed, "cues": cues, "stats": processor.stats}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("video", nargs="?", default=None, help="Video to OCR (default: generated synthetic clip)")
+    default_workers = sorted({1, 2, 4, os.cpu_count() or 1} - {0})
+    parser.add_argument("--workers", default=",".join(str(n) for n in default_workers),
+                        help="Comma-separated worker counts (default: 1,2,4,<cpu count>)")
+    parser.add_argument("--interval", type=float, default=0.5, help="Sampling interval in seconds (default: 0.5)")
+    parser.add_argument("--seconds", type=int, default=120, help="Length of the synthetic clip (default: 120)")
+    parser.add_argument("--recognizer", choices=("tesseract", "synthetic"), default=None,
+                        help="OCR engine (default: tesseract if installed, else synthetic)")
+    parser.add_argument("--cost-ms", type=float, default=200.0,
+                        help="CPU milliseconds per megapixel for the synthetic recognizer (default: 200)")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    worker_counts = [int(n) for n in args.workers.split(",") if n.strip()]
+    recognizer_name = args.recognizer or default_recognizer()
+    recognizer = make_recognizer(recognizer_name, args.cost_ms)
+
+    temp_dir = None
+    video = Path(args.video) if args.video else None
+    if video is None:
+        temp_dir = tempfile.mkdtemp(prefix="ocr-scaling-")
+        video = synthetic_clip(Path(temp_dir) / "synthetic.mp4", args.seconds)
+    try:
+        results = []
+        baseline = None
+        for workers in worker_counts:
+            result = run(video, workers, args.interval, recognizer)
+            if baseline is None:
+                baseline = result
+            results.append({
+                "workers": workers,
+                "seconds": round(result["seconds"], 3),
+                "speedup": round(baseline["seconds"] / result["seconds"], 2),
+                "cues": len(result["cues"]),
+                "same_cues": result["cues"] == baseline["cues"],
+            })
+        report = {
+            "video": args.video or f"synthetic ({args.seconds} s)",
+            "cpu_count": os.cpu_count(),
+            "recognizer": recognizer_name,
+            "interval": args.interval,
+            "frames": baseline["stats"]["frames"] if baseline else 0,
+            "ocr_regions": baseline["stats"]["ocr_regions"] if baseline else 0,
+            "ocr_pixel_share": baseline["stats"]["ocr_pixel_share"] if baseline else 0.0,
+            "runs": results,
+        }
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output, encoding='utf-8')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
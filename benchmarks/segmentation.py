@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Measure subtitle segmentation speed and readability for every preset.
+
+Segments a transcription JSON (as returned by ElevenLabs, e.g. the .json
+written by subtitle_batch.py) or a synthetic transcript of --hours of speech,
+and reports the time taken plus cue statistics: count, mean duration,
+reading speed (characters per second) and longest line.
+
+Results are printed as JSON.
+
+Usage:
+    python benchmarks/segmentation.py [--transcript lecture.json] [--hours 10]
+"""
+
+import sys
+import json
+import time
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from subtitle_core import SEGMENTATION_PRESETS, segment_words
+from synthetic import synthetic_words
+
+
+def cue_statistics(cues: List[Dict]) -> Dict:
+    durations = [cue['end'] - cue['start'] for cue in cues]
+    rates = [len(cue['text'].replace('\n', ' ')) / duration for cue, duration in zip(cues, durations) if duration > 0]
+    return {
+        "cues": len(cues),
+        "mean_duration_seconds": round(statistics.mean(durations), 3) if durations else 0.0,
+        "median_cps": round(statistics.median(rates), 2) if rates else 0.0,
+        "cues_over_17_cps": round(sum(rate > 17 for rate in rates) / len(rates), 3) if rates else 0.0,
+        "longest_line_chars": max((len(line) for cue in cues for line in cue['text'].split('\n')), default=0),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transcript", default=None, help="ElevenLabs transcription JSON (default: synthetic)")
+    parser.add_argument("--hours", type=float, default=10.0, help="Length of the synthetic transcript (default: 10)")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per preset (default: 3)")
+    args = parser.parse_args()
+
+    if args.transcript:
+        words = json.loads(Path(args.transcript).read_text(encoding='utf-8')).get('words', [])
+    else:
+        words = synthetic_words(args.hours)
+
+    report = {"words": sum(word.get('type') == 'word' for word in words), "presets": {}}
+    for name in SEGMENTATION_PRESETS:
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            cues = segment_words(words, name)
+            timings.append(time.perf_counter() - started)
+        report["presets"][name] = dict(cue_statistics(cues), segment_seconds_median=round(statistics.median(timings), 4))
+
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,231 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite: subtitle formats, translation and the FastAPI backend.
+
+No API keys or network access are needed. The ElevenLabs and translation
+APIs are replaced by the local mock servers in mock_services.py, and
+transcripts are synthetic (1k to 100k words by default). Scenarios:
+
+    formats     generate_srt_subtitles / generate_vtt_subtitles / parse_srt_subtitles
+    translate   translate_subtitles_preserve_structure per translation service
+    api         /api/transcribe, session, render and download endpoints (needs fastapi)
+
+Results are printed as JSON (and written to --output) so runs can be
+compared over time.
+
+Usage:
+    python benchmarks/suite.py [--sizes 1000,10000,100000] [--latency 0.02] [--error-rate 0.01]
+                               [--rate-limit 50] [--scenarios formats,translate,api] [--output results.json]
+"""
+
+import os
+import sys
+import json
+import time
+import logging
+import argparse
+import platform
+import statistics
+import subprocess
+from pathlib import Path
+from typing import Callable, Dict, List
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+BACKEND_DIR = REPO_ROOT / "subtitle-app" / "backend"
+sys.path.insert(0, str(REPO_ROOT))
+
+# subtitle_core reads its endpoint settings at import time, so it is only
+# imported once the mock servers are running (see main)
+from mock_services import MockServices, ServiceBehaviour
+from synthetic import synthetic_transcription
+
+SCENARIOS = ("formats", "translate", "api")
+# Translation service -> mock service it calls
+TRANSLATION_SERVICES = {"google_free": "google", "libre": "libre", "azure": "azure"}
+
+
+def timed(function: Callable, repeat: int) -> Dict:
+    """Run function repeat times; returns the median and best time and the last result"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = function()
+        timings.append(time.perf_counter() - started)
+    return {"median": statistics.median(timings), "min": min(timings), "result": result}
+
+
+def environment_info() -> Dict:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "commit": commit,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+def benchmark_formats(sizes: List[int], repeat: int) -> Dict:
+    from subtitle_core import generate_srt_subtitles, generate_vtt_subtitles, parse_srt_subtitles
+
+    results = {}
+    for size in sizes:
+        transcription = synthetic_transcription(size)
+        srt = timed(lambda: generate_srt_subtitles(transcription), repeat)
+        vtt = timed(lambda: generate_vtt_subtitles(transcription), repeat)
+        srt_content = srt["result"]
+        parsed = timed(lambda: parse_srt_subtitles(srt_content), repeat)
+        results[str(size)] = {
+            "cues": len(parsed["result"]),
+            "srt_bytes": len(srt_content.encode('utf-8')),
+            "generate_srt_seconds": round(srt["median"], 5),
+            "generate_vtt_seconds": round(vtt["median"], 5),
+            "parse_srt_seconds": round(parsed["median"], 5),
+            "words_per_second": round(size / srt["median"]) if srt["median"] else None,
+        }
+    return results
+
+
+def benchmark_translate(services: MockServices, words: int, target_language: str) -> Dict:
+    from subtitle_core import TARGET_LANGUAGES, generate_srt_subtitles, parse_srt_subtitles, translate_subtitles_preserve_structure
+
+    srt_content = generate_srt_subtitles(synthetic_transcription(words))
+    cues = parse_srt_subtitles(srt_content)
+    prefix = f"{TARGET_LANGUAGES[target_language]}: "
+    results = {"words": words, "cues": len(cues), "target_language": target_language, "services": {}}
+
+    for service, mock_service in TRANSLATION_SERVICES.items():
+        services.reset_stats()
+        started = time.perf_counter()
+        translated = translate_subtitles_preserve_structure(srt_content, target_language, service, "benchmark-key")
+        elapsed = time.perf_counter() - started
+        translated_cues = parse_srt_subtitles(translated)
+        # Speaker labels stay in front of the translated text
+        ok = sum(prefix in cue['text'] for cue in translated_cues)
+        drift = max((abs(a[key] - b[key]) for a, b in zip(cues, translated_cues) for key in ('start', 'end')), default=0.0)
+        results["services"][service] = {
+            "seconds": round(elapsed, 4),
+            "cues_per_second": round(len(cues) / elapsed, 1) if elapsed else None,
+            "translated_cues": ok,
+            "untranslated_cues": len(translated_cues) - ok,
+            "missing_cues": len(cues) - len(translated_cues),
+            "max_timestamp_drift_ms": round(drift * 1000, 3),
+            "requests": services.stats()[mock_service],
+        }
+    return results
+
+
+def response_bytes(response) -> int:
+    """Bytes on the wire (httpx transparently decodes gzip/zstd responses)"""
+    return response.num_bytes_downloaded or len(response.content)
+
+
+def benchmark_api(services: MockServices, sizes: List[int], repeat: int) -> Dict:
+    try:
+        from fastapi.testclient import TestClient
+    except ImportError as e:
+        return {"skipped": f"fastapi test client unavailable: {e}"}
+    sys.path.insert(0, str(BACKEND_DIR))
+    import main as backend
+
+    client = TestClient(backend.app)
+    upload = b'\x00' * 64 * 1024  # Passed through as audio; the mock does not decode it
+    results = {}
+    for size in sizes:
+        services.transcript_words = size
+        services.transcription_body()  # Build the mock response outside the timed requests
+        session_ids = []
+
+        def transcribe():
+            response = client.post(
+                "/api/transcribe",
+                files={"file": ("audio.mp3", upload, "audio/mpeg")},
+                data={"api_key": "benchmark-key"},
+            )
+            response.raise_for_status()
+            session_ids.append(response.json()["data"]["session_id"])
+            return response
+
+        transcribed = timed(transcribe, repeat)
+        session_id = session_ids[-1]
+
+        def request(method: str, path: str, **kwargs):
+            response = client.request(method, path, **kwargs)
+            response.raise_for_status()
+            return response
+
+        endpoints = {
+            "get_session": timed(lambda: request("GET", f"/api/session/{session_id}"), repeat),
+            "get_session_all": timed(lambda: request("GET", f"/api/session/{session_id}?include=all"), repeat),
+            "download_srt": timed(lambda: request("GET", f"/api/download/{session_id}/srt/original"), repeat),
+            "render_readable": timed(lambda: request("POST", f"/api/session/{session_id}/render",
+                                                     data={"segmentation": "readable"}), repeat),
+            "export_zip": timed(lambda: request("GET", f"/api/export/{session_id}"), repeat),
+        }
+        results[str(size)] = {
+            "transcribe_ms": round(transcribed["median"] * 1000, 2),
+            "transcribe_response_bytes": response_bytes(transcribed["result"]),
+        }
+        for name, timing in endpoints.items():
+            results[str(size)][f"{name}_ms"] = round(timing["median"] * 1000, 2)
+            results[str(size)][f"{name}_bytes"] = response_bytes(timing["result"])
+
+        for finished in session_ids:
+            client.delete(f"/api/session/{finished}")
+    return results
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,100000", help="Transcript sizes in words (default: 1000,10000,100000)")
+    parser.add_argument("--translate-words", type=int, default=1000,
+                        help="Transcript size for the translate scenario, one request per cue (default: 1000)")
+    parser.add_argument("--target-language", default="Spanish", help="Translation target (default: Spanish)")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS), help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per measurement (default: 3)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Mock service latency in seconds (default: 0)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random mock latency up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of mock requests failing with 500")
+    parser.add_argument("--rate-limit", type=float, default=None, help="Mock requests per second per service before 429")
+    parser.add_argument("--output", default=None, help="Also write the JSON report to this file")
+    args = parser.parse_args()
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    behaviour = ServiceBehaviour(args.latency, args.jitter, args.error_rate, args.rate_limit)
+    report = {
+        "environment": environment_info(),
+        "config": {"sizes": sizes, "repeat": args.repeat, "mock_services": behaviour._asdict()},
+        "scenarios": {},
+    }
+
+    with MockServices(behaviour) as services:
+        os.environ.update(services.environment())
+        # Translation fallbacks are expected with --error-rate; they are counted, not printed
+        logging.getLogger("subtitle_core").setLevel(logging.ERROR)
+
+        if "formats" in scenarios:
+            report["scenarios"]["formats"] = benchmark_formats(sizes, args.repeat)
+        if "translate" in scenarios:
+            report["scenarios"]["translate"] = benchmark_translate(services, args.translate_words, args.target_language)
+        if "api" in scenarios:
+            report["scenarios"]["api"] = benchmark_api(services, sizes, args.repeat)
+
+    output = json.dumps(report, indent=2)
+    print(output)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding='utf-8')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,50 @@
+"""
+Synthetic ElevenLabs-shaped transcripts for the benchmarks.
+
+Deliberately free of subtitle_core imports so scripts can configure service
+endpoints (see mock_services.py) before the library reads them.
+"""
+
+import random
+from typing import Dict, List
+
+VOCABULARY = ("so today we are going to look at how gradient descent works in practice "
+              "and why the learning rate matters. okay, any questions? great! let's see "
+              "an example, then we will move on to momentum.").split()
+
+
+def synthetic_words(hours: float = None, seed: int = 0, max_words: int = None) -> List[Dict]:
+    """Generate ElevenLabs-shaped words at about 150 words per minute, two speakers
+
+    Stops after ``hours`` of speech or ``max_words`` words, whichever comes first.
+    """
+    rng = random.Random(seed)
+    words = []
+    t = 0.0
+    count = 0
+    speaker = 'speaker_0'
+    end_time = hours * 3600 if hours is not None else float('inf')
+    while t < end_time and (max_words is None or count < max_words):
+        duration = rng.uniform(0.12, 0.45)
+        if rng.random() < 0.01:
+            speaker = 'speaker_1' if speaker == 'speaker_0' else 'speaker_0'
+        words.append({'text': rng.choice(VOCABULARY), 'start': round(t, 3), 'end': round(t + duration, 3),
+                      'type': 'word', 'speaker_id': speaker})
+        count += 1
+        t += duration
+        gap = rng.uniform(0.6, 2.0) if rng.random() < 0.04 else rng.uniform(0.0, 0.08)
+        words.append({'text': ' ', 'start': round(t, 3), 'end': round(t + gap, 3),
+                      'type': 'spacing', 'speaker_id': speaker})
+        t += gap
+    return words
+
+
+def synthetic_transcription(word_count: int, seed: int = 0) -> Dict:
+    """A complete transcription response with ``word_count`` words"""
+    words = synthetic_words(max_words=word_count, seed=seed)
+    return {
+        'language_code': 'eng',
+        'language_probability': 0.98,
+        'text': ''.join(word['text'] if word['type'] == 'word' else ' ' for word in words).strip(),
+        'words': words,
+    }
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Summarize a trace file written with TRACING=file to find hot spots.
+
+Spans are grouped by name and reported with their count, total time and
+self time (total minus time spent in child spans), sorted by self time.
+Filter to one job with --session.
+
+Results are printed as JSON.
+
+Usage:
+    python benchmarks/trace_report.py traces.jsonl [--session SESSION_ID] [--top 20]
+"""
+
+import sys
+import json
+import argparse
+import statistics
+from pathlib import Path
+from typing import Dict, List
+
+
+def load_spans(path: Path, session_id: str = None) -> List[Dict]:
+    spans = []
+    with path.open(encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                spans.append(json.loads(line))
+    if session_id:
+        traces = {span['traceId'] for span in spans if span['attributes'].get('session_id') == session_id}
+        spans = [span for span in spans if span['traceId'] in traces]
+    return spans
+
+
+def summarize(spans: List[Dict]) -> List[Dict]:
+    child_ms: Dict[str, float] = {}
+    for span in spans:
+        if span.get('parentSpanId'):
+            child_ms[span['parentSpanId']] = child_ms.get(span['parentSpanId'], 0.0) + (span['durationMs'] or 0.0)
+
+    groups: Dict[str, Dict] = {}
+    for span in spans:
+        duration = span['durationMs'] or 0.0
+        group = groups.setdefault(span['name'], {'durations': [], 'self_ms': 0.0, 'errors': 0})
+        group['durations'].append(duration)
+        # Children on other threads can overlap, so self time never goes below zero
+        group['self_ms'] += max(duration - child_ms.get(span['spanId'], 0.0), 0.0)
+        group['errors'] += span['status']['code'] == 'ERROR'
+
+    rows = []
+    for name, group in groups.items():
+        durations = sorted(group['durations'])
+        rows.append({
+            'name': name,
+            'count': len(durations),
+            'total_ms': round(sum(durations), 3),
+            'self_ms': round(group['self_ms'], 3),
+            'median_ms': round(statistics.median(durations), 3),
+            'max_ms': round(durations[-1], 3),
+            'errors': group['errors'],
+        })
+    return sorted(rows, key=lambda row: -row['self_ms'])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("trace_file", help="JSON lines written by FileSpanExporter")
+    parser.add_argument("--session", default=None, help="Only traces that touched this session_id")
+    parser.add_argument("--top", type=int, default=20, help="Span names to report (default: 20)")
+    args = parser.parse_args()
+
+    spans = load_spans(Path(args.trace_file), args.session)
+    report = {
+        "spans": len(spans),
+        "traces": len({span['traceId'] for span in spans}),
+        "hot_spots": summarize(spans)[:args.top],
+    }
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
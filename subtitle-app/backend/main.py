@@ -1,6 +1,9 @@
 import os
+import re
 import requests
-import tempfile
+import gzip
+import hashlib
+from urllib.parse import quote
 from typing import Dict, List, Optional, Union
 from datetime import timedelta
 import subprocess
@@ -8,27 +11,53 @@ import base64
 import json
 import asyncio
 import uuid
+import time
 from pathlib import Path
 
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, FileResponse
+from fastapi.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
 from pydantic import BaseModel
 
-# Import our existing classes
+# Import the shared core library (repository root) - no Streamlit dependency
 import sys
-sys.path.append('..')
-from subtitle import (
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+from subtitle_core import (
     SubtitleTranslator, 
     ElevenLabsSubtitleGenerator,
     TARGET_LANGUAGES,
+    TRANSCRIPTION_LANGUAGES,
     TRANSLATION_SERVICES,
     generate_srt_subtitles,
     generate_vtt_subtitles,
+    srt_to_vtt,
     translate_subtitles_preserve_structure,
     parse_srt_subtitles,
-    extract_audio_from_video
+    ExtractionScheduler,
+    SchedulerFull,
+    transcribe_and_translate,
+    VideoOCRProcessor,
+    merge_ocr_subtitles,
+    merge_ocr_translations,
+    SEGMENTATION_PRESETS,
+    AUDIO_PROFILES,
+    build_segmentation_policy,
+    validate_speaker_names,
+    render_cache,
+    render_subtitles,
+    metrics,
+    record_cache,
+    start_span,
+    set_trace_attributes,
+    bind_context,
+    PROFILE,
+    PROFILE_MODES,
+    profile_run,
+    set_profile_key
 )
+from session_store import create_session_store, pack_transcription, unpack_transcription, transcription_dict
+from zip_export import stream_zip, session_export_entries
 
 app = FastAPI(title="Subtitle Generator API", version="1.0.0")
 
@@ -48,6 +77,8 @@ class TranscriptionRequest(BaseModel):
     num_speakers: Optional[int] = None
     diarize: bool = True
     tag_audio_events: bool = True
+    trim_silence: bool = False
+    audio_profile: Optional[str] = None
 
 class TranslationRequest(BaseModel):
     srt_content: str
@@ -60,8 +91,209 @@ class APIResponse(BaseModel):
     message: str
     data: Optional[Dict] = None
 
-# Global storage for session data
-sessions = {}
+# Session storage (memory, sqlite or redis - see session_store.py)
+sessions = create_session_store()
+
+# Bounded ffmpeg extraction queue (FFMPEG_MAX_CONCURRENT / FFMPEG_THREADS / FFMPEG_MAX_QUEUE)
+extraction_scheduler = ExtractionScheduler()
+
+# Download settings
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+GZIP_MIN_SIZE = 1024  # Smaller payloads are not worth compressing
+DOWNLOAD_MEDIA_TYPES = {
+    "srt": "application/x-subrip; charset=utf-8",
+    "vtt": "text/vtt",  # Starlette appends the charset for text/* types
+    "json": "application/json",
+}
+
+def content_disposition(filename: str) -> str:
+    """Build a Content-Disposition header with an ASCII fallback and RFC 5987 UTF-8 name"""
+    ascii_name = filename.encode('ascii', 'replace').decode('ascii').replace('?', '_').replace('"', '_')
+    return f"attachment; filename=\"{ascii_name}\"; filename*=UTF-8''{quote(filename)}"
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Check an If-None-Match header against an ETag (weak comparison)"""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in if_none_match.split(',')]
+    return any((tag[2:] if tag.startswith('W/') else tag) == etag for tag in candidates)
+
+def iter_chunks(data: bytes, chunk_size: int = DOWNLOAD_CHUNK_SIZE):
+    """Yield data in fixed-size chunks for streaming responses"""
+    for offset in range(0, len(data), chunk_size):
+        yield data[offset:offset + chunk_size]
+
+# Optional response fields: ?include=srt,vtt,words,translations (or "all")
+RESPONSE_FIELDS = {
+    "srt": ("srt_content",),
+    "vtt": ("vtt_content",),
+    "words": ("transcription",),
+    "translations": ("translated_subtitles", "translated_vtt"),
+}
+
+def parse_include(include: Optional[str]) -> List[str]:
+    """Validate the include query parameter; returns the requested field groups"""
+    if not include:
+        return []
+    requested = [name.strip() for name in include.split(',') if name.strip()]
+    if "all" in requested:
+        return list(RESPONSE_FIELDS)
+    unknown = [name for name in requested if name not in RESPONSE_FIELDS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include fields: {', '.join(unknown)}. Available: {', '.join(RESPONSE_FIELDS)}, all"
+        )
+    return requested
+
+def parse_language_list(value: Optional[str], field: str) -> List[str]:
+    """Parse a form field holding a JSON list of language names"""
+    if not value:
+        return []
+    try:
+        languages = json.loads(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"{field} must be a JSON list of language names")
+    if not isinstance(languages, list) or not all(isinstance(lang, str) for lang in languages):
+        raise HTTPException(status_code=400, detail=f"{field} must be a JSON list of language names")
+    return languages
+
+def recognize_on_screen_text(video_bytes: bytes, suffix: str):
+    """(OCR cues, error message) for an uploaded video; OCR is best effort"""
+    try:
+        return VideoOCRProcessor().process_video_bytes(video_bytes, suffix), None
+    except Exception as e:
+        return [], str(e)
+
+def session_links(session_id: str, session_data: Dict) -> Dict:
+    """URLs for fetching the heavy parts of a session on demand"""
+    links = {
+        'session': f"/api/session/{session_id}",
+        'srt': f"/api/download/{session_id}/srt/original",
+        'vtt': f"/api/download/{session_id}/vtt/original",
+        'json': f"/api/download/{session_id}/json/original",
+        'export': f"/api/export/{session_id}",
+    }
+    translations = session_data.get('translated_subtitles') or {}
+    if translations:
+        links['translations'] = {
+            lang: {
+                'srt': f"/api/download/{session_id}/srt/{quote(lang)}",
+                'vtt': f"/api/download/{session_id}/vtt/{quote(lang)}",
+            }
+            for lang in translations
+        }
+    return links
+
+def session_response_data(session_id: str, session_data: Dict, include: List[str]) -> Dict:
+    """Lightweight session summary plus links, with the requested fields inlined"""
+    data = {'session_id': session_id, 'filename': session_data.get('filename')}
+    data.update(session_data.get('summary') or {})
+    data['translated_languages'] = list((session_data.get('translated_subtitles') or {}).keys())
+    data['links'] = session_links(session_id, session_data)
+    for name in include:
+        for key in RESPONSE_FIELDS[name]:
+            if key == 'transcription':
+                data[key] = transcription_dict(session_data)
+            else:
+                data[key] = session_data.get(key) or ({} if name == 'translations' else '')
+    return data
+
+def choose_content_encoding(accept_encoding: str) -> Optional[str]:
+    """Pick zstd (when the zstandard package is installed) or gzip from Accept-Encoding"""
+    accepted = accept_encoding.lower()
+    if 'zstd' in accepted:
+        try:
+            import zstandard  # noqa: F401
+            return 'zstd'
+        except ImportError:
+            pass
+    if 'gzip' in accepted:
+        return 'gzip'
+    return None
+
+def compress_body(body: bytes, encoding: str) -> bytes:
+    if encoding == 'zstd':
+        import zstandard
+        return zstandard.ZstdCompressor(level=3).compress(body)
+    return gzip.compress(body, compresslevel=6)
+
+@app.middleware("http")
+async def compress_json_responses(request: Request, call_next):
+    """Compress large JSON API responses (downloads handle their own encoding and ETags)"""
+    response = await call_next(request)
+    content_type = response.headers.get('content-type', '')
+    if (not content_type.startswith('application/json') or 'content-encoding' in response.headers
+            or 'etag' in response.headers):
+        return response
+    encoding = choose_content_encoding(request.headers.get('accept-encoding', ''))
+    if encoding is None:
+        return response
+    
+    body = b''.join([chunk async for chunk in response.body_iterator])
+    headers = {key: value for key, value in response.headers.items() if key != 'content-length'}
+    if len(body) >= GZIP_MIN_SIZE:
+        body = compress_body(body, encoding)
+        headers['content-encoding'] = encoding
+        headers['vary'] = 'Accept-Encoding'
+    return Response(body, status_code=response.status_code, headers=headers)
+
+# Session-scoped routes; their spans (and all child spans) are tagged with session_id
+SESSION_PATH = re.compile(r"^/api/(?:session|download|export)/([^/]+)")
+
+@app.middleware("http")
+async def trace_requests(request: Request, call_next):
+    """Root span per request (TRACING=file|otel); pipeline spans become its children"""
+    with start_span(f"{request.method} {request.url.path}", **{
+        'http.method': request.method,
+        'http.target': request.url.path,
+    }) as span:
+        match = SESSION_PATH.match(request.url.path)
+        if match:
+            set_trace_attributes(session_id=match.group(1))
+        response = await call_next(request)
+        route = request.scope.get('route')
+        if route is not None:
+            # Name by route template so spans group across sessions
+            span.update_name(f"{request.method} {route.path}")
+        span.set_attribute('http.status_code', response.status_code)
+        return response
+
+# ?profile (or ?profile=cprofile) profiles a single request without redeploying.
+# Off by default: any client could otherwise make the server write profiles.
+PROFILE_ALLOW_QUERY = os.getenv("PROFILE_ALLOW_QUERY", "0") != "0"
+
+@app.middleware("http")
+async def profile_requests(request: Request, call_next):
+    """Profile requests when PROFILE is set or ?profile is allowed and passed; X-Profile names the output
+
+    The profile covers the event-loop thread plus the worker threads a
+    request hands work to through bind_context. The loop thread is shared,
+    so coroutines of other requests running at the same time show up in it;
+    profile one request at a time for clean results (a request arriving
+    while another is profiled is served unprofiled). cprofile only sees the
+    event-loop thread, not the threadpool running transcription, so prefer
+    "sample" for /api/transcribe.
+    """
+    mode = PROFILE if PROFILE != "off" else None
+    if PROFILE_ALLOW_QUERY and 'profile' in request.query_params:
+        requested = request.query_params['profile']
+        mode = requested if requested in PROFILE_MODES else "sample"
+    if mode is None:
+        return await call_next(request)
+    
+    match = SESSION_PATH.match(request.url.path)
+    key = match.group(1) if match else f"{request.method}-{request.url.path}"
+    with profile_run(key, mode, write=False) as profile:
+        response = await call_next(request)
+    if profile is not None:
+        # Writing the profile is disk I/O (and pstats work for cprofile): keep it off the loop
+        await run_in_threadpool(profile.write)
+        # Only the file name stem: server paths stay on the server
+        response.headers['X-Profile'] = profile.name
+    return response
 
 @app.get("/")
 async def root():
@@ -70,27 +302,7 @@ async def root():
 @app.get("/api/languages")
 async def get_languages():
     """Get supported languages for transcription and translation"""
-    transcription_languages = {
-        "Auto-detect": None,
-        "English": "eng", "Spanish": "spa", "French": "fra", "German": "deu",
-        "Italian": "ita", "Portuguese": "por", "Russian": "rus", "Japanese": "jpn",
-        "Chinese (Mandarin)": "zho", "Korean": "kor", "Hindi": "hin", "Arabic": "ara",
-        "Dutch": "nld", "Turkish": "tur", "Polish": "pol", "Swedish": "swe",
-        "Norwegian": "nor", "Danish": "dan", "Finnish": "fin", "Czech": "ces",
-        "Hungarian": "hun", "Bulgarian": "bul", "Romanian": "ron", "Greek": "ell",
-        "Hebrew": "heb", "Thai": "tha", "Vietnamese": "vie", "Indonesian": "ind",
-        "Malay": "msa", "Filipino": "fil", "Ukrainian": "ukr", "Bengali": "ben",
-        "Afrikaans": "afr", "Amharic": "amh", "Armenian": "hye", "Assamese": "asm",
-        "Azerbaijani": "aze", "Belarusian": "bel", "Bosnian": "bos", "Burmese": "mya",
-        "Catalan": "cat", "Croatian": "hrv", "Estonian": "est", "Georgian": "kat",
-        "Gujarati": "guj", "Icelandic": "isl", "Irish": "gle", "Javanese": "jav",
-        "Kannada": "kan", "Kazakh": "kaz", "Khmer": "khm", "Latvian": "lav",
-        "Lithuanian": "lit", "Macedonian": "mkd", "Malayalam": "mal", "Maltese": "mlt",
-        "Marathi": "mar", "Mongolian": "mon", "Nepali": "nep", "Persian": "fas",
-        "Punjabi": "pan", "Serbian": "srp", "Slovak": "slk", "Slovenian": "slv",
-        "Swahili": "swa", "Tamil": "tam", "Telugu": "tel", "Urdu": "urd",
-        "Welsh": "cym", "Zulu": "zul"
-    }
+    transcription_languages = TRANSCRIPTION_LANGUAGES
     
     return APIResponse(
         success=True,
@@ -98,7 +310,8 @@ async def get_languages():
         data={
             "transcription_languages": transcription_languages,
             "translation_languages": TARGET_LANGUAGES,
-            "translation_services": TRANSLATION_SERVICES
+            "translation_services": TRANSLATION_SERVICES,
+            "segmentation_presets": {name: policy._asdict() for name, policy in SEGMENTATION_PRESETS.items()}
         }
     )
 
@@ -109,23 +322,63 @@ async def create_transcription(
     language_code: Optional[str] = Form(None),
     num_speakers: Optional[int] = Form(None),
     diarize: bool = Form(True),
-    tag_audio_events: bool = Form(True)
+    tag_audio_events: bool = Form(True),
+    trim_silence: bool = Form(False),
+    audio_profile: Optional[str] = Form(None),
+    segmentation: Optional[str] = Form(None),
+    translate_to: Optional[str] = Form(None),  # JSON string of list; translated while transcribing
+    translation_service: str = Form("google_free"),
+    translation_api_key: Optional[str] = Form(None),
+    ocr: bool = Form(False),
+    include: Optional[str] = None
 ):
-    """Create transcription from uploaded audio/video file"""
+    """Create transcription from uploaded audio/video file
+
+    With translate_to, the file is transcribed in chunks and finished
+    subtitles are translated in parallel (pipeline mode). With ocr, text shown
+    in a video (slides, captions) is read while the audio is transcribed and
+    added as [ON-SCREEN] cues.
+
+    The response is a summary with download links; add e.g.
+    ``?include=srt,vtt`` to inline subtitle content (see RESPONSE_FIELDS).
+    """
     try:
+        include_fields = parse_include(include)
+        target_languages_list = parse_language_list(translate_to, "translate_to")
         if not api_key or api_key == "your_api_key_here":
             raise HTTPException(status_code=400, detail="Valid ElevenLabs API key required")
+        if segmentation and segmentation not in SEGMENTATION_PRESETS:
+            raise HTTPException(status_code=400, detail=f"Unknown segmentation preset. Available: {', '.join(SEGMENTATION_PRESETS)}")
+        if audio_profile and audio_profile not in AUDIO_PROFILES:
+            raise HTTPException(status_code=400, detail=f"Unknown audio profile. Available: {', '.join(AUDIO_PROFILES)}")
+        is_video = bool(file.content_type and file.content_type.startswith('video/'))
+        if ocr and not is_video:
+            raise HTTPException(status_code=400, detail="ocr needs a video upload")
         
         # Create session ID
         session_id = str(uuid.uuid4())
+        set_trace_attributes(session_id=session_id)
+        set_profile_key(session_id)
         
         # Read file content
         file_content = await file.read()
         
+        upload_name = file.filename or 'audio.mp3'
+        upload_type = file.content_type or 'audio/mpeg'
+        
+        # On-screen text is read on a worker thread while the audio is transcribed
+        ocr_task = None
+        if ocr:
+            ocr_task = asyncio.ensure_future(run_in_threadpool(
+                bind_context(recognize_on_screen_text), file_content, Path(upload_name).suffix or '.mp4'))
+        
         # Extract audio if video file
-        if file.content_type and file.content_type.startswith('video/'):
+        if is_video:
             try:
-                file_content = extract_audio_from_video(file_content)
+                extracted = await extraction_scheduler.extract_async(file_content, audio_profile)
+                file_content, upload_name, upload_type = extracted.audio, extracted.filename, extracted.mime_type
+            except SchedulerFull as e:
+                raise HTTPException(status_code=503, detail=str(e), headers={'Retry-After': '5'})
             except Exception as e:
                 # Continue with original file if extraction fails
                 pass
@@ -133,26 +386,64 @@ async def create_transcription(
         # Initialize generator
         generator = ElevenLabsSubtitleGenerator(api_key)
         
-        # Create transcription
-        transcription = generator.create_transcription(
-            file_content,
-            language_code=language_code,
-            num_speakers=num_speakers,
-            diarize=diarize,
-            tag_audio_events=tag_audio_events
-        )
+        translated_subtitles = {}
+        translated_vtt = {}
+        pipeline_data = None
+        
+        # Both paths block for the whole job: run them off the event loop
+        # (bind_context keeps the request's trace and profile on the worker thread)
+        if target_languages_list:
+            # Pipeline mode: translate finished cues while later chunks are transcribed
+            result = await run_in_threadpool(
+                bind_context(transcribe_and_translate),
+                generator,
+                file_content,
+                target_languages_list,
+                translation_service,
+                translation_api_key,
+                audio_profile=audio_profile,
+                segmentation=segmentation,
+                language_code=language_code,
+                num_speakers=num_speakers,
+                diarize=diarize,
+                tag_audio_events=tag_audio_events,
+                trim_silence=trim_silence,
+                scheduler=extraction_scheduler
+            )
+            transcription = result.transcription
+            translated_subtitles = result.translated_subtitles
+            translated_vtt = {lang: srt_to_vtt(srt) for lang, srt in translated_subtitles.items()}
+            pipeline_data = {'timings': result.timings, 'errors': result.errors}
+        else:
+            # Create transcription
+            transcription = await run_in_threadpool(
+                bind_context(generator.create_transcription),
+                file_content,
+                language_code=language_code,
+                num_speakers=num_speakers,
+                diarize=diarize,
+                tag_audio_events=tag_audio_events,
+                trim_silence=trim_silence,
+                filename=upload_name,
+                mime_type=upload_type,
+                audio_profile=audio_profile,
+                scheduler=extraction_scheduler
+            )
         
         # Generate subtitle formats
-        srt_content = generate_srt_subtitles(transcription)
-        vtt_content = generate_vtt_subtitles(transcription)
+        srt_content = generate_srt_subtitles(transcription, segmentation)
+        vtt_content = generate_vtt_subtitles(transcription, segmentation)
         
-        # Store in session
-        sessions[session_id] = {
-            'transcription': transcription,
-            'srt_content': srt_content,
-            'vtt_content': vtt_content,
-            'filename': file.filename
-        }
+        ocr_cues, ocr_error = (await ocr_task) if ocr_task is not None else ([], None)
+        if ocr_cues:
+            srt_content = merge_ocr_subtitles(srt_content, ocr_cues)
+            vtt_content = srt_to_vtt(srt_content)
+            if translated_subtitles:
+                # Pipeline translations were made before OCR finished
+                translated_subtitles = await run_in_threadpool(
+                    bind_context(merge_ocr_translations), translated_subtitles, ocr_cues,
+                    translation_service, translation_api_key)
+                translated_vtt = {lang: srt_to_vtt(srt) for lang, srt in translated_subtitles.items()}
         
         # Calculate statistics
         speakers = set()
@@ -165,21 +456,45 @@ async def create_transcription(
         if 'words' in transcription and transcription['words']:
             duration = transcription['words'][-1].get('end', 0)
         
-        return APIResponse(
-            success=True,
-            message="Transcription completed successfully",
-            data={
-                'session_id': session_id,
+        # Store in session
+        session_data = {
+            'word_table': pack_transcription(transcription),
+            'srt_content': srt_content,
+            'vtt_content': vtt_content,
+            'filename': file.filename,
+            'summary': {
                 'language': transcription.get('language_code', 'Unknown'),
                 'confidence': transcription.get('language_probability', 0),
                 'speakers_detected': len(speakers),
                 'duration': duration,
-                'srt_content': srt_content,
-                'vtt_content': vtt_content,
-                'transcription': transcription
             }
+        }
+        if target_languages_list:
+            session_data['translated_subtitles'] = translated_subtitles
+            session_data['translated_vtt'] = translated_vtt
+        if ocr:
+            # Kept so re-rendered subtitles include them again
+            session_data['ocr_cues'] = ocr_cues
+            session_data['summary']['on_screen_cues'] = len(ocr_cues)
+        sessions.set(session_id, session_data)
+        
+        data = session_response_data(session_id, session_data, include_fields)
+        if pipeline_data:
+            data['pipeline'] = pipeline_data
+        if ocr_error:
+            data['ocr_error'] = ocr_error
+        
+        return APIResponse(
+            success=True,
+            message="Transcription completed successfully",
+            data=data
         )
         
+    except HTTPException:
+        raise
+    except SchedulerFull as e:
+        # Chunk splitting or silence trimming found the ffmpeg queue full
+        raise HTTPException(status_code=503, detail=str(e), headers={'Retry-After': '5'})
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -191,14 +506,16 @@ async def translate_subtitles(
     api_key: Optional[str] = Form(None)
 ):
     """Translate subtitles to multiple languages"""
+    set_trace_attributes(session_id=session_id, service=translation_service)
+    set_profile_key(session_id)
     try:
-        if session_id not in sessions:
+        session_data = sessions.get(session_id)
+        if session_data is None:
             raise HTTPException(status_code=404, detail="Session not found")
         
         # Parse target languages from JSON string
-        target_languages_list = json.loads(target_languages)
+        target_languages_list = parse_language_list(target_languages, "target_languages")
         
-        session_data = sessions[session_id]
         srt_content = session_data['srt_content']
         
         translated_subtitles = {}
@@ -218,23 +535,16 @@ async def translate_subtitles(
                     translated_subtitles[lang] = translated_srt
                     
                     # Convert to VTT format
-                    vtt_content = "WEBVTT\n\n"
-                    lines = translated_srt.strip().split('\n')
-                    for line in lines:
-                        if '-->' in line:
-                            vtt_line = line.replace(',', '.')
-                            vtt_content += vtt_line + '\n'
-                        else:
-                            vtt_content += line + '\n'
-                    translated_vtt[lang] = vtt_content
+                    translated_vtt[lang] = srt_to_vtt(translated_srt)
                     
             except Exception as e:
                 print(f"Failed to translate to {lang}: {str(e)}")
                 continue
         
         # Update session with translations
-        sessions[session_id]['translated_subtitles'] = translated_subtitles
-        sessions[session_id]['translated_vtt'] = translated_vtt
+        session_data['translated_subtitles'] = translated_subtitles
+        session_data['translated_vtt'] = translated_vtt
+        sessions.set(session_id, session_data)
         
         return APIResponse(
             success=True,
@@ -247,28 +557,129 @@ async def translate_subtitles(
             }
         )
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/api/session/{session_id}")
-async def get_session(session_id: str):
-    """Get session data"""
-    if session_id not in sessions:
+async def get_session(session_id: str, include: Optional[str] = None):
+    """Get session summary and links; ?include=srt,vtt,words,translations inlines content"""
+    include_fields = parse_include(include)
+    session_data = sessions.get(session_id)
+    if session_data is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
     return APIResponse(
         success=True,
         message="Session data retrieved",
-        data=sessions[session_id]
+        data=session_response_data(session_id, session_data, include_fields)
+    )
+
+@app.post("/api/session/{session_id}/render")
+async def render_session_subtitles(
+    session_id: str,
+    segmentation: Optional[str] = Form(None),
+    options: Optional[str] = Form(None),  # JSON object of SegmentationPolicy overrides
+    speaker_names: Optional[str] = Form(None),  # JSON object, e.g. {"speaker_1": "Alice"}
+    store: bool = Form(False)
+):
+    """Re-segment the stored transcription with new display options (no new transcription)
+
+    With store, the result replaces the session's SRT/VTT used by downloads
+    and exports; existing translations no longer match and are removed.
+    """
+    session_data = sessions.get(session_id)
+    if session_data is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    try:
+        overrides = json.loads(options) if options else {}
+        if not isinstance(overrides, dict):
+            raise ValueError("options must be a JSON object")
+        policy = build_segmentation_policy(segmentation, **overrides)
+        names = validate_speaker_names(json.loads(speaker_names) if speaker_names else None)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    started = time.perf_counter()
+    # Decoded only on a cache miss
+    rendered = render_subtitles(lambda: unpack_transcription(session_data), policy, names, cache_key=session_id)
+    srt_content, vtt_content = rendered.srt_content, rendered.vtt_content
+    if session_data.get('ocr_cues'):
+        srt_content = merge_ocr_subtitles(srt_content, session_data['ocr_cues'])
+        vtt_content = srt_to_vtt(srt_content)
+    render_ms = (time.perf_counter() - started) * 1000
+    
+    if store:
+        session_data['srt_content'] = srt_content
+        session_data['vtt_content'] = vtt_content
+        session_data['render_options'] = {'policy': policy._asdict(), 'speaker_names': names}
+        session_data.pop('translated_subtitles', None)
+        session_data.pop('translated_vtt', None)
+        sessions.set(session_id, session_data)
+    
+    return APIResponse(
+        success=True,
+        message="Subtitles rendered",
+        data={
+            'srt_content': srt_content,
+            'vtt_content': vtt_content,
+            'cue_count': rendered.cue_count + len(session_data.get('ocr_cues') or []),
+            'cached': rendered.cached,
+            'render_ms': round(render_ms, 3),
+            'policy': policy._asdict(),
+            'stored': store
+        }
+    )
+
+@app.delete("/api/session/{session_id}")
+async def delete_session(session_id: str):
+    """Delete session data"""
+    sessions.delete(session_id)
+    render_cache.invalidate(session_id)
+    return APIResponse(success=True, message="Session deleted")
+
+@app.get("/api/extraction/stats")
+async def get_extraction_stats():
+    """Get ffmpeg extraction queue metrics (queue depth, wait and run times)"""
+    return APIResponse(
+        success=True,
+        message="Extraction scheduler statistics retrieved",
+        data=extraction_scheduler.stats()
+    )
+
+@app.get("/api/sessions/stats")
+async def get_session_store_stats():
+    """Get session store metrics (hit rate, evictions, size)"""
+    return APIResponse(
+        success=True,
+        message="Session store statistics retrieved",
+        data=sessions.stats()
     )
 
+@app.get("/metrics")
+async def get_metrics():
+    """Prometheus metrics: stage timings, translation latency, cache hit rates and queue gauges"""
+    extraction_stats = extraction_scheduler.stats()
+    session_stats = sessions.stats()
+    gauges = {
+        'subtitle_extraction_queue_depth': extraction_stats['queue_depth'],
+        'subtitle_extraction_running': extraction_stats['running'],
+        'subtitle_session_hit_ratio': session_stats['hit_rate'],
+        'subtitle_render_cache_entries': render_cache.stats()['entries'],
+    }
+    if 'entries' in session_stats:
+        gauges['subtitle_sessions'] = session_stats['entries']
+    return PlainTextResponse(metrics.render_prometheus(gauges), media_type="text/plain; version=0.0.4")
+
 @app.get("/api/download/{session_id}/{format}/{language}")
-async def download_subtitle(session_id: str, format: str, language: str = "original"):
+async def download_subtitle(request: Request, session_id: str, format: str, language: str = "original"):
     """Download subtitle file"""
-    if session_id not in sessions:
+    session_data = sessions.get(session_id)
+    if session_data is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session_data = sessions[session_id]
     filename_base = session_data['filename'].split('.')[0] if session_data['filename'] else 'subtitle'
     
     try:
@@ -280,7 +691,7 @@ async def download_subtitle(session_id: str, format: str, language: str = "origi
                 content = session_data['vtt_content']
                 filename = f"{filename_base}.vtt"
             elif format == "json":
-                content = json.dumps(session_data['transcription'], indent=2)
+                content = json.dumps(transcription_dict(session_data), indent=2)
                 filename = f"{filename_base}.json"
             else:
                 raise HTTPException(status_code=400, detail="Invalid format")
@@ -295,22 +706,62 @@ async def download_subtitle(session_id: str, format: str, language: str = "origi
             else:
                 raise HTTPException(status_code=400, detail="Invalid format for translation")
         
-        # Create temporary file
-        with tempfile.NamedTemporaryFile(mode='w', delete=False, suffix=f'.{format}', encoding='utf-8') as tmp_file:
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
-        return FileResponse(
-            path=tmp_file_path,
-            filename=filename,
-            media_type='application/octet-stream'
-        )
+        return stream_download(request, content, filename, DOWNLOAD_MEDIA_TYPES[format])
         
     except KeyError:
         raise HTTPException(status_code=404, detail="Translation not found")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.get("/api/export/{session_id}")
+async def export_session_zip(session_id: str):
+    """Download all formats and translations for a session as a single ZIP archive"""
+    session_data = sessions.get(session_id)
+    if session_data is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+    
+    filename_base = session_data['filename'].split('.')[0] if session_data['filename'] else 'subtitle'
+    entries = session_export_entries(session_data, filename_base)
+    
+    return StreamingResponse(
+        stream_zip(entries),
+        media_type='application/zip',
+        headers={'Content-Disposition': content_disposition(f"{filename_base}_subtitles.zip")}
+    )
+
+def stream_download(request: Request, content: str, filename: str, media_type: str) -> Response:
+    """Serve in-memory subtitle content with ETag revalidation and optional gzip"""
+    body = content.encode('utf-8')
+    
+    # Compress only when the client accepts it and the payload is large enough
+    accept_encoding = request.headers.get('accept-encoding', '')
+    use_gzip = 'gzip' in accept_encoding.lower() and len(body) >= GZIP_MIN_SIZE
+    
+    # ETag identifies the exact representation sent (content + encoding)
+    digest = hashlib.sha256(body).hexdigest()[:32]
+    etag = f'"{digest}-gzip"' if use_gzip else f'"{digest}"'
+    
+    headers = {
+        'ETag': etag,
+        'Cache-Control': 'private, no-cache',
+        'Vary': 'Accept-Encoding',
+        'Content-Disposition': content_disposition(filename),
+    }
+    
+    not_modified = etag_matches(request.headers.get('if-none-match'), etag)
+    record_cache("download_etag", not_modified)
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    
+    if use_gzip:
+        body = gzip.compress(body, compresslevel=6)
+        headers['Content-Encoding'] = 'gzip'
+    headers['Content-Length'] = str(len(body))
+    
+    return StreamingResponse(iter_chunks(body), media_type=media_type, headers=headers)
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
\ No newline at end of file
@@ -0,0 +1,378 @@
+import os
+import json
+import time
+import base64
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Union
+
+from subtitle_core import WordTable
+
+# Session store configuration (override with environment variables)
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE", "memory")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", "3600"))
+SESSION_MAX_ENTRIES = int(os.getenv("SESSION_MAX_ENTRIES", "256"))
+SESSION_MAX_BYTES = int(os.getenv("SESSION_MAX_BYTES", str(512 * 1024 * 1024)))
+SESSION_SQLITE_PATH = os.getenv("SESSION_SQLITE_PATH", "sessions.db")
+SESSION_REDIS_URL = os.getenv("SESSION_REDIS_URL", "redis://localhost:6379/0")
+
+
+def encode_session(data: Dict) -> str:
+    """Serialize session data for stores that keep text values"""
+    return json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+
+
+def decode_session(raw) -> Dict:
+    """Deserialize session data written by encode_session"""
+    if isinstance(raw, bytes):
+        raw = raw.decode('utf-8')
+    return json.loads(raw)
+
+
+def pack_transcription(transcription: Dict) -> str:
+    """Encode a transcription as a compressed WordTable for storing in a session
+
+    A multi-hour transcript shrinks from tens of MB of JSON (and far more as
+    Python objects) to a couple of MB, which keeps more sessions within
+    SESSION_MAX_BYTES and makes every session read cheaper.
+    """
+    return base64.b64encode(WordTable.from_transcription(transcription).to_bytes(compress=True)).decode('ascii')
+
+
+def unpack_transcription(session_data: Dict) -> Union[WordTable, Dict]:
+    """Return a session's transcription: a WordTable, or the plain dict for older sessions"""
+    if session_data.get('word_table'):
+        return WordTable.from_bytes(base64.b64decode(session_data['word_table']))
+    return session_data.get('transcription') or {}
+
+
+def transcription_dict(session_data: Dict) -> Dict:
+    """Return a session's transcription in the ElevenLabs JSON shape"""
+    transcription = unpack_transcription(session_data)
+    return transcription.to_transcription() if isinstance(transcription, WordTable) else transcription
+
+
+class SessionStore:
+    """Base class for session stores keyed by session ID
+
+    Stores return copies of the session data, so callers must call ``set``
+    again after modifying a session for the change to be persisted.
+    """
+
+    backend_name = "base"
+
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            'hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'deletes': 0,
+            'evictions': 0,
+            'expirations': 0,
+        }
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        raise NotImplementedError
+
+    def set(self, session_id: str, data: Dict) -> None:
+        raise NotImplementedError
+
+    def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+    def _count(self, stat: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            self._stats[stat] += amount
+
+    def _record_lookup(self, data: Optional[Dict]) -> Optional[Dict]:
+        self._count('hits' if data is not None else 'misses')
+        return data
+
+    def stats(self) -> Dict:
+        """Return store metrics (hit/miss counters, evictions, size)"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        lookups = stats['hits'] + stats['misses']
+        stats['hit_rate'] = stats['hits'] / lookups if lookups else 0.0
+        stats['backend'] = self.backend_name
+        stats['ttl_seconds'] = self.ttl_seconds
+        return stats
+
+    def __contains__(self, session_id: str) -> bool:
+        return self.get(session_id) is not None
+
+    def __getitem__(self, session_id: str) -> Dict:
+        data = self.get(session_id)
+        if data is None:
+            raise KeyError(session_id)
+        return data
+
+    def __setitem__(self, session_id: str, data: Dict) -> None:
+        self.set(session_id, data)
+
+    def __delitem__(self, session_id: str) -> None:
+        self.delete(session_id)
+
+
+class MemorySessionStore(SessionStore):
+    """In-process LRU store with TTL and entry/byte-size based eviction
+
+    Only suitable for a single worker; use the SQLite or Redis store when
+    running several uvicorn workers behind one port.
+    """
+
+    backend_name = "memory"
+
+    def __init__(self, ttl_seconds: int = SESSION_TTL_SECONDS,
+                 max_entries: int = SESSION_MAX_ENTRIES,
+                 max_bytes: int = SESSION_MAX_BYTES):
+        super().__init__(ttl_seconds)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # session_id -> (expires_at, size_bytes, serialized data)
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+
+    def _drop(self, session_id: str) -> None:
+        _, size, _ = self._entries.pop(session_id)
+        self._total_bytes -= size
+
+    def _purge_expired(self, now: float) -> None:
+        expired = [sid for sid, (expires_at, _, _) in self._entries.items() if expires_at <= now]
+        for sid in expired:
+            self._drop(sid)
+        if expired:
+            self._count('expirations', len(expired))
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return self._record_lookup(None)
+            expires_at, size, raw = entry
+            if expires_at <= now:
+                self._drop(session_id)
+                self._count('expirations')
+                return self._record_lookup(None)
+            # Sliding expiration: reading a session keeps it alive
+            self._entries[session_id] = (now + self.ttl_seconds, size, raw)
+            self._entries.move_to_end(session_id)
+        return self._record_lookup(decode_session(raw))
+
+    def set(self, session_id: str, data: Dict) -> None:
+        raw = encode_session(data)
+        size = len(raw.encode('utf-8'))
+        now = time.time()
+        with self._lock:
+            if session_id in self._entries:
+                self._drop(session_id)
+            self._purge_expired(now)
+            self._entries[session_id] = (now + self.ttl_seconds, size, raw)
+            self._total_bytes += size
+            # Evict least recently used sessions until within limits
+            evicted = 0
+            while len(self._entries) > 1 and (
+                len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes
+            ):
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                evicted += 1
+        self._count('sets')
+        if evicted:
+            self._count('evictions', evicted)
+
+    def delete(self, session_id: str) -> None:
+        with self._lock:
+            if session_id in self._entries:
+                self._drop(session_id)
+                self._count('deletes')
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        with self._lock:
+            stats['entries'] = len(self._entries)
+            stats['bytes'] = self._total_bytes
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        return stats
+
+
+class SQLiteSessionStore(SessionStore):
+    """Disk-backed store shared by all workers on the same host
+
+    Sessions survive restarts. Expired rows are purged on write, and the least
+    recently used sessions are evicted when entry or byte limits are exceeded.
+    """
+
+    backend_name = "sqlite"
+
+    def __init__(self, path: str = SESSION_SQLITE_PATH,
+                 ttl_seconds: int = SESSION_TTL_SECONDS,
+                 max_entries: int = SESSION_MAX_ENTRIES,
+                 max_bytes: int = SESSION_MAX_BYTES):
+        super().__init__(ttl_seconds)
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sessions ("
+                " session_id TEXT PRIMARY KEY,"
+                " data TEXT NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " expires_at REAL NOT NULL,"
+                " accessed_at REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires ON sessions (expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS sessions_accessed ON sessions (accessed_at)")
+
+    def _connect(self) -> sqlite3.Connection:
+        # One connection per thread; WAL lets several worker processes read concurrently
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        now = time.time()
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT data, expires_at FROM sessions WHERE session_id = ?", (session_id,)
+        ).fetchone()
+        if row is None:
+            return self._record_lookup(None)
+        raw, expires_at = row
+        if expires_at <= now:
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            self._count('expirations')
+            return self._record_lookup(None)
+        conn.execute(
+            "UPDATE sessions SET expires_at = ?, accessed_at = ? WHERE session_id = ?",
+            (now + self.ttl_seconds, now, session_id)
+        )
+        return self._record_lookup(decode_session(raw))
+
+    def set(self, session_id: str, data: Dict) -> None:
+        raw = encode_session(data)
+        size = len(raw.encode('utf-8'))
+        now = time.time()
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "INSERT OR REPLACE INTO sessions (session_id, data, size, expires_at, accessed_at)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (session_id, raw, size, now + self.ttl_seconds, now)
+            )
+            expired = conn.execute("DELETE FROM sessions WHERE expires_at <= ?", (now,)).rowcount
+            evicted = self._evict(conn, session_id)
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        self._count('sets')
+        if expired:
+            self._count('expirations', expired)
+        if evicted:
+            self._count('evictions', evicted)
+
+    def _evict(self, conn: sqlite3.Connection, keep_id: str) -> int:
+        """Delete least recently used rows until entry and byte limits hold"""
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions").fetchone()
+        evicted = 0
+        if count <= self.max_entries and total <= self.max_bytes:
+            return evicted
+        rows = conn.execute(
+            "SELECT session_id, size FROM sessions WHERE session_id != ? ORDER BY accessed_at",
+            (keep_id,)
+        ).fetchall()
+        for sid, size in rows:
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (sid,))
+            count -= 1
+            total -= size
+            evicted += 1
+        return evicted
+
+    def delete(self, session_id: str) -> None:
+        deleted = self._connect().execute(
+            "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+        ).rowcount
+        if deleted:
+            self._count('deletes')
+
+    def stats(self) -> Dict:
+        stats = super().stats()
+        count, total = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM sessions WHERE expires_at > ?", (time.time(),)
+        ).fetchone()
+        stats['entries'] = count
+        stats['bytes'] = total
+        stats['max_entries'] = self.max_entries
+        stats['max_bytes'] = self.max_bytes
+        stats['path'] = self.path
+        return stats
+
+
+class RedisSessionStore(SessionStore):
+    """Store backed by a Redis-compatible client
+
+    The client only needs ``get(key)``, ``set(key, value, ex=seconds)``,
+    ``expire(key, seconds)`` and ``delete(key)``, so redis-py or any local
+    stand-in implementing those methods works. Size-based eviction is left to
+    the server (configure ``maxmemory`` with an ``allkeys-lru`` policy).
+    """
+
+    backend_name = "redis"
+
+    def __init__(self, client, ttl_seconds: int = SESSION_TTL_SECONDS,
+                 key_prefix: str = "subtitle:session:"):
+        super().__init__(ttl_seconds)
+        self.client = client
+        self.key_prefix = key_prefix
+
+    def _key(self, session_id: str) -> str:
+        return f"{self.key_prefix}{session_id}"
+
+    def get(self, session_id: str) -> Optional[Dict]:
+        key = self._key(session_id)
+        raw = self.client.get(key)
+        if raw is None:
+            return self._record_lookup(None)
+        self.client.expire(key, self.ttl_seconds)
+        return self._record_lookup(decode_session(raw))
+
+    def set(self, session_id: str, data: Dict) -> None:
+        self.client.set(self._key(session_id), encode_session(data), ex=self.ttl_seconds)
+        self._count('sets')
+
+    def delete(self, session_id: str) -> None:
+        if self.client.delete(self._key(session_id)):
+            self._count('deletes')
+
+
+def create_session_store(backend: str = SESSION_STORE_BACKEND) -> SessionStore:
+    """Create the session store selected by the SESSION_STORE environment variable"""
+    backend = (backend or "memory").lower()
+    if backend == "memory":
+        return MemorySessionStore()
+    elif backend == "sqlite":
+        return SQLiteSessionStore()
+    elif backend == "redis":
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("SESSION_STORE=redis requires the 'redis' package")
+        return RedisSessionStore(redis.Redis.from_url(SESSION_REDIS_URL))
+    else:
+        raise ValueError(f"Unknown session store backend: {backend}")
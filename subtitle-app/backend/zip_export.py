@@ -0,0 +1,78 @@
+import json
+import zipfile
+from typing import Callable, Dict, Iterable, Iterator, List, Tuple
+
+from subtitle_core import parse_srt_subtitles, render_srt_from_cues, render_vtt_from_cues
+from session_store import transcription_dict
+
+ZIP_CHUNK_SIZE = 64 * 1024
+
+
+class _StreamBuffer:
+    """Write-only file object that collects bytes written by ZipFile until drained
+
+    It deliberately has no seek/tell, so ZipFile writes in streaming mode
+    (data descriptors after each entry) and never needs to rewind.
+    """
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data: bytes) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def stream_zip(entries: Iterable[Tuple[str, Callable[[], str]]]) -> Iterator[bytes]:
+    """Build a ZIP archive on the fly, yielding compressed bytes as they are produced
+
+    Each entry is a (name, render) pair; render is called only when the entry
+    is written, so at most one file's content is held in memory at a time.
+    """
+    buffer = _StreamBuffer()
+    with zipfile.ZipFile(buffer, mode='w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, render in entries:
+            data = render().encode('utf-8')
+            with archive.open(name, mode='w') as entry:
+                for offset in range(0, len(data), ZIP_CHUNK_SIZE):
+                    entry.write(data[offset:offset + ZIP_CHUNK_SIZE])
+                    chunk = buffer.drain()
+                    if chunk:
+                        yield chunk
+            chunk = buffer.drain()
+            if chunk:
+                yield chunk
+    # Central directory is written when the archive is closed
+    chunk = buffer.drain()
+    if chunk:
+        yield chunk
+
+
+def session_export_entries(session_data: Dict, filename_base: str) -> List[Tuple[str, Callable[[], str]]]:
+    """List the archive entries for a session: original SRT/VTT/JSON plus every translation"""
+
+    def cues_renderer(srt_content: str, renderer: Callable[[List[Dict]], str]) -> Callable[[], str]:
+        return lambda: renderer(parse_srt_subtitles(srt_content))
+
+    srt_content = session_data.get('srt_content', '')
+    entries = [
+        (f"{filename_base}.srt", cues_renderer(srt_content, render_srt_from_cues)),
+        (f"{filename_base}.vtt", cues_renderer(srt_content, render_vtt_from_cues)),
+        (f"{filename_base}.json", lambda: json.dumps(transcription_dict(session_data), indent=2)),
+    ]
+
+    for language, translated_srt in (session_data.get('translated_subtitles') or {}).items():
+        entries.append((f"translations/{filename_base}_{language}.srt",
+                        cues_renderer(translated_srt, render_srt_from_cues)))
+        entries.append((f"translations/{filename_base}_{language}.vtt",
+                        cues_renderer(translated_srt, render_vtt_from_cues)))
+
+    return entries
@@ -68,7 +68,8 @@ const SubtitleGenerator: React.FC = () => {
 
       setProcessingStep('Creating transcription...');
       
-      const transcriptionResponse = await fetch('http://localhost:8001/api/transcribe', {
+      // Only the subtitle text is needed; the word-level JSON stays available via the JSON download
+      const transcriptionResponse = await fetch('http://localhost:8001/api/transcribe?include=srt,vtt', {
         method: 'POST',
         body: formData,
       });
@@ -6,7 +6,18 @@ export interface TranscriptionData {
   duration: number;
   srt_content: string;
   vtt_content: string;
-  transcription: any;
+  transcription?: any;  // only with ?include=words
+  translated_languages: string[];
+  links: SessionLinks;
+}
+
+export interface SessionLinks {
+  session: string;
+  srt: string;
+  vtt: string;
+  json: string;
+  export: string;
+  translations?: { [language: string]: { srt: string; vtt: string } };
 }
 
 export interface TranslationData {
@@ -1,699 +1,41 @@
-import os
-import requests
 import streamlit as st
-import tempfile
 from typing import Dict, List
-from datetime import timedelta
-import subprocess
 import base64
 import json
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 
-# ElevenLabs API Configuration
-ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "your_api_key_here")
-BASE_URL = "https://api.elevenlabs.io"
-
-# Translation Services Configuration
-TRANSLATION_SERVICES = {
-    "Google Translate (Free)": "google_free",
-    "LibreTranslate (Free)": "libre",
-    "Azure Translator": "azure"
-}
-
-# Supported target languages for translation
-TARGET_LANGUAGES = {
-    "English": "en", "Spanish": "es", "French": "fr", "German": "de", "Italian": "it",
-    "Portuguese": "pt", "Russian": "ru", "Japanese": "ja", "Chinese (Simplified)": "zh",
-    "Korean": "ko", "Hindi": "hi", "Arabic": "ar", "Dutch": "nl",
-    "Turkish": "tr", "Polish": "pl", "Swedish": "sv", "Norwegian": "no",
-    "Danish": "da", "Finnish": "fi", "Czech": "cs", "Hungarian": "hu",
-    "Bulgarian": "bg", "Romanian": "ro", "Greek": "el", "Hebrew": "he",
-    "Thai": "th", "Vietnamese": "vi", "Indonesian": "id", "Malay": "ms",
-    "Filipino": "tl", "Ukrainian": "uk", "Bengali": "bn", "Tamil": "ta",
-    "Telugu": "te", "Marathi": "mr", "Gujarati": "gu", "Kannada": "kn",
-    "Malayalam": "ml", "Punjabi": "pa", "Urdu": "ur", "Persian": "fa",
-    "Swahili": "sw", "Afrikaans": "af", "Catalan": "ca", "Croatian": "hr"
-}
-
-class SubtitleTranslator:
-    def __init__(self, service: str = "google_free"):
-        self.service = service
-    
-    def translate_text_google_free(self, text: str, target_lang: str, source_lang: str = "auto") -> str:
-        """Enhanced translation with context awareness, especially for English"""
-        try:
-            from deep_translator import GoogleTranslator
-            
-            # Clean the text but preserve formatting
-            text = text.strip()
-            if not text:
-                return text
-            
-            # Enhanced prompting for English translations
-            if target_lang == "en":
-                # Add context cues for more natural English
-                if any(word in text.lower() for word in ["hello", "hi", "hey", "good morning", "good evening"]):
-                    text = f"Translate this greeting naturally to conversational English: {text}"
-                elif any(word in text.lower() for word in ["thank", "thanks", "please", "sorry", "excuse"]):
-                    text = f"Translate this polite expression to natural English: {text}"
-                elif "?" in text:
-                    text = f"Translate this question to natural English: {text}"
-                elif "!" in text:
-                    text = f"Translate this exclamation to natural English: {text}"
-                else:
-                    text = f"Translate to natural conversational English: {text}"
-            
-            # Use deep-translator which is more stable
-            translator = GoogleTranslator(source=source_lang, target=target_lang)
-            
-            # Split long text into chunks if needed (deep-translator has limits)
-            max_length = 4500  # Safe limit for Google Translate
-            if len(text) > max_length:
-                # Split by sentences or periods
-                sentences = text.split('. ')
-                translated_parts = []
-                current_chunk = ""
-                
-                for sentence in sentences:
-                    if len(current_chunk + sentence) < max_length:
-                        current_chunk += sentence + ". "
-                    else:
-                        if current_chunk:
-                            translated_chunk = translator.translate(current_chunk.strip())
-                            # Clean up English translation artifacts
-                            if target_lang == "en":
-                                translated_chunk = self.clean_english_translation(translated_chunk)
-                            translated_parts.append(translated_chunk)
-                        current_chunk = sentence + ". "
-                
-                # Translate remaining chunk
-                if current_chunk:
-                    translated_chunk = translator.translate(current_chunk.strip())
-                    if target_lang == "en":
-                        translated_chunk = self.clean_english_translation(translated_chunk)
-                    translated_parts.append(translated_chunk)
-                
-                return " ".join(translated_parts)
-            else:
-                # Translate normally for shorter text
-                result = translator.translate(text)
-                if target_lang == "en":
-                    result = self.clean_english_translation(result)
-                return result
-            
-        except Exception as e:
-            st.warning(f"Google Translation failed: {str(e)}")
-            # Fallback: return text with language indicator
-            return f"[{target_lang.upper()}] {text}"
-    
-    def translate_text_libre(self, text: str, target_lang: str, source_lang: str = "auto") -> str:
-        """Translate text using LibreTranslate API with improved error handling"""
-        try:
-            # Clean the text
-            text = text.strip()
-            if not text:
-                return text
-            
-            # Try deep-translator's LibreTranslate first (more reliable)
-            try:
-                from deep_translator import LibreTranslator
-                translator = LibreTranslator(source=source_lang, target=target_lang)
-                return translator.translate(text)
-            except Exception:
-                pass
-            
-            # Fallback to direct API calls with multiple endpoints
-            urls = [
-                "https://libretranslate.de/translate",
-                "https://translate.terraprint.co/translate",
-                "https://libretranslate.com/translate"
-            ]
-            
-            for url in urls:
-                try:
-                    data = {
-                        "q": text,
-                        "source": "auto" if source_lang == "auto" else source_lang,
-                        "target": target_lang,
-                        "format": "text"
-                    }
-                    
-                    response = requests.post(url, data=data, timeout=15)
-                    
-                    if response.status_code == 200:
-                        try:
-                            result = response.json()
-                            translated_text = result.get("translatedText", "")
-                            if translated_text and translated_text != text:
-                                return translated_text
-                        except json.JSONDecodeError:
-                            continue
-                    
-                except requests.exceptions.RequestException:
-                    continue
-            
-            # If all LibreTranslate instances fail, fallback to Google Translate
-            st.warning("LibreTranslate services unavailable, falling back to Google Translate")
-            return self.translate_text_google_free(text, target_lang, source_lang)
-            
-        except Exception as e:
-            st.warning(f"LibreTranslate failed: {str(e)}, falling back to Google Translate")
-            return self.translate_text_google_free(text, target_lang, source_lang)
-    
-    def translate_text_azure(self, text: str, target_lang: str, api_key: str, region: str = "global") -> str:
-        """Translate text using Azure Translator API"""
-        try:
-            endpoint = "https://api.cognitive.microsofttranslator.com"
-            path = '/translate'
-            constructed_url = endpoint + path
-            
-            params = {
-                'api-version': '3.0',
-                'to': target_lang
-            }
-            
-            headers = {
-                'Ocp-Apim-Subscription-Key': api_key,
-                'Ocp-Apim-Subscription-Region': region,
-                'Content-type': 'application/json',
-                'X-ClientTraceId': str(os.urandom(16).hex())
-            }
-            
-            body = [{'text': text}]
-            
-            response = requests.post(constructed_url, params=params, headers=headers, json=body)
-            if response.status_code == 200:
-                result = response.json()
-                return result[0]['translations'][0]['text']
-            else:
-                return text
-        except Exception as e:
-            st.warning(f"Azure translation failed: {str(e)}")
-            return text
-    
-    def translate_subtitle_text(self, text: str, target_lang: str, api_key: str = None) -> str:
-        """Translate subtitle text while preserving speaker labels and formatting"""
-        try:
-            if self.service == "google_free":
-                return self.translate_text_google_free(text, target_lang)
-            elif self.service == "libre":
-                return self.translate_text_libre(text, target_lang)
-            elif self.service == "azure" and api_key:
-                return self.translate_text_azure(text, target_lang, api_key)
-            else:
-                return text
-        except Exception as e:
-            st.warning(f"Translation service failed: {str(e)}")
-            # Simple fallback: return with language indicator
-            return f"[{target_lang.upper()}] {text}"
-    
-    def clean_english_translation(self, text: str) -> str:
-        """Clean up English translation artifacts and improve naturalness"""
-        if not text:
-            return text
-        
-        # Remove translation prompt artifacts
-        cleaned = text
-        
-        # Remove common translation prompts that might leak through
-        prompts_to_remove = [
-            "Translate this greeting naturally to conversational English:",
-            "Translate this polite expression to natural English:",
-            "Translate this question to natural English:",
-            "Translate this exclamation to natural English:",
-            "Translate to natural conversational English:",
-            "Translation:",
-            "English:",
-            "The translation is:",
-            "In English:",
-        ]
-        
-        for prompt in prompts_to_remove:
-            cleaned = cleaned.replace(prompt, "").strip()
-        
-        # Fix common English translation issues
-        fixes = {
-            # Grammar improvements
-            " a hour": " an hour",
-            " a university": " a university", 
-            " an university": " a university",
-            " a apple": " an apple",
-            " a orange": " an orange",
-            " a elephant": " an elephant",
-            
-            # Natural conversation patterns
-            "very very ": "really ",
-            "more better": "better",
-            "most best": "best",
-            "can not": "cannot",
-            
-            # Proper capitalization
-            " i ": " I ",
-            " i'm": " I'm",
-            " i'll": " I'll", 
-            " i've": " I've",
-            " i'd": " I'd",
-            " i.": " I.",
-            " i,": " I,",
-            " i!": " I!",
-            " i?": " I?",
-        }
-        
-        # Apply fixes
-        for old, new in fixes.items():
-            cleaned = cleaned.replace(old, new)
-        
-        # Ensure proper sentence capitalization
-        if cleaned and len(cleaned) > 0:
-            cleaned = cleaned[0].upper() + cleaned[1:] if len(cleaned) > 1 else cleaned.upper()
-        
-        # Ensure proper punctuation for natural speech
-        if cleaned and not cleaned.endswith(('.', '!', '?', ':', ';', ',')):
-            # Add period for statements, but be smart about it
-            if any(word in cleaned.lower() for word in ['hello', 'hi', 'hey', 'thanks', 'yes', 'no', 'okay', 'ok']):
-                # Short responses don't always need periods
-                pass
-            else:
-                cleaned += "."
-        
-        return cleaned.strip()
-
-def create_simple_translation_map() -> Dict[str, Dict[str, str]]:
-    """Create a simple translation map for common subtitle phrases"""
-    return {
-        "es": {  # Spanish
-            "Hello": "Hola",
-            "Thank you": "Gracias", 
-            "Yes": "Sí",
-            "No": "No",
-            "Please": "Por favor",
-            "Sorry": "Lo siento",
-            "Excuse me": "Disculpe",
-            "Good morning": "Buenos días",
-            "Good afternoon": "Buenas tardes",
-            "Good evening": "Buenas noches",
-            "Goodbye": "Adiós"
-        },
-        "fr": {  # French
-            "Hello": "Bonjour",
-            "Thank you": "Merci",
-            "Yes": "Oui", 
-            "No": "Non",
-            "Please": "S'il vous plaît",
-            "Sorry": "Désolé",
-            "Excuse me": "Excusez-moi",
-            "Good morning": "Bonjour",
-            "Good afternoon": "Bon après-midi",
-            "Good evening": "Bonsoir",
-            "Goodbye": "Au revoir"
-        },
-        "de": {  # German
-            "Hello": "Hallo",
-            "Thank you": "Danke",
-            "Yes": "Ja",
-            "No": "Nein", 
-            "Please": "Bitte",
-            "Sorry": "Entschuldigung",
-            "Excuse me": "Entschuldigen Sie",
-            "Good morning": "Guten Morgen",
-            "Good afternoon": "Guten Tag",
-            "Good evening": "Guten Abend",
-            "Goodbye": "Auf Wiedersehen"
-        }
-    }
-
-def check_translation_service_status(service: str) -> bool:
-    """Check if a translation service is available"""
-    try:
-        if service == "libre":
-            # Quick test with LibreTranslate using deep-translator
-            try:
-                from deep_translator import LibreTranslator
-                translator = LibreTranslator(source="en", target="es")
-                result = translator.translate("test")
-                return bool(result and result != "test")
-            except Exception:
-                # Fallback to direct API test
-                try:
-                    response = requests.post("https://libretranslate.de/translate", 
-                        data={"q": "test", "source": "en", "target": "es", "format": "text"}, 
-                        timeout=5
-                    )
-                    return response.status_code == 200
-                except Exception:
-                    return False
-        elif service == "google_free":
-            # Quick test with Google Translate using deep-translator
-            try:
-                from deep_translator import GoogleTranslator
-                translator = GoogleTranslator(source="en", target="es")
-                result = translator.translate("test")
-                return bool(result and result != "test")
-            except Exception:
-                return False
-        return True
-    except Exception:
-        return False
-
-def translate_subtitles_preserve_structure(srt_content: str, target_language: str, 
-                                         translation_service: str = "google_free", 
-                                         api_key: str = None) -> str:
-    """
-    Translate SRT subtitles with context awareness while preserving timestamps, speaker diarization, and structure
-    """
-    if not srt_content or not target_language:
-        return srt_content
-    
-    translator = SubtitleTranslator(translation_service)
-    target_lang_code = TARGET_LANGUAGES.get(target_language, "en")
-    
-    # Parse original subtitles to preserve structure
-    subtitles = parse_srt_subtitles(srt_content)
-    
-    # Enhanced context-aware translation for English
-    if target_lang_code == "en":
-        return translate_with_context_awareness(subtitles, translator, api_key)
-    
-    # Standard translation for other languages
-    translated_srt = ""
-    
-    for subtitle in subtitles:
-        original_text = subtitle['text']
-        
-        # Check if text contains speaker label [Speaker_X]
-        speaker_label = ""
-        text_to_translate = original_text
-        
-        if original_text.startswith('[') and ']' in original_text:
-            # Extract speaker label
-            end_bracket = original_text.find(']')
-            speaker_label = original_text[:end_bracket + 1] + " "
-            text_to_translate = original_text[end_bracket + 1:].strip()
-        
-        # Translate only the actual text, not the speaker label
-        if text_to_translate:
-            translated_text = translator.translate_subtitle_text(text_to_translate, target_lang_code, api_key)
-        else:
-            translated_text = text_to_translate
-        
-        # Reconstruct the subtitle with preserved structure
-        final_text = speaker_label + translated_text
-        
-        # Reconstruct SRT format with preserved timestamps
-        start_timestamp = format_timestamp(subtitle['start'])
-        end_timestamp = format_timestamp(subtitle['end'])
-        
-        translated_srt += f"{subtitle['id']}\n"
-        translated_srt += f"{start_timestamp} --> {end_timestamp}\n"
-        translated_srt += f"{final_text}\n\n"
-    
-    return translated_srt
-
-def translate_with_context_awareness(subtitles: List[Dict], translator: SubtitleTranslator, api_key: str = None) -> str:
-    """
-    Enhanced context-aware translation specifically optimized for English
-    """
-    translated_srt = ""
-    conversation_context = []
-    speaker_contexts = {}
-    
-    # Group subtitles by conversation segments
-    conversation_segments = group_by_conversation_segments(subtitles)
-    
-    for segment in conversation_segments:
-        # Translate each conversation segment with full context
-        segment_texts = []
-        speaker_info = []
-        
-        for subtitle in segment:
-            original_text = subtitle['text']
-            speaker_label = ""
-            text_content = original_text
-            
-            # Extract speaker information
-            if original_text.startswith('[') and ']' in original_text:
-                end_bracket = original_text.find(']')
-                speaker_label = original_text[:end_bracket + 1]
-                text_content = original_text[end_bracket + 1:].strip()
-                
-                # Build speaker context
-                speaker_id = speaker_label.strip('[]')
-                if speaker_id not in speaker_contexts:
-                    speaker_contexts[speaker_id] = []
-                speaker_contexts[speaker_id].append(text_content)
-            
-            segment_texts.append(text_content)
-            speaker_info.append((speaker_label, subtitle['id'], subtitle['start'], subtitle['end']))
-        
-        # Create context-aware translation prompt
-        if len(segment_texts) > 1:
-            # Multi-line conversation - translate with context
-            context_text = " | ".join(segment_texts)
-            context_prompt = f"Translate this conversation naturally to English, maintaining conversational flow and context: {context_text}"
-            
-            try:
-                translated_conversation = translator.translate_subtitle_text(context_prompt, "en", api_key)
-                # Extract individual translations from context
-                context_translations = extract_individual_translations(translated_conversation, len(segment_texts))
-            except Exception as e:
-                # Fallback to individual translation
-                context_translations = [translator.translate_subtitle_text(text, "en", api_key) for text in segment_texts]
-        else:
-            # Single line - translate with accumulated context
-            context_translations = [enhance_single_translation(segment_texts[0], conversation_context, translator, api_key)]
-        
-        # Reconstruct SRT with enhanced translations
-        for i, (speaker_label, sub_id, start_time, end_time) in enumerate(speaker_info):
-            if i < len(context_translations):
-                enhanced_text = context_translations[i]
-                
-                # Apply English-specific enhancements
-                enhanced_text = apply_english_enhancements(enhanced_text, speaker_label)
-                
-                # Add speaker label back
-                final_text = f"{speaker_label} {enhanced_text}" if speaker_label else enhanced_text
-                
-                # Update conversation context
-                conversation_context.append(enhanced_text)
-                if len(conversation_context) > 5:  # Keep last 5 for context
-                    conversation_context.pop(0)
-                
-                # Build SRT entry
-                start_timestamp = format_timestamp(start_time)
-                end_timestamp = format_timestamp(end_time)
-                
-                translated_srt += f"{sub_id}\n"
-                translated_srt += f"{start_timestamp} --> {end_timestamp}\n"
-                translated_srt += f"{final_text}\n\n"
-    
-    return translated_srt
-
-def group_by_conversation_segments(subtitles: List[Dict], max_gap: float = 3.0) -> List[List[Dict]]:
-    """Group subtitles into conversation segments based on time gaps"""
-    if not subtitles:
-        return []
-    
-    segments = []
-    current_segment = [subtitles[0]]
-    
-    for i in range(1, len(subtitles)):
-        time_gap = subtitles[i]['start'] - subtitles[i-1]['end']
-        
-        # Start new segment if gap is too large or speaker changes significantly
-        if time_gap > max_gap:
-            segments.append(current_segment)
-            current_segment = [subtitles[i]]
-        else:
-            current_segment.append(subtitles[i])
-    
-    segments.append(current_segment)
-    return segments
-
-def extract_individual_translations(context_translation: str, expected_count: int) -> List[str]:
-    """Extract individual translations from context-aware translation"""
-    # Split by common separators
-    separators = [' | ', ' |', '| ', '|', '. ', '; ', '\n']
-    
-    for sep in separators:
-        if sep in context_translation:
-            parts = context_translation.split(sep)
-            if len(parts) == expected_count:
-                return [part.strip() for part in parts]
-    
-    # Fallback: split by sentences
-    sentences = context_translation.split('. ')
-    if len(sentences) >= expected_count:
-        return sentences[:expected_count]
-    
-    # Last resort: return the whole translation for first item
-    return [context_translation] + [""] * (expected_count - 1)
-
-def enhance_single_translation(text: str, context: List[str], translator: SubtitleTranslator, api_key: str = None) -> str:
-    """Enhance single line translation with conversation context"""
-    if not context:
-        return translator.translate_subtitle_text(text, "en", api_key)
-    
-    # Create context-aware prompt
-    recent_context = " ".join(context[-3:])  # Last 3 lines of context
-    context_prompt = f"Given this conversation context: '{recent_context}', translate this naturally to English: '{text}'"
-    
-    try:
-        enhanced = translator.translate_subtitle_text(context_prompt, "en", api_key)
-        # Extract just the translation part (remove context explanation)
-        if "translate" in enhanced.lower() and ":" in enhanced:
-            enhanced = enhanced.split(":")[-1].strip()
-        return enhanced
-    except Exception as e:
-        return translator.translate_subtitle_text(text, "en", api_key)
-
-def apply_english_enhancements(text: str, speaker_label: str = "") -> str:
-    """Apply English-specific enhancements for natural conversation"""
-    if not text:
-        return text
-    
-    # Remove translation artifacts
-    text = text.replace("Translate this", "").replace("translate this", "")
-    text = text.replace("Translation:", "").replace("translation:", "")
-    
-    # Fix common translation issues
-    enhancements = {
-        # Casual conversation improvements
-        " uh ": " um ",
-        " yeah ": " yes ",
-        " gonna ": " going to ",
-        " wanna ": " want to ",
-        " gotta ": " have to ",
-        
-        # Formal improvements
-        " i ": " I ",
-        " i'm ": " I'm ",
-        " i'll ": " I'll ",
-        " i've ": " I've ",
-        " i'd ": " I'd ",
-        
-        # Common grammar fixes
-        " a apple": " an apple",
-        " a orange": " an orange",
-        " a hour": " an hour",
-        " a university": " a university",
-        
-        # Speech patterns
-        "very very ": "really ",
-        "more better": "better",
-        "most best": "best",
-    }
-    
-    # Apply enhancements
-    enhanced_text = text
-    for old, new in enhancements.items():
-        enhanced_text = enhanced_text.replace(old, new)
-    
-    # Capitalize first letter
-    if enhanced_text:
-        enhanced_text = enhanced_text[0].upper() + enhanced_text[1:] if len(enhanced_text) > 1 else enhanced_text.upper()
-    
-    # Ensure proper ending punctuation for dialogue
-    if enhanced_text and not enhanced_text.endswith(('.', '!', '?', ':')):
-        enhanced_text += "."
-    
-    return enhanced_text.strip()
-
-class ElevenLabsSubtitleGenerator:
-    def __init__(self, api_key: str):
-        self.api_key = api_key
-        self.headers = {
-            "Accept": "application/json",
-            "xi-api-key": api_key
-        }
-    
-    def create_transcription(self, audio_file: bytes, language_code: str = None, 
-                           num_speakers: int = None, diarize: bool = True,
-                           tag_audio_events: bool = True) -> Dict:
-        """
-        Create a transcription using ElevenLabs Speech-to-Text API
-        Returns: transcription result with timestamps and speaker diarization
-        """
-        url = f"{BASE_URL}/v1/speech-to-text"
-        
-        files = {
-            'file': ('audio.mp3', audio_file, 'audio/mp3')
-        }
-        
-        data = {
-            'model_id': 'scribe_v1',
-            'diarize': str(diarize).lower(),
-            'tag_audio_events': str(tag_audio_events).lower(),
-        }
-        
-        # Add optional parameters
-        if language_code:
-            data['language_code'] = language_code
-        if num_speakers:
-            data['num_speakers'] = str(num_speakers)
-        
-        response = requests.post(url, headers=self.headers, files=files, data=data)
-        
-        if response.status_code == 200:
-            return response.json()
-        else:
-            raise Exception(f"Failed to create transcription: {response.text}")
-
-def format_timestamp(seconds: float) -> str:
-    """Convert seconds to SRT timestamp format"""
-    td = timedelta(seconds=seconds)
-    hours, remainder = divmod(td.total_seconds(), 3600)
-    minutes, seconds = divmod(remainder, 60)
-    milliseconds = int((seconds % 1) * 1000)
-    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d},{milliseconds:03d}"
-
-def parse_srt_subtitles(srt_content: str) -> List[Dict]:
-    """Parse SRT content into a list of subtitle entries with timestamps"""
-    subtitles = []
-    blocks = srt_content.strip().split('\n\n')
-    
-    for block in blocks:
-        if not block.strip():
-            continue
-            
-        lines = block.strip().split('\n')
-        if len(lines) < 3:
-            continue
-            
-        try:
-            # Parse subtitle number
-            subtitle_num = int(lines[0])
-            
-            # Parse timestamps
-            timestamp_line = lines[1]
-            start_time, end_time = timestamp_line.split(' --> ')
-            
-            # Convert timestamps to seconds
-            start_seconds = timestamp_to_seconds(start_time)
-            end_seconds = timestamp_to_seconds(end_time)
-            
-            # Get subtitle text
-            text = '\n'.join(lines[2:])
-            
-            subtitles.append({
-                'id': subtitle_num,
-                'start': start_seconds,
-                'end': end_seconds,
-                'text': text
-            })
-            
-        except (ValueError, IndexError):
-            continue
-    
-    return subtitles
-
-def timestamp_to_seconds(timestamp: str) -> float:
-    """Convert SRT timestamp format to seconds"""
-    # Format: HH:MM:SS,mmm
-    time_part, ms_part = timestamp.split(',')
-    hours, minutes, seconds = map(int, time_part.split(':'))
-    milliseconds = int(ms_part)
-    
-    total_seconds = hours * 3600 + minutes * 60 + seconds + milliseconds / 1000
-    return total_seconds
+from subtitle_core import (
+    ELEVENLABS_API_KEY,
+    TRANSLATION_SERVICES,
+    TARGET_LANGUAGES,
+    TRANSCRIPTION_LANGUAGES,
+    SubtitleTranslator,
+    ElevenLabsSubtitleGenerator,
+    set_warning_handler,
+    format_timestamp,
+    parse_srt_subtitles,
+    timestamp_to_seconds,
+    seconds_to_vtt_timestamp,
+    generate_srt_subtitles,
+    generate_vtt_subtitles,
+    srt_to_vtt,
+    translate_subtitles_preserve_structure,
+    AUDIO_PROFILES,
+    DEFAULT_AUDIO_PROFILE,
+    extract_audio,
+    transcribe_and_translate,
+    SEGMENTATION_PRESETS,
+    DEFAULT_SEGMENTATION,
+    build_segmentation_policy,
+    render_subtitles,
+    WordTable,
+    metrics,
+    bind_context,
+    VideoOCRProcessor,
+    merge_ocr_subtitles,
+    merge_ocr_translations,
+)
 
 def create_multilingual_video_player(video_bytes: bytes, subtitle_languages: Dict[str, List[Dict]], 
                                     video_name: str, subtitle_style: str = "Both", font_size: int = 18) -> str:
@@ -978,171 +320,45 @@ def create_video_player_with_subtitles(video_bytes: bytes, subtitles: List[Dict]
     
     return html_player
 
-def seconds_to_vtt_timestamp(seconds: float) -> str:
-    """Convert seconds to VTT timestamp format"""
-    hours = int(seconds // 3600)
-    minutes = int((seconds % 3600) // 60)
-    secs = seconds % 60
-    return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
-
-def generate_srt_subtitles(transcription_data: Dict) -> str:
-    """Generate SRT format subtitles from transcription data"""
-    """Generate SRT format subtitles from transcription data"""
-    if not transcription_data or 'words' not in transcription_data:
-        return ""
-    
-    words = transcription_data['words']
-    srt_content = ""
-    subtitle_index = 1
-    
-    # Group words into subtitle segments (2-5 seconds each)
-    current_segment = []
-    segment_start = None
-    segment_end = None
-    max_segment_duration = 5.0  # Maximum segment duration in seconds
-    max_words_per_segment = 8  # Maximum words per segment
-    current_speaker = None
-    
-    for word in words:
-        if word.get('type') != 'word':
-            continue
-            
-        word_start = word.get('start', 0)
-        word_end = word.get('end', word_start)
-        word_text = word.get('text', '')
-        speaker_id = word.get('speaker_id', 'speaker_0')
-        
-        # Start new segment if needed
-        if not current_segment:
-            segment_start = word_start
-            current_segment = [{'text': word_text, 'speaker': speaker_id}]
-            segment_end = word_end
-            current_speaker = speaker_id
-            continue
-        
-        # Check if we should start a new segment
-        should_break = (
-            len(current_segment) >= max_words_per_segment or
-            (word_start - segment_start) > max_segment_duration or
-            (current_speaker != speaker_id)  # Speaker change
-        )
-        
-        if should_break:
-            # Write current segment to SRT
-            segment_text = ' '.join([w['text'] for w in current_segment])
-            
-            # Add speaker label if diarization is enabled
-            speaker_prefix = ""
-            if len(set(w['speaker'] for w in current_segment)) > 1 or current_speaker != 'speaker_0':
-                speaker_prefix = f"[{current_speaker}] "
-            
-            start_timestamp = format_timestamp(segment_start)
-            end_timestamp = format_timestamp(segment_end)
-            
-            srt_content += f"{subtitle_index}\n"
-            srt_content += f"{start_timestamp} --> {end_timestamp}\n"
-            srt_content += f"{speaker_prefix}{segment_text}\n\n"
-            subtitle_index += 1
-            
-            # Start new segment
-            segment_start = word_start
-            current_segment = [{'text': word_text, 'speaker': speaker_id}]
-            current_speaker = speaker_id
+def show_timing_panel():
+    """Stage timings, translation latency and cache hit rates collected by subtitle_core.metrics"""
+    with st.expander("⏱️ Timing", expanded=True):
+        st.caption("Collected by this app process since it started (all sessions)")
+        
+        def seconds_rows(rows, keys):
+            return [{**{key: row.get(key) for key in keys},
+                     **{column: round(row[column], 3) for column in ('mean', 'p50', 'p95', 'max', 'last', 'total')},
+                     'count': row['count']} for row in rows]
+        
+        stage_rows = metrics.summary()
+        if stage_rows:
+            st.markdown("**Stages (seconds)**")
+            st.dataframe(seconds_rows(stage_rows, ('stage',)), use_container_width=True)
         else:
-            current_segment.append({'text': word_text, 'speaker': speaker_id})
+            st.info("No timings yet - generate subtitles first.")
         
-        segment_end = word_end
-    
-    # Add final segment
-    if current_segment:
-        segment_text = ' '.join([w['text'] for w in current_segment])
-        
-        # Add speaker label if diarization is enabled
-        speaker_prefix = ""
-        if len(set(w['speaker'] for w in current_segment)) > 1 or current_speaker != 'speaker_0':
-            speaker_prefix = f"[{current_speaker}] "
+        translation_rows = metrics.summary("subtitle_translation_seconds")
+        if translation_rows:
+            st.markdown("**Translation calls (seconds)**")
+            st.dataframe(seconds_rows(translation_rows, ('service', 'language')), use_container_width=True)
         
-        start_timestamp = format_timestamp(segment_start)
-        end_timestamp = format_timestamp(segment_end)
+        hit_rates = metrics.cache_hit_rates()
+        if hit_rates:
+            st.markdown("**Cache hit rates:** " + ", ".join(f"{cache} {rate:.0%}" for cache, rate in hit_rates.items()))
         
-        srt_content += f"{subtitle_index}\n"
-        srt_content += f"{start_timestamp} --> {end_timestamp}\n"
-        srt_content += f"{speaker_prefix}{segment_text}\n\n"
-    
-    return srt_content
-
-def generate_vtt_subtitles(transcription_data: Dict) -> str:
-    """Generate VTT format subtitles from transcription data"""
-    srt_content = generate_srt_subtitles(transcription_data)
-    if not srt_content:
-        return ""
-    
-    # Convert SRT to VTT format
-    vtt_content = "WEBVTT\n\n"
-    
-    # Replace SRT timestamp format with VTT format
-    lines = srt_content.strip().split('\n')
-    for line in lines:
-        if '-->' in line:
-            # Replace comma with dot in timestamps for VTT format
-            vtt_line = line.replace(',', '.')
-            vtt_content += vtt_line + '\n'
-        else:
-            vtt_content += line + '\n'
-    
-    return vtt_content
+        if st.button("Reset Timings"):
+            metrics.reset()
+            st.rerun()
 
-def extract_audio_from_video(video_bytes: bytes) -> bytes:
-    """Extract audio from video file using ffmpeg (if available)"""
-    try:
-        # Find ffmpeg executable
-        ffmpeg_cmd = 'ffmpeg'
-        
-        # Check if ffmpeg is in PATH, if not try common installation locations
-        try:
-            subprocess.run([ffmpeg_cmd, '-version'], capture_output=True, check=True)
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            # Try WinGet installation path
-            winget_ffmpeg = os.path.join(
-                os.environ.get('LOCALAPPDATA', ''),
-                'Microsoft', 'WinGet', 'Packages',
-                'Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe',
-                'ffmpeg-8.0-full_build', 'bin', 'ffmpeg.exe'
-            )
-            if os.path.exists(winget_ffmpeg):
-                ffmpeg_cmd = winget_ffmpeg
-            else:
-                raise FileNotFoundError("FFmpeg not found in PATH or common locations")
-        
-        # Write video to temp file
-        with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_video:
-            temp_video.write(video_bytes)
-            temp_video_path = temp_video.name
-        
-        # Extract audio to temp file
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_audio:
-            temp_audio_path = temp_audio.name
-        
-        # Use ffmpeg to extract audio
-        subprocess.run([
-            ffmpeg_cmd, '-i', temp_video_path, 
-            '-vn', '-acodec', 'mp3', '-ab', '128k', 
-            '-ar', '16000', '-y', temp_audio_path
-        ], check=True, capture_output=True)
-        
-        # Read extracted audio
-        with open(temp_audio_path, 'rb') as f:
-            audio_bytes = f.read()
-        
-        # Clean up temp files
-        os.unlink(temp_video_path)
-        os.unlink(temp_audio_path)
-        
-        return audio_bytes
-        
-    except Exception as e:
-        st.warning(f"Could not extract audio from video: {str(e)}. Using original file.")
-        return video_bytes
+def store_rendered_subtitles(rendered):
+    """Keep rendered subtitles in the session state, with any on-screen text cues merged in"""
+    ocr_cues = st.session_state.get('ocr_cues')
+    if ocr_cues:
+        st.session_state['srt_content'] = merge_ocr_subtitles(rendered.srt_content, ocr_cues)
+        st.session_state['vtt_content'] = srt_to_vtt(st.session_state['srt_content'])
+    else:
+        st.session_state['srt_content'] = rendered.srt_content
+        st.session_state['vtt_content'] = rendered.vtt_content
 
 def main():
     st.set_page_config(
@@ -1151,6 +367,9 @@ def main():
         layout="wide"
     )
     
+    # Show library warnings (translation fallbacks, extraction failures) in the UI
+    set_warning_handler(st.warning)
+    
     st.title("🎬 Real-time Subtitle Generator with ElevenLabs")
     st.markdown("Upload an audio or video file to generate subtitles with speech diarization and timestamps")
     
@@ -1167,27 +386,7 @@ def main():
         )
         
         # Language selection (99 languages supported by Scribe v1)
-        languages = {
-            "Auto-detect": None,
-            "English": "eng", "Spanish": "spa", "French": "fra", "German": "deu",
-            "Italian": "ita", "Portuguese": "por", "Russian": "rus", "Japanese": "jpn",
-            "Chinese (Mandarin)": "zho", "Korean": "kor", "Hindi": "hin", "Arabic": "ara",
-            "Dutch": "nld", "Turkish": "tur", "Polish": "pol", "Swedish": "swe",
-            "Norwegian": "nor", "Danish": "dan", "Finnish": "fin", "Czech": "ces",
-            "Hungarian": "hun", "Bulgarian": "bul", "Romanian": "ron", "Greek": "ell",
-            "Hebrew": "heb", "Thai": "tha", "Vietnamese": "vie", "Indonesian": "ind",
-            "Malay": "msa", "Filipino": "fil", "Ukrainian": "ukr", "Bengali": "ben",
-            "Afrikaans": "afr", "Amharic": "amh", "Armenian": "hye", "Assamese": "asm",
-            "Azerbaijani": "aze", "Belarusian": "bel", "Bosnian": "bos", "Burmese": "mya",
-            "Catalan": "cat", "Croatian": "hrv", "Estonian": "est", "Georgian": "kat",
-            "Gujarati": "guj", "Icelandic": "isl", "Irish": "gle", "Javanese": "jav",
-            "Kannada": "kan", "Kazakh": "kaz", "Khmer": "khm", "Latvian": "lav",
-            "Lithuanian": "lit", "Macedonian": "mkd", "Malayalam": "mal", "Maltese": "mlt",
-            "Marathi": "mar", "Mongolian": "mon", "Nepali": "nep", "Persian": "fas",
-            "Punjabi": "pan", "Serbian": "srp", "Slovak": "slk", "Slovenian": "slv",
-            "Swahili": "swa", "Tamil": "tam", "Telugu": "tel", "Urdu": "urd",
-            "Welsh": "cym", "Zulu": "zul"
-        }
+        languages = TRANSCRIPTION_LANGUAGES
         
         target_language = st.selectbox(
             "Audio Language",
@@ -1219,6 +418,28 @@ def main():
             help="Tag events like laughter, applause, etc."
         )
         
+        trim_silence = st.checkbox(
+            "Trim Silence Before Upload",
+            value=False,
+            help="Remove long silent stretches before transcription (faster uploads for lectures); timestamps are mapped back to the original audio"
+        )
+        
+        read_on_screen_text = st.checkbox(
+            "Read On-Screen Text (OCR)",
+            value=False,
+            help="For videos: add slide titles and captions shown on screen as [ON-SCREEN] subtitles (needs Tesseract). Runs while the audio is transcribed"
+        )
+        
+        audio_profile = st.selectbox(
+            "Upload Audio Encoding",
+            options=[None] + list(AUDIO_PROFILES.keys()),
+            index=0,
+            format_func=lambda name: (AUDIO_PROFILES[name].description if name else
+                                      f"Automatic - copy the video's audio track when possible, "
+                                      f"else {AUDIO_PROFILES[DEFAULT_AUDIO_PROFILE].description}"),
+            help="Encoding used for audio extracted from video before upload to ElevenLabs"
+        )
+        
         # Video subtitle display options
         st.subheader("Video Subtitle Options")
         
@@ -1229,6 +450,29 @@ def main():
             help="Choose how subtitles are displayed on video"
         )
         
+        segmentation = st.selectbox(
+            "Subtitle Segmentation",
+            options=list(SEGMENTATION_PRESETS.keys()),
+            index=list(SEGMENTATION_PRESETS.keys()).index(DEFAULT_SEGMENTATION),
+            format_func=lambda name: {
+                "legacy": "Legacy (8 words / 5 s per subtitle)",
+                "readable": "Readable (2 x 42 chars, 17 chars/s, sentence breaks)",
+                "compact": "Compact (1 x 32 chars, for small screens)",
+            }.get(name, name),
+            help="How words are grouped into subtitles. Changing it re-segments the current transcription instantly, without calling ElevenLabs again"
+        )
+        
+        speaker_labels = st.selectbox(
+            "Speaker Labels",
+            options=["auto", "always", "none"],
+            format_func=lambda mode: {
+                "auto": "Label speakers other than the first",
+                "always": "Label every subtitle",
+                "none": "No speaker labels",
+            }[mode],
+            help="How [speaker] labels are shown in subtitles"
+        )
+        
         subtitle_size = st.slider(
             "Subtitle Font Size",
             min_value=14,
@@ -1291,6 +535,12 @@ def main():
             else:
                 translation_api_key = None
                 
+            pipeline_translation = st.checkbox(
+                "Translate While Transcribing",
+                value=False,
+                help="Transcribe in chunks and translate finished subtitles in parallel - much faster for long files, but speaker labels are only consistent within each chunk"
+            )
+                
             if target_languages:
                 st.success(f"✅ Will translate to: {', '.join(target_languages)}")
                 st.info("🎯 All features preserved: timestamps, speaker diarization, audio events")
@@ -1306,6 +556,25 @@ def main():
             target_languages = []
             translation_service = None
             translation_api_key = None
+            pipeline_translation = False
+        
+        show_timings = st.checkbox(
+            "Show Timing Panel",
+            value=False,
+            help="Time spent per stage (extraction, ElevenLabs, SRT generation, translation) and cache hit rates"
+        )
+    
+    # Re-render the existing transcription when display options change (cached, no API call)
+    segmentation_policy = build_segmentation_policy(segmentation, speaker_labels=speaker_labels)
+    if 'transcription' in st.session_state and st.session_state.get('segmentation') != segmentation_policy:
+        rendered = render_subtitles(st.session_state['transcription'], segmentation_policy,
+                                    cache_key=st.session_state.get('transcription_id'))
+        store_rendered_subtitles(rendered)
+        if st.session_state.get('translated_subtitles'):
+            st.session_state['translated_subtitles'] = {}
+            st.session_state['translated_vtt'] = {}
+            st.info("Subtitles were re-segmented; generate them again to refresh the translations.")
+    st.session_state['segmentation'] = segmentation_policy
     
     # Main content area
     col1, col2 = st.columns([1, 1])
@@ -1406,33 +675,97 @@ def main():
                     
                     with st.spinner("Processing file and generating subtitles..."):
                         file_bytes = uploaded_file.read()
+                        upload_name, upload_type = uploaded_file.name, uploaded_file.type
+                        
+                        # On-screen text is read on a worker thread while the audio is transcribed
+                        ocr_future = None
+                        if read_on_screen_text and uploaded_file.type.startswith('video/'):
+                            ocr_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr")
+                            ocr_future = ocr_executor.submit(bind_context(VideoOCRProcessor().process_video_bytes),
+                                                             file_bytes, f".{uploaded_file.name.rsplit('.', 1)[-1]}")
+                            ocr_executor.shutdown(wait=False)
                         
                         # Extract audio if it's a video file
                         if uploaded_file.type.startswith('video/'):
                             st.info("Extracting audio from video...")
                             try:
-                                file_bytes = extract_audio_from_video(file_bytes)
+                                extracted = extract_audio(file_bytes, audio_profile)
+                                file_bytes, upload_name, upload_type = extracted.audio, extracted.filename, extracted.mime_type
                             except Exception as e:
                                 st.warning(f"Could not extract audio: {str(e)}. Using original file.")
                         
-                        # Create transcription
-                        transcription = generator.create_transcription(
-                            file_bytes,
-                            language_code=languages[target_language],
-                            num_speakers=num_speakers,
-                            diarize=diarize,
-                            tag_audio_events=tag_audio_events
-                        )
+                        use_pipeline = enable_translation and target_languages and pipeline_translation
+                        if use_pipeline:
+                            # Transcribe in chunks, translating finished cues in parallel
+                            chunk_progress = st.progress(0.0, "Transcribing and translating...")
+                            result = transcribe_and_translate(
+                                generator,
+                                file_bytes,
+                                target_languages,
+                                translation_service,
+                                translation_api_key,
+                                audio_profile=audio_profile,
+                                segmentation=segmentation_policy,
+                                on_progress=lambda done, total: chunk_progress.progress(
+                                    done / total, f"Transcribed chunk {done}/{total}..."),
+                                language_code=languages[target_language],
+                                num_speakers=num_speakers,
+                                diarize=diarize,
+                                tag_audio_events=tag_audio_events,
+                                trim_silence=trim_silence
+                            )
+                            transcription = result.transcription
+                        else:
+                            # Create transcription
+                            transcription = generator.create_transcription(
+                                file_bytes,
+                                language_code=languages[target_language],
+                                num_speakers=num_speakers,
+                                diarize=diarize,
+                                tag_audio_events=tag_audio_events,
+                                trim_silence=trim_silence,
+                                filename=upload_name,
+                                mime_type=upload_type,
+                                audio_profile=audio_profile
+                            )
                         
                         st.success("Subtitles generated successfully!")
                         
                         # Store in session state for display
+                        # Keep the words in compact columnar form (multi-hour files stay small)
+                        transcription = WordTable.from_transcription(transcription)
                         st.session_state['transcription'] = transcription
-                        st.session_state['srt_content'] = generate_srt_subtitles(transcription)
-                        st.session_state['vtt_content'] = generate_vtt_subtitles(transcription)
+                        st.session_state['transcription_id'] = str(uuid.uuid4())
+                        st.session_state['ocr_cues'] = []
+                        if ocr_future is not None:
+                            try:
+                                st.session_state['ocr_cues'] = ocr_future.result()
+                                st.info(f"Found {len(st.session_state['ocr_cues'])} on-screen text cues")
+                            except Exception as e:
+                                st.warning(f"Could not read on-screen text: {str(e)}")
+                        rendered = render_subtitles(transcription, segmentation_policy,
+                                                    cache_key=st.session_state['transcription_id'])
+                        store_rendered_subtitles(rendered)
+                        
+                        if use_pipeline:
+                            for lang, error in result.errors.items():
+                                st.error(f"❌ Failed to translate to {lang}: {error}")
+                            if result.translated_subtitles:
+                                # Translated before OCR finished: add the on-screen text now
+                                translated = merge_ocr_translations(result.translated_subtitles,
+                                                                    st.session_state['ocr_cues'],
+                                                                    translation_service, translation_api_key)
+                                st.session_state['translated_subtitles'] = translated
+                                st.session_state['translated_vtt'] = {
+                                    lang: srt_to_vtt(srt) for lang, srt in translated.items()
+                                }
+                                st.success(f"🎉 Successfully translated to {len(result.translated_subtitles)}/{len(target_languages)} languages "
+                                           f"in {result.timings['wall_seconds']:.1f}s total")
+                            else:
+                                st.error("❌ All translations failed. Please try a different translation service or check your internet connection.")
                         
                         # Generate translations if enabled
-                        if enable_translation and target_languages:
+                        elif enable_translation and target_languages:
                             with st.spinner(f"Translating subtitles to {len(target_languages)} languages..."):
                                 translated_subtitles = {}
                                 translated_vtt = {}
@@ -1460,15 +793,7 @@ def main():
                                             success_count += 1
                                             
                                             # Convert to VTT format
-                                            vtt_content = "WEBVTT\n\n"
-                                            lines = translated_srt.strip().split('\n')
-                                            for line in lines:
-                                                if '-->' in line:
-                                                    vtt_line = line.replace(',', '.')
-                                                    vtt_content += vtt_line + '\n'
-                                                else:
-                                                    vtt_content += line + '\n'
-                                            translated_vtt[lang] = vtt_content
+                                            translated_vtt[lang] = srt_to_vtt(translated_srt)
                                             
                                             st.success(f"✅ {lang} translation completed")
                                         else:
@@ -1506,17 +831,11 @@ def main():
             
             with col2_2:
                 # Count unique speakers
-                speakers = set()
-                if 'words' in transcription:
-                    for word in transcription['words']:
-                        if word.get('speaker_id'):
-                            speakers.add(word['speaker_id'])
-                st.metric("Speakers Detected", len(speakers))
+                st.metric("Speakers Detected", len(transcription.speaker_ids()))
                 
                 # Calculate duration
-                if 'words' in transcription and transcription['words']:
-                    duration = transcription['words'][-1].get('end', 0)
-                    st.metric("Duration", f"{duration:.1f}s")
+                if len(transcription):
+                    st.metric("Duration", f"{transcription.duration:.1f}s")
             
             # Display subtitle format tabs - add translations tab if available
             if 'translated_subtitles' in st.session_state and st.session_state['translated_subtitles']:
@@ -1691,7 +1010,7 @@ def main():
                 # Export transcription data as JSON
                 if st.button("Download JSON Data"):
                     import json
-                    json_data = json.dumps(transcription, indent=2)
+                    json_data = json.dumps(transcription.to_transcription(), indent=2)
                     st.download_button(
                         label="Download Transcription JSON",
                         data=json_data,
@@ -1701,6 +1020,9 @@ def main():
         else:
             st.info("Upload a file and click 'Generate Subtitles' to see results here.")
     
+    if show_timings:
+        show_timing_panel()
+    
     # Footer with information
     st.markdown("---")
     st.markdown("""
@@ -0,0 +1,394 @@
+#!/usr/bin/env python3
+"""
+Headless batch subtitle generation for folders or manifests of media files.
+
+Runs audio extraction -> ElevenLabs transcription -> SRT/VTT -> translations for
+every file and writes the results next to each input:
+
+    lecture.mp4  ->  lecture.json, lecture.srt, lecture.vtt,
+                     lecture.Spanish.srt, lecture.Spanish.vtt, ...
+
+With --ocr, on-screen text in videos is recognised while the audio is being
+transcribed (one ffmpeg pass feeds both), saved to lecture.ocr.json and merged
+into the subtitles as [ON-SCREEN] cues.
+
+Progress is recorded in a state file so an interrupted run can be resumed
+without repeating finished transcriptions or translations.
+
+Usage:
+    python subtitle_batch.py videos/ --translate Spanish French --jobs 4
+    python subtitle_batch.py manifest.txt --api-key sk_...
+    python subtitle_batch.py videos/ --ocr --ocr-interval 2 --ocr-sampling keyframes
+"""
+
+import os
+import sys
+import json
+import logging
+import argparse
+import mimetypes
+import threading
+from contextlib import ExitStack
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from subtitle_core import (
+    ELEVENLABS_API_KEY,
+    AUDIO_PROFILES,
+    DEFAULT_AUDIO_PROFILE,
+    DEFAULT_SEGMENTATION,
+    SEGMENTATION_PRESETS,
+    TARGET_LANGUAGES,
+    TRANSLATION_SERVICES,
+    ElevenLabsSubtitleGenerator,
+    ExtractionScheduler,
+    MediaIngest,
+    OCR_SAMPLE_INTERVAL,
+    OCR_SAMPLING,
+    OCR_SAMPLING_MODES,
+    PROFILE_MODES,
+    VideoOCRProcessor,
+    bind_context,
+    generate_srt_subtitles,
+    generate_vtt_subtitles,
+    merge_ocr_subtitles,
+    srt_to_vtt,
+    translate_subtitles_preserve_structure,
+    profile_run,
+    warn,
+)
+
+AUDIO_EXTENSIONS = {'.mp3', '.wav', '.flac', '.m4a', '.aac', '.ogg'}
+VIDEO_EXTENSIONS = {'.mp4', '.mov', '.avi', '.mkv', '.webm'}
+MEDIA_EXTENSIONS = AUDIO_EXTENSIONS | VIDEO_EXTENSIONS
+
+STATE_FILENAME = ".subtitle_batch_state.json"
+
+
+def write_text_atomic(path: Path, content: str) -> None:
+    """Write a file via a temporary sibling so interrupted runs never leave partial output"""
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def collect_media_files(source: Path, recursive: bool = False) -> List[Path]:
+    """Collect media files from a directory, or read them from a manifest file
+
+    Manifests are either a JSON list of paths or a text file with one path per
+    line (blank lines and lines starting with # are ignored). Relative paths
+    are resolved against the manifest's directory.
+    """
+    if source.is_dir():
+        pattern = '**/*' if recursive else '*'
+        return sorted(p for p in source.glob(pattern) if p.is_file() and p.suffix.lower() in MEDIA_EXTENSIONS)
+
+    text = source.read_text(encoding='utf-8')
+    if source.suffix.lower() == '.json':
+        entries = json.loads(text)
+    else:
+        entries = [line.strip() for line in text.splitlines()
+                   if line.strip() and not line.strip().startswith('#')]
+
+    files = []
+    for entry in entries:
+        path = Path(entry)
+        if not path.is_absolute():
+            path = source.parent / path
+        files.append(path)
+    return files
+
+
+class BatchState:
+    """Thread-safe record of finished stages per input file, persisted as JSON"""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data = {}
+        if path.exists():
+            try:
+                self._data = json.loads(path.read_text(encoding='utf-8'))
+            except (OSError, json.JSONDecodeError):
+                self._data = {}
+
+    @staticmethod
+    def fingerprint(media_path: Path) -> str:
+        stat = media_path.stat()
+        return f"{stat.st_size}:{int(stat.st_mtime)}"
+
+    def completed_stages(self, media_path: Path) -> List[str]:
+        """Return finished stages, or nothing if the input changed since they ran"""
+        with self._lock:
+            entry = self._data.get(str(media_path.resolve()))
+        if not entry or entry.get('fingerprint') != self.fingerprint(media_path):
+            return []
+        return list(entry.get('stages', []))
+
+    def mark(self, media_path: Path, stage: str) -> None:
+        key = str(media_path.resolve())
+        with self._lock:
+            entry = self._data.get(key)
+            fingerprint = self.fingerprint(media_path)
+            if not entry or entry.get('fingerprint') != fingerprint:
+                entry = {'fingerprint': fingerprint, 'stages': []}
+                self._data[key] = entry
+            if stage not in entry['stages']:
+                entry['stages'].append(stage)
+            write_text_atomic(self.path, json.dumps(self._data, indent=2))
+
+    def unmark(self, media_path: Path, *stages: str) -> None:
+        key = str(media_path.resolve())
+        with self._lock:
+            entry = self._data.get(key)
+            stale = [stage for stage in stages if entry and stage in entry['stages']]
+            if stale:
+                entry['stages'] = [stage for stage in entry['stages'] if stage not in stale]
+                write_text_atomic(self.path, json.dumps(self._data, indent=2))
+
+
+def process_media_file(media_path: Path, args: argparse.Namespace, state: BatchState,
+                       scheduler: ExtractionScheduler) -> Dict:
+    """Run every pipeline stage for one file, skipping stages already completed"""
+    done = [] if args.force else state.completed_stages(media_path)
+    stem = media_path.with_suffix('')
+    json_path = Path(f"{stem}.json")
+    srt_path = Path(f"{stem}.srt")
+    vtt_path = Path(f"{stem}.vtt")
+    ocr_path = Path(f"{stem}.ocr.json")
+    summary = {'file': str(media_path), 'skipped': [], 'completed': [], 'failed': {}}
+    is_video = media_path.suffix.lower() in VIDEO_EXTENSIONS
+    needs_transcription = not ('transcription' in done and json_path.exists())
+
+    ocr_cues = []
+    if args.ocr and is_video and 'ocr' in done and ocr_path.exists():
+        ocr_cues = json.loads(ocr_path.read_text(encoding='utf-8'))
+        summary['skipped'].append('ocr')
+
+    with ExitStack() as stack:
+        # OCR runs on its own thread while the audio is transcribed. When both
+        # are needed, one ffmpeg pass produces the audio track and the frames.
+        ocr_future = ingest = None
+        if args.ocr and is_video and 'ocr' not in summary['skipped']:
+            processor = VideoOCRProcessor(interval=args.ocr_interval, sampling=args.ocr_sampling)
+            if needs_transcription:
+                try:
+                    ingest = stack.enter_context(MediaIngest(media_path, args.audio_profile, args.ocr_interval,
+                                                             threads=scheduler.ffmpeg_threads,
+                                                             sampling=args.ocr_sampling, scheduler=scheduler))
+                except Exception as e:
+                    warn(f"Could not start single-pass decoding of {media_path.name}: {str(e)}. Decoding twice.")
+            frames = ingest.frames() if ingest else processor.extract_frames_from_video(str(media_path))
+            ocr_executor = stack.enter_context(ThreadPoolExecutor(max_workers=1, thread_name_prefix="ocr"))
+            ocr_future = ocr_executor.submit(bind_context(processor.process_frames), frames)
+
+        # Transcription (reuse the saved JSON when resuming)
+        if not needs_transcription:
+            transcription = json.loads(json_path.read_text(encoding='utf-8'))
+            summary['skipped'].append('transcription')
+        else:
+            file_bytes = None
+            upload_name, upload_type = media_path.name, mimetypes.guess_type(media_path.name)[0] or 'application/octet-stream'
+            if is_video:
+                try:
+                    extracted = ingest.audio() if ingest else scheduler.extract(media_path.read_bytes(), args.audio_profile)
+                    if extracted is not None:
+                        file_bytes, upload_name, upload_type = extracted.audio, extracted.filename, extracted.mime_type
+                except Exception as e:
+                    warn(f"Could not extract audio from {media_path.name}: {str(e)}. Using original file.")
+            if file_bytes is None:
+                file_bytes = media_path.read_bytes()
+
+            generator = ElevenLabsSubtitleGenerator(args.api_key)
+            transcription = generator.create_transcription(
+                file_bytes,
+                language_code=args.language,
+                num_speakers=args.num_speakers,
+                diarize=args.diarize,
+                tag_audio_events=args.tag_audio_events,
+                trim_silence=args.trim_silence,
+                filename=upload_name,
+                mime_type=upload_type,
+                audio_profile=args.audio_profile,
+                scheduler=scheduler
+            )
+            write_text_atomic(json_path, json.dumps(transcription, indent=2))
+            state.mark(media_path, 'transcription')
+            summary['completed'].append('transcription')
+            # Subtitles and translations built from an earlier transcription are stale
+            done = [stage for stage in done if not stage.startswith(('subtitles', 'translation:'))]
+
+        if ocr_future is not None:
+            try:
+                ocr_cues = ocr_future.result()
+                write_text_atomic(ocr_path, json.dumps(ocr_cues, indent=2))
+                state.mark(media_path, 'ocr')
+                summary['completed'].append('ocr')
+                done = [stage for stage in done if not stage.startswith(('subtitles', 'translation:'))]
+            except Exception as e:
+                summary['failed']['ocr'] = str(e)
+
+    # Subtitle formats. The stage name records the segmentation preset and
+    # whether on-screen text is merged in, so changing either rebuilds them.
+    subtitles_stage = f"subtitles{'+ocr' if ocr_cues else ''}:{args.segmentation}"
+    if subtitles_stage in done and srt_path.exists() and vtt_path.exists():
+        srt_content = srt_path.read_text(encoding='utf-8')
+        summary['skipped'].append(subtitles_stage)
+    else:
+        srt_content = generate_srt_subtitles(transcription, args.segmentation)
+        if ocr_cues:
+            srt_content = merge_ocr_subtitles(srt_content, ocr_cues)
+            vtt_content = srt_to_vtt(srt_content)
+        else:
+            vtt_content = generate_vtt_subtitles(transcription, args.segmentation)
+        write_text_atomic(srt_path, srt_content)
+        write_text_atomic(vtt_path, vtt_content)
+        # Other subtitle variants and translations of the previous subtitles are stale
+        state.unmark(media_path, *[stage for stage in state.completed_stages(media_path)
+                                   if stage.startswith(('subtitles', 'translation:'))])
+        state.mark(media_path, subtitles_stage)
+        summary['completed'].append(subtitles_stage)
+        done = [stage for stage in done if not stage.startswith('translation:')]
+
+    # Translations
+    for lang in args.translate:
+        stage = f"translation:{lang}"
+        lang_srt_path = Path(f"{stem}.{lang}.srt")
+        if stage in done and lang_srt_path.exists():
+            summary['skipped'].append(stage)
+            continue
+        try:
+            translated_srt = translate_subtitles_preserve_structure(
+                srt_content,
+                lang,
+                args.translation_service,
+                args.translation_api_key
+            )
+            if not translated_srt or translated_srt == srt_content:
+                raise RuntimeError("translation service returned untranslated subtitles")
+            write_text_atomic(lang_srt_path, translated_srt)
+            write_text_atomic(Path(f"{stem}.{lang}.vtt"), srt_to_vtt(translated_srt))
+            state.mark(media_path, stage)
+            summary['completed'].append(stage)
+        except Exception as e:
+            summary['failed'][stage] = str(e)
+
+    return summary
+
+
+def process_media_file_profiled(media_path: Path, args: argparse.Namespace, state: BatchState,
+                                scheduler: ExtractionScheduler) -> Dict:
+    """process_media_file under --profile / $PROFILE, one profile per file named after it"""
+    with profile_run(media_path.stem, args.profile, args.profile_dir) as profile:
+        summary = process_media_file(media_path, args, state, scheduler)
+    if profile is not None:
+        summary['profile'] = profile.paths
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Generate subtitles and translations for a folder or manifest of media files"
+    )
+    parser.add_argument("source", help="Directory of media files, or a manifest (.txt with one path per line, or .json list)")
+    parser.add_argument("--api-key", default=ELEVENLABS_API_KEY, help="ElevenLabs API key (default: $ELEVENLABS_API_KEY)")
+    parser.add_argument("--language", default=None, help="ISO 639-3 audio language code, e.g. eng (default: auto-detect)")
+    parser.add_argument("--num-speakers", type=int, default=None, help="Expected number of speakers")
+    parser.add_argument("--no-diarize", dest="diarize", action="store_false", help="Disable speaker diarization")
+    parser.add_argument("--no-audio-events", dest="tag_audio_events", action="store_false", help="Disable audio event tagging")
+    parser.add_argument("--trim-silence", action="store_true", help="Remove long silences before upload (timestamps are remapped)")
+    parser.add_argument("--audio-profile", default=None, choices=sorted(AUDIO_PROFILES),
+                        help="Encoding for audio extracted from video (default: stream-copy suitable tracks, "
+                             f"else {DEFAULT_AUDIO_PROFILE})")
+    parser.add_argument("--segmentation", default=DEFAULT_SEGMENTATION, choices=sorted(SEGMENTATION_PRESETS),
+                        help=f"How words are grouped into subtitles (default: {DEFAULT_SEGMENTATION})")
+    parser.add_argument("--translate", nargs="*", default=[], metavar="LANGUAGE",
+                        help="Target languages by name, e.g. Spanish French")
+    parser.add_argument("--translation-service", default="google_free", choices=sorted(TRANSLATION_SERVICES.values()),
+                        help="Translation service (default: google_free)")
+    parser.add_argument("--translation-api-key", default=None, help="API key for the Azure translation service")
+    parser.add_argument("--jobs", type=int, default=2, help="Number of files processed in parallel (default: 2)")
+    parser.add_argument("--ffmpeg-jobs", type=int, default=None,
+                        help="Maximum concurrent ffmpeg extractions (default: $FFMPEG_MAX_CONCURRENT or half the cores)")
+    parser.add_argument("--ffmpeg-threads", type=int, default=None,
+                        help="Threads per ffmpeg process (default: $FFMPEG_THREADS or 2)")
+    parser.add_argument("--ocr", action="store_true",
+                        help="Also recognise on-screen text in videos and add it to the subtitles as [ON-SCREEN] cues")
+    parser.add_argument("--ocr-interval", type=float, default=OCR_SAMPLE_INTERVAL,
+                        help=f"Seconds between frames sampled for OCR (default: {OCR_SAMPLE_INTERVAL})")
+    parser.add_argument("--ocr-sampling", default=OCR_SAMPLING, choices=list(OCR_SAMPLING_MODES),
+                        help="Frames decoded for OCR: 'all' is exact, 'reference'/'predicted' skip frames nothing "
+                             "depends on / B-frames, 'keyframes' is fastest but can miss briefly shown text "
+                             f"(default: {OCR_SAMPLING})")
+    parser.add_argument("--recursive", action="store_true", help="Search the source directory recursively")
+    parser.add_argument("--state-file", default=None, help=f"Resume state file (default: {STATE_FILENAME} in the source directory)")
+    parser.add_argument("--force", action="store_true", help="Ignore saved progress and reprocess every stage")
+    parser.add_argument("--profile", default=None, choices=PROFILE_MODES,
+                        help="Profile each file: 'sample' writes flamegraph stacks (.folded), 'cprofile' writes .prof "
+                             "(default: $PROFILE or off; one file is profiled at a time, so use --jobs 1 to profile every file)")
+    parser.add_argument("--profile-dir", default="profiles", help="Directory for profile output (default: profiles)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(level=logging.WARNING, format="%(levelname)s: %(message)s")
+
+    if not args.api_key or args.api_key == "your_api_key_here":
+        print("Error: a valid ElevenLabs API key is required (--api-key or $ELEVENLABS_API_KEY)", file=sys.stderr)
+        return 2
+
+    unknown = [lang for lang in args.translate if lang not in TARGET_LANGUAGES]
+    if unknown:
+        print(f"Error: unsupported target languages: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+
+    source = Path(args.source)
+    if not source.exists():
+        print(f"Error: {source} does not exist", file=sys.stderr)
+        return 2
+
+    files = collect_media_files(source, args.recursive)
+    if not files:
+        print("No media files found")
+        return 0
+
+    state_dir = source if source.is_dir() else source.parent
+    state = BatchState(Path(args.state_file) if args.state_file else state_dir / STATE_FILENAME)
+
+    print(f"Processing {len(files)} files with {args.jobs} parallel jobs")
+    failures = 0
+    scheduler_options = {'max_queue': len(files)}
+    if args.ffmpeg_jobs:
+        scheduler_options['max_concurrent'] = args.ffmpeg_jobs
+    if args.ffmpeg_threads:
+        scheduler_options['ffmpeg_threads'] = args.ffmpeg_threads
+    scheduler = ExtractionScheduler(**scheduler_options)
+
+    with ThreadPoolExecutor(max_workers=max(1, args.jobs)) as executor:
+        futures = {executor.submit(process_media_file_profiled, path, args, state, scheduler): path for path in files}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                failures += 1
+                print(f"❌ {path}: {e}")
+                continue
+            if summary['failed']:
+                failures += 1
+                for stage, error in summary['failed'].items():
+                    print(f"⚠️ {path}: {stage} failed: {error}")
+            done = ", ".join(summary['completed']) or "nothing new"
+            print(f"✅ {path}: {done}" + (f" (resumed: {len(summary['skipped'])} stages skipped)" if summary['skipped'] else ""))
+            if summary.get('profile'):
+                print(f"   profile: {', '.join(summary['profile'])}")
+
+    print(f"Finished: {len(files) - failures}/{len(files)} files completed without errors")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+"""
+UI-free core of the subtitle generator: transcription, subtitle formats,
+translation, audio extraction and on-screen text OCR.
+
+Shared by the Streamlit app (subtitle.py), the FastAPI backend and the batch
+CLI. Nothing in this package imports Streamlit; user-facing warnings go
+through ``set_warning_handler`` (the Streamlit app routes them to
+``st.warning``) and are always logged to the ``subtitle_core`` logger.
+"""
+
+from .config import (
+    ELEVENLABS_API_KEY,
+    BASE_URL,
+    TRANSLATION_SERVICES,
+    TARGET_LANGUAGES,
+    TRANSCRIPTION_LANGUAGES,
+)
+from .notify import set_warning_handler, warn
+from .profiling import (
+    PROFILE,
+    PROFILE_MODES,
+    PROFILE_TARGETS,
+    Profile,
+    StackSampler,
+    profile_run,
+    active_profile,
+    set_profile_key,
+)
+from .tracing import (
+    TRACING,
+    FileSpanExporter,
+    InMemorySpanExporter,
+    configure_tracing,
+    get_tracer,
+    start_span,
+    current_span,
+    set_trace_attributes,
+    bind_context,
+)
+from .metrics import METRICS_ENABLED, MetricsRegistry, metrics, record_cache, stage_timer
+from .segmentation import (
+    SegmentationPolicy,
+    SEGMENTATION_PRESETS,
+    DEFAULT_SEGMENTATION,
+    SPEAKER_LABEL_MODES,
+    get_segmentation_policy,
+    build_segmentation_policy,
+    validate_speaker_names,
+    IncrementalSegmenter,
+    iter_subtitle_cues,
+    segment_words,
+)
+from .wordtable import WordTable, transcription_words
+from .formats import (
+    format_timestamp,
+    parse_srt_subtitles,
+    timestamp_to_seconds,
+    seconds_to_vtt_timestamp,
+    generate_srt_subtitles,
+    generate_vtt_subtitles,
+    srt_to_vtt,
+    render_srt_from_cues,
+    render_vtt_from_cues,
+)
+from .render import RenderCache, RenderedSubtitles, render_cache, render_subtitles
+from .generator import ElevenLabsSubtitleGenerator
+from .translator import (
+    SubtitleTranslator,
+    create_simple_translation_map,
+    check_translation_service_status,
+    translate_subtitles_preserve_structure,
+    translate_with_context_awareness,
+    group_by_conversation_segments,
+    extract_individual_translations,
+    enhance_single_translation,
+    apply_english_enhancements,
+)
+from .audio import (
+    AUDIO_PROFILES,
+    DEFAULT_AUDIO_PROFILE,
+    AudioProfile,
+    ExtractedAudio,
+    get_audio_profile,
+    find_ffmpeg,
+    find_ffprobe,
+    probe_audio_stream,
+    extract_audio,
+    extract_audio_from_video,
+)
+from .scheduler import ExtractionScheduler, SchedulerFull
+from .pipeline import (
+    PIPELINE_CHUNK_SECONDS,
+    AudioChunk,
+    PipelineResult,
+    split_audio_chunks,
+    transcribe_and_translate,
+)
+from .ocr import (
+    OCR_SAMPLE_INTERVAL,
+    OCR_MIN_CONFIDENCE,
+    OCR_WORKERS,
+    OCR_TEXT_REGIONS,
+    OCR_CUE_PREFIX,
+    OCR_SAMPLING,
+    OCR_SAMPLING_MODES,
+    OCRLine,
+    OCRRegion,
+    TesseractRecognizer,
+    FrameChangeDetector,
+    TextRegionDetector,
+    OCRWorkerPool,
+    VideoOCRProcessor,
+    iter_video_frames,
+    coalesce_ocr_cues,
+    merge_ocr_cues,
+    merge_ocr_subtitles,
+    merge_ocr_translations,
+)
+from .ingest import (
+    INGEST_BUFFER_MB,
+    MediaIngest,
+    probe_video_stream,
+    iter_sampled_frames,
+)
@@ -0,0 +1,249 @@
+import os
+import re
+import json
+import tempfile
+import subprocess
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .metrics import stage_timer
+from .tracing import current_span
+from .notify import warn
+
+class AudioProfile(NamedTuple):
+    """ffmpeg encoding settings for audio sent to the transcription API"""
+    name: str
+    codec_args: List[str]
+    extension: str
+    mime_type: str
+    description: str
+
+# Encoding profiles for transcription uploads. Speech needs far less than
+# 128 kbps stereo; all profiles except "legacy_mp3" downmix to 16 kHz mono.
+AUDIO_PROFILES: Dict[str, AudioProfile] = {
+    "legacy_mp3": AudioProfile(
+        "legacy_mp3", ['-acodec', 'mp3', '-ab', '128k', '-ar', '16000'],
+        ".mp3", "audio/mpeg", "MP3 128 kbps, original channels (default)"
+    ),
+    "speech_mp3": AudioProfile(
+        "speech_mp3", ['-ac', '1', '-ar', '16000', '-acodec', 'mp3', '-ab', '32k'],
+        ".mp3", "audio/mpeg", "MP3 32 kbps mono - small and widely supported"
+    ),
+    "opus": AudioProfile(
+        "opus", ['-ac', '1', '-ar', '16000', '-acodec', 'libopus', '-b:a', '24k', '-application', 'voip'],
+        ".ogg", "audio/ogg", "Opus 24 kbps mono - low-bitrate speech codec"
+    ),
+    "flac": AudioProfile(
+        "flac", ['-ac', '1', '-ar', '16000', '-acodec', 'flac'],
+        ".flac", "audio/flac", "FLAC lossless mono - best accuracy, largest uploads"
+    ),
+}
+
+DEFAULT_AUDIO_PROFILE = os.getenv("AUDIO_PROFILE", "legacy_mp3")
+
+# Source codecs the transcription API accepts as-is, with the container used
+# when stream-copying them out of a video (no decode/re-encode needed)
+STREAM_COPY_CODECS = {
+    'aac': ('.m4a', 'audio/mp4'),
+    'mp3': ('.mp3', 'audio/mpeg'),
+    'opus': ('.ogg', 'audio/ogg'),
+    'vorbis': ('.ogg', 'audio/ogg'),
+    'flac': ('.flac', 'audio/flac'),
+}
+# Copying a high-bitrate track would upload more than re-encoding it
+STREAM_COPY_MAX_BITRATE = int(os.getenv("AUDIO_STREAM_COPY_MAX_BITRATE", "192000"))
+AUDIO_STREAM_COPY = os.getenv("AUDIO_STREAM_COPY", "1") != "0"
+
+class ExtractedAudio(NamedTuple):
+    """Encoded audio plus the upload filename and MIME type that match its container"""
+    audio: bytes
+    filename: str
+    mime_type: str
+    profile: str
+
+def get_audio_profile(name: str = None) -> AudioProfile:
+    """Look up an encoding profile by name (defaults to $AUDIO_PROFILE or legacy_mp3)"""
+    name = name or DEFAULT_AUDIO_PROFILE
+    if name not in AUDIO_PROFILES:
+        raise ValueError(f"Unknown audio profile '{name}'. Available: {', '.join(AUDIO_PROFILES)}")
+    return AUDIO_PROFILES[name]
+
+@lru_cache(maxsize=None)
+def find_ffmpeg() -> str:
+    """Locate the ffmpeg executable (PATH or common installation locations)"""
+    ffmpeg_cmd = 'ffmpeg'
+    
+    # Check if ffmpeg is in PATH, if not try common installation locations
+    try:
+        subprocess.run([ffmpeg_cmd, '-version'], capture_output=True, check=True)
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        # Try WinGet installation path
+        winget_ffmpeg = os.path.join(
+            os.environ.get('LOCALAPPDATA', ''),
+            'Microsoft', 'WinGet', 'Packages',
+            'Gyan.FFmpeg_Microsoft.Winget.Source_8wekyb3d8bbwe',
+            'ffmpeg-8.0-full_build', 'bin', 'ffmpeg.exe'
+        )
+        if os.path.exists(winget_ffmpeg):
+            ffmpeg_cmd = winget_ffmpeg
+        else:
+            raise FileNotFoundError("FFmpeg not found in PATH or common locations")
+    
+    return ffmpeg_cmd
+
+@lru_cache(maxsize=None)
+def find_ffprobe() -> str:
+    """Locate ffprobe on PATH or next to the ffmpeg executable"""
+    try:
+        subprocess.run(['ffprobe', '-version'], capture_output=True, check=True)
+        return 'ffprobe'
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        pass
+    
+    ffmpeg_cmd = find_ffmpeg()
+    ffprobe_cmd = os.path.join(os.path.dirname(ffmpeg_cmd), os.path.basename(ffmpeg_cmd).replace('ffmpeg', 'ffprobe'))
+    if os.path.dirname(ffmpeg_cmd) and os.path.exists(ffprobe_cmd):
+        return ffprobe_cmd
+    raise FileNotFoundError("FFprobe not found in PATH or next to ffmpeg")
+
+def probe_audio_stream(media_path: str) -> Optional[Dict]:
+    """Describe the first audio stream of a media file
+    
+    Returns a dict with codec_name, channels, sample_rate and bit_rate (None
+    where unknown), or None if the file has no audio stream. Uses ffprobe when
+    available and falls back to parsing the ``ffmpeg -i`` banner.
+    """
+    try:
+        ffprobe_cmd = find_ffprobe()
+    except FileNotFoundError:
+        ffprobe_cmd = None
+    
+    if ffprobe_cmd:
+        result = subprocess.run([
+            ffprobe_cmd, '-v', 'error', '-select_streams', 'a:0',
+            '-show_entries', 'stream=codec_name,channels,sample_rate,bit_rate',
+            '-of', 'json', media_path
+        ], capture_output=True, text=True, check=True)
+        streams = json.loads(result.stdout or '{}').get('streams', [])
+        if not streams:
+            return None
+        stream = streams[0]
+        return {
+            'codec_name': stream.get('codec_name'),
+            'channels': int(stream['channels']) if stream.get('channels') else None,
+            'sample_rate': int(stream['sample_rate']) if stream.get('sample_rate') else None,
+            'bit_rate': int(stream['bit_rate']) if str(stream.get('bit_rate', '')).isdigit() else None,
+        }
+    
+    # ffmpeg exits non-zero without an output file but still prints stream info
+    result = subprocess.run([find_ffmpeg(), '-hide_banner', '-i', media_path], capture_output=True, text=True)
+    match = re.search(r'Stream #\S+.*?: Audio: (\w+)[^\n]*', result.stderr)
+    if not match:
+        return None
+    line = match.group(0)
+    sample_rate = re.search(r'(\d+) Hz', line)
+    bit_rate = re.search(r'(\d+) kb/s', line)
+    channels = 1 if 'mono' in line else 2 if 'stereo' in line else None
+    return {
+        'codec_name': match.group(1),
+        'channels': channels,
+        'sample_rate': int(sample_rate.group(1)) if sample_rate else None,
+        'bit_rate': int(bit_rate.group(1)) * 1000 if bit_rate else None,
+    }
+
+def stream_copy_format(stream_info: Dict) -> Optional[Tuple[str, str]]:
+    """(extension, MIME type) to stream-copy an audio track into, or None if it must be re-encoded"""
+    codec = stream_info.get('codec_name')
+    if codec not in STREAM_COPY_CODECS:
+        return None
+    bit_rate = stream_info.get('bit_rate')
+    if bit_rate and bit_rate > STREAM_COPY_MAX_BITRATE:
+        return None
+    return STREAM_COPY_CODECS[codec]
+
+def stream_copy_audio(ffmpeg_cmd: str, media_path: str, stream_info: Dict) -> Optional[ExtractedAudio]:
+    """Demux the audio track without re-encoding if its codec is acceptable for upload"""
+    copy_format = stream_copy_format(stream_info)
+    if copy_format is None:
+        return None
+    
+    extension, mime_type = copy_format
+    with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as temp_audio:
+        temp_audio_path = temp_audio.name
+    try:
+        subprocess.run([
+            ffmpeg_cmd, '-i', media_path, '-vn', '-map', '0:a:0', '-c:a', 'copy', '-y', temp_audio_path
+        ], check=True, capture_output=True)
+        with open(temp_audio_path, 'rb') as f:
+            audio_bytes = f.read()
+    finally:
+        os.unlink(temp_audio_path)
+    
+    if not audio_bytes:
+        return None
+    return ExtractedAudio(audio_bytes, f"audio{extension}", mime_type, "stream_copy")
+
+@stage_timer("extract_audio")
+def extract_audio(video_bytes: bytes, profile: str = None,
+                  allow_stream_copy: bool = AUDIO_STREAM_COPY,
+                  threads: int = None) -> ExtractedAudio:
+    """Extract and encode the audio track with ffmpeg using an encoding profile
+    
+    Without an explicit profile, when the source already holds speech audio
+    the API accepts (AAC, MP3, Opus, Vorbis, FLAC at a moderate bitrate), the
+    track is stream-copied instead, which is far faster than re-encoding long
+    files; otherwise the default profile is used. threads caps ffmpeg's
+    decoder/encoder threads when encoding (default: ffmpeg decides). Raises if
+    ffmpeg is unavailable or fails; see extract_audio_from_video for the
+    variant that falls back to the original bytes.
+    """
+    audio_profile = get_audio_profile(profile)
+    current_span().set_attributes({'audio_profile': audio_profile.name, 'input_bytes': len(video_bytes)})
+    ffmpeg_cmd = find_ffmpeg()
+    thread_args = ['-threads', str(threads)] if threads else []
+    
+    # Write video to temp file
+    with tempfile.NamedTemporaryFile(suffix='.mp4', delete=False) as temp_video:
+        temp_video.write(video_bytes)
+        temp_video_path = temp_video.name
+    
+    # Fast path: demux only (a profile the caller chose is always honoured)
+    if allow_stream_copy and profile is None:
+        try:
+            stream_info = probe_audio_stream(temp_video_path)
+            copied = stream_copy_audio(ffmpeg_cmd, temp_video_path, stream_info) if stream_info else None
+            if copied is not None:
+                os.unlink(temp_video_path)
+                return copied
+        except (subprocess.CalledProcessError, OSError, ValueError):
+            # Fall back to transcoding
+            pass
+    
+    # Extract audio to temp file (the extension selects the container)
+    with tempfile.NamedTemporaryFile(suffix=audio_profile.extension, delete=False) as temp_audio:
+        temp_audio_path = temp_audio.name
+    
+    try:
+        subprocess.run(
+            [ffmpeg_cmd] + thread_args + ['-i', temp_video_path, '-vn'] + audio_profile.codec_args
+            + thread_args + ['-y', temp_audio_path],
+            check=True, capture_output=True
+        )
+        
+        # Read extracted audio
+        with open(temp_audio_path, 'rb') as f:
+            audio_bytes = f.read()
+    finally:
+        # Clean up temp files
+        os.unlink(temp_video_path)
+        os.unlink(temp_audio_path)
+    
+    return ExtractedAudio(audio_bytes, f"audio{audio_profile.extension}", audio_profile.mime_type, audio_profile.name)
+
+def extract_audio_from_video(video_bytes: bytes, profile: str = None) -> bytes:
+    """Extract audio from video file using ffmpeg (if available)"""
+    try:
+        return extract_audio(video_bytes, profile).audio
+    except Exception as e:
+        warn(f"Could not extract audio from video: {str(e)}. Using original file.")
+        return video_bytes
@@ -0,0 +1,56 @@
+import os
+
+# ElevenLabs API Configuration
+ELEVENLABS_API_KEY = os.getenv("ELEVENLABS_API_KEY", "your_api_key_here")
+BASE_URL = os.getenv("ELEVENLABS_BASE_URL", "https://api.elevenlabs.io")
+
+# Translation Services Configuration
+TRANSLATION_SERVICES = {
+    "Google Translate (Free)": "google_free",
+    "LibreTranslate (Free)": "libre",
+    "Azure Translator": "azure"
+}
+
+# Translation endpoints; override to use a proxy or the offline mock servers
+# in benchmarks/mock_services.py (unset Google/Libre URLs keep the public defaults)
+GOOGLE_TRANSLATE_URL = os.getenv("GOOGLE_TRANSLATE_URL")
+LIBRETRANSLATE_URL = os.getenv("LIBRETRANSLATE_URL")
+AZURE_TRANSLATOR_ENDPOINT = os.getenv("AZURE_TRANSLATOR_ENDPOINT", "https://api.cognitive.microsofttranslator.com")
+
+# Supported target languages for translation
+TARGET_LANGUAGES = {
+    "English": "en", "Spanish": "es", "French": "fr", "German": "de", "Italian": "it",
+    "Portuguese": "pt", "Russian": "ru", "Japanese": "ja", "Chinese (Simplified)": "zh",
+    "Korean": "ko", "Hindi": "hi", "Arabic": "ar", "Dutch": "nl",
+    "Turkish": "tr", "Polish": "pl", "Swedish": "sv", "Norwegian": "no",
+    "Danish": "da", "Finnish": "fi", "Czech": "cs", "Hungarian": "hu",
+    "Bulgarian": "bg", "Romanian": "ro", "Greek": "el", "Hebrew": "he",
+    "Thai": "th", "Vietnamese": "vi", "Indonesian": "id", "Malay": "ms",
+    "Filipino": "tl", "Ukrainian": "uk", "Bengali": "bn", "Tamil": "ta",
+    "Telugu": "te", "Marathi": "mr", "Gujarati": "gu", "Kannada": "kn",
+    "Malayalam": "ml", "Punjabi": "pa", "Urdu": "ur", "Persian": "fa",
+    "Swahili": "sw", "Afrikaans": "af", "Catalan": "ca", "Croatian": "hr"
+}
+
+# Audio languages supported by ElevenLabs Scribe v1 (ISO 639-3 codes)
+TRANSCRIPTION_LANGUAGES = {
+    "Auto-detect": None,
+    "English": "eng", "Spanish": "spa", "French": "fra", "German": "deu",
+    "Italian": "ita", "Portuguese": "por", "Russian": "rus", "Japanese": "jpn",
+    "Chinese (Mandarin)": "zho", "Korean": "kor", "Hindi": "hin", "Arabic": "ara",
+    "Dutch": "nld", "Turkish": "tur", "Polish": "pol", "Swedish": "swe",
+    "Norwegian": "nor", "Danish": "dan", "Finnish": "fin", "Czech": "ces",
+    "Hungarian": "hun", "Bulgarian": "bul", "Romanian": "ron", "Greek": "ell",
+    "Hebrew": "heb", "Thai": "tha", "Vietnamese": "vie", "Indonesian": "ind",
+    "Malay": "msa", "Filipino": "fil", "Ukrainian": "ukr", "Bengali": "ben",
+    "Afrikaans": "afr", "Amharic": "amh", "Armenian": "hye", "Assamese": "asm",
+    "Azerbaijani": "aze", "Belarusian": "bel", "Bosnian": "bos", "Burmese": "mya",
+    "Catalan": "cat", "Croatian": "hrv", "Estonian": "est", "Georgian": "kat",
+    "Gujarati": "guj", "Icelandic": "isl", "Irish": "gle", "Javanese": "jav",
+    "Kannada": "kan", "Kazakh": "kaz", "Khmer": "khm", "Latvian": "lav",
+    "Lithuanian": "lit", "Macedonian": "mkd", "Malayalam": "mal", "Maltese": "mlt",
+    "Marathi": "mar", "Mongolian": "mon", "Nepali": "nep", "Persian": "fas",
+    "Punjabi": "pan", "Serbian": "srp", "Slovak": "slk", "Slovenian": "slv",
+    "Swahili": "swa", "Tamil": "tam", "Telugu": "tel", "Urdu": "urd",
+    "Welsh": "cym", "Zulu": "zul"
+}
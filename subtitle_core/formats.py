@@ -0,0 +1,123 @@
+from typing import Dict, List
+from datetime import timedelta
+
+from .metrics import stage_timer
+from .segmentation import iter_subtitle_cues
+from .wordtable import WordTable, transcription_words
+
+def format_timestamp(seconds: float) -> str:
+    """Convert seconds to SRT timestamp format"""
+    td = timedelta(seconds=seconds)
+    hours, remainder = divmod(td.total_seconds(), 3600)
+    minutes, seconds = divmod(remainder, 60)
+    milliseconds = int((seconds % 1) * 1000)
+    return f"{int(hours):02d}:{int(minutes):02d}:{int(seconds):02d},{milliseconds:03d}"
+
+def parse_srt_subtitles(srt_content: str) -> List[Dict]:
+    """Parse SRT content into a list of subtitle entries with timestamps"""
+    subtitles = []
+    blocks = srt_content.strip().split('\n\n')
+    
+    for block in blocks:
+        if not block.strip():
+            continue
+            
+        lines = block.strip().split('\n')
+        if len(lines) < 3:
+            continue
+            
+        try:
+            # Parse subtitle number
+            subtitle_num = int(lines[0])
+            
+            # Parse timestamps
+            timestamp_line = lines[1]
+            start_time, end_time = timestamp_line.split(' --> ')
+            
+            # Convert timestamps to seconds
+            start_seconds = timestamp_to_seconds(start_time)
+            end_seconds = timestamp_to_seconds(end_time)
+            
+            # Get subtitle text
+            text = '\n'.join(lines[2:])
+            
+            subtitles.append({
+                'id': subtitle_num,
+                'start': start_seconds,
+                'end': end_seconds,
+                'text': text
+            })
+            
+        except (ValueError, IndexError):
+            continue
+    
+    return subtitles
+
+def timestamp_to_seconds(timestamp: str) -> float:
+    """Convert SRT timestamp format to seconds"""
+    # Format: HH:MM:SS,mmm
+    time_part, ms_part = timestamp.split(',')
+    hours, minutes, seconds = map(int, time_part.split(':'))
+    milliseconds = int(ms_part)
+    
+    total_seconds = hours * 3600 + minutes * 60 + seconds + milliseconds / 1000
+    return total_seconds
+
+def seconds_to_vtt_timestamp(seconds: float) -> str:
+    """Convert seconds to VTT timestamp format"""
+    hours = int(seconds // 3600)
+    minutes = int((seconds % 3600) // 60)
+    secs = seconds % 60
+    return f"{hours:02d}:{minutes:02d}:{secs:06.3f}"
+
+@stage_timer("generate_srt")
+def generate_srt_subtitles(transcription_data: Dict, policy=None) -> str:
+    """Generate SRT format subtitles from transcription data
+    
+    transcription_data is an ElevenLabs transcription dict or a WordTable.
+    policy is a SegmentationPolicy or preset name (see segmentation.py);
+    re-segmenting an existing transcription needs no new API call.
+    """
+    if not transcription_data or (not isinstance(transcription_data, WordTable) and 'words' not in transcription_data):
+        return ""
+    
+    return render_srt_from_cues(list(iter_subtitle_cues(transcription_words(transcription_data), policy)))
+
+@stage_timer("generate_vtt")
+def generate_vtt_subtitles(transcription_data: Dict, policy=None) -> str:
+    """Generate VTT format subtitles from transcription data"""
+    srt_content = generate_srt_subtitles(transcription_data, policy)
+    if not srt_content:
+        return ""
+    
+    return srt_to_vtt(srt_content)
+
+def srt_to_vtt(srt_content: str) -> str:
+    """Convert SRT content to VTT format"""
+    vtt_content = "WEBVTT\n\n"
+    
+    # Replace SRT timestamp format with VTT format
+    lines = srt_content.strip().split('\n')
+    for line in lines:
+        if '-->' in line:
+            # Replace comma with dot in timestamps for VTT format
+            vtt_line = line.replace(',', '.')
+            vtt_content += vtt_line + '\n'
+        else:
+            vtt_content += line + '\n'
+    
+    return vtt_content
+
+def render_srt_from_cues(cues: List[Dict], start_index: int = 1) -> str:
+    """Render parsed subtitle cues as SRT (numbered from start_index, for appending)"""
+    parts = []
+    for index, cue in enumerate(cues, start=start_index):
+        parts.append(f"{index}\n{format_timestamp(cue['start'])} --> {format_timestamp(cue['end'])}\n{cue['text']}\n\n")
+    return "".join(parts)
+
+def render_vtt_from_cues(cues: List[Dict]) -> str:
+    """Render parsed subtitle cues as WebVTT"""
+    parts = ["WEBVTT\n\n"]
+    for index, cue in enumerate(cues, start=1):
+        parts.append(f"{index}\n{seconds_to_vtt_timestamp(cue['start'])} --> {seconds_to_vtt_timestamp(cue['end'])}\n{cue['text']}\n\n")
+    return "".join(parts)
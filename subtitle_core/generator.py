@@ -0,0 +1,87 @@
+import requests
+from typing import Dict
+
+from .config import BASE_URL
+from .metrics import UPLOAD_BYTES, metrics, stage_timer
+from .tracing import current_span
+from .notify import warn
+from .scheduler import ExtractionScheduler
+
+class ElevenLabsSubtitleGenerator:
+    def __init__(self, api_key: str):
+        self.api_key = api_key
+        self.headers = {
+            "Accept": "application/json",
+            "xi-api-key": api_key
+        }
+    
+    @stage_timer("transcription")
+    def create_transcription(self, audio_file: bytes, language_code: str = None, 
+                           num_speakers: int = None, diarize: bool = True,
+                           tag_audio_events: bool = True, trim_silence: bool = False,
+                           filename: str = 'audio.mp3', mime_type: str = 'audio/mp3',
+                           audio_profile: str = None, scheduler: ExtractionScheduler = None) -> Dict:
+        """
+        Create a transcription using ElevenLabs Speech-to-Text API
+        Returns: transcription result with timestamps and speaker diarization
+        
+        filename and mime_type label the upload and should match the actual
+        container (see ExtractedAudio). With trim_silence, long silent stretches are removed before upload and
+        word timestamps are mapped back to the original audio timeline; its
+        ffmpeg runs take slots of ``scheduler`` if given.
+        """
+        url = f"{BASE_URL}/v1/speech-to-text"
+        current_span().set_attributes({
+            'service': 'elevenlabs',
+            'language_code': language_code,
+            'diarize': diarize,
+            'trim_silence': trim_silence,
+        })
+        
+        upload = (filename, audio_file, mime_type)
+        trimmed = None
+        if trim_silence:
+            try:
+                from .vad import trim_silence as vad_trim_silence
+                with stage_timer("silence_trim"):
+                    trimmed = vad_trim_silence(audio_file, profile=audio_profile, scheduler=scheduler)
+            except Exception as e:
+                warn(f"Silence trimming failed: {str(e)}. Uploading full audio.")
+            if trimmed is not None:
+                upload = (trimmed.filename, trimmed.audio, trimmed.mime_type)
+        
+        files = {
+            'file': upload
+        }
+        
+        data = {
+            'model_id': 'scribe_v1',
+            'diarize': str(diarize).lower(),
+            'tag_audio_events': str(tag_audio_events).lower(),
+        }
+        
+        # Add optional parameters
+        if language_code:
+            data['language_code'] = language_code
+        if num_speakers:
+            data['num_speakers'] = str(num_speakers)
+        
+        # Upload plus ElevenLabs processing time
+        metrics.inc(UPLOAD_BYTES, len(upload[1]))
+        with stage_timer("elevenlabs_request"):
+            current_span().set_attribute('upload_bytes', len(upload[1]))
+            response = requests.post(url, headers=self.headers, files=files, data=data)
+            current_span().set_attribute('http.status_code', response.status_code)
+        
+        if response.status_code == 200:
+            transcription = response.json()
+            if trimmed is not None:
+                from .vad import remap_transcription
+                transcription = remap_transcription(transcription, trimmed.offset_map)
+                transcription['silence_trimming'] = {
+                    'original_duration': round(trimmed.original_duration, 3),
+                    'uploaded_duration': round(trimmed.trimmed_duration, 3),
+                }
+            return transcription
+        else:
+            raise Exception(f"Failed to create transcription: {response.text}")
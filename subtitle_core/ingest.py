@@ -0,0 +1,436 @@
+import os
+import re
+import json
+import tempfile
+import queue
+import threading
+import subprocess
+from collections import deque
+from typing import Dict, Iterator, Optional, Tuple
+
+from .audio import (
+    AUDIO_STREAM_COPY,
+    ExtractedAudio,
+    find_ffmpeg,
+    find_ffprobe,
+    get_audio_profile,
+    probe_audio_stream,
+    stream_copy_format,
+)
+from .ocr import OCR_SAMPLE_INTERVAL, OCR_SAMPLING, OCR_SAMPLING_MODES
+from .tracing import bind_context
+
+# Compressed video the decoder has not reached yet is kept in memory up to
+# this many MiB; the rest is spilled to a temporary file, so demuxing (and with
+# it the audio track) never waits for decoding or OCR
+INGEST_BUFFER_MB = int(os.getenv("INGEST_BUFFER_MB", "32"))
+
+_CHUNK_SIZE = 64 * 1024
+# showinfo logs a frame before ffmpeg writes it, so its timestamp is normally there at once
+_TIMESTAMP_TIMEOUT = 30.0
+
+
+def probe_video_stream(media_path: str) -> Optional[Dict]:
+    """Width and height of the first video stream as ffmpeg outputs it, or None without video
+
+    Like probe_audio_stream, uses ffprobe when available and falls back to
+    parsing the ``ffmpeg -i`` banner.
+    """
+    try:
+        ffprobe_cmd = find_ffprobe()
+    except FileNotFoundError:
+        ffprobe_cmd = None
+    
+    if ffprobe_cmd:
+        result = subprocess.run([
+            ffprobe_cmd, '-v', 'error', '-select_streams', 'v:0',
+            '-show_entries', 'stream=width,height:stream_side_data=rotation:stream_tags=rotate',
+            '-of', 'json', media_path
+        ], capture_output=True, text=True, check=True)
+        streams = json.loads(result.stdout or '{}').get('streams', [])
+        if not streams or not streams[0].get('width'):
+            return None
+        stream = streams[0]
+        width, height = int(stream['width']), int(stream['height'])
+        rotation = next((side_data['rotation'] for side_data in stream.get('side_data_list', [])
+                         if 'rotation' in side_data), stream.get('tags', {}).get('rotate', 0))
+    else:
+        result = subprocess.run([find_ffmpeg(), '-hide_banner', '-i', media_path], capture_output=True, text=True)
+        match = re.search(r'Stream #\S+.*?: Video: [^\n]*?, (\d+)x(\d+)[^\n]*((?:\n +[^\n]*)*)', result.stderr)
+        if not match:
+            return None
+        width, height = int(match.group(1)), int(match.group(2))
+        rotation = re.search(r'rotat(?:e +: |ion of )(-?[\d.]+)', match.group(3))
+        rotation = rotation.group(1) if rotation else 0
+    
+    # ffmpeg auto-rotates, so portrait phone videos come out with the sides swapped
+    if int(float(rotation)) % 180:
+        width, height = height, width
+    return {'width': width, 'height': height}
+
+
+_SHOWINFO_FRAME = re.compile(r'^\[Parsed_showinfo_\d+ @ [^\]]+\] n: *\d+ .*?pts_time:(\S+)')
+
+
+class _PacketSpool:
+    """FIFO of byte chunks between the demuxer and the decoder
+
+    The first ``capacity`` chunks wait in memory; once that is full, chunks
+    go to a temporary file until the reader has caught up with it. ``put``
+    never blocks.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = capacity
+        self.spilled_bytes = 0
+        self._condition = threading.Condition()
+        self._memory = deque()
+        self._spilled = deque()
+        self._file = None
+        self._read_offset = 0
+        self._finished = False
+        self._abandoned = False
+
+    def put(self, data: bytes) -> None:
+        with self._condition:
+            if self._abandoned:
+                return
+            if not self._spilled and len(self._memory) < self.capacity:
+                self._memory.append(data)
+            else:
+                if self._file is None:
+                    self._file = tempfile.TemporaryFile(prefix="ingest-video-")
+                self._file.seek(0, os.SEEK_END)
+                self._file.write(data)
+                self._spilled.append(len(data))
+                self.spilled_bytes += len(data)
+            self._condition.notify()
+
+    def get(self) -> Optional[bytes]:
+        """Next chunk, blocking until one arrives; None at the end or once abandoned"""
+        with self._condition:
+            while not self._memory and not self._spilled and not self._finished and not self._abandoned:
+                self._condition.wait()
+            if self._abandoned:
+                return None
+            if self._memory:
+                return self._memory.popleft()
+            if not self._spilled:
+                return None
+            size = self._spilled.popleft()
+            self._file.seek(self._read_offset)
+            data = self._file.read(size)
+            self._read_offset += size
+            if not self._spilled:
+                # Drained: reuse the file from the start
+                self._file.truncate(0)
+                self._read_offset = 0
+            return data
+
+    def finish(self) -> None:
+        with self._condition:
+            self._finished = True
+            self._condition.notify_all()
+
+    def abandon(self) -> None:
+        """Drop buffered chunks and ignore new ones (the decoder stopped early)"""
+        with self._condition:
+            self._abandoned = True
+            self._memory.clear()
+            self._spilled.clear()
+            self.close()
+            self._condition.notify_all()
+
+    def close(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class MediaIngest:
+    """Demuxes a video once, producing its audio track and sampled frames
+
+    One ffmpeg process demuxes the input, writing the audio (stream-copied or
+    encoded with an audio profile, as in extract_audio) to a temporary file
+    and stream-copying the compressed video to a second ffmpeg process, which
+    decodes and pipes the first frame of every ``interval`` seconds as BGR.
+    ``sampling`` (see OCR_SAMPLING_MODES) lets the decoder skip non-reference
+    frames, B-frames or everything but keyframes.
+
+    Demuxing never waits for decoding: compressed video the decoder has not
+    reached yet is buffered (see INGEST_BUFFER_MB), so ``audio()`` returns as
+    soon as the input has been read, while ``frames()`` feeds
+    VideoOCRProcessor.process_frames at the pace of OCR. With
+    ``with_audio=False`` (or a video without audio) a single ffmpeg process
+    decodes the input directly. Given a ``scheduler``, the ingest takes one of
+    its ffmpeg slots until both processes have exited.
+
+    Use as a context manager, or call ``start()`` and ``close()``::
+
+        with MediaIngest("lecture.mp4") as ingest:
+            ocr = executor.submit(processor.process_frames, ingest.frames())
+            transcription = generator.create_transcription(ingest.audio().audio, ...)
+            cues = ocr.result()
+    """
+
+    def __init__(self, video_path: str, profile: str = None, interval: float = OCR_SAMPLE_INTERVAL,
+                 allow_stream_copy: bool = AUDIO_STREAM_COPY, threads: int = None,
+                 buffer_mb: int = INGEST_BUFFER_MB, sampling: str = OCR_SAMPLING,
+                 with_audio: bool = True, scheduler=None):
+        if sampling not in OCR_SAMPLING_MODES:
+            raise ValueError(f"Unknown OCR sampling mode '{sampling}'. Available: {', '.join(OCR_SAMPLING_MODES)}")
+        self.video_path = str(video_path)
+        self.profile = profile
+        self.interval = interval
+        self.sampling = sampling
+        self.with_audio = with_audio
+        self.allow_stream_copy = allow_stream_copy
+        self.threads = threads
+        self.buffer_mb = buffer_mb
+        self.scheduler = scheduler
+        self.stats: Dict = {}
+        self._demuxer = None
+        self._decoder = None
+        self._spool = None
+        self._audio_path = None
+        self._audio_format = None
+        self._demux_log = None
+        self._demux_errors = ""
+        self._stderr = []
+        self._timestamps = queue.Queue()
+        self._audio_ready = threading.Event()
+        self._threads = []
+        self._slot = None
+        self._slot_lock = threading.Lock()
+
+    def __enter__(self) -> "MediaIngest":
+        return self.start()
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _thread_args(self) -> list:
+        return ['-threads', str(self.threads)] if self.threads else []
+
+    def _demux_command(self, ffmpeg_cmd: str, audio_info: Dict) -> list:
+        audio_profile = get_audio_profile(self.profile)
+        copy_format = stream_copy_format(audio_info) if self.allow_stream_copy and self.profile is None else None
+        if copy_format is not None:
+            extension, mime_type = copy_format
+            codec_args, name = ['-c:a', 'copy'], "stream_copy"
+        else:
+            extension, mime_type = audio_profile.extension, audio_profile.mime_type
+            codec_args, name = audio_profile.codec_args + self._thread_args(), audio_profile.name
+        with tempfile.NamedTemporaryFile(suffix=extension, delete=False) as temp_audio:
+            self._audio_path = temp_audio.name
+        self._audio_format = (f"audio{extension}", mime_type, name)
+        # Matroska carries any codec and keeps the rotation the decoder applies
+        return [ffmpeg_cmd, '-nostdin', '-hide_banner', '-nostats', '-loglevel', 'error', '-i', self.video_path,
+                '-map', '0:a:0', '-vn'] + codec_args + ['-y', self._audio_path,
+                '-map', '0:v:0', '-an', '-c:v', 'copy', '-f', 'matroska', 'pipe:1']
+
+    def _decode_command(self, ffmpeg_cmd: str, from_pipe: bool) -> list:
+        # Info level for showinfo, which reports the timestamp of every frame piped out
+        command = [ffmpeg_cmd, '-nostdin', '-hide_banner', '-nostats', '-loglevel', 'info'] + self._thread_args()
+        if self.sampling != "all":
+            command += ['-skip_frame:v', OCR_SAMPLING_MODES[self.sampling]]
+        command += ['-f', 'matroska', '-i', 'pipe:0'] if from_pipe else ['-i', self.video_path]
+        # First decoded frame in each interval; only those are converted to BGR
+        interval = self.interval
+        select = f"select='isnan(prev_selected_t)+gt(floor(t/{interval}),floor(prev_selected_t/{interval}))'"
+        command += ['-map', '0:v:0', '-an', '-vf', f"{select},showinfo=checksum=0", '-fps_mode', 'passthrough',
+                    '-f', 'rawvideo', '-pix_fmt', 'bgr24', 'pipe:1']
+        return command
+
+    def start(self) -> "MediaIngest":
+        """Probe the input and start ffmpeg; raises ValueError if it has no video stream
+
+        With a scheduler, waits for a free ffmpeg slot first.
+        """
+        ffmpeg_cmd = find_ffmpeg()
+        video_info = probe_video_stream(self.video_path)
+        if video_info is None:
+            raise ValueError(f"No video stream in {self.video_path}")
+        audio_info = probe_audio_stream(self.video_path) if self.with_audio else None
+        self.width, self.height = video_info['width'], video_info['height']
+        self.stats = {'frames': 0, 'spilled_bytes': 0, 'audio_profile': None}
+
+        if self.scheduler is not None:
+            self._slot = self.scheduler.acquire()
+        try:
+            if audio_info is not None:
+                self._spool = _PacketSpool(max(1, self.buffer_mb * 1024 * 1024 // _CHUNK_SIZE))
+                self._demux_log = tempfile.TemporaryFile(prefix="ingest-demux-")
+                self._demuxer = subprocess.Popen(self._demux_command(ffmpeg_cmd, audio_info),
+                                                 stdout=subprocess.PIPE, stderr=self._demux_log)
+            self._decoder = subprocess.Popen(self._decode_command(ffmpeg_cmd, self._demuxer is not None),
+                                             stdin=subprocess.PIPE if self._demuxer else subprocess.DEVNULL,
+                                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        except Exception:
+            self.close()
+            raise
+
+        targets = [(self._read_stderr, "ingest-stderr")]
+        if self._demuxer is not None:
+            targets += [(self._read_demuxer, "ingest-demux"), (self._feed_decoder, "ingest-feed")]
+        else:
+            self._audio_ready.set()
+        for target, name in targets:
+            thread = threading.Thread(target=bind_context(target), name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def _read_stderr(self) -> None:
+        try:
+            for line in self._decoder.stderr:
+                line = line.decode('utf-8', 'replace').rstrip()
+                match = _SHOWINFO_FRAME.search(line)
+                if match:
+                    self._timestamps.put(float(match.group(1)))
+                elif not line.startswith('[Parsed_showinfo'):
+                    self._stderr.append(line)
+        finally:
+            self._timestamps.put(None)
+
+    def _read_demuxer(self) -> None:
+        try:
+            while True:
+                chunk = self._demuxer.stdout.read(_CHUNK_SIZE)
+                if not chunk:
+                    break
+                self._spool.put(chunk)
+        finally:
+            self._demuxer.wait()
+            self._demux_log.seek(0)
+            self._demux_errors = self._demux_log.read().decode('utf-8', 'replace')[-4000:]
+            self.stats['spilled_bytes'] = self._spool.spilled_bytes
+            self._spool.finish()
+            self._audio_ready.set()
+            self._release_slot()
+
+    def _feed_decoder(self) -> None:
+        try:
+            while True:
+                chunk = self._spool.get()
+                if chunk is None:
+                    break
+                self._decoder.stdin.write(chunk)
+        except OSError:
+            # The decoder exited early (failed, or frames() was closed); keep demuxing for the audio
+            self._spool.abandon()
+        finally:
+            try:
+                self._decoder.stdin.close()
+            except OSError:
+                pass
+
+    def _release_slot(self) -> None:
+        """Give the scheduler slot back once every ffmpeg process has exited"""
+        processes = [process for process in (self._demuxer, self._decoder) if process is not None]
+        with self._slot_lock:
+            if self._slot is None or any(process.poll() is None for process in processes):
+                return
+            token, self._slot = self._slot, None
+        self.scheduler.release(token, not any(process.returncode > 0 for process in processes))
+
+    def _stop_decoder(self) -> None:
+        if self._spool is not None:
+            self._spool.abandon()
+        if self._decoder.poll() is None:
+            self._decoder.kill()
+
+    def frames(self) -> Iterator[Tuple[float, object]]:
+        """Yield (timestamp, BGR frame) samples, like iter_video_frames
+
+        Raises CalledProcessError if ffmpeg failed, and TimeoutError (stopping
+        ffmpeg) if it never reports a frame's timestamp.
+        """
+        import numpy as np
+
+        frame_size = self.width * self.height * 3
+        index = 0
+        completed = False
+        try:
+            while True:
+                data = bytearray(frame_size)
+                view = memoryview(data)
+                filled = 0
+                while filled < frame_size:
+                    count = self._decoder.stdout.readinto(view[filled:])
+                    if not count:
+                        break
+                    filled += count
+                if filled < frame_size:
+                    break
+                try:
+                    timestamp = self._timestamps.get(timeout=_TIMESTAMP_TIMEOUT)
+                except queue.Empty:
+                    raise TimeoutError(f"ffmpeg reported no timestamp for frame {index} of {self.video_path}")
+                if timestamp is None:
+                    timestamp = index * self.interval
+                yield timestamp, np.frombuffer(data, np.uint8).reshape(self.height, self.width, 3)
+                index += 1
+            completed = True
+        finally:
+            self.stats['frames'] = index
+            if not completed:
+                self._stop_decoder()
+
+        self._decoder.wait()
+        self._threads[0].join()
+        self._release_slot()
+        if self._decoder.returncode:
+            raise subprocess.CalledProcessError(self._decoder.returncode, self._decoder.args,
+                                                stderr="\n".join(self._stderr[-20:]))
+        if self._demuxer is not None:
+            # The decoder's input ends when the demuxer exits, so this does not wait for long
+            self._audio_ready.wait()
+            self._check_demuxer()
+
+    def _check_demuxer(self) -> None:
+        if self._demuxer.returncode:
+            raise subprocess.CalledProcessError(self._demuxer.returncode, self._demuxer.args,
+                                                stderr=self._demux_errors)
+
+    def audio(self, timeout: float = None) -> Optional[ExtractedAudio]:
+        """Wait for the audio track; None if the video has none
+
+        Returns once the input has been demuxed, without waiting for the
+        frames. Raises CalledProcessError if ffmpeg failed.
+        """
+        if not self._audio_ready.wait(timeout):
+            raise TimeoutError(f"Audio extraction from {self.video_path} did not finish in {timeout} s")
+        if self._demuxer is None:
+            return None
+        self._check_demuxer()
+        with open(self._audio_path, 'rb') as f:
+            audio_bytes = f.read()
+        filename, mime_type, name = self._audio_format
+        self.stats['audio_profile'] = name
+        return ExtractedAudio(audio_bytes, filename, mime_type, name)
+
+    def close(self) -> None:
+        """Stop ffmpeg if it is still running and remove temporary files"""
+        if self._spool is not None:
+            self._spool.abandon()
+        processes = [process for process in (self._decoder, self._demuxer) if process is not None]
+        for process in processes:
+            if process.poll() is None:
+                process.kill()
+        for thread in self._threads:
+            thread.join()
+        for process in processes:
+            process.wait()
+        self._release_slot()
+        if self._demux_log is not None:
+            self._demux_log.close()
+        if self._audio_path is not None and os.path.exists(self._audio_path):
+            os.unlink(self._audio_path)
+
+
+def iter_sampled_frames(video_path: str, interval: float = OCR_SAMPLE_INTERVAL,
+                        sampling: str = OCR_SAMPLING) -> Iterator[Tuple[float, object]]:
+    """Yield (timestamp, BGR frame) samples decoded by ffmpeg in a sampling mode (no audio)"""
+    with MediaIngest(video_path, interval=interval, sampling=sampling, with_audio=False) as ingest:
+        yield from ingest.frames()
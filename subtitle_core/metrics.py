@@ -0,0 +1,229 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, List, Sequence, Tuple
+
+from .tracing import start_span
+
+# Set METRICS_ENABLED=0 to turn timers and counters into no-ops
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1") != "0"
+
+# Stages range from milliseconds (SRT generation) to minutes (long transcriptions)
+STAGE_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+TRANSLATION_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+STAGE_SECONDS = "subtitle_stage_seconds"
+STAGE_ERRORS = "subtitle_stage_errors_total"
+TRANSLATION_SECONDS = "subtitle_translation_seconds"
+TRANSLATION_REQUESTS = "subtitle_translation_requests_total"
+CACHE_REQUESTS = "subtitle_cache_requests_total"
+UPLOAD_BYTES = "subtitle_upload_bytes_total"
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum', 'max', 'last')
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+        self.last = 0.0
+
+    def observe(self, value: float) -> None:
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        self.last = value
+
+    def quantile(self, fraction: float) -> float:
+        """Upper bucket bound below which ``fraction`` of the observations fall"""
+        target = fraction * self.count
+        seen = 0
+        for bound, count in zip(self.buckets, self.counts):
+            seen += count
+            if seen >= target:
+                return min(bound, self.max)
+        return self.max
+
+
+def _label_key(labels: Dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], le: str = None) -> str:
+    parts = [f'{key}="{_escape(value)}"' for key, value in labels]
+    if le is not None:
+        parts.append(f'le="{le}"')
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class MetricsRegistry:
+    """Process-wide counters and histograms with Prometheus text output
+
+    Metrics are declared once with a help text and then updated by name with
+    keyword labels. Updates are cheap (a lock and a few additions), so they
+    can stay on in production.
+    """
+
+    def __init__(self, enabled: bool = METRICS_ENABLED):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._help: Dict[str, str] = {}
+        self._buckets: Dict[str, Sequence[float]] = {}
+        self._counters: Dict[str, Dict[tuple, float]] = {}
+        self._histograms: Dict[str, Dict[tuple, _Histogram]] = {}
+
+    def counter(self, name: str, help_text: str) -> None:
+        self._help[name] = help_text
+        self._counters.setdefault(name, {})
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = STAGE_BUCKETS) -> None:
+        self._help[name] = help_text
+        self._buckets[name] = tuple(buckets)
+        self._histograms.setdefault(name, {})
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._buckets.get(name, STAGE_BUCKETS))
+            histogram.observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Observe the duration of the block (also when it raises)"""
+        if not self.enabled:
+            yield
+            return
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def cache_hit_rates(self) -> Dict[str, float]:
+        """Hit rate per cache from CACHE_REQUESTS"""
+        totals: Dict[str, List[float]] = {}
+        with self._lock:
+            for key, value in self._counters.get(CACHE_REQUESTS, {}).items():
+                labels = dict(key)
+                hits_and_total = totals.setdefault(labels.get('cache', ''), [0, 0])
+                hits_and_total[0] += value if labels.get('result') == 'hit' else 0
+                hits_and_total[1] += value
+        return {cache: hits / total if total else 0.0 for cache, (hits, total) in totals.items()}
+
+    def summary(self, name: str = STAGE_SECONDS) -> List[Dict]:
+        """One row per label set of a histogram: count, mean, p50/p95 and last/max seconds"""
+        with self._lock:
+            rows = []
+            for key, histogram in self._histograms.get(name, {}).items():
+                row = dict(key)
+                row.update({
+                    'count': histogram.count,
+                    'mean': histogram.sum / histogram.count if histogram.count else 0.0,
+                    'p50': histogram.quantile(0.5),
+                    'p95': histogram.quantile(0.95),
+                    'max': histogram.max,
+                    'last': histogram.last,
+                    'total': histogram.sum,
+                })
+                rows.append(row)
+        return sorted(rows, key=lambda row: -row['total'])
+
+    def render_prometheus(self, gauges: Dict[str, float] = None) -> str:
+        """Prometheus text exposition format (version 0.0.4)
+
+        gauges adds point-in-time values owned by the caller (queue depth,
+        stored sessions, ...) as unlabelled gauges.
+        """
+        lines = []
+        with self._lock:
+            for name, series in sorted(self._counters.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(series.items()):
+                    lines.append(f"{name}{_format_labels(key)} {_format_number(value)}")
+            for name, series in sorted(self._histograms.items()):
+                lines.append(f"# HELP {name} {self._help.get(name, name)}")
+                lines.append(f"# TYPE {name} histogram")
+                for key, histogram in sorted(series.items()):
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(key, _format_number(bound))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(key, '+Inf')} {histogram.count}")
+                    lines.append(f"{name}_sum{_format_labels(key)} {_format_number(histogram.sum)}")
+                    lines.append(f"{name}_count{_format_labels(key)} {histogram.count}")
+
+        hit_rates = self.cache_hit_rates()
+        if hit_rates:
+            lines.append("# HELP subtitle_cache_hit_ratio Cache hits divided by lookups since start")
+            lines.append("# TYPE subtitle_cache_hit_ratio gauge")
+            for cache, rate in sorted(hit_rates.items()):
+                lines.append(f'subtitle_cache_hit_ratio{{cache="{cache}"}} {_format_number(rate)}')
+        for name, value in sorted((gauges or {}).items()):
+            lines.append(f"# TYPE {name} gauge")
+            lines.append(f"{name} {_format_number(value)}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self) -> None:
+        with self._lock:
+            for series in self._counters.values():
+                series.clear()
+            for series in self._histograms.values():
+                series.clear()
+
+
+metrics = MetricsRegistry()
+metrics.histogram(STAGE_SECONDS, "Time spent in each processing stage")
+metrics.counter(STAGE_ERRORS, "Processing stages that raised an exception")
+metrics.histogram(TRANSLATION_SECONDS, "Latency of single translation calls by service and target language",
+                  TRANSLATION_BUCKETS)
+metrics.counter(TRANSLATION_REQUESTS, "Translation calls by service and result (translated or unchanged)")
+metrics.counter(CACHE_REQUESTS, "Cache lookups by cache and result (hit or miss)")
+metrics.counter(UPLOAD_BYTES, "Audio bytes uploaded for transcription")
+
+
+@contextmanager
+def stage_timer(stage: str, **labels):
+    """Time a processing stage; usable as ``with stage_timer(...)`` or as a decorator
+
+    The stage is also traced as a span of the same name (see tracing.py).
+    """
+    try:
+        with start_span(stage, **labels), metrics.timer(STAGE_SECONDS, stage=stage, **labels):
+            yield
+    except Exception:
+        metrics.inc(STAGE_ERRORS, stage=stage)
+        raise
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    metrics.inc(CACHE_REQUESTS, cache=cache, result="hit" if hit else "miss")
@@ -0,0 +1,24 @@
+import logging
+from typing import Callable, Optional
+
+logger = logging.getLogger("subtitle_core")
+
+# Optional callback for user-facing warnings (e.g. st.warning in the Streamlit app)
+_warning_handler: Optional[Callable[[str], None]] = None
+
+
+def set_warning_handler(handler: Optional[Callable[[str], None]]) -> None:
+    """Route library warnings to a UI callback; pass None to only log them"""
+    global _warning_handler
+    _warning_handler = handler
+
+
+def warn(message: str) -> None:
+    """Report a recoverable problem (translation fallback, failed extraction, ...)"""
+    logger.warning(message)
+    if _warning_handler is not None:
+        try:
+            _warning_handler(message)
+        except Exception:
+            # A broken UI hook must never interrupt processing
+            logger.debug("Warning handler failed", exc_info=True)
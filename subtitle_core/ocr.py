@@ -0,0 +1,765 @@
+import os
+import difflib
+import tempfile
+import threading
+import multiprocessing
+from collections import deque
+from contextlib import nullcontext
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from .formats import parse_srt_subtitles, render_srt_from_cues
+from .metrics import stage_timer
+from .notify import warn
+
+# OCR defaults (the Streamlit sliders allow 0.5-5 s and 30-95 %)
+OCR_SAMPLE_INTERVAL = float(os.getenv("OCR_SAMPLE_INTERVAL", "1.0"))
+OCR_MIN_CONFIDENCE = float(os.getenv("OCR_MIN_CONFIDENCE", "60"))
+OCR_LANGUAGE = os.getenv("OCR_LANGUAGE", "eng")
+
+# Which frames are decoded to take samples from, trading accuracy for speed.
+# Every mode except "all" decodes with ffmpeg (-skip_frame) and takes the first
+# decoded frame in each interval, so samples can land up to a GOP late:
+#   all        every frame (OpenCV), samples exactly every interval
+#   reference  skips non-reference frames, about 2x faster
+#   predicted  skips B-frames (I/P only), about 4x faster
+#   keyframes  keyframes only, 10x+ faster on long-GOP video, but text shown
+#              between two keyframes (often 2-10 s apart) can be missed and
+#              cue times snap to keyframes
+OCR_SAMPLING = os.getenv("OCR_SAMPLING", "all")
+OCR_SAMPLING_MODES = {"all": "default", "reference": "noref", "predicted": "bidir", "keyframes": "nokey"}
+
+# Change detection: each sampled frame is split into a grid of tiles and every
+# tile is reduced to a small thumbnail. A tile has changed when its difference
+# hash (dHash) flips more than OCR_HASH_THRESHOLD of its bits, or when more than
+# OCR_CHANGED_CELLS of its thumbnail pixels moved by over OCR_DIFF_THRESHOLD
+# levels in any colour channel (catches coloured text with little luma contrast).
+OCR_GRID = (4, 4)               # Tile rows, columns
+OCR_HASH_SIZE = 16              # dHash bits per tile side
+OCR_HASH_THRESHOLD = 0.08
+OCR_HASH_FLAT = 3               # Grey-level steps treated as flat by the hash
+OCR_DIFF_THRESHOLD = 24
+OCR_CHANGED_CELLS = 0.01
+OCR_REGION_PADDING = 8          # Pixels added around changed regions before OCR
+
+# Optional text-region detection inside changed regions (TextRegionDetector):
+# only crops that look like text are OCR'd, and a crop identical to one at the
+# same place in the previous sample reuses its result
+OCR_TEXT_REGIONS = os.getenv("OCR_TEXT_REGIONS", "0") != "0"
+OCR_TEXT_MAX_WIDTH = 960        # Detection runs on frames downscaled to this width
+OCR_TEXT_MIN_GRADIENT = 40      # Weakest edge (grey levels) counted as text
+OCR_DEDUP_OVERLAP = 0.7         # Box overlap (IoU) and hash bits for reusing a result
+OCR_DEDUP_BITS = 4
+
+# OCR readings of one caption differ by a character here and there; texts at
+# least this similar (difflib ratio) are treated as the same caption
+OCR_MATCH_RATIO = float(os.getenv("OCR_MATCH_RATIO", "0.85"))
+# Sightings of a caption up to this many samples apart are merged into one cue
+# (bridges samples where OCR missed it)
+OCR_COALESCE_SAMPLES = 2
+# Prefix marking on-screen text cues when merged with the audio subtitles
+OCR_CUE_PREFIX = "[ON-SCREEN]"
+
+# Tesseract is single-threaded, so OCR runs in worker processes: 1 keeps it
+# in-process, 0 uses every core. Frames reach the workers through shared memory.
+OCR_WORKERS = int(os.getenv("OCR_WORKERS", "1"))
+# "fork" is unsafe in threaded servers; forkserver/spawn start clean workers
+OCR_START_METHOD = os.getenv("OCR_START_METHOD",
+                             "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn")
+
+
+class OCRLine(NamedTuple):
+    """A line of recognised text; box is (x, y, width, height) in frame pixels"""
+    text: str
+    confidence: float
+    box: Tuple[int, int, int, int]
+
+
+class OCRRegion(NamedTuple):
+    """A changed area of a sampled frame to be recognised"""
+    timestamp: float
+    box: Tuple[int, int, int, int]
+    image: object  # numpy array (BGR crop of the frame)
+
+
+class TesseractRecognizer:
+    """Recognises text lines in an image with pytesseract
+
+    Lines whose mean word confidence is below ``min_confidence`` are dropped.
+    The image is binarised (Otsu) first, which helps Tesseract with text on
+    video backgrounds. Instances are picklable, for use in OCRWorkerPool.
+    """
+
+    def __init__(self, language: str = OCR_LANGUAGE, min_confidence: float = OCR_MIN_CONFIDENCE,
+                 config: str = "--psm 11"):
+        import pytesseract  # noqa: F401 - fail early when it is missing
+
+        self.language = language
+        self.min_confidence = min_confidence
+        self.config = config
+
+    def __call__(self, image) -> List[OCRLine]:
+        import cv2
+        import pytesseract
+
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+        _, binary = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        data = pytesseract.image_to_data(binary, lang=self.language, config=self.config,
+                                         output_type=pytesseract.Output.DICT)
+
+        # Group words by (block, paragraph, line)
+        lines: Dict[tuple, List[int]] = {}
+        for index, word in enumerate(data['text']):
+            if word.strip() and float(data['conf'][index]) >= 0:
+                key = (data['block_num'][index], data['par_num'][index], data['line_num'][index])
+                lines.setdefault(key, []).append(index)
+
+        results = []
+        for indexes in lines.values():
+            confidence = sum(float(data['conf'][i]) for i in indexes) / len(indexes)
+            if confidence < self.min_confidence:
+                continue
+            left = min(data['left'][i] for i in indexes)
+            top = min(data['top'][i] for i in indexes)
+            right = max(data['left'][i] + data['width'][i] for i in indexes)
+            bottom = max(data['top'][i] + data['height'][i] for i in indexes)
+            text = " ".join(data['text'][i].strip() for i in indexes)
+            results.append(OCRLine(text, round(confidence, 1), (left, top, right - left, bottom - top)))
+        return results
+
+
+def iter_video_frames(video_path: str, interval: float = OCR_SAMPLE_INTERVAL) -> Iterator[Tuple[float, object]]:
+    """Yield (timestamp, BGR frame) every ``interval`` seconds of a video
+
+    Frames between samples are only grabbed, not converted, which is much
+    cheaper than reading every frame or seeking (seeking re-decodes from the
+    previous keyframe for most codecs).
+    """
+    import cv2
+
+    capture = cv2.VideoCapture(str(video_path))
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video: {video_path}")
+    fps = capture.get(cv2.CAP_PROP_FPS) or 25.0
+    step = max(int(round(fps * interval)), 1)
+    index = 0
+    try:
+        while True:
+            if index % step == 0:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                yield index / fps, frame
+            elif not capture.grab():
+                break
+            index += 1
+    finally:
+        capture.release()
+
+
+def _boxes_overlap(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> bool:
+    return a[0] < b[0] + b[2] and b[0] < a[0] + a[2] and a[1] < b[1] + b[3] and b[1] < a[1] + a[3]
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def _similar(a: str, b: str, ratio: float = OCR_MATCH_RATIO) -> bool:
+    """Fuzzy match of two normalized texts"""
+    if a == b:
+        return True
+    matcher = difflib.SequenceMatcher(None, a, b, autojunk=False)
+    return matcher.real_quick_ratio() >= ratio and matcher.quick_ratio() >= ratio and matcher.ratio() >= ratio
+
+
+class FrameChangeDetector:
+    """Finds the regions of a frame that changed since the previous sample
+
+    Compares per-tile dHashes and thumbnail pixels against the previous
+    sampled frame. The first frame is reported as changed everywhere.
+    """
+
+    def __init__(self, grid: Tuple[int, int] = OCR_GRID, hash_size: int = OCR_HASH_SIZE,
+                 hash_threshold: float = OCR_HASH_THRESHOLD, diff_threshold: int = OCR_DIFF_THRESHOLD,
+                 changed_cells: float = OCR_CHANGED_CELLS, padding: int = OCR_REGION_PADDING):
+        self.grid = grid
+        self.hash_size = hash_size
+        self.hash_threshold = hash_threshold
+        self.diff_threshold = diff_threshold
+        self.changed_cells = changed_cells
+        self.padding = padding
+        self._previous = None
+
+    def reset(self) -> None:
+        self._previous = None
+
+    def changed_boxes(self, frame) -> List[Tuple[int, int, int, int]]:
+        """Bounding boxes (x, y, width, height) of connected changed tiles"""
+        import cv2
+        import numpy as np
+
+        rows, cols = self.grid
+        size = self.hash_size
+        # One resize for all tiles: (rows * size) x (cols * (size + 1)) thumbnail
+        thumb = cv2.resize(frame, (cols * (size + 1), rows * size), interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(thumb, cv2.COLOR_BGR2GRAY) if thumb.ndim == 3 else thumb
+        pixels = thumb.reshape(rows, size, cols, size + 1, -1).transpose(0, 2, 1, 3, 4).astype(np.int16)
+        tiles = gray.reshape(rows, size, cols, size + 1).transpose(0, 2, 1, 3).astype(np.int16)
+        # Gradients within a few grey levels count as flat, so noise on plain
+        # backgrounds does not flip bits
+        bits = tiles[..., 1:] - tiles[..., :-1] > OCR_HASH_FLAT
+
+        previous, self._previous = self._previous, (pixels, bits)
+        if previous is None:
+            changed = np.ones((rows, cols), dtype=np.uint8)
+        else:
+            hash_distance = (bits != previous[1]).mean(axis=(2, 3))
+            moved = (np.abs(pixels - previous[0]).max(axis=4) > self.diff_threshold).mean(axis=(2, 3))
+            changed = ((hash_distance > self.hash_threshold) | (moved > self.changed_cells)).astype(np.uint8)
+        if not changed.any():
+            return []
+
+        height, width = frame.shape[:2]
+        count, _, stats, _ = cv2.connectedComponentsWithStats(changed, connectivity=4)
+        boxes = []
+        for left, top, tile_width, tile_height, _ in stats[1:count]:
+            x0 = max(left * width // cols - self.padding, 0)
+            y0 = max(top * height // rows - self.padding, 0)
+            x1 = min((left + tile_width) * width // cols + self.padding, width)
+            y1 = min((top + tile_height) * height // rows + self.padding, height)
+            boxes.append((int(x0), int(y0), int(x1 - x0), int(y1 - y0)))
+        return boxes
+
+
+def _region_signature(image) -> int:
+    """64-bit difference hash of an image, for recognising the same crop in the next frame"""
+    import cv2
+    import numpy as np
+
+    gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY) if image.ndim == 3 else image
+    thumb = cv2.resize(gray, (9, 8), interpolation=cv2.INTER_AREA).astype(np.int16)
+    bits = (thumb[:, 1:] - thumb[:, :-1] > OCR_HASH_FLAT).flatten()
+    return int(np.packbits(bits).view('>u8')[0])
+
+
+def _overlap_ratio(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    """Intersection over union of two (x, y, width, height) boxes"""
+    width = min(a[0] + a[2], b[0] + b[2]) - max(a[0], b[0])
+    height = min(a[1] + a[3], b[1] + b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    intersection = width * height
+    return intersection / (a[2] * a[3] + b[2] * b[3] - intersection)
+
+
+class TextRegionDetector:
+    """Finds areas of an image that look like text, so OCR can skip the rest
+
+    Classic morphological detector: text has dense, strong edges in short
+    horizontal runs. The image is reduced to its morphological gradient,
+    thresholded, closed horizontally to join letters into lines, and the
+    resulting blobs are kept if their size, aspect ratio and edge density
+    fit a line of text. Runs on a copy downscaled to ``max_width`` (about
+    25 ms per 1080p frame on one core, far less than OCR of the full frame).
+    """
+
+    def __init__(self, max_width: int = OCR_TEXT_MAX_WIDTH, min_gradient: int = OCR_TEXT_MIN_GRADIENT,
+                 min_height: int = 8, max_height_share: float = 0.25, min_aspect: float = 1.2,
+                 min_density: float = 0.2, padding: int = OCR_REGION_PADDING):
+        self.max_width = max_width
+        self.min_gradient = min_gradient
+        self.min_height = min_height
+        self.max_height_share = max_height_share
+        self.min_aspect = min_aspect
+        self.min_density = min_density
+        self.padding = padding
+
+    def detect(self, image) -> List[Tuple[int, int, int, int]]:
+        """Candidate text boxes (x, y, width, height) in image pixels"""
+        import cv2
+
+        height, width = image.shape[:2]
+        scale = min(self.max_width / width, 1.0) if width else 1.0
+        if scale < 1.0:
+            image = cv2.resize(image, (int(width * scale), max(int(height * scale), 1)), interpolation=cv2.INTER_AREA)
+
+        # Strongest edge in any colour channel: coloured captions can have
+        # almost no contrast in greyscale
+        gradient = cv2.morphologyEx(image, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (3, 3)))
+        if gradient.ndim == 3:
+            gradient = gradient.max(axis=2)
+        otsu, _ = cv2.threshold(gradient, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        # Plain or noisy backgrounds have a low Otsu threshold; never go below min_gradient
+        _, binary = cv2.threshold(gradient, max(otsu, self.min_gradient), 255, cv2.THRESH_BINARY)
+        joined = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (9, 1)))
+        contours, _ = cv2.findContours(joined, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+
+        blobs = []
+        max_height = gradient.shape[0] * self.max_height_share
+        min_height = self.min_height * scale
+        for contour in contours:
+            x, y, w, h = cv2.boundingRect(contour)
+            if h < min_height or h > max_height:
+                continue
+            if cv2.countNonZero(binary[y:y + h, x:x + w]) < self.min_density * w * h:
+                continue
+            # Widen by half the text height so the words of a line merge into one box
+            blobs.append((x - h // 2, y, w + h // 2 * 2, h))
+
+        boxes = []
+        for x, y, w, h in _merge_boxes(blobs):
+            x, w = x + h // 2, w - h // 2 * 2
+            if w < h * self.min_aspect:
+                continue
+            x0 = max(int(x / scale) - self.padding, 0)
+            y0 = max(int(y / scale) - self.padding, 0)
+            x1 = min(int((x + w) / scale) + self.padding, width)
+            y1 = min(int((y + h) / scale) + self.padding, height)
+            boxes.append((x0, y0, x1 - x0, y1 - y0))
+        return _merge_boxes(boxes)
+
+
+def _merge_boxes(boxes: List[Tuple[int, int, int, int]]) -> List[Tuple[int, int, int, int]]:
+    """Merge overlapping boxes until none overlap"""
+    merged = list(boxes)
+    changed = True
+    while changed:
+        changed = False
+        result = []
+        for box in merged:
+            for index, other in enumerate(result):
+                if _boxes_overlap(box, other):
+                    x0, y0 = min(box[0], other[0]), min(box[1], other[1])
+                    x1 = max(box[0] + box[2], other[0] + other[2])
+                    y1 = max(box[1] + box[3], other[1] + other[3])
+                    result[index] = (x0, y0, x1 - x0, y1 - y0)
+                    changed = True
+                    break
+            else:
+                result.append(box)
+        merged = result
+    return sorted(merged, key=lambda box: (box[1], box[0]))
+
+
+# Per-process state of OCRWorkerPool workers
+_worker_recognizer = None
+# Mapped block per pool slot; a slot's block is replaced when it grows
+_worker_memory: Dict[int, object] = {}
+
+
+def _attach_shared_memory(name: str):
+    from multiprocessing import shared_memory
+
+    try:
+        # The pool owns and unlinks the block; workers only map it (Python 3.13+)
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        return shared_memory.SharedMemory(name=name)
+
+
+def _init_ocr_worker(recognizer: Callable) -> None:
+    global _worker_recognizer
+    _worker_recognizer = recognizer
+
+
+def _recognize_shared(slot: int, name: str, shape: Tuple[int, ...], dtype: str) -> List[OCRLine]:
+    import numpy as np
+
+    memory = _worker_memory.get(slot)
+    if memory is None or memory.name != name:
+        if memory is not None:
+            # The pool unlinked the old block; drop the mapping so it is freed
+            memory.close()
+        memory = _worker_memory[slot] = _attach_shared_memory(name)
+    return _worker_recognizer(np.ndarray(shape, dtype=dtype, buffer=memory.buf))
+
+
+class OCRWorkerPool:
+    """Runs a recognizer in worker processes, passing images through shared memory
+
+    Each image is copied once into one of a fixed set of shared-memory slots
+    (two per worker) and the worker maps the slot instead of unpickling a
+    copy; only the small list of OCRLines comes back through the pipe.
+    submit() blocks while every slot is in use, which bounds memory when
+    frames are decoded faster than they can be recognised.
+
+    The recognizer is pickled once per worker, so it must be picklable
+    (TesseractRecognizer is).
+    """
+
+    def __init__(self, recognizer: Callable, workers: int = OCR_WORKERS,
+                 start_method: str = OCR_START_METHOD, slots_per_worker: int = 2):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = ProcessPoolExecutor(
+            self.workers, mp_context=multiprocessing.get_context(start_method),
+            initializer=_init_ocr_worker, initargs=(recognizer,)
+        )
+        self._memory: List[object] = [None] * (self.workers * slots_per_worker)
+        self._free = deque(range(len(self._memory)))
+        self._available = threading.Semaphore(len(self._memory))
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "OCRWorkerPool":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _slot(self, size: int) -> int:
+        from multiprocessing import shared_memory
+
+        self._available.acquire()
+        with self._lock:
+            index = self._free.popleft()
+        memory = self._memory[index]
+        if memory is None or memory.size < size:
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+            # Round up so slightly larger crops reuse the block
+            self._memory[index] = shared_memory.SharedMemory(create=True, size=max(-(-size // 65536) * 65536, 65536))
+        return index
+
+    def _release(self, index: int) -> None:
+        with self._lock:
+            self._free.append(index)
+        self._available.release()
+
+    def submit(self, image) -> Future:
+        """Recognise an image (numpy array) in a worker; the future resolves to its OCRLines"""
+        import numpy as np
+
+        index = self._slot(image.nbytes)
+        memory = self._memory[index]
+        try:
+            np.ndarray(image.shape, dtype=image.dtype, buffer=memory.buf)[...] = image
+            future = self._executor.submit(_recognize_shared, index, memory.name, image.shape, image.dtype.str)
+        except BaseException:
+            self._release(index)
+            raise
+        future.add_done_callback(lambda _: self._release(index))
+        return future
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True)
+        for memory in self._memory:
+            if memory is not None:
+                memory.close()
+                memory.unlink()
+        self._memory = [None] * len(self._memory)
+
+
+class VideoOCRProcessor:
+    """Extracts on-screen text from a video as timed subtitle cues
+
+    Frames are sampled every ``interval`` seconds. Tiles that did not change
+    since the previous sample are not OCR'd again: text in them simply stays
+    on screen. Changed regions are cropped and recognised, so a static slide
+    costs one OCR call however long it is shown. Output cues have the same
+    shape as ``parse_srt_subtitles`` (plus ``confidence``).
+
+    ``recognizer`` is any callable taking a BGR image and returning OCRLines;
+    the default is TesseractRecognizer. ``text_regions`` (True or a
+    TextRegionDetector) narrows changed regions down to likely text before
+    OCR. With ``workers`` other than 1 regions are recognised in an
+    OCRWorkerPool while later frames are decoded; results are still applied
+    in timestamp order. ``sampling`` picks the frames decoded (see
+    OCR_SAMPLING_MODES); "keyframes" is much faster on long videos.
+    """
+
+    def __init__(self, interval: float = OCR_SAMPLE_INTERVAL, min_confidence: float = OCR_MIN_CONFIDENCE,
+                 language: str = OCR_LANGUAGE, recognizer: Callable = None,
+                 detector: FrameChangeDetector = None, workers: int = OCR_WORKERS,
+                 text_regions=OCR_TEXT_REGIONS, sampling: str = OCR_SAMPLING):
+        if sampling not in OCR_SAMPLING_MODES:
+            raise ValueError(f"Unknown OCR sampling mode '{sampling}'. Available: {', '.join(OCR_SAMPLING_MODES)}")
+        self.interval = interval
+        self.sampling = sampling
+        self.min_confidence = min_confidence
+        self.language = language
+        self.workers = workers or os.cpu_count() or 1
+        self._recognizer = recognizer
+        self.detector = detector or FrameChangeDetector()
+        if text_regions is True:
+            text_regions = TextRegionDetector()
+        self.text_detector = text_regions or None
+        self.stats: Dict = {}
+
+    @property
+    def recognizer(self) -> Callable:
+        if self._recognizer is None:
+            self._recognizer = TesseractRecognizer(self.language, self.min_confidence)
+        return self._recognizer
+
+    def extract_frames_from_video(self, video_path: str) -> Iterator[Tuple[float, object]]:
+        if self.sampling == "all":
+            return iter_video_frames(video_path, self.interval)
+        from .ingest import iter_sampled_frames
+        return iter_sampled_frames(video_path, self.interval, self.sampling)
+
+    def extract_text_from_frame(self, frame) -> List[OCRLine]:
+        """OCR a whole frame (no change detection)"""
+        return [line for line in self.recognizer(frame) if line.confidence >= self.min_confidence]
+
+    def changed_regions(self, frames: Iterable[Tuple[float, object]]):
+        """Yield (timestamp, changed boxes, regions to OCR) per sampled frame
+
+        Without text-region detection the regions are the changed boxes;
+        with it, the likely-text boxes that overlap them.
+        """
+        self.detector.reset()
+        self.stats = {'frames': 0, 'unchanged_frames': 0, 'ocr_regions': 0, 'reused_regions': 0,
+                      'ocr_pixels': 0, 'frame_pixels': 0}
+        for timestamp, frame in frames:
+            self.stats['frames'] += 1
+            self.stats['frame_pixels'] += frame.shape[0] * frame.shape[1]
+            changed = self.detector.changed_boxes(frame)
+            if not changed:
+                self.stats['unchanged_frames'] += 1
+            boxes = changed
+            if self.text_detector is not None and changed:
+                # Detect on the whole frame so text crossing a tile edge is not cut in two
+                boxes = [box for box in self.text_detector.detect(frame)
+                         if any(_boxes_overlap(box, area) for area in changed)]
+            regions = [OCRRegion(timestamp, (x, y, width, height), frame[y:y + height, x:x + width])
+                       for x, y, width, height in boxes]
+            self.stats['ocr_regions'] += len(regions)
+            yield timestamp, changed, regions
+
+    def _frame_lines(self, region: OCRRegion, lines: List[OCRLine]) -> List[OCRLine]:
+        x, y = region.box[:2]
+        return [OCRLine(line.text, line.confidence, (line.box[0] + x, line.box[1] + y) + tuple(line.box[2:]))
+                for line in lines if line.confidence >= self.min_confidence]
+
+    def recognize_region(self, region: OCRRegion) -> List[OCRLine]:
+        """OCR a region; line boxes are returned in frame coordinates"""
+        return self._frame_lines(region, self.recognizer(region.image))
+
+    def _submit(self, region: OCRRegion, pool: Optional[OCRWorkerPool]) -> Future:
+        self.stats['ocr_pixels'] += region.box[2] * region.box[3]
+        if pool is not None:
+            return pool.submit(region.image)
+        future = Future()
+        future.set_result(self.recognizer(region.image))
+        return future
+
+    def _submit_regions(self, changed: List[Tuple[int, int, int, int]], regions: List[OCRRegion],
+                        pool: Optional[OCRWorkerPool], seen: List[Tuple]) -> Tuple[List, List]:
+        """Start OCR for a frame's regions, reusing results for crops seen in the previous sample
+
+        ``seen`` holds (region, signature, future) of crops still on screen;
+        returns the submitted (region, future) pairs and the updated ``seen``.
+        """
+        if self.text_detector is None:
+            return [(region, self._submit(region, pool)) for region in regions], seen
+
+        submitted = []
+        current = [entry for entry in seen if not any(_boxes_overlap(entry[0].box, box) for box in changed)]
+        for region in regions:
+            signature = _region_signature(region.image)
+            match = next((entry for entry in seen
+                          if _overlap_ratio(entry[0].box, region.box) >= OCR_DEDUP_OVERLAP
+                          and bin(entry[1] ^ signature).count('1') <= OCR_DEDUP_BITS), None)
+            if match is not None:
+                self.stats['reused_regions'] += 1
+                entry = match
+            else:
+                entry = (region, signature, self._submit(region, pool))
+            submitted.append((entry[0], entry[2]))
+            current.append(entry)
+        return submitted, current
+
+    def process_frames(self, frames: Iterable[Tuple[float, object]]) -> List[Dict]:
+        """Run change detection and OCR over (timestamp, frame) samples; returns cues"""
+        tracker = _TextTracker()
+        last_timestamp = None
+        with (OCRWorkerPool(self.recognizer, self.workers) if self.workers != 1 else nullcontext()) as pool:
+            pending = deque()
+            seen = []
+            for timestamp, changed, regions in self.changed_regions(frames):
+                submitted, seen = self._submit_regions(changed, regions, pool, seen)
+                pending.append((timestamp, changed, submitted))
+                # Apply finished frames in order while later ones are still being recognised
+                while pending and all(future.done() for _, future in pending[0][2]):
+                    self._apply_results(tracker, *pending.popleft())
+                last_timestamp = timestamp
+            while pending:
+                self._apply_results(tracker, *pending.popleft())
+        if last_timestamp is not None:
+            tracker.close_all(last_timestamp + self.interval)
+        self.stats['ocr_pixel_share'] = (round(self.stats['ocr_pixels'] / self.stats['frame_pixels'], 4)
+                                         if self.stats['frame_pixels'] else 0.0)
+        cues = tracker.cues()
+        self.stats['tracked_cues'] = len(cues)
+        return coalesce_ocr_cues(cues, max_gap=self.interval * OCR_COALESCE_SAMPLES)
+
+    def _apply_results(self, tracker: "_TextTracker", timestamp: float, changed: List[Tuple[int, int, int, int]],
+                       submitted: List[Tuple[OCRRegion, Future]]) -> None:
+        tracker.update(timestamp, changed, [line for region, future in submitted
+                                            for line in self._frame_lines(region, future.result())])
+
+    @stage_timer("ocr")
+    def process_video_ocr(self, video_path: str) -> List[Dict]:
+        """Extract on-screen text cues from a video file"""
+        return self.process_frames(self.extract_frames_from_video(video_path))
+
+    def process_video_bytes(self, video_bytes: bytes, suffix: str = '.mp4') -> List[Dict]:
+        """Extract on-screen text cues from an uploaded video held in memory"""
+        # OpenCV and ffmpeg need a file to read from
+        with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_video:
+            temp_video.write(video_bytes)
+            temp_video_path = temp_video.name
+        try:
+            return self.process_video_ocr(temp_video_path)
+        finally:
+            os.unlink(temp_video_path)
+
+    def convert_ocr_to_srt(self, cues: List[Dict], prefix: str = OCR_CUE_PREFIX) -> str:
+        return render_srt_from_cues(merge_ocr_cues([], cues, prefix))
+
+
+class _TextTracker:
+    """Turns per-sample OCR results into cues with start/end times
+
+    Text stays on screen until a change is detected in its area. When the
+    area is re-OCR'd and still contains the same text, fuzzily matched (e.g.
+    only the background changed, or one letter was misread) the cue
+    continues instead of being split.
+    """
+
+    def __init__(self):
+        self.active: List[Dict] = []
+        self.finished: List[Dict] = []
+
+    def update(self, timestamp: float, changed: List[Tuple[int, int, int, int]], lines: List[OCRLine]) -> None:
+        if not changed:
+            return
+        affected = [text for text in self.active if any(_boxes_overlap(text['box'], box) for box in changed)]
+        affected_ids = {id(text) for text in affected}
+        still_active = [text for text in self.active if id(text) not in affected_ids]
+
+        for line in lines:
+            key = _normalize_text(line.text)
+            match = next((text for text in affected if _similar(text['key'], key)), None)
+            if match is not None:
+                affected.remove(match)
+                match['box'] = line.box
+                _add_reading(match['readings'], line.text, line.confidence)
+                still_active.append(match)
+            elif not any(_similar(text['key'], key) and _boxes_overlap(text['box'], line.box) for text in still_active):
+                still_active.append({'key': key, 'start': timestamp, 'box': line.box,
+                                     'readings': {line.text: [1, line.confidence]}})
+
+        for text in affected:
+            text['end'] = timestamp
+            self.finished.append(text)
+        self.active = still_active
+
+    def close_all(self, timestamp: float) -> None:
+        for text in self.active:
+            text['end'] = timestamp
+            self.finished.append(text)
+        self.active = []
+
+    def cues(self) -> List[Dict]:
+        """Finished cues, with their OCR ``readings`` for coalesce_ocr_cues"""
+        # Reading order within a start time: top to bottom, left to right
+        ordered = sorted(self.finished, key=lambda text: (text['start'], text['box'][1], text['box'][0]))
+        return [{'id': index, 'start': round(text['start'], 3), 'end': round(text['end'], 3),
+                 **_best_reading(text['readings']), 'readings': text['readings']}
+                for index, text in enumerate(ordered, start=1)]
+
+
+def _add_reading(readings: Dict[str, List[float]], text: str, confidence: float, count: int = 1) -> None:
+    """Tally one sighting (or ``count``) of a reading with its confidence"""
+    tally = readings.setdefault(text, [0, 0.0])
+    tally[0] += count
+    tally[1] += confidence * count
+
+
+def _best_reading(readings: Dict[str, List[float]]) -> Dict:
+    """Text read most often (ties: most confident) and the mean confidence of all sightings"""
+    text = max(readings, key=lambda reading: (readings[reading][0], readings[reading][1]))
+    sightings = sum(tally[0] for tally in readings.values())
+    return {'text': text, 'confidence': round(sum(tally[1] for tally in readings.values()) / sightings, 1)}
+
+
+def coalesce_ocr_cues(cues: List[Dict], max_gap: float = OCR_SAMPLE_INTERVAL * OCR_COALESCE_SAMPLES,
+                      ratio: float = OCR_MATCH_RATIO) -> List[Dict]:
+    """Merge cues of the same (fuzzily matched) text that overlap or are at most max_gap apart
+
+    A caption is split when OCR misses or misreads it in a sample, or read in
+    two places at once; merging the runs leaves one cue per distinct caption,
+    spanning first to last sighting. The text is decided by vote over all
+    readings (cues from VideoOCRProcessor carry them in ``readings``), so one
+    confident misread does not win. Returns renumbered cues in start order.
+    """
+    merged: List[Dict] = []
+    open_cues: List[Dict] = []
+    for cue in sorted(cues, key=lambda cue: (cue['start'], cue['end'])):
+        key = _normalize_text(cue['text'])
+        readings = cue.get('readings') or {cue['text']: [1, cue.get('confidence', 0.0)]}
+        # Sorted by start, so cues that ended too long ago can never match again
+        open_cues = [other for other in open_cues if other['end'] >= cue['start'] - max_gap]
+        match = next((other for other in open_cues if _similar(other['key'], key, ratio)), None)
+        if match is not None:
+            match['end'] = max(match['end'], cue['end'])
+            for text, (count, confidence_sum) in readings.items():
+                _add_reading(match['readings'], text, confidence_sum / count, count)
+            continue
+        entry = dict(cue, key=key, readings={text: list(tally) for text, tally in readings.items()})
+        merged.append(entry)
+        open_cues.append(entry)
+
+    result = []
+    for index, entry in enumerate(merged, start=1):
+        entry.pop('key')
+        entry.update(_best_reading(entry.pop('readings')), id=index)
+        result.append(entry)
+    return result
+
+
+def merge_ocr_cues(audio_cues: List[Dict], ocr_cues: List[Dict], prefix: str = OCR_CUE_PREFIX) -> List[Dict]:
+    """Interleave on-screen text cues, labelled with ``prefix``, with audio subtitle cues
+
+    The result is ordered by start time (audio first on ties) and
+    renumbered. The prefix sits where a speaker label would, so translation
+    keeps it untouched.
+    """
+    on_screen = [dict(cue, text=cue['text'] if not prefix or cue['text'].startswith(prefix) else f"{prefix} {cue['text']}")
+                 for cue in ocr_cues]
+    ordered = sorted([(cue['start'], 0, cue) for cue in audio_cues] + [(cue['start'], 1, cue) for cue in on_screen],
+                     key=lambda item: (item[0], item[1]))
+    return [dict(cue, id=index) for index, (_, _, cue) in enumerate(ordered, start=1)]
+
+
+def merge_ocr_subtitles(srt_content: str, ocr_cues: List[Dict], prefix: str = OCR_CUE_PREFIX) -> str:
+    """Add on-screen text cues to SRT subtitles (e.g. from generate_srt_subtitles)"""
+    return render_srt_from_cues(merge_ocr_cues(parse_srt_subtitles(srt_content), ocr_cues, prefix))
+
+
+def merge_ocr_translations(translated_subtitles: Dict[str, str], ocr_cues: List[Dict],
+                           translation_service: str = "google_free", api_key: str = None,
+                           prefix: str = OCR_CUE_PREFIX) -> Dict[str, str]:
+    """Add translated on-screen text cues to subtitles that were translated without them
+
+    In pipeline mode the audio cues are translated while the video is still
+    being OCR'd; the on-screen text is then translated in one request per
+    language. A language whose request fails gets the untranslated cues.
+    """
+    from .translator import translate_subtitles_preserve_structure
+
+    if not ocr_cues:
+        return dict(translated_subtitles)
+    ocr_srt = render_srt_from_cues(merge_ocr_cues([], ocr_cues, prefix))
+    merged = {}
+    for language, srt_content in translated_subtitles.items():
+        try:
+            translated_cues = parse_srt_subtitles(
+                translate_subtitles_preserve_structure(ocr_srt, language, translation_service, api_key))
+        except Exception as e:
+            warn(f"Could not translate on-screen text to {language}: {str(e)}. Keeping it untranslated.")
+            translated_cues = ocr_cues
+        merged[language] = merge_ocr_subtitles(srt_content, translated_cues, prefix)
+    return merged
@@ -0,0 +1,286 @@
+import os
+import csv
+import time
+import queue
+import tempfile
+import threading
+import subprocess
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+from .audio import find_ffmpeg, get_audio_profile
+from .formats import render_srt_from_cues
+from .segmentation import IncrementalSegmenter
+from .generator import ElevenLabsSubtitleGenerator
+from .metrics import stage_timer
+from .notify import warn
+from .scheduler import ExtractionScheduler, ffmpeg_slot, ffmpeg_thread_args
+from .tracing import bind_context, start_span
+from .translator import translate_subtitles_preserve_structure
+
+# Length of each transcription request in pipeline mode
+PIPELINE_CHUNK_SECONDS = float(os.getenv("PIPELINE_CHUNK_SECONDS", "120"))
+# Trailing chunks shorter than this are dropped
+PIPELINE_MIN_CHUNK_SECONDS = 0.5
+# Maximum cues a translation worker sends in one batch
+PIPELINE_TRANSLATE_BATCH = int(os.getenv("PIPELINE_TRANSLATE_BATCH", "40"))
+
+_DONE = object()
+
+
+class AudioChunk(NamedTuple):
+    audio: bytes
+    filename: str
+    mime_type: str
+    offset: float  # Start of the chunk in the original audio (seconds)
+
+
+class PipelineResult(NamedTuple):
+    transcription: Dict
+    srt_content: str
+    translated_subtitles: Dict[str, str]
+    errors: Dict[str, str]
+    timings: Dict
+
+
+@stage_timer("split_audio")
+def split_audio_chunks(audio_bytes: bytes, chunk_seconds: float = PIPELINE_CHUNK_SECONDS,
+                       profile: str = None, scheduler: ExtractionScheduler = None) -> List[AudioChunk]:
+    """Split audio into consecutive chunks encoded with an audio profile
+
+    Uses ffmpeg's segment muxer in a single pass; the segment list gives the
+    exact start time of every chunk. Without ffmpeg the audio is returned as
+    a single chunk, so translation simply follows transcription. Given a
+    ``scheduler``, ffmpeg waits for one of its slots.
+    """
+    audio_profile = get_audio_profile(profile)
+    try:
+        ffmpeg_cmd = find_ffmpeg()
+    except FileNotFoundError:
+        return [AudioChunk(audio_bytes, f"audio{audio_profile.extension}", audio_profile.mime_type, 0.0)]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = os.path.join(temp_dir, 'input')
+        list_path = os.path.join(temp_dir, 'chunks.csv')
+        with open(input_path, 'wb') as f:
+            f.write(audio_bytes)
+
+        thread_args = ffmpeg_thread_args(scheduler)
+        with ffmpeg_slot(scheduler):
+            subprocess.run(
+                [ffmpeg_cmd] + thread_args + ['-i', input_path, '-vn'] + audio_profile.codec_args + thread_args + [
+                    '-f', 'segment', '-segment_time', str(chunk_seconds), '-reset_timestamps', '1',
+                    '-segment_list', list_path, '-segment_list_type', 'csv',
+                    '-y', os.path.join(temp_dir, f"chunk%05d{audio_profile.extension}")
+                ],
+                check=True, capture_output=True
+            )
+
+        chunks = []
+        with open(list_path, newline='') as f:
+            for row in csv.reader(f):
+                if not row:
+                    continue
+                # A sliver left over at the end is not worth its own API request
+                if chunks and float(row[2]) - float(row[1]) < PIPELINE_MIN_CHUNK_SECONDS:
+                    continue
+                with open(os.path.join(temp_dir, row[0]), 'rb') as chunk_file:
+                    chunks.append(AudioChunk(chunk_file.read(), row[0], audio_profile.mime_type, float(row[1])))
+    return chunks
+
+
+def offset_words(words: List[Dict], offset: float) -> List[Dict]:
+    """Shift word (and character) timestamps of a chunk onto the full timeline"""
+    if not offset:
+        return words
+    shifted = []
+    for word in words:
+        word = dict(word)
+        for key in ('start', 'end'):
+            if word.get(key) is not None:
+                word[key] = round(word[key] + offset, 3)
+        if word.get('characters'):
+            characters = []
+            for char in word['characters']:
+                char = dict(char)
+                for key in ('start', 'end'):
+                    if char.get(key) is not None:
+                        char[key] = round(char[key] + offset, 3)
+                characters.append(char)
+            word['characters'] = characters
+        shifted.append(word)
+    return shifted
+
+
+class _TranslationWorker(threading.Thread):
+    """Translates cues for one language as they are pushed onto its queue"""
+
+    def __init__(self, language: str, translation_service: str, api_key: Optional[str]):
+        super().__init__(name=f"translate-{language}", daemon=True)
+        self.language = language
+        self.translation_service = translation_service
+        self.api_key = api_key
+        self.cues = queue.Queue()
+        self.parts = []
+        self.translated_any = False
+        self.error = None
+        self.cancelled = False
+        self.busy_seconds = 0.0
+        # Threads do not inherit the trace context of the request that started them
+        self._process = bind_context(self._process)
+
+    def run(self):
+        self._process()
+
+    def _process(self):
+        finished = False
+        while not finished:
+            batch = [self.cues.get()]
+            # Take whatever else is already waiting, so slow services get bigger batches
+            while len(batch) < PIPELINE_TRANSLATE_BATCH:
+                try:
+                    batch.append(self.cues.get_nowait())
+                except queue.Empty:
+                    break
+            if batch[-1] is _DONE:
+                batch.pop()
+                finished = True
+            if batch and self.error is None and not self.cancelled:
+                self._translate(batch)
+
+    def cancel(self):
+        """Skip the cues still queued (nobody will use the translation)"""
+        self.cancelled = True
+
+    def _translate(self, batch: List[Dict]):
+        started = time.perf_counter()
+        srt_batch = render_srt_from_cues(batch, start_index=batch[0]['id'])
+        try:
+            translated = translate_subtitles_preserve_structure(
+                srt_batch, self.language, self.translation_service, self.api_key
+            )
+            if translated and translated != srt_batch:
+                self.translated_any = True
+            self.parts.append(translated or srt_batch)
+        except Exception as e:
+            self.error = str(e)
+        self.busy_seconds += time.perf_counter() - started
+
+
+@stage_timer("pipeline")
+def transcribe_and_translate(generator: ElevenLabsSubtitleGenerator, audio_bytes: bytes,
+                             target_languages: List[str],
+                             translation_service: str = "google_free",
+                             translation_api_key: str = None,
+                             chunk_seconds: float = PIPELINE_CHUNK_SECONDS,
+                             audio_profile: str = None,
+                             segmentation=None,
+                             on_progress: Callable[[int, int], None] = None,
+                             scheduler: ExtractionScheduler = None,
+                             **transcription_options) -> PipelineResult:
+    """Transcribe audio chunk by chunk while translating finished cues in parallel
+
+    Cues completed by each transcribed chunk are pushed to one translation
+    worker thread per target language, so translation of the first minutes
+    runs while later chunks are still being transcribed and total wall time
+    approaches max(transcribe, translate) instead of their sum.
+
+    Speaker diarization runs per chunk, so speaker ids are only consistent
+    within a chunk, and a word spoken across a chunk boundary may be split.
+    ``segmentation`` is a SegmentationPolicy or preset name.
+    ``on_progress(done, total)`` is called from the calling thread after each
+    chunk. Given a ``scheduler``, chunk splitting and silence trimming count
+    against its ffmpeg concurrency cap. Returns the merged transcription, the
+    SRT, the translations that succeeded and an error message for each
+    language that failed.
+    """
+    started = time.perf_counter()
+    chunks = split_audio_chunks(audio_bytes, chunk_seconds, audio_profile, scheduler)
+
+    workers = [_TranslationWorker(lang, translation_service, translation_api_key) for lang in target_languages]
+    for worker in workers:
+        worker.start()
+
+    segmenter = IncrementalSegmenter(segmentation)
+    cues = []
+    words = []
+    texts = []
+    transcription = {}
+    first_cue_seconds = None
+    trimmed = False
+    trimming = {'original_duration': 0.0, 'uploaded_duration': 0.0}
+
+    def publish(finished_cues: List[Dict]):
+        for cue in finished_cues:
+            cues.append(cue)
+            for worker in workers:
+                worker.cues.put(cue)
+
+    try:
+        for index, chunk in enumerate(chunks):
+            with start_span("pipeline_chunk", chunk=index, offset=chunk.offset):
+                result = generator.create_transcription(
+                    chunk.audio,
+                    filename=chunk.filename,
+                    mime_type=chunk.mime_type,
+                    audio_profile=audio_profile,
+                    scheduler=scheduler,
+                    **transcription_options
+                )
+            if not transcription:
+                transcription = {key: value for key, value in result.items() if key not in ('words', 'text')}
+            if result.get('text'):
+                texts.append(result['text'])
+            if 'silence_trimming' in result:
+                trimmed = True
+                for key in trimming:
+                    trimming[key] += result['silence_trimming'][key]
+
+            chunk_words = offset_words(result.get('words', []), chunk.offset)
+            words.extend(chunk_words)
+            publish(segmenter.feed_many(chunk_words))
+            if cues and first_cue_seconds is None:
+                first_cue_seconds = time.perf_counter() - started
+            if on_progress:
+                on_progress(index + 1, len(chunks))
+
+        publish(segmenter.flush())
+    except BaseException:
+        # Drop the queued cues and stop the workers before re-raising
+        for worker in workers:
+            worker.cancel()
+            worker.cues.put(_DONE)
+        for worker in workers:
+            worker.join()
+        raise
+    for worker in workers:
+        worker.cues.put(_DONE)
+    transcribed_seconds = time.perf_counter() - started
+
+    for worker in workers:
+        worker.join()
+
+    transcription['text'] = ' '.join(texts)
+    transcription['words'] = words
+    if trimmed:
+        transcription['silence_trimming'] = {key: round(value, 3) for key, value in trimming.items()}
+    transcription['pipeline'] = {'chunks': len(chunks), 'chunk_seconds': chunk_seconds}
+
+    translated_subtitles = {}
+    errors = {}
+    for worker in workers:
+        if worker.error is not None:
+            errors[worker.language] = worker.error
+            warn(f"Pipeline translation to {worker.language} failed: {worker.error}")
+        elif not worker.translated_any:
+            errors[worker.language] = "translation service returned untranslated subtitles"
+        else:
+            translated_subtitles[worker.language] = "".join(worker.parts)
+
+    timings = {
+        'chunks': len(chunks),
+        'first_cue_seconds': round(first_cue_seconds or 0.0, 3),
+        'transcribe_seconds': round(transcribed_seconds, 3),
+        'translate_seconds': {worker.language: round(worker.busy_seconds, 3) for worker in workers},
+        'wall_seconds': round(time.perf_counter() - started, 3),
+    }
+    return PipelineResult(transcription, render_srt_from_cues(cues), translated_subtitles, errors, timings)
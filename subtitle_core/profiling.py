@@ -0,0 +1,260 @@
+import os
+import re
+import sys
+import json
+import time
+import threading
+import contextvars
+from collections import Counter
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from .notify import warn
+
+# "off", "sample" (stack sampling, flamegraph output) or "cprofile" (deterministic,
+# calling thread only). Profiles every backend request / batch file when set.
+PROFILE = os.getenv("PROFILE", "off")
+PROFILE_MODES = ("sample", "cprofile")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.005"))
+# Functions broken out in the summary written next to each profile
+PROFILE_TARGETS = tuple(os.getenv("PROFILE_TARGETS", ",".join((
+    "generate_srt_subtitles",
+    "translate_subtitles_preserve_structure",
+    "translate_with_context_awareness",
+    "clean_english_translation",
+    "apply_english_enhancements",
+))).split(","))
+
+_active_profile = contextvars.ContextVar("subtitle_active_profile", default=None)
+# cProfile allows one active profiler per process (Python 3.12+ raises on a
+# second enable()), and overlapping samplers would attribute each other's
+# threads, so only one profile runs at a time
+_profile_slot = threading.Lock()
+
+
+class StackSampler:
+    """Samples the Python stacks of selected threads at a fixed interval
+
+    Produces folded stacks (``thread;module:function;... count``), the input
+    format of flamegraph.pl, speedscope and most flamegraph viewers. Sampling
+    costs a few percent of CPU at the default 5 ms interval and, unlike
+    cProfile, does not slow down the profiled code itself.
+    """
+
+    def __init__(self, interval: float = PROFILE_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.thread_ids = set()
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            module = os.path.splitext(os.path.basename(code.co_filename))[0]
+            label = self._labels[code] = f"{module}:{getattr(code, 'co_qualname', code.co_name)}".replace(';', ':').replace(' ', '_')
+        return label
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            names = None
+            for thread_id in list(self.thread_ids):
+                frame = frames.get(thread_id)
+                if frame is None:
+                    continue
+                if names is None:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)).replace(' ', '_'))
+                self.stacks[';'.join(reversed(stack))] += 1
+            self.samples += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def target_summary(self, targets=PROFILE_TARGETS) -> Dict:
+        """Share of samples in which each target function was on the stack / running"""
+        total = sum(self.stacks.values())
+        summary = {}
+        for target in targets:
+            inclusive = exclusive = 0
+            for stack, count in self.stacks.items():
+                frames = [frame.split(':', 1)[-1].rsplit('.', 1)[-1] for frame in stack.split(';')[1:]]
+                if target in frames:
+                    inclusive += count
+                    if frames[-1] == target:
+                        exclusive += count
+            summary[target] = {
+                'inclusive_seconds': round(inclusive * self.interval, 3),
+                'self_seconds': round(exclusive * self.interval, 3),
+                'inclusive_share': round(inclusive / total, 4) if total else 0.0,
+            }
+        return summary
+
+
+class Profile:
+    """One profiled run; ``key`` names the output files and may be set late (set_profile_key)"""
+
+    def __init__(self, key: str, mode: str, output_dir: str = PROFILE_DIR):
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}'. Use one of: {', '.join(PROFILE_MODES)}")
+        self.key = key
+        self.mode = mode
+        self.output_dir = output_dir
+        self.paths: List[str] = []
+        self.name: Optional[str] = None
+        self.summary: Dict = {}
+        self._sampler = StackSampler() if mode == "sample" else None
+        # Threads being sampled (None for cProfile, which only sees the calling thread)
+        self.threads = self._sampler.thread_ids if self._sampler is not None else None
+        self._profiler = None
+        self._started = None
+        self._elapsed = None
+
+    def start(self) -> None:
+        self._started = time.perf_counter()
+        if self._sampler is not None:
+            self.threads.add(threading.get_ident())
+            self._sampler.start()
+        else:
+            import cProfile
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop(self) -> List[str]:
+        """Stop profiling and write the output files; returns their paths"""
+        self.halt()
+        return self.write()
+
+    def halt(self) -> None:
+        """Stop collecting samples/calls without writing anything"""
+        if self._sampler is not None:
+            self._sampler.stop()
+        else:
+            self._profiler.disable()
+        self._elapsed = time.perf_counter() - self._started
+
+    def write(self) -> List[str]:
+        """Write the output files of a halted profile; returns their paths"""
+        elapsed = self._elapsed
+        os.makedirs(self.output_dir, exist_ok=True)
+        safe_key = re.sub(r'[^\w.-]+', '_', self.key).strip('_') or 'profile'
+        now = time.time()
+        stamp = time.strftime('%Y%m%dT%H%M%S', time.localtime(now)) + f"{int(now * 1000) % 1000:03d}"
+        self.name = f"{safe_key}-{stamp}"
+        base = os.path.join(self.output_dir, self.name)
+        if self._sampler is not None:
+            with open(f"{base}.folded", 'w', encoding='utf-8') as f:
+                f.write(self._sampler.folded())
+            self.paths.append(f"{base}.folded")
+            targets = self._sampler.target_summary()
+            samples = self._sampler.samples
+        else:
+            self._profiler.dump_stats(f"{base}.prof")
+            self.paths.append(f"{base}.prof")
+            targets = _cprofile_target_summary(self._profiler)
+            samples = None
+
+        self.summary = {
+            'key': self.key,
+            'mode': self.mode,
+            'wall_seconds': round(elapsed, 3),
+            'samples': samples,
+            'targets': targets,
+            'files': list(self.paths),
+        }
+        with open(f"{base}.summary.json", 'w', encoding='utf-8') as f:
+            json.dump(self.summary, f, indent=2)
+        self.paths.append(f"{base}.summary.json")
+        return self.paths
+
+
+def _cprofile_target_summary(profiler, targets=PROFILE_TARGETS) -> Dict:
+    import pstats
+
+    stats = pstats.Stats(profiler).stats
+    summary = {}
+    for target in targets:
+        calls = 0
+        own = cumulative = 0.0
+        for (filename, line, function), (primitive_calls, total_calls, tottime, cumtime, callers) in stats.items():
+            if function == target:
+                calls += total_calls
+                own += tottime
+                cumulative += cumtime
+        summary[target] = {'calls': calls, 'inclusive_seconds': round(cumulative, 3), 'self_seconds': round(own, 3)}
+    return summary
+
+
+@contextmanager
+def profile_run(key: str, mode: str = None, output_dir: str = PROFILE_DIR, write: bool = True):
+    """Profile the enclosed block (mode defaults to $PROFILE); yields the Profile, or None when off
+
+    Output files are written on exit: ``<key>-<time>.folded`` (sample) or
+    ``.prof`` (cprofile, for snakeviz/flameprof), plus ``.summary.json`` with
+    the time spent in PROFILE_TARGETS. With ``write=False`` profiling stops on
+    exit and the caller writes the files later with ``Profile.write()`` (e.g.
+    from a worker thread). Only one profile runs per process; a block entered
+    while another is running is not profiled (yields None).
+    """
+    mode = mode or PROFILE
+    if mode == "off":
+        yield None
+        return
+    profile = Profile(key, mode, output_dir)
+    if not _profile_slot.acquire(blocking=False):
+        warn(f"Not profiling '{key}': another profile is already running")
+        yield None
+        return
+    try:
+        token = _active_profile.set(profile)
+        profile.start()
+        try:
+            yield profile
+        finally:
+            _active_profile.reset(token)
+            profile.halt()
+            if write:
+                profile.write()
+    finally:
+        _profile_slot.release()
+
+
+def active_profile() -> Optional[Profile]:
+    return _active_profile.get()
+
+
+def set_profile_key(key: str) -> None:
+    """Name the running profile (e.g. by session id once it is known)"""
+    profile = _active_profile.get()
+    if profile is not None:
+        profile.key = key
+
+
+def run_in_profile(function, *args, **kwargs):
+    """Call function, sampling the current thread too if a profile is active in this context"""
+    profile = _active_profile.get()
+    thread_id = threading.get_ident()
+    if profile is None or profile.threads is None or thread_id in profile.threads:
+        return function(*args, **kwargs)
+    profile.threads.add(thread_id)
+    try:
+        return function(*args, **kwargs)
+    finally:
+        profile.threads.discard(thread_id)
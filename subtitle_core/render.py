@@ -0,0 +1,100 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, NamedTuple, Optional
+
+from .formats import render_srt_from_cues, srt_to_vtt
+from .metrics import record_cache, stage_timer
+from .segmentation import get_segmentation_policy, segment_words
+from .wordtable import transcription_words
+
+# Rendered subtitle sets kept in memory (a 10-hour SRT is a few MB)
+RENDER_CACHE_SIZE = int(os.getenv("RENDER_CACHE_SIZE", "32"))
+
+
+class RenderedSubtitles(NamedTuple):
+    srt_content: str
+    vtt_content: str
+    cue_count: int
+    cached: bool
+
+
+class RenderCache:
+    """Thread-safe LRU of rendered subtitles keyed by (transcription key, options)"""
+
+    def __init__(self, max_entries: int = RENDER_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable) -> Optional[RenderedSubtitles]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+            else:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        record_cache("render", entry is not None)
+        return entry
+
+    def put(self, key: Hashable, entry: RenderedSubtitles) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, transcription_key: Hashable) -> None:
+        """Drop every rendering of one transcription (e.g. when its session is deleted)"""
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == transcription_key]:
+                del self._entries[key]
+
+    def stats(self) -> Dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+            }
+
+
+render_cache = RenderCache()
+
+
+def render_subtitles(transcription, policy=None, speaker_names: Dict[str, str] = None,
+                     cache_key: Hashable = None, cache: RenderCache = None) -> RenderedSubtitles:
+    """Re-derive SRT and VTT from the stored words of a transcription
+
+    transcription is a transcription dict or WordTable, or a function returning
+    one, called only on a cache miss (e.g. to skip decoding a stored
+    transcription when the rendering is cached). No API call is made:
+    the words are re-segmented in-process with the given SegmentationPolicy
+    (or preset name) and speaker names. With cache_key (e.g. the session id)
+    results are cached per option set, so switching back and forth between
+    display options is a dictionary lookup.
+    """
+    policy = get_segmentation_policy(policy)
+    cache = cache if cache is not None else render_cache
+    key = None
+    if cache_key is not None:
+        key = (cache_key, policy, tuple(sorted((speaker_names or {}).items())))
+        cached = cache.get(key)
+        if cached is not None:
+            return cached._replace(cached=True)
+
+    if callable(transcription):
+        transcription = transcription()
+    with stage_timer("render_subtitles"):
+        cues = segment_words(transcription_words(transcription), policy, speaker_names)
+        srt_content = render_srt_from_cues(cues)
+        rendered = RenderedSubtitles(srt_content, srt_to_vtt(srt_content) if srt_content else "", len(cues), False)
+    if key is not None:
+        cache.put(key, rendered)
+    return rendered
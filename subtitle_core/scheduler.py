@@ -0,0 +1,164 @@
+import os
+import time
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List
+
+from .audio import ExtractedAudio, extract_audio
+from .tracing import bind_context
+
+# Defaults keep a burst of uploads from taking every core away from the API
+FFMPEG_MAX_CONCURRENT = int(os.getenv("FFMPEG_MAX_CONCURRENT", str(max(1, (os.cpu_count() or 2) // 2))))
+FFMPEG_THREADS = int(os.getenv("FFMPEG_THREADS", "2"))
+FFMPEG_MAX_QUEUE = int(os.getenv("FFMPEG_MAX_QUEUE", "64"))
+
+
+class SchedulerFull(Exception):
+    """Raised when the extraction queue is at capacity (callers should retry later)"""
+
+
+def _percentile(values, fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(fraction * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+class ExtractionScheduler:
+    """Bounded queue in front of extract_audio
+
+    At most ``max_concurrent`` ffmpeg processes run at once, each limited to
+    ``ffmpeg_threads`` threads, so CPU use is capped at roughly
+    max_concurrent x ffmpeg_threads cores no matter how many uploads arrive.
+    Jobs beyond that wait in a FIFO queue of at most ``max_queue`` entries;
+    further submissions are rejected with SchedulerFull instead of piling up.
+    Callers running ffmpeg themselves (MediaIngest, chunk splitting, silence
+    trimming) take one of the same slots with ``acquire()``/``release()`` or
+    the ``slot()`` context manager.
+    """
+
+    def __init__(self, max_concurrent: int = FFMPEG_MAX_CONCURRENT,
+                 ffmpeg_threads: int = FFMPEG_THREADS,
+                 max_queue: int = FFMPEG_MAX_QUEUE,
+                 sample_window: int = 1000):
+        self.max_concurrent = max_concurrent
+        self.ffmpeg_threads = ffmpeg_threads
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_concurrent, thread_name_prefix="ffmpeg")
+        self._slots = threading.Semaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._counters = {'submitted': 0, 'completed': 0, 'failed': 0, 'rejected': 0}
+        self._wait_times = deque(maxlen=sample_window)
+        self._run_times = deque(maxlen=sample_window)
+
+    def submit(self, video_bytes: bytes, profile: str = None, **options) -> Future:
+        """Queue an extraction; returns a Future resolving to ExtractedAudio"""
+        self._admit()
+        options.setdefault('threads', self.ffmpeg_threads)
+        # Keep the caller's trace context (session_id, parent span) on the worker thread
+        return self._executor.submit(bind_context(self._run), time.perf_counter(), video_bytes, profile, options)
+
+    def _admit(self) -> None:
+        with self._lock:
+            if self._queued >= self.max_queue:
+                self._counters['rejected'] += 1
+                raise SchedulerFull(f"Extraction queue is full ({self._queued} waiting)")
+            self._queued += 1
+            self._counters['submitted'] += 1
+
+    def _start(self, enqueued_at: float) -> float:
+        self._slots.acquire()
+        started_at = time.perf_counter()
+        with self._lock:
+            self._queued -= 1
+            self._running += 1
+            self._wait_times.append(started_at - enqueued_at)
+        return started_at
+
+    def _finish(self, started_at: float, succeeded: bool) -> None:
+        with self._lock:
+            self._running -= 1
+            self._run_times.append(time.perf_counter() - started_at)
+            self._counters['completed' if succeeded else 'failed'] += 1
+        self._slots.release()
+
+    def _run(self, enqueued_at: float, video_bytes: bytes, profile: str, options: Dict) -> ExtractedAudio:
+        started_at = self._start(enqueued_at)
+        succeeded = False
+        try:
+            result = extract_audio(video_bytes, profile, **options)
+            succeeded = True
+            return result
+        finally:
+            self._finish(started_at, succeeded)
+
+    def acquire(self) -> float:
+        """Wait for a free ffmpeg slot for a process the caller starts itself
+
+        Queues like ``submit`` (raising SchedulerFull when the queue is full)
+        and returns a token to pass to ``release()`` once the process exits.
+        """
+        self._admit()
+        return self._start(time.perf_counter())
+
+    def release(self, token: float, succeeded: bool = True) -> None:
+        """Give back a slot taken with ``acquire()``"""
+        self._finish(token, succeeded)
+
+    @contextmanager
+    def slot(self):
+        """Hold an ffmpeg slot for the duration of the block"""
+        token = self.acquire()
+        succeeded = False
+        try:
+            yield
+            succeeded = True
+        finally:
+            self.release(token, succeeded)
+
+    def extract(self, video_bytes: bytes, profile: str = None, **options) -> ExtractedAudio:
+        """Blocking extraction through the queue"""
+        return self.submit(video_bytes, profile, **options).result()
+
+    async def extract_async(self, video_bytes: bytes, profile: str = None, **options) -> ExtractedAudio:
+        """Await an extraction without blocking the event loop"""
+        return await asyncio.wrap_future(self.submit(video_bytes, profile, **options))
+
+    def stats(self) -> Dict:
+        """Queue depth, concurrency and wait/run time percentiles (seconds)"""
+        with self._lock:
+            wait_times = list(self._wait_times)
+            run_times = list(self._run_times)
+            stats = dict(self._counters)
+            stats['queue_depth'] = self._queued
+            stats['running'] = self._running
+        stats.update({
+            'max_concurrent': self.max_concurrent,
+            'ffmpeg_threads': self.ffmpeg_threads,
+            'max_queue': self.max_queue,
+            'wait_seconds_p50': _percentile(wait_times, 0.50),
+            'wait_seconds_p95': _percentile(wait_times, 0.95),
+            'wait_seconds_max': max(wait_times, default=0.0),
+            'run_seconds_p50': _percentile(run_times, 0.50),
+            'run_seconds_p95': _percentile(run_times, 0.95),
+        })
+        return stats
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+
+
+def ffmpeg_slot(scheduler: ExtractionScheduler = None):
+    """Context manager holding a slot of ``scheduler``, or nothing when it is None"""
+    return scheduler.slot() if scheduler is not None else nullcontext()
+
+
+def ffmpeg_thread_args(scheduler: ExtractionScheduler = None) -> List[str]:
+    """ffmpeg ``-threads`` arguments matching the scheduler's per-process cap"""
+    return ['-threads', str(scheduler.ffmpeg_threads)] if scheduler is not None and scheduler.ffmpeg_threads else []
@@ -0,0 +1,275 @@
+import os
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional
+
+SENTENCE_END = ('.', '!', '?', '…', '。', '！', '？')
+
+
+class SegmentationPolicy(NamedTuple):
+    """Rules for grouping transcription words into subtitle cues
+
+    Limits set to None are not enforced. The defaults reproduce the original
+    behaviour (at most 8 words or 5 seconds per cue, new cue on speaker
+    change); see SEGMENTATION_PRESETS for a reading-speed-aware alternative.
+    """
+    max_words: Optional[int] = 8           # Words per cue
+    max_duration: Optional[float] = 5.0    # Seconds from the first word of a cue to the start of the last
+    max_chars_per_line: Optional[int] = None  # Lines are wrapped greedily at word boundaries
+    max_lines: int = 1                     # Lines per cue (only with max_chars_per_line)
+    max_cps: Optional[float] = None        # Reading speed; short cues are held on screen longer
+    min_duration: float = 0.0              # Cues are held at least this long, and not split on punctuation sooner
+    min_gap: float = 0.0                   # Seconds left blank between consecutive cues
+    break_on_pause: Optional[float] = None  # Start a new cue after a silence this long (seconds)
+    break_on_punctuation: bool = False     # Start a new cue after sentence-ending punctuation
+    break_on_speaker: bool = True          # Start a new cue when the speaker changes
+    speaker_labels: str = "auto"           # "auto" (all but speaker_0), "always" or "none"
+
+
+SEGMENTATION_PRESETS: Dict[str, SegmentationPolicy] = {
+    "legacy": SegmentationPolicy(),
+    # Common broadcast guidelines: 2 lines of 42 characters, 17 characters per
+    # second, 2 frames between cues, cues follow sentences and pauses
+    "readable": SegmentationPolicy(
+        max_words=None, max_duration=7.0, max_chars_per_line=42, max_lines=2,
+        max_cps=17.0, min_duration=1.0, min_gap=0.083, break_on_pause=0.8, break_on_punctuation=True
+    ),
+    # Short single lines for mobile screens and vertical video
+    "compact": SegmentationPolicy(
+        max_words=None, max_duration=3.0, max_chars_per_line=32, max_lines=1,
+        max_cps=20.0, min_duration=0.7, min_gap=0.083, break_on_pause=0.6, break_on_punctuation=True
+    ),
+}
+
+DEFAULT_SEGMENTATION = os.getenv("SUBTITLE_SEGMENTATION", "legacy")
+SPEAKER_LABEL_MODES = ("auto", "always", "none")
+
+
+def get_segmentation_policy(policy=None) -> SegmentationPolicy:
+    """Resolve a policy object or preset name (defaults to $SUBTITLE_SEGMENTATION or legacy)"""
+    if isinstance(policy, SegmentationPolicy):
+        return policy
+    name = policy or DEFAULT_SEGMENTATION
+    if name not in SEGMENTATION_PRESETS:
+        raise ValueError(f"Unknown segmentation preset '{name}'. Available: {', '.join(SEGMENTATION_PRESETS)}")
+    return SEGMENTATION_PRESETS[name]
+
+
+# Type, lower bound and whether None is allowed for each numeric policy field
+_POLICY_NUMBERS = {
+    'max_words': (int, 1, True),
+    'max_duration': (float, 0.0, True),
+    'max_chars_per_line': (int, 1, True),
+    'max_lines': (int, 1, False),
+    'max_cps': (float, 0.0, True),
+    'min_duration': (float, 0.0, False),
+    'min_gap': (float, 0.0, False),
+    'break_on_pause': (float, 0.0, True),
+}
+_POLICY_FLAGS = ('break_on_punctuation', 'break_on_speaker')
+
+
+def _check_policy_option(name: str, value):
+    if name in _POLICY_FLAGS:
+        if not isinstance(value, bool):
+            raise ValueError(f"{name} must be true or false")
+        return value
+    if name == 'speaker_labels':
+        if value not in SPEAKER_LABEL_MODES:
+            raise ValueError(f"speaker_labels must be one of: {', '.join(SPEAKER_LABEL_MODES)}")
+        return value
+    kind, minimum, optional = _POLICY_NUMBERS[name]
+    if value is None and optional:
+        return None
+    # bool is an int subclass, and 2.5 words makes no sense
+    valid = isinstance(value, (int, float)) and not isinstance(value, bool)
+    if kind is int and valid and not float(value).is_integer():
+        valid = False
+    if not valid or value < minimum:
+        expected = f"an integer of at least {minimum}" if kind is int else "a non-negative number"
+        raise ValueError(f"{name} must be {expected}" + (" or null" if optional else ""))
+    return kind(value)
+
+
+def build_segmentation_policy(preset: str = None, **overrides) -> SegmentationPolicy:
+    """Start from a preset and replace individual fields, validating names, types and ranges
+
+    Raises ValueError for anything invalid (e.g. options from an API request).
+    """
+    policy = get_segmentation_policy(preset)
+    unknown = set(overrides) - set(SegmentationPolicy._fields)
+    if unknown:
+        raise ValueError(f"Unknown segmentation options: {', '.join(sorted(unknown))}")
+    return policy._replace(**{name: _check_policy_option(name, value) for name, value in overrides.items()})
+
+
+def validate_speaker_names(speaker_names) -> Optional[Dict[str, str]]:
+    """Check a speaker id -> display name mapping (None passes); raises ValueError"""
+    if speaker_names is None:
+        return None
+    if not isinstance(speaker_names, dict) or not all(
+            isinstance(key, str) and isinstance(value, str) for key, value in speaker_names.items()):
+        raise ValueError("speaker_names must map speaker ids to names (strings)")
+    return speaker_names
+
+
+class IncrementalSegmenter:
+    """Groups transcription words into subtitle cues as the words arrive
+
+    Feed words one at a time (or a chunk at a time) and finished cues are
+    returned as soon as their break condition is met, so subtitles for the
+    start of a long file are available before transcription has finished.
+    Call ``flush`` once the last word has been fed to get the final cue.
+
+    Each word is looked at once, so segmenting a whole transcript is a single
+    linear pass. When the policy sets max_cps, min_duration or min_gap, a
+    cue's end time depends on when the next one starts, so cues are returned
+    one cue late.
+
+    Cues have the same shape as ``parse_srt_subtitles`` entries:
+    ``{'id', 'start', 'end', 'text'}``.
+    """
+
+    def __init__(self, policy=None, start_index: int = 1, speaker_names: Dict[str, str] = None):
+        self.policy = get_segmentation_policy(policy)
+        self.speaker_names = speaker_names or {}
+        self.next_index = start_index
+        self._holds_cues = bool(self.policy.max_cps or self.policy.min_duration or self.policy.min_gap)
+        self._pending = None
+        self._segment = []
+        self._line_starts = []
+        self._line_length = 0
+        self._text_length = 0
+        self._segment_start = None
+        self._segment_end = None
+        self._speaker = None
+        self._sentence_ended = False
+
+    def feed(self, word: Dict) -> List[Dict]:
+        """Consume one transcription word; returns the cues it completed (zero or one)"""
+        if word.get('type') != 'word':
+            return []
+
+        policy = self.policy
+        word_start = word.get('start', 0)
+        word_end = word.get('end', word_start)
+        word_text = word.get('text', '')
+        speaker_id = word.get('speaker_id', 'speaker_0')
+
+        finished = []
+        if self._segment and (
+            (policy.max_words is not None and len(self._segment) >= policy.max_words) or
+            (policy.max_duration is not None and (word_start - self._segment_start) > policy.max_duration) or
+            (policy.break_on_speaker and self._speaker != speaker_id) or
+            (policy.break_on_pause is not None and (word_start - self._segment_end) >= policy.break_on_pause) or
+            (policy.break_on_punctuation and self._sentence_ended and
+             (self._segment_end - self._segment_start) >= policy.min_duration) or
+            not self._fits(word_text)
+        ):
+            finished.extend(self._finish(self._emit()))
+
+        if not self._segment:
+            self._segment_start = word_start
+            self._speaker = speaker_id
+            self._line_starts = [0]
+            self._line_length = len(self._speaker_prefix())
+        self._append(word_text)
+        self._segment_end = word_end
+        self._sentence_ended = word_text.rstrip('"\'”’)]').endswith(SENTENCE_END)
+        return finished
+
+    def feed_many(self, words: Iterable[Dict]) -> List[Dict]:
+        """Consume a chunk of words; returns every cue completed by the chunk"""
+        finished = []
+        for word in words:
+            finished.extend(self.feed(word))
+        return finished
+
+    def flush(self) -> List[Dict]:
+        """Emit the segment in progress and any held cue (call after the last word)"""
+        finished = []
+        if self._segment:
+            finished.extend(self._finish(self._emit()))
+        if self._pending is not None:
+            finished.append(self._settle(self._pending, None))
+            self._pending = None
+        return finished
+
+    def _speaker_prefix(self) -> str:
+        # Add speaker label if diarization is enabled
+        mode = self.policy.speaker_labels
+        if mode == "none" or (mode == "auto" and self._speaker == 'speaker_0'):
+            return ""
+        return f"[{self.speaker_names.get(self._speaker, self._speaker)}] "
+
+    def _fits(self, word_text: str) -> bool:
+        """Whether the word still fits the line limits of the current cue"""
+        max_chars = self.policy.max_chars_per_line
+        if max_chars is None or self._line_length + 1 + len(word_text) <= max_chars:
+            return True
+        return len(self._line_starts) < self.policy.max_lines
+
+    def _append(self, word_text: str) -> None:
+        max_chars = self.policy.max_chars_per_line
+        if not self._segment:
+            self._line_length += len(word_text)
+        elif max_chars is not None and self._line_length + 1 + len(word_text) > max_chars:
+            self._line_starts.append(len(self._segment))
+            self._line_length = len(word_text)
+        else:
+            self._line_length += 1 + len(word_text)
+        self._text_length += len(word_text) + (1 if self._segment else 0)
+        self._segment.append(word_text)
+
+    def _emit(self) -> Dict:
+        bounds = self._line_starts[1:] + [len(self._segment)]
+        lines = []
+        start = 0
+        for end in bounds:
+            lines.append(' '.join(self._segment[start:end]))
+            start = end
+        cue = {
+            'id': self.next_index,
+            'start': self._segment_start,
+            'end': self._segment_end,
+            'text': self._speaker_prefix() + '\n'.join(lines),
+            'chars': self._text_length
+        }
+        self.next_index += 1
+        self._segment = []
+        self._text_length = 0
+        return cue
+
+    def _finish(self, cue: Dict) -> List[Dict]:
+        """Return the cues that are final now that ``cue`` exists"""
+        if not self._holds_cues:
+            return [self._settle(cue, None)]
+        finished = []
+        if self._pending is not None:
+            finished.append(self._settle(self._pending, cue['start']))
+        self._pending = cue
+        return finished
+
+    def _settle(self, cue: Dict, next_start: Optional[float]) -> Dict:
+        """Apply reading speed and minimum gap once the next cue's start is known"""
+        policy = self.policy
+        chars = cue.pop('chars')
+        reading_end = cue['start'] + max(chars / policy.max_cps if policy.max_cps else 0.0, policy.min_duration)
+        if policy.max_duration is not None:
+            reading_end = min(reading_end, cue['start'] + policy.max_duration)
+        end = max(cue['end'], reading_end)
+        if next_start is not None:
+            end = min(end, max(next_start - policy.min_gap, cue['start']))
+        cue['end'] = end
+        return cue
+
+
+def iter_subtitle_cues(words: Iterable[Dict], policy=None, speaker_names: Dict[str, str] = None) -> Iterator[Dict]:
+    """Yield subtitle cues lazily from an iterable of transcription words"""
+    segmenter = IncrementalSegmenter(policy, speaker_names=speaker_names)
+    for word in words:
+        yield from segmenter.feed(word)
+    yield from segmenter.flush()
+
+
+def segment_words(words: Iterable[Dict], policy=None, speaker_names: Dict[str, str] = None) -> List[Dict]:
+    """Segment a whole transcript into cues (single pass; no API call needed)"""
+    return list(iter_subtitle_cues(words, policy, speaker_names))
@@ -0,0 +1,264 @@
+import os
+import json
+import time
+import random
+import threading
+import contextvars
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional
+
+from .profiling import run_in_profile
+
+# "off", "file" (JSON lines written to TRACE_FILE) or "otel" (the opentelemetry
+# API, exporting through whatever SDK the process has configured)
+TRACING = os.getenv("TRACING", "off")
+TRACE_FILE = os.getenv("TRACE_FILE", "traces.jsonl")
+
+_current_span = contextvars.ContextVar("subtitle_current_span", default=None)
+# Attributes copied onto every span started in this context (session_id, ...)
+_correlation = contextvars.ContextVar("subtitle_trace_correlation", default={})
+_random = random.Random()
+
+
+class Span:
+    """A timed operation within a trace, mirroring the OpenTelemetry Span API"""
+
+    def __init__(self, tracer: "Tracer", name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Dict):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = f"{_random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.events: List[Dict] = []
+        self.status = "UNSET"
+        self.status_message = None
+        self.start_ns = time.time_ns()
+        self.end_ns = None
+
+    def is_recording(self) -> bool:
+        return self.end_ns is None
+
+    def set_attribute(self, key: str, value) -> None:
+        if value is not None:
+            self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict) -> None:
+        for key, value in attributes.items():
+            self.set_attribute(key, value)
+
+    def add_event(self, name: str, attributes: Dict = None) -> None:
+        self.events.append({'name': name, 'timeUnixNano': time.time_ns(), 'attributes': attributes or {}})
+
+    def record_exception(self, exception: BaseException) -> None:
+        self.add_event('exception', {
+            'exception.type': type(exception).__name__,
+            'exception.message': str(exception),
+        })
+
+    def set_status(self, status: str, description: str = None) -> None:
+        self.status = status
+        self.status_message = description
+
+    def update_name(self, name: str) -> None:
+        self.name = name
+
+    def end(self) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.tracer.exporter.export(self.to_dict())
+
+    def to_dict(self) -> Dict:
+        """Span as a JSON-friendly dict using OTLP field names"""
+        return {
+            'traceId': self.trace_id,
+            'spanId': self.span_id,
+            'parentSpanId': self.parent_id,
+            'name': self.name,
+            'startTimeUnixNano': self.start_ns,
+            'endTimeUnixNano': self.end_ns,
+            'durationMs': round((self.end_ns - self.start_ns) / 1e6, 3) if self.end_ns else None,
+            'attributes': self.attributes,
+            'events': self.events,
+            'status': {'code': self.status, 'message': self.status_message},
+        }
+
+
+class _NoopSpan:
+    """Returned when tracing is off; every method does nothing"""
+    trace_id = None
+    span_id = None
+    attributes = {}
+
+    def is_recording(self) -> bool:
+        return False
+
+    def set_attribute(self, key: str, value) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Dict = None) -> None:
+        pass
+
+    def record_exception(self, exception: BaseException) -> None:
+        pass
+
+    def set_status(self, status: str, description: str = None) -> None:
+        pass
+
+    def update_name(self, name: str) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class FileSpanExporter:
+    """Appends finished spans to a file, one JSON object per line"""
+
+    def __init__(self, path: str = TRACE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def export(self, span: Dict) -> None:
+        line = json.dumps(span, ensure_ascii=False, default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+class InMemorySpanExporter:
+    """Keeps finished spans in a list (for tests and benchmarks)"""
+
+    def __init__(self):
+        self.spans: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def export(self, span: Dict) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def shutdown(self) -> None:
+        pass
+
+
+class Tracer:
+    """Creates spans and tracks the current one per thread/async task (contextvars)"""
+
+    def __init__(self, exporter=None):
+        self.exporter = exporter
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Dict = None):
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent is not None else f"{_random.getrandbits(128):032x}"
+        span = Span(self, name, trace_id, parent.span_id if parent is not None else None,
+                    {**_correlation.get(), **(attributes or {})})
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            span.set_status("ERROR", str(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+
+
+class _OpenTelemetryTracer:
+    """Delegates to the opentelemetry API, adding the correlation attributes"""
+
+    def __init__(self):
+        from opentelemetry import trace
+        self._trace = trace
+        self._tracer = trace.get_tracer("subtitle_core")
+
+    @contextmanager
+    def start_as_current_span(self, name: str, attributes: Dict = None):
+        attributes = {key: value for key, value in {**_correlation.get(), **(attributes or {})}.items()
+                      if value is not None}
+        with self._tracer.start_as_current_span(name, attributes=attributes) as span:
+            yield span
+
+
+_tracer = Tracer()
+
+
+def configure_tracing(mode: str = TRACING, path: str = TRACE_FILE, exporter=None):
+    """Select where spans go: "off", "file" (path) or "otel"; or pass any exporter with export(dict)"""
+    global _tracer
+    previous = getattr(_tracer, 'exporter', None)
+    if exporter is not None:
+        _tracer = Tracer(exporter)
+    elif mode == "file":
+        _tracer = Tracer(FileSpanExporter(path))
+    elif mode == "otel":
+        _tracer = _OpenTelemetryTracer()
+    elif mode == "off":
+        _tracer = Tracer()
+    else:
+        raise ValueError(f"Unknown tracing mode '{mode}'. Use off, file or otel")
+    if previous is not None and previous is not exporter:
+        previous.shutdown()
+    return _tracer
+
+
+def get_tracer():
+    return _tracer
+
+
+def start_span(name: str, **attributes):
+    """``with start_span("name", language="es") as span:`` on the configured tracer"""
+    return _tracer.start_as_current_span(name, attributes)
+
+
+def current_span():
+    """The active span (a no-op span when there is none or tracing is off)"""
+    if isinstance(_tracer, _OpenTelemetryTracer):
+        return _tracer._trace.get_current_span()
+    return _current_span.get() or NOOP_SPAN
+
+
+def set_trace_attributes(**attributes) -> None:
+    """Tag the current span and every span started later in this context
+
+    Used for correlation ids such as session_id that are only known part way
+    through a request.
+    """
+    attributes = {key: value for key, value in attributes.items() if value is not None}
+    current_span().set_attributes(attributes)
+    _correlation.set({**_correlation.get(), **attributes})
+
+
+def bind_context(function: Callable) -> Callable:
+    """Wrap function to run in a copy of the current context, for use on another thread
+
+    Threads do not inherit contextvars, so without this spans started in a
+    worker thread would begin a new trace and lose the correlation attributes,
+    and an active sampling profile (profiling.py) would not see the thread.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        # A context can only be entered by one thread at a time
+        return context.copy().run(run_in_profile, function, *args, **kwargs)
+    return run
+
+
+if TRACING != "off":
+    configure_tracing(TRACING)
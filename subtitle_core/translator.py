@@ -0,0 +1,603 @@
+import os
+import json
+import requests
+from typing import Dict, List
+
+from .config import AZURE_TRANSLATOR_ENDPOINT, GOOGLE_TRANSLATE_URL, LIBRETRANSLATE_URL, TARGET_LANGUAGES
+from .formats import format_timestamp, parse_srt_subtitles
+from .metrics import TRANSLATION_REQUESTS, TRANSLATION_SECONDS, metrics, stage_timer
+from .tracing import current_span, start_span
+from .notify import warn
+
+
+def _google_translator(source: str, target: str):
+    """deep-translator's GoogleTranslator, querying GOOGLE_TRANSLATE_URL instead of Google when set
+
+    GoogleTranslator always hands Google's URL to BaseTranslator's
+    ``base_url``, so a configured URL replaces that base URL after
+    construction; the query and the page parsing stay deep-translator's.
+    """
+    from deep_translator import GoogleTranslator
+    translator = GoogleTranslator(source=source, target=target)
+    if GOOGLE_TRANSLATE_URL:
+        if not hasattr(translator, '_base_url'):
+            raise RuntimeError("GOOGLE_TRANSLATE_URL is not supported by this deep-translator version")
+        translator._base_url = GOOGLE_TRANSLATE_URL
+    return translator
+
+
+class SubtitleTranslator:
+    def __init__(self, service: str = "google_free"):
+        self.service = service
+    
+    def translate_text_google_free(self, text: str, target_lang: str, source_lang: str = "auto") -> str:
+        """Enhanced translation with context awareness, especially for English"""
+        try:
+            # Clean the text but preserve formatting
+            text = text.strip()
+            if not text:
+                return text
+            
+            # Enhanced prompting for English translations
+            if target_lang == "en":
+                # Add context cues for more natural English
+                if any(word in text.lower() for word in ["hello", "hi", "hey", "good morning", "good evening"]):
+                    text = f"Translate this greeting naturally to conversational English: {text}"
+                elif any(word in text.lower() for word in ["thank", "thanks", "please", "sorry", "excuse"]):
+                    text = f"Translate this polite expression to natural English: {text}"
+                elif "?" in text:
+                    text = f"Translate this question to natural English: {text}"
+                elif "!" in text:
+                    text = f"Translate this exclamation to natural English: {text}"
+                else:
+                    text = f"Translate to natural conversational English: {text}"
+            
+            # Use deep-translator which is more stable
+            translator = _google_translator(source_lang, target_lang)
+            
+            # Split long text into chunks if needed (deep-translator has limits)
+            max_length = 4500  # Safe limit for Google Translate
+            if len(text) > max_length:
+                # Split by sentences or periods
+                sentences = text.split('. ')
+                translated_parts = []
+                current_chunk = ""
+                
+                for sentence in sentences:
+                    if len(current_chunk + sentence) < max_length:
+                        current_chunk += sentence + ". "
+                    else:
+                        if current_chunk:
+                            translated_chunk = translator.translate(current_chunk.strip())
+                            # Clean up English translation artifacts
+                            if target_lang == "en":
+                                translated_chunk = self.clean_english_translation(translated_chunk)
+                            translated_parts.append(translated_chunk)
+                        current_chunk = sentence + ". "
+                
+                # Translate remaining chunk
+                if current_chunk:
+                    translated_chunk = translator.translate(current_chunk.strip())
+                    if target_lang == "en":
+                        translated_chunk = self.clean_english_translation(translated_chunk)
+                    translated_parts.append(translated_chunk)
+                
+                return " ".join(translated_parts)
+            else:
+                # Translate normally for shorter text
+                result = translator.translate(text)
+                if target_lang == "en":
+                    result = self.clean_english_translation(result)
+                return result
+            
+        except Exception as e:
+            warn(f"Google Translation failed: {str(e)}")
+            # Fallback: return text with language indicator
+            return f"[{target_lang.upper()}] {text}"
+    
+    def translate_text_libre(self, text: str, target_lang: str, source_lang: str = "auto") -> str:
+        """Translate text using LibreTranslate API with improved error handling"""
+        try:
+            # Clean the text
+            text = text.strip()
+            if not text:
+                return text
+            
+            if LIBRETRANSLATE_URL:
+                # A configured instance is used exclusively
+                urls = [LIBRETRANSLATE_URL]
+            else:
+                # Try deep-translator's LibreTranslate first (more reliable)
+                try:
+                    from deep_translator import LibreTranslator
+                    translator = LibreTranslator(source=source_lang, target=target_lang)
+                    return translator.translate(text)
+                except Exception:
+                    pass
+                
+                # Fallback to direct API calls with multiple endpoints
+                urls = [
+                    "https://libretranslate.de/translate",
+                    "https://translate.terraprint.co/translate",
+                    "https://libretranslate.com/translate"
+                ]
+            
+            for url in urls:
+                try:
+                    data = {
+                        "q": text,
+                        "source": "auto" if source_lang == "auto" else source_lang,
+                        "target": target_lang,
+                        "format": "text"
+                    }
+                    
+                    response = requests.post(url, data=data, timeout=15)
+                    
+                    if response.status_code == 200:
+                        try:
+                            result = response.json()
+                            translated_text = result.get("translatedText", "")
+                            if translated_text and translated_text != text:
+                                return translated_text
+                        except json.JSONDecodeError:
+                            continue
+                    
+                except requests.exceptions.RequestException:
+                    continue
+            
+            # If all LibreTranslate instances fail, fallback to Google Translate
+            warn("LibreTranslate services unavailable, falling back to Google Translate")
+            return self.translate_text_google_free(text, target_lang, source_lang)
+            
+        except Exception as e:
+            warn(f"LibreTranslate failed: {str(e)}, falling back to Google Translate")
+            return self.translate_text_google_free(text, target_lang, source_lang)
+    
+    def translate_text_azure(self, text: str, target_lang: str, api_key: str, region: str = "global") -> str:
+        """Translate text using Azure Translator API"""
+        try:
+            endpoint = AZURE_TRANSLATOR_ENDPOINT
+            path = '/translate'
+            constructed_url = endpoint + path
+            
+            params = {
+                'api-version': '3.0',
+                'to': target_lang
+            }
+            
+            headers = {
+                'Ocp-Apim-Subscription-Key': api_key,
+                'Ocp-Apim-Subscription-Region': region,
+                'Content-type': 'application/json',
+                'X-ClientTraceId': str(os.urandom(16).hex())
+            }
+            
+            body = [{'text': text}]
+            
+            response = requests.post(constructed_url, params=params, headers=headers, json=body)
+            if response.status_code == 200:
+                result = response.json()
+                return result[0]['translations'][0]['text']
+            else:
+                return text
+        except Exception as e:
+            warn(f"Azure translation failed: {str(e)}")
+            return text
+    
+    def translate_subtitle_text(self, text: str, target_lang: str, api_key: str = None) -> str:
+        """Translate subtitle text while preserving speaker labels and formatting"""
+        with start_span("translate_call", service=self.service, language=target_lang, chars=len(text)) as span, \
+                metrics.timer(TRANSLATION_SECONDS, service=self.service, language=target_lang):
+            translated = self._translate_subtitle_text(text, target_lang, api_key)
+            # Services fall back to the source text (possibly tagged [XX]) when they fail
+            unchanged = translated == text or translated == f"[{target_lang.upper()}] {text}"
+            span.set_attribute('result', "unchanged" if unchanged else "translated")
+        metrics.inc(TRANSLATION_REQUESTS, service=self.service, result="unchanged" if unchanged else "translated")
+        return translated
+    
+    def _translate_subtitle_text(self, text: str, target_lang: str, api_key: str = None) -> str:
+        try:
+            if self.service == "google_free":
+                return self.translate_text_google_free(text, target_lang)
+            elif self.service == "libre":
+                return self.translate_text_libre(text, target_lang)
+            elif self.service == "azure" and api_key:
+                return self.translate_text_azure(text, target_lang, api_key)
+            else:
+                return text
+        except Exception as e:
+            warn(f"Translation service failed: {str(e)}")
+            # Simple fallback: return with language indicator
+            return f"[{target_lang.upper()}] {text}"
+    
+    def clean_english_translation(self, text: str) -> str:
+        """Clean up English translation artifacts and improve naturalness"""
+        if not text:
+            return text
+        
+        # Remove translation prompt artifacts
+        cleaned = text
+        
+        # Remove common translation prompts that might leak through
+        prompts_to_remove = [
+            "Translate this greeting naturally to conversational English:",
+            "Translate this polite expression to natural English:",
+            "Translate this question to natural English:",
+            "Translate this exclamation to natural English:",
+            "Translate to natural conversational English:",
+            "Translation:",
+            "English:",
+            "The translation is:",
+            "In English:",
+        ]
+        
+        for prompt in prompts_to_remove:
+            cleaned = cleaned.replace(prompt, "").strip()
+        
+        # Fix common English translation issues
+        fixes = {
+            # Grammar improvements
+            " a hour": " an hour",
+            " a university": " a university", 
+            " an university": " a university",
+            " a apple": " an apple",
+            " a orange": " an orange",
+            " a elephant": " an elephant",
+            
+            # Natural conversation patterns
+            "very very ": "really ",
+            "more better": "better",
+            "most best": "best",
+            "can not": "cannot",
+            
+            # Proper capitalization
+            " i ": " I ",
+            " i'm": " I'm",
+            " i'll": " I'll", 
+            " i've": " I've",
+            " i'd": " I'd",
+            " i.": " I.",
+            " i,": " I,",
+            " i!": " I!",
+            " i?": " I?",
+        }
+        
+        # Apply fixes
+        for old, new in fixes.items():
+            cleaned = cleaned.replace(old, new)
+        
+        # Ensure proper sentence capitalization
+        if cleaned and len(cleaned) > 0:
+            cleaned = cleaned[0].upper() + cleaned[1:] if len(cleaned) > 1 else cleaned.upper()
+        
+        # Ensure proper punctuation for natural speech
+        if cleaned and not cleaned.endswith(('.', '!', '?', ':', ';', ',')):
+            # Add period for statements, but be smart about it
+            if any(word in cleaned.lower() for word in ['hello', 'hi', 'hey', 'thanks', 'yes', 'no', 'okay', 'ok']):
+                # Short responses don't always need periods
+                pass
+            else:
+                cleaned += "."
+        
+        return cleaned.strip()
+
+def create_simple_translation_map() -> Dict[str, Dict[str, str]]:
+    """Create a simple translation map for common subtitle phrases"""
+    return {
+        "es": {  # Spanish
+            "Hello": "Hola",
+            "Thank you": "Gracias", 
+            "Yes": "Sí",
+            "No": "No",
+            "Please": "Por favor",
+            "Sorry": "Lo siento",
+            "Excuse me": "Disculpe",
+            "Good morning": "Buenos días",
+            "Good afternoon": "Buenas tardes",
+            "Good evening": "Buenas noches",
+            "Goodbye": "Adiós"
+        },
+        "fr": {  # French
+            "Hello": "Bonjour",
+            "Thank you": "Merci",
+            "Yes": "Oui", 
+            "No": "Non",
+            "Please": "S'il vous plaît",
+            "Sorry": "Désolé",
+            "Excuse me": "Excusez-moi",
+            "Good morning": "Bonjour",
+            "Good afternoon": "Bon après-midi",
+            "Good evening": "Bonsoir",
+            "Goodbye": "Au revoir"
+        },
+        "de": {  # German
+            "Hello": "Hallo",
+            "Thank you": "Danke",
+            "Yes": "Ja",
+            "No": "Nein", 
+            "Please": "Bitte",
+            "Sorry": "Entschuldigung",
+            "Excuse me": "Entschuldigen Sie",
+            "Good morning": "Guten Morgen",
+            "Good afternoon": "Guten Tag",
+            "Good evening": "Guten Abend",
+            "Goodbye": "Auf Wiedersehen"
+        }
+    }
+
+def check_translation_service_status(service: str) -> bool:
+    """Check if a translation service is available"""
+    try:
+        if service == "libre":
+            # Quick test with LibreTranslate using deep-translator
+            try:
+                from deep_translator import LibreTranslator
+                translator = LibreTranslator(source="en", target="es")
+                result = translator.translate("test")
+                return bool(result and result != "test")
+            except Exception:
+                # Fallback to direct API test
+                try:
+                    response = requests.post(LIBRETRANSLATE_URL or "https://libretranslate.de/translate", 
+                        data={"q": "test", "source": "en", "target": "es", "format": "text"}, 
+                        timeout=5
+                    )
+                    return response.status_code == 200
+                except Exception:
+                    return False
+        elif service == "google_free":
+            # Quick test with Google Translate using deep-translator
+            try:
+                translator = _google_translator("en", "es")
+                result = translator.translate("test")
+                return bool(result and result != "test")
+            except Exception:
+                return False
+        return True
+    except Exception:
+        return False
+
+@stage_timer("translate")
+def translate_subtitles_preserve_structure(srt_content: str, target_language: str, 
+                                         translation_service: str = "google_free", 
+                                         api_key: str = None) -> str:
+    """
+    Translate SRT subtitles with context awareness while preserving timestamps, speaker diarization, and structure
+    """
+    if not srt_content or not target_language:
+        return srt_content
+    
+    translator = SubtitleTranslator(translation_service)
+    target_lang_code = TARGET_LANGUAGES.get(target_language, "en")
+    
+    # Parse original subtitles to preserve structure
+    subtitles = parse_srt_subtitles(srt_content)
+    current_span().set_attributes({'language': target_lang_code, 'service': translation_service, 'cues': len(subtitles)})
+    
+    # Enhanced context-aware translation for English
+    if target_lang_code == "en":
+        return translate_with_context_awareness(subtitles, translator, api_key)
+    
+    # Standard translation for other languages
+    translated_srt = ""
+    
+    for subtitle in subtitles:
+        original_text = subtitle['text']
+        
+        # Check if text contains speaker label [Speaker_X]
+        speaker_label = ""
+        text_to_translate = original_text
+        
+        if original_text.startswith('[') and ']' in original_text:
+            # Extract speaker label
+            end_bracket = original_text.find(']')
+            speaker_label = original_text[:end_bracket + 1] + " "
+            text_to_translate = original_text[end_bracket + 1:].strip()
+        
+        # Translate only the actual text, not the speaker label
+        if text_to_translate:
+            translated_text = translator.translate_subtitle_text(text_to_translate, target_lang_code, api_key)
+        else:
+            translated_text = text_to_translate
+        
+        # Reconstruct the subtitle with preserved structure
+        final_text = speaker_label + translated_text
+        
+        # Reconstruct SRT format with preserved timestamps
+        start_timestamp = format_timestamp(subtitle['start'])
+        end_timestamp = format_timestamp(subtitle['end'])
+        
+        translated_srt += f"{subtitle['id']}\n"
+        translated_srt += f"{start_timestamp} --> {end_timestamp}\n"
+        translated_srt += f"{final_text}\n\n"
+    
+    return translated_srt
+
+def translate_with_context_awareness(subtitles: List[Dict], translator: SubtitleTranslator, api_key: str = None) -> str:
+    """
+    Enhanced context-aware translation specifically optimized for English
+    """
+    translated_srt = ""
+    conversation_context = []
+    speaker_contexts = {}
+    
+    # Group subtitles by conversation segments
+    conversation_segments = group_by_conversation_segments(subtitles)
+    
+    for segment in conversation_segments:
+        # Translate each conversation segment with full context
+        segment_texts = []
+        speaker_info = []
+        
+        for subtitle in segment:
+            original_text = subtitle['text']
+            speaker_label = ""
+            text_content = original_text
+            
+            # Extract speaker information
+            if original_text.startswith('[') and ']' in original_text:
+                end_bracket = original_text.find(']')
+                speaker_label = original_text[:end_bracket + 1]
+                text_content = original_text[end_bracket + 1:].strip()
+                
+                # Build speaker context
+                speaker_id = speaker_label.strip('[]')
+                if speaker_id not in speaker_contexts:
+                    speaker_contexts[speaker_id] = []
+                speaker_contexts[speaker_id].append(text_content)
+            
+            segment_texts.append(text_content)
+            speaker_info.append((speaker_label, subtitle['id'], subtitle['start'], subtitle['end']))
+        
+        # Create context-aware translation prompt
+        if len(segment_texts) > 1:
+            # Multi-line conversation - translate with context
+            context_text = " | ".join(segment_texts)
+            context_prompt = f"Translate this conversation naturally to English, maintaining conversational flow and context: {context_text}"
+            
+            try:
+                translated_conversation = translator.translate_subtitle_text(context_prompt, "en", api_key)
+                # Extract individual translations from context
+                context_translations = extract_individual_translations(translated_conversation, len(segment_texts))
+            except Exception as e:
+                # Fallback to individual translation
+                context_translations = [translator.translate_subtitle_text(text, "en", api_key) for text in segment_texts]
+        else:
+            # Single line - translate with accumulated context
+            context_translations = [enhance_single_translation(segment_texts[0], conversation_context, translator, api_key)]
+        
+        # Reconstruct SRT with enhanced translations
+        for i, (speaker_label, sub_id, start_time, end_time) in enumerate(speaker_info):
+            if i < len(context_translations):
+                enhanced_text = context_translations[i]
+                
+                # Apply English-specific enhancements
+                enhanced_text = apply_english_enhancements(enhanced_text, speaker_label)
+                
+                # Add speaker label back
+                final_text = f"{speaker_label} {enhanced_text}" if speaker_label else enhanced_text
+                
+                # Update conversation context
+                conversation_context.append(enhanced_text)
+                if len(conversation_context) > 5:  # Keep last 5 for context
+                    conversation_context.pop(0)
+                
+                # Build SRT entry
+                start_timestamp = format_timestamp(start_time)
+                end_timestamp = format_timestamp(end_time)
+                
+                translated_srt += f"{sub_id}\n"
+                translated_srt += f"{start_timestamp} --> {end_timestamp}\n"
+                translated_srt += f"{final_text}\n\n"
+    
+    return translated_srt
+
+def group_by_conversation_segments(subtitles: List[Dict], max_gap: float = 3.0) -> List[List[Dict]]:
+    """Group subtitles into conversation segments based on time gaps"""
+    if not subtitles:
+        return []
+    
+    segments = []
+    current_segment = [subtitles[0]]
+    
+    for i in range(1, len(subtitles)):
+        time_gap = subtitles[i]['start'] - subtitles[i-1]['end']
+        
+        # Start new segment if gap is too large or speaker changes significantly
+        if time_gap > max_gap:
+            segments.append(current_segment)
+            current_segment = [subtitles[i]]
+        else:
+            current_segment.append(subtitles[i])
+    
+    segments.append(current_segment)
+    return segments
+
+def extract_individual_translations(context_translation: str, expected_count: int) -> List[str]:
+    """Extract individual translations from context-aware translation"""
+    # Split by common separators
+    separators = [' | ', ' |', '| ', '|', '. ', '; ', '\n']
+    
+    for sep in separators:
+        if sep in context_translation:
+            parts = context_translation.split(sep)
+            if len(parts) == expected_count:
+                return [part.strip() for part in parts]
+    
+    # Fallback: split by sentences
+    sentences = context_translation.split('. ')
+    if len(sentences) >= expected_count:
+        return sentences[:expected_count]
+    
+    # Last resort: return the whole translation for first item
+    return [context_translation] + [""] * (expected_count - 1)
+
+def enhance_single_translation(text: str, context: List[str], translator: SubtitleTranslator, api_key: str = None) -> str:
+    """Enhance single line translation with conversation context"""
+    if not context:
+        return translator.translate_subtitle_text(text, "en", api_key)
+    
+    # Create context-aware prompt
+    recent_context = " ".join(context[-3:])  # Last 3 lines of context
+    context_prompt = f"Given this conversation context: '{recent_context}', translate this naturally to English: '{text}'"
+    
+    try:
+        enhanced = translator.translate_subtitle_text(context_prompt, "en", api_key)
+        # Extract just the translation part (remove context explanation)
+        if "translate" in enhanced.lower() and ":" in enhanced:
+            enhanced = enhanced.split(":")[-1].strip()
+        return enhanced
+    except Exception as e:
+        return translator.translate_subtitle_text(text, "en", api_key)
+
+def apply_english_enhancements(text: str, speaker_label: str = "") -> str:
+    """Apply English-specific enhancements for natural conversation"""
+    if not text:
+        return text
+    
+    # Remove translation artifacts
+    text = text.replace("Translate this", "").replace("translate this", "")
+    text = text.replace("Translation:", "").replace("translation:", "")
+    
+    # Fix common translation issues
+    enhancements = {
+        # Casual conversation improvements
+        " uh ": " um ",
+        " yeah ": " yes ",
+        " gonna ": " going to ",
+        " wanna ": " want to ",
+        " gotta ": " have to ",
+        
+        # Formal improvements
+        " i ": " I ",
+        " i'm ": " I'm ",
+        " i'll ": " I'll ",
+        " i've ": " I've ",
+        " i'd ": " I'd ",
+        
+        # Common grammar fixes
+        " a apple": " an apple",
+        " a orange": " an orange",
+        " a hour": " an hour",
+        " a university": " a university",
+        
+        # Speech patterns
+        "very very ": "really ",
+        "more better": "better",
+        "most best": "best",
+    }
+    
+    # Apply enhancements
+    enhanced_text = text
+    for old, new in enhancements.items():
+        enhanced_text = enhanced_text.replace(old, new)
+    
+    # Capitalize first letter
+    if enhanced_text:
+        enhanced_text = enhanced_text[0].upper() + enhanced_text[1:] if len(enhanced_text) > 1 else enhanced_text.upper()
+    
+    # Ensure proper ending punctuation for dialogue
+    if enhanced_text and not enhanced_text.endswith(('.', '!', '?', ':')):
+        enhanced_text += "."
+    
+    return enhanced_text.strip()
@@ -0,0 +1,263 @@
+import io
+import os
+import bisect
+import wave
+import tempfile
+import subprocess
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from .audio import find_ffmpeg, get_audio_profile
+from .scheduler import ExtractionScheduler, ffmpeg_slot, ffmpeg_thread_args
+
+# Voice activity detection defaults
+VAD_SAMPLE_RATE = 16000
+VAD_FRAME_MS = 30               # Analysis frame length
+VAD_MARGIN_DB = 12.0            # Speech must be this much louder than the noise floor
+VAD_MIN_SPEECH_MS = 150         # Shorter bursts are treated as noise
+VAD_MIN_SILENCE_MS = 700        # Shorter pauses are kept as-is
+VAD_PADDING_MS = 200            # Context kept around each speech region
+VAD_KEEP_SILENCE_MS = 300       # Silence left between compressed regions
+VAD_MIN_SAVINGS = 0.05          # Skip trimming if it removes less than 5% of the audio
+
+
+class OffsetMap:
+    """Maps timestamps in trimmed audio back to the original timeline
+
+    Each kept span is stored as (trimmed_start, original_start, duration) in
+    seconds, in order. A timestamp inside the short silence inserted between
+    two spans maps into the (longer) original silence after the first span.
+    """
+
+    def __init__(self, spans: List[Tuple[float, float, float]]):
+        self.spans = spans
+        self._trimmed_starts = [span[0] for span in spans]
+
+    def to_original(self, t: float) -> float:
+        if not self.spans:
+            return t
+        index = max(bisect.bisect_right(self._trimmed_starts, t) - 1, 0)
+        trimmed_start, original_start, _ = self.spans[index]
+        return original_start + (t - trimmed_start)
+
+    @property
+    def trimmed_duration(self) -> float:
+        if not self.spans:
+            return 0.0
+        return self.spans[-1][0] + self.spans[-1][2]
+
+    def to_dict(self) -> Dict:
+        return {'spans': [list(span) for span in self.spans]}
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "OffsetMap":
+        return cls([tuple(span) for span in data.get('spans', [])])
+
+
+class TrimmedAudio(NamedTuple):
+    audio: bytes
+    filename: str
+    mime_type: str
+    offset_map: OffsetMap
+    original_duration: float
+    trimmed_duration: float
+
+
+def decode_audio(audio_bytes: bytes, sample_rate: int = VAD_SAMPLE_RATE,
+                 scheduler: ExtractionScheduler = None):
+    """Decode any audio/video payload to mono float32 samples
+
+    Uses an ffmpeg pipe when available (fast, no temp files) and falls back to
+    librosa otherwise. Given a ``scheduler``, ffmpeg waits for one of its slots.
+    """
+    import numpy as np
+
+    try:
+        ffmpeg_cmd = find_ffmpeg()
+    except FileNotFoundError:
+        ffmpeg_cmd = None
+
+    if ffmpeg_cmd:
+        with ffmpeg_slot(scheduler):
+            result = subprocess.run([ffmpeg_cmd] + ffmpeg_thread_args(scheduler) + [
+                '-i', 'pipe:0', '-vn', '-ac', '1', '-ar', str(sample_rate),
+                '-f', 's16le', '-acodec', 'pcm_s16le', 'pipe:1'
+            ], input=audio_bytes, capture_output=True, check=True)
+        return np.frombuffer(result.stdout, dtype=np.int16).astype(np.float32) / 32768.0
+
+    import librosa
+
+    # librosa/audioread need a real file for compressed formats such as mp3
+    with tempfile.NamedTemporaryFile(suffix='.audio', delete=False) as temp_audio:
+        temp_audio.write(audio_bytes)
+        temp_audio_path = temp_audio.name
+    try:
+        samples, _ = librosa.load(temp_audio_path, sr=sample_rate, mono=True)
+    finally:
+        os.unlink(temp_audio_path)
+    return samples.astype(np.float32)
+
+
+def detect_speech_regions(samples, sample_rate: int = VAD_SAMPLE_RATE,
+                          frame_ms: int = VAD_FRAME_MS,
+                          margin_db: float = VAD_MARGIN_DB,
+                          min_speech_ms: int = VAD_MIN_SPEECH_MS,
+                          min_silence_ms: int = VAD_MIN_SILENCE_MS,
+                          padding_ms: int = VAD_PADDING_MS) -> List[Tuple[int, int]]:
+    """Find speech regions with an adaptive frame-energy detector
+
+    Returns a list of (start_sample, end_sample) pairs. The threshold adapts to
+    the recording: it sits ``margin_db`` above the estimated noise floor (10th
+    percentile of frame energy), so quiet lecture halls and noisy rooms both work.
+    """
+    import numpy as np
+
+    frame_length = max(int(sample_rate * frame_ms / 1000), 1)
+    n_frames = len(samples) // frame_length
+    if n_frames == 0:
+        return [(0, len(samples))] if len(samples) else []
+
+    frames = samples[:n_frames * frame_length].reshape(n_frames, frame_length)
+    rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+    energy_db = 20 * np.log10(np.maximum(rms, 1e-10))
+
+    noise_floor = np.percentile(energy_db, 10)
+    speech = energy_db > max(noise_floor + margin_db, energy_db.max() - 60)
+
+    # Run-length encode the frame decisions: boundaries where speech toggles
+    changes = np.flatnonzero(np.diff(speech.astype(np.int8))) + 1
+    bounds = np.concatenate(([0], changes, [n_frames]))
+    runs = [(int(bounds[i]), int(bounds[i + 1]), bool(speech[bounds[i]])) for i in range(len(bounds) - 1)]
+
+    min_silence_frames = min_silence_ms / frame_ms
+    min_speech_frames = min_speech_ms / frame_ms
+
+    # Bridge short pauses, then drop short bursts
+    regions = []
+    for start, end, is_speech in runs:
+        if is_speech:
+            if regions and start - regions[-1][1] < min_silence_frames:
+                regions[-1][1] = end
+            else:
+                regions.append([start, end])
+    regions = [r for r in regions if r[1] - r[0] >= min_speech_frames]
+
+    # Pad and convert to samples, merging regions that now overlap
+    padding = int(sample_rate * padding_ms / 1000)
+    merged = []
+    for start, end in regions:
+        start = max(start * frame_length - padding, 0)
+        end = min(end * frame_length + padding, len(samples))
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def compress_silence(samples, regions: List[Tuple[int, int]], sample_rate: int = VAD_SAMPLE_RATE,
+                     keep_silence_ms: int = VAD_KEEP_SILENCE_MS):
+    """Concatenate speech regions separated by short silences and build the offset map"""
+    import numpy as np
+
+    gap = np.zeros(int(sample_rate * keep_silence_ms / 1000), dtype=samples.dtype)
+    pieces = []
+    spans = []
+    position = 0
+    for index, (start, end) in enumerate(regions):
+        if index:
+            pieces.append(gap)
+            position += len(gap)
+        pieces.append(samples[start:end])
+        spans.append((position / sample_rate, start / sample_rate, (end - start) / sample_rate))
+        position += end - start
+
+    trimmed = np.concatenate(pieces) if pieces else samples[:0]
+    return trimmed, OffsetMap(spans)
+
+
+def encode_speech_audio(samples, sample_rate: int = VAD_SAMPLE_RATE,
+                        profile: str = None, scheduler: ExtractionScheduler = None) -> Tuple[bytes, str, str]:
+    """Encode mono float samples for upload; returns (bytes, filename, mime type)
+
+    Uses the given audio profile via ffmpeg when available (in a slot of
+    ``scheduler`` if given), otherwise 16-bit WAV.
+    """
+    import numpy as np
+
+    pcm = (np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes()
+    audio_profile = get_audio_profile(profile)
+
+    try:
+        ffmpeg_cmd = find_ffmpeg()
+        # Encode through a temp file: some containers (ogg, flac) need a seekable output
+        with tempfile.NamedTemporaryFile(suffix=audio_profile.extension, delete=False) as temp_audio:
+            temp_audio_path = temp_audio.name
+        try:
+            with ffmpeg_slot(scheduler):
+                subprocess.run(
+                    [ffmpeg_cmd, '-f', 's16le', '-ar', str(sample_rate), '-ac', '1', '-i', 'pipe:0']
+                    + audio_profile.codec_args + ffmpeg_thread_args(scheduler) + ['-y', temp_audio_path],
+                    input=pcm, capture_output=True, check=True
+                )
+            with open(temp_audio_path, 'rb') as f:
+                return f.read(), f"audio{audio_profile.extension}", audio_profile.mime_type
+        finally:
+            os.unlink(temp_audio_path)
+    except (FileNotFoundError, subprocess.CalledProcessError):
+        buffer = io.BytesIO()
+        with wave.open(buffer, 'wb') as wav_file:
+            wav_file.setnchannels(1)
+            wav_file.setsampwidth(2)
+            wav_file.setframerate(sample_rate)
+            wav_file.writeframes(pcm)
+        return buffer.getvalue(), 'audio.wav', 'audio/wav'
+
+
+def trim_silence(audio_bytes: bytes, sample_rate: int = VAD_SAMPLE_RATE,
+                 keep_silence_ms: int = VAD_KEEP_SILENCE_MS,
+                 min_savings: float = VAD_MIN_SAVINGS, profile: str = None,
+                 scheduler: ExtractionScheduler = None, **vad_options) -> Optional[TrimmedAudio]:
+    """Drop long silent stretches from audio before upload
+
+    Returns None when trimming would save less than ``min_savings`` of the
+    duration (the original audio should then be uploaded unchanged). Given a
+    ``scheduler``, the decode and encode ffmpeg runs each wait for one of its
+    slots.
+    """
+    samples = decode_audio(audio_bytes, sample_rate, scheduler)
+    original_duration = len(samples) / sample_rate
+    if original_duration == 0:
+        return None
+
+    regions = detect_speech_regions(samples, sample_rate, **vad_options)
+    trimmed, offset_map = compress_silence(samples, regions, sample_rate, keep_silence_ms)
+    trimmed_duration = len(trimmed) / sample_rate
+
+    if not regions or trimmed_duration > original_duration * (1 - min_savings):
+        return None
+
+    audio, filename, mime_type = encode_speech_audio(trimmed, sample_rate, profile, scheduler)
+    return TrimmedAudio(audio, filename, mime_type, offset_map, original_duration, trimmed_duration)
+
+
+def remap_transcription(transcription: Dict, offset_map: OffsetMap) -> Dict:
+    """Return a copy of an ElevenLabs transcription with timestamps on the original timeline"""
+    remapped = dict(transcription)
+    words = []
+    for word in transcription.get('words', []):
+        word = dict(word)
+        for key in ('start', 'end'):
+            if word.get(key) is not None:
+                word[key] = round(offset_map.to_original(word[key]), 3)
+        if word.get('characters'):
+            characters = []
+            for char in word['characters']:
+                char = dict(char)
+                for key in ('start', 'end'):
+                    if char.get(key) is not None:
+                        char[key] = round(offset_map.to_original(char[key]), 3)
+                characters.append(char)
+            word['characters'] = characters
+        words.append(word)
+    remapped['words'] = words
+    return remapped
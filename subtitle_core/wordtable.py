@@ -0,0 +1,207 @@
+import io
+import json
+from typing import Dict, Iterator, List, Optional, Sequence
+
+# Keys stored as columns; anything else on a word (e.g. character timings) is kept in ``extras``
+_COLUMN_KEYS = ('text', 'start', 'end', 'type', 'speaker_id')
+_FORMAT_VERSION = 1
+
+
+class WordTable:
+    """Columnar, compact form of an ElevenLabs transcription
+
+    Instead of one dict per word, timestamps are NumPy float64 arrays, word
+    types and speaker ids are small integer codes into interned lists, and all
+    word texts share one UTF-8 buffer addressed by offsets. A multi-hour
+    transcript takes a few MB instead of hundreds of MB of Python objects, and
+    saves/loads as a single ``.npz`` without pickling.
+
+    Everything except the word list (language_code, text, ...) is kept in
+    ``metadata``. Use ``to_transcription`` to get the original dict back.
+    """
+
+    def __init__(self, start, end, kind, speaker, text_offsets, text_data,
+                 kinds: List[str], speakers: List[Optional[str]],
+                 metadata: Dict = None, extras: Dict[int, Dict] = None):
+        self.start = start
+        self.end = end
+        self.kind = kind
+        self.speaker = speaker
+        self.text_offsets = text_offsets
+        self.text_data = text_data
+        self.kinds = kinds
+        self.speakers = speakers
+        self.metadata = metadata or {}
+        self.extras = extras or {}
+
+    @classmethod
+    def from_transcription(cls, transcription: Dict) -> "WordTable":
+        """Build a table from a transcription dict (the word dicts are not kept)"""
+        import numpy as np
+
+        words = transcription.get('words') or []
+        metadata = {key: value for key, value in transcription.items() if key != 'words'}
+        kinds = []
+        kind_codes = {}
+        speakers = []
+        speaker_codes = {}
+        missing = object()
+
+        count = len(words)
+        start = np.full(count, np.nan)
+        end = np.full(count, np.nan)
+        kind = np.empty(count, dtype=np.uint8)
+        speaker = np.empty(count, dtype=np.int16)
+        text_offsets = np.zeros(count + 1, dtype=np.uint32)
+        texts = []
+        extras = {}
+        position = 0
+
+        for index, word in enumerate(words):
+            if word.get('start') is not None:
+                start[index] = word['start']
+            if word.get('end') is not None:
+                end[index] = word['end']
+
+            word_type = word.get('type')
+            if word_type not in kind_codes:
+                kind_codes[word_type] = len(kinds)
+                kinds.append(word_type)
+            kind[index] = kind_codes[word_type]
+
+            speaker_id = word.get('speaker_id', missing)
+            if speaker_id is missing:
+                speaker[index] = -1
+            else:
+                if speaker_id not in speaker_codes:
+                    speaker_codes[speaker_id] = len(speakers)
+                    speakers.append(speaker_id)
+                speaker[index] = speaker_codes[speaker_id]
+
+            encoded = (word.get('text') or '').encode('utf-8')
+            texts.append(encoded)
+            position += len(encoded)
+            text_offsets[index + 1] = position
+
+            extra = {key: value for key, value in word.items() if key not in _COLUMN_KEYS}
+            if extra:
+                extras[index] = extra
+
+        text_data = np.frombuffer(b''.join(texts), dtype=np.uint8)
+        return cls(start, end, kind, speaker, text_offsets, text_data, kinds, speakers, metadata, extras)
+
+    def __len__(self) -> int:
+        return len(self.start)
+
+    def get(self, key: str, default=None):
+        """Metadata lookup, mirroring ``transcription.get``"""
+        if key == 'words':
+            return self.to_words()
+        return self.metadata.get(key, default)
+
+    def iter_words(self, types: Sequence[str] = None) -> Iterator[Dict]:
+        """Yield word dicts on demand (optionally only the given types, e.g. ('word',))"""
+        import numpy as np
+
+        indices = range(len(self))
+        if types is not None:
+            codes = [code for code, kind in enumerate(self.kinds) if kind in types]
+            indices = np.flatnonzero(np.isin(self.kind, codes)).tolist()
+
+        starts = self.start.tolist()
+        ends = self.end.tolist()
+        kind_names = [self.kinds[code] for code in self.kind.tolist()]
+        speaker_names = [self.speakers[code] if code >= 0 else None for code in self.speaker.tolist()]
+        has_speaker = (self.speaker >= 0).tolist()
+        offsets = self.text_offsets.tolist()
+        buffer = self.text_data.tobytes()
+        extras = self.extras
+
+        for index in indices:
+            word = {'text': buffer[offsets[index]:offsets[index + 1]].decode('utf-8')}
+            start = starts[index]
+            if start == start:  # NaN marks a missing timestamp
+                word['start'] = start
+            end = ends[index]
+            if end == end:
+                word['end'] = end
+            word['type'] = kind_names[index]
+            if has_speaker[index]:
+                word['speaker_id'] = speaker_names[index]
+            if extras and index in extras:
+                word.update(extras[index])
+            yield word
+
+    def to_words(self) -> List[Dict]:
+        return list(self.iter_words())
+
+    def to_transcription(self) -> Dict:
+        """Rebuild the ElevenLabs-shaped transcription dict"""
+        transcription = dict(self.metadata)
+        transcription['words'] = self.to_words()
+        return transcription
+
+    @property
+    def duration(self) -> float:
+        """End time of the last timed word (0 if there is none)"""
+        import numpy as np
+
+        valid = self.end[~np.isnan(self.end)]
+        return float(valid[-1]) if len(valid) else 0.0
+
+    def speaker_ids(self) -> List[str]:
+        """Distinct non-empty speaker ids that occur in the transcript"""
+        return [speaker for speaker in self.speakers if speaker]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(array.nbytes for array in (self.start, self.end, self.kind, self.speaker,
+                                              self.text_offsets, self.text_data))
+
+    def save(self, file, compress: bool = False) -> None:
+        """Write the table as .npz to a path or binary file object (no pickle)"""
+        import numpy as np
+
+        header = json.dumps({
+            'version': _FORMAT_VERSION,
+            'kinds': self.kinds,
+            'speakers': self.speakers,
+            'metadata': self.metadata,
+            'extras': {str(index): extra for index, extra in self.extras.items()},
+        }, ensure_ascii=False).encode('utf-8')
+        writer = np.savez_compressed if compress else np.savez
+        writer(file, start=self.start, end=self.end, kind=self.kind, speaker=self.speaker,
+               text_offsets=self.text_offsets, text_data=self.text_data,
+               header=np.frombuffer(header, dtype=np.uint8))
+
+    @classmethod
+    def load(cls, file) -> "WordTable":
+        """Read a table written by ``save``"""
+        import numpy as np
+
+        with np.load(file, allow_pickle=False) as data:
+            header = json.loads(data['header'].tobytes().decode('utf-8'))
+            if header.get('version') != _FORMAT_VERSION:
+                raise ValueError(f"Unsupported word table version: {header.get('version')}")
+            return cls(
+                data['start'], data['end'], data['kind'], data['speaker'],
+                data['text_offsets'], data['text_data'],
+                header['kinds'], header['speakers'], header['metadata'],
+                {int(index): extra for index, extra in header['extras'].items()}
+            )
+
+    def to_bytes(self, compress: bool = False) -> bytes:
+        buffer = io.BytesIO()
+        self.save(buffer, compress)
+        return buffer.getvalue()
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "WordTable":
+        return cls.load(io.BytesIO(data))
+
+
+def transcription_words(transcription) -> Iterator[Dict]:
+    """Words to segment from a transcription dict or WordTable (tables skip spacing entries)"""
+    if isinstance(transcription, WordTable):
+        return transcription.iter_words(('word',))
+    return iter((transcription or {}).get('words') or [])
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Tests for audio extraction: encoding profiles for transcription uploads and
+stream-copying suitable tracks. Extraction tests need ffmpeg and are skipped
+without it.
+
+Run with: python -m pytest -q test_audio.py
+"""
+
+import sys
+import os
+import subprocess
+import tempfile
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from subtitle_core import AUDIO_PROFILES, extract_audio, find_ffmpeg, get_audio_profile, probe_audio_stream
+from subtitle_core.audio import DEFAULT_AUDIO_PROFILE, STREAM_COPY_MAX_BITRATE, stream_copy_format
+
+
+def ffmpeg_or_skip() -> str:
+    try:
+        return find_ffmpeg()
+    except FileNotFoundError:
+        pytest.skip("ffmpeg is not installed")
+
+
+def make_video(audio_args) -> bytes:
+    """A 2 s 160x120 clip with a 44.1 kHz stereo tone encoded with ``audio_args``"""
+    ffmpeg_cmd = ffmpeg_or_skip()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "clip.mp4")
+        subprocess.run([
+            ffmpeg_cmd, '-f', 'lavfi', '-i', 'testsrc=size=160x120:rate=10:duration=2',
+            '-f', 'lavfi', '-i', 'sine=frequency=440:sample_rate=44100:duration=2',
+            '-ac', '2', '-c:v', 'libx264', '-pix_fmt', 'yuv420p'] + audio_args + ['-shortest', '-y', path],
+            check=True, capture_output=True)
+        with open(path, 'rb') as f:
+            return f.read()
+
+
+def probe_bytes(audio: bytes, suffix: str):
+    with tempfile.NamedTemporaryFile(suffix=suffix, delete=False) as temp_audio:
+        temp_audio.write(audio)
+    try:
+        return probe_audio_stream(temp_audio.name)
+    finally:
+        os.unlink(temp_audio.name)
+
+
+@pytest.fixture(scope="module")
+def aac_video():
+    return make_video(['-c:a', 'aac', '-b:a', '96k'])
+
+
+def test_profile_lookup():
+    assert get_audio_profile().name == DEFAULT_AUDIO_PROFILE
+    assert get_audio_profile("opus").extension == ".ogg"
+    with pytest.raises(ValueError) as error:
+        get_audio_profile("wav")
+    assert "speech_mp3" in str(error.value)
+
+
+def test_speech_profiles_downmix_to_16k_mono():
+    for name, profile in AUDIO_PROFILES.items():
+        assert profile.name == name
+        assert ['-ar', '16000'] == profile.codec_args[profile.codec_args.index('-ar'):][:2]
+        assert ('-ac' in profile.codec_args) == (name != "legacy_mp3")
+
+
+@pytest.mark.parametrize("name", sorted(AUDIO_PROFILES))
+def test_extract_audio_with_each_profile(aac_video, name):
+    profile = AUDIO_PROFILES[name]
+    extracted = extract_audio(aac_video, name)
+
+    assert extracted.profile == name
+    assert extracted.filename == f"audio{profile.extension}"
+    assert extracted.mime_type == profile.mime_type
+    stream = probe_bytes(extracted.audio, profile.extension)
+    # Opus always decodes at 48 kHz, whatever rate it was encoded from
+    assert stream['sample_rate'] == (48000 if name == "opus" else 16000)
+    assert stream['channels'] == (2 if name == "legacy_mp3" else 1)
+
+
+def test_transcribe_endpoint_rejects_unknown_audio_profile():
+    pytest.importorskip("fastapi")
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+    from fastapi.testclient import TestClient
+    import main
+
+    response = TestClient(main.app).post("/api/transcribe", files={'file': ("talk.mp3", b"audio", "audio/mpeg")},
+                                         data={'api_key': 'key', 'audio_profile': 'wav'})
+    assert response.status_code == 400
+    assert "audio profile" in response.json()['detail']
+
+
+def test_stream_copy_format():
+    assert stream_copy_format({'codec_name': 'aac', 'bit_rate': 96000}) == ('.m4a', 'audio/mp4')
+    assert stream_copy_format({'codec_name': 'opus', 'bit_rate': None}) == ('.ogg', 'audio/ogg')
+    assert stream_copy_format({'codec_name': 'mp3', 'bit_rate': STREAM_COPY_MAX_BITRATE}) == ('.mp3', 'audio/mpeg')
+    # Copying a high-bitrate track would upload more than re-encoding it
+    assert stream_copy_format({'codec_name': 'mp3', 'bit_rate': STREAM_COPY_MAX_BITRATE + 1}) is None
+    assert stream_copy_format({'codec_name': 'pcm_s16le', 'bit_rate': 705600}) is None
+    assert stream_copy_format({}) is None
+
+
+def test_suitable_track_is_stream_copied(aac_video):
+    extracted = extract_audio(aac_video, allow_stream_copy=True)
+    assert (extracted.profile, extracted.filename, extracted.mime_type) == ("stream_copy", "audio.m4a", "audio/mp4")
+    stream = probe_bytes(extracted.audio, ".m4a")
+    # Untouched: still the source's 44.1 kHz stereo AAC
+    assert (stream['codec_name'], stream['sample_rate'], stream['channels']) == ('aac', 44100, 2)
+
+
+def test_requested_profile_or_disabled_copy_re_encodes(aac_video):
+    assert extract_audio(aac_video, "speech_mp3", allow_stream_copy=True).profile == "speech_mp3"
+    assert extract_audio(aac_video, allow_stream_copy=False).profile == DEFAULT_AUDIO_PROFILE
+
+
+def test_high_bitrate_track_is_re_encoded():
+    video = make_video(['-c:a', 'aac', '-b:a', '320k'])
+    stream = probe_bytes(video, ".mp4")
+    if not stream['bit_rate'] or stream['bit_rate'] <= STREAM_COPY_MAX_BITRATE:
+        pytest.skip("the encoder did not reach a bitrate above the stream-copy limit")
+    assert extract_audio(video, allow_stream_copy=True).profile == DEFAULT_AUDIO_PROFILE
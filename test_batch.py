@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Tests for resuming the batch CLI: input fingerprints, stage keys and which
+stages a second run skips. Transcription and translation are stubbed.
+
+Run with: python -m pytest -q test_batch.py
+"""
+
+import sys
+import os
+import json
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import subtitle_batch
+from subtitle_batch import STATE_FILENAME, BatchState, build_parser, process_media_file
+from subtitle_core import ExtractionScheduler
+
+
+class StubGenerator:
+    calls = 0
+
+    def __init__(self, api_key):
+        self.api_key = api_key
+
+    def create_transcription(self, audio, **options):
+        StubGenerator.calls += 1
+        words = []
+        for index, token in enumerate("Hello everyone, welcome back. Today we talk about compilers.".split()):
+            words.append({'text': token, 'start': index * 0.5, 'end': index * 0.5 + 0.4,
+                          'type': 'word', 'speaker_id': 'speaker_0'})
+        return {'language_code': 'en', 'text': ' '.join(word['text'] for word in words), 'words': words}
+
+
+@pytest.fixture
+def media(tmp_path, monkeypatch):
+    StubGenerator.calls = 0
+    translations = []
+
+    def translate(srt_content, language, service, api_key):
+        translations.append(language)
+        return srt_content.replace("Hello", f"[{language}] Hello")
+    monkeypatch.setattr(subtitle_batch, "ElevenLabsSubtitleGenerator", StubGenerator)
+    monkeypatch.setattr(subtitle_batch, "translate_subtitles_preserve_structure", translate)
+
+    path = tmp_path / "lecture.mp3"
+    path.write_bytes(b"not really audio")
+    return path, translations
+
+
+def run(path, *options):
+    args = build_parser().parse_args([str(path.parent), "--api-key", "key"] + list(options))
+    state = BatchState(path.parent / STATE_FILENAME)
+    scheduler = ExtractionScheduler(max_concurrent=1)
+    try:
+        return process_media_file(path, args, state, scheduler)
+    finally:
+        scheduler.shutdown()
+
+
+def touch(path, seconds: int):
+    stat = path.stat()
+    os.utime(path, (stat.st_atime, int(stat.st_mtime) + seconds))
+
+
+def test_state_is_persisted_and_tied_to_the_input(tmp_path):
+    media_path = tmp_path / "talk.mp4"
+    media_path.write_bytes(b"video")
+    state = BatchState(tmp_path / STATE_FILENAME)
+    state.mark(media_path, 'transcription')
+    state.mark(media_path, 'subtitles:legacy')
+    state.mark(media_path, 'transcription')
+
+    reloaded = BatchState(tmp_path / STATE_FILENAME)
+    assert reloaded.completed_stages(media_path) == ['transcription', 'subtitles:legacy']
+    assert BatchState.fingerprint(media_path) == f"5:{int(media_path.stat().st_mtime)}"
+
+    reloaded.unmark(media_path, 'subtitles:legacy', 'translation:Spanish')
+    assert BatchState(tmp_path / STATE_FILENAME).completed_stages(media_path) == ['transcription']
+
+    # A new modification time invalidates every stage, and marking starts over
+    touch(media_path, 60)
+    assert reloaded.completed_stages(media_path) == []
+    reloaded.mark(media_path, 'ocr')
+    assert reloaded.completed_stages(media_path) == ['ocr']
+
+
+def test_corrupt_state_file_starts_fresh(tmp_path):
+    (tmp_path / STATE_FILENAME).write_text("{not json", encoding='utf-8')
+    media_path = tmp_path / "talk.mp4"
+    media_path.write_bytes(b"video")
+    assert BatchState(tmp_path / STATE_FILENAME).completed_stages(media_path) == []
+
+
+def test_second_run_skips_completed_stages(media):
+    path, translations = media
+    first = run(path, "--translate", "Spanish", "French")
+    assert first['completed'] == ['transcription', 'subtitles:legacy', 'translation:Spanish', 'translation:French']
+    assert (path.parent / "lecture.Spanish.srt").exists()
+    assert (path.parent / "lecture.French.vtt").exists()
+
+    second = run(path, "--translate", "Spanish", "French")
+    assert second['completed'] == []
+    assert second['skipped'] == ['transcription', 'subtitles:legacy', 'translation:Spanish', 'translation:French']
+    assert StubGenerator.calls == 1
+    assert translations == ['Spanish', 'French']
+
+
+def test_new_language_and_new_segmentation(media):
+    path, translations = media
+    run(path, "--translate", "Spanish")
+
+    added = run(path, "--translate", "Spanish", "German")
+    assert added['completed'] == ['translation:German']
+
+    # Another preset rebuilds the subtitles and every translation of them
+    resegmented = run(path, "--translate", "Spanish", "--segmentation", "compact")
+    assert resegmented['skipped'] == ['transcription']
+    assert resegmented['completed'] == ['subtitles:compact', 'translation:Spanish']
+    stages = BatchState(path.parent / STATE_FILENAME).completed_stages(path)
+    assert sorted(stages) == ['subtitles:compact', 'transcription', 'translation:Spanish']
+    assert StubGenerator.calls == 1
+
+
+def test_changed_input_reruns_every_stage(media):
+    path, translations = media
+    run(path, "--translate", "Spanish")
+    touch(path, 60)
+
+    rerun = run(path, "--translate", "Spanish")
+    assert rerun['skipped'] == []
+    assert rerun['completed'] == ['transcription', 'subtitles:legacy', 'translation:Spanish']
+    assert StubGenerator.calls == 2
+
+
+def test_force_ignores_saved_progress(media):
+    path, translations = media
+    run(path)
+    forced = run(path, "--force")
+    assert forced['completed'] == ['transcription', 'subtitles:legacy']
+    assert StubGenerator.calls == 2
+
+
+def test_missing_output_is_rebuilt(media):
+    path, translations = media
+    run(path, "--translate", "Spanish")
+    (path.parent / "lecture.Spanish.srt").unlink()
+    (path.parent / "lecture.json").unlink()
+
+    rerun = run(path, "--translate", "Spanish")
+    assert rerun['completed'] == ['transcription', 'subtitles:legacy', 'translation:Spanish']
+    saved = json.loads((path.parent / "lecture.json").read_text(encoding='utf-8'))
+    assert saved['language_code'] == 'en'
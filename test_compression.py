@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Tests for lightweight API responses: session summaries with links, opt-in
+inlined content (?include=) and compression of large JSON responses.
+
+Run with: python -m pytest -q test_compression.py
+"""
+
+import sys
+import os
+import gzip
+import json
+
+# Add the current directory and the backend to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import main
+
+SESSION = 'compression-test'
+
+
+@pytest.fixture
+def client():
+    main.sessions.set(SESSION, {
+        'filename': 'lecture.mp4',
+        'srt_content': "1\n00:00:00,000 --> 00:00:01,500\nHello everyone\n\n",
+        'vtt_content': "WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nHello everyone\n\n",
+        'transcription': {'text': 'Hello everyone', 'words': []},
+        'translated_subtitles': {'Spanish': "1\n00:00:00,000 --> 00:00:01,500\nHola a todos\n\n"},
+        'translated_vtt': {'Spanish': "WEBVTT\n\n00:00:00.000 --> 00:00:01.500\nHola a todos\n\n"},
+        'summary': {'cue_count': 1},
+    })
+    yield TestClient(main.app)
+    main.sessions.delete(SESSION)
+
+
+def session_with_srt_length(length: int):
+    session = dict(main.sessions.get(SESSION))
+    session['srt_content'] = "x" * length
+    main.sessions.set(SESSION, session)
+
+
+def raw_get(client, url: str, accept_encoding: str):
+    """(status, headers, undecoded body) so compressed bodies can be checked as sent"""
+    with client.stream("GET", url, headers={'Accept-Encoding': accept_encoding}) as response:
+        return response.status_code, response.headers, b"".join(response.iter_raw())
+
+
+def test_session_summary_links_instead_of_content(client):
+    data = client.get(f"/api/session/{SESSION}").json()['data']
+
+    assert 'srt_content' not in data and 'transcription' not in data
+    assert data['cue_count'] == 1
+    assert data['translated_languages'] == ['Spanish']
+    assert data['links']['srt'] == f"/api/download/{SESSION}/srt/original"
+    assert data['links']['translations']['Spanish']['vtt'] == f"/api/download/{SESSION}/vtt/Spanish"
+
+
+def test_include_inlines_requested_fields(client):
+    data = client.get(f"/api/session/{SESSION}?include=srt,translations").json()['data']
+    assert data['srt_content'].endswith("Hello everyone\n\n")
+    assert list(data['translated_vtt']) == ['Spanish']
+    assert 'vtt_content' not in data and 'transcription' not in data
+
+    everything = client.get(f"/api/session/{SESSION}?include=all").json()['data']
+    assert {'srt_content', 'vtt_content', 'transcription', 'translated_subtitles'} <= set(everything)
+
+    response = client.get(f"/api/session/{SESSION}?include=srt,audio")
+    assert response.status_code == 400
+    assert "audio" in response.json()['detail']
+
+
+def test_compression_starts_at_the_size_threshold(client):
+    url = f"/api/session/{SESSION}?include=srt"
+    session_with_srt_length(100)
+    baseline = len(raw_get(client, url, 'identity')[2])
+    padding = 100 - baseline
+
+    session_with_srt_length(main.GZIP_MIN_SIZE - 1 + padding)
+    status, headers, body = raw_get(client, url, 'gzip')
+    assert (status, len(body)) == (200, main.GZIP_MIN_SIZE - 1)
+    assert 'content-encoding' not in headers
+
+    session_with_srt_length(main.GZIP_MIN_SIZE + padding)
+    status, headers, body = raw_get(client, url, 'gzip')
+    assert headers['content-encoding'] == 'gzip'
+    assert headers['vary'] == 'Accept-Encoding'
+    assert int(headers['content-length']) == len(body) < main.GZIP_MIN_SIZE
+    assert len(gzip.decompress(body)) == main.GZIP_MIN_SIZE
+    assert json.loads(gzip.decompress(body))['data']['srt_content'].startswith("xxx")
+
+
+def test_clients_without_gzip_get_plain_json(client):
+    session_with_srt_length(5000)
+    status, headers, body = raw_get(client, f"/api/session/{SESSION}?include=srt", 'identity')
+    assert 'content-encoding' not in headers
+    assert len(json.loads(body)['data']['srt_content']) == 5000
+
+
+def test_zstd_is_preferred_when_available(client):
+    zstandard = pytest.importorskip("zstandard")
+    session_with_srt_length(5000)
+    status, headers, body = raw_get(client, f"/api/session/{SESSION}?include=srt", 'gzip, zstd')
+    assert headers['content-encoding'] == 'zstd'
+    assert len(json.loads(zstandard.ZstdDecompressor().decompress(body))['data']['srt_content']) == 5000
+
+
+def test_downloads_bypass_the_json_compression(client):
+    session = dict(main.sessions.get(SESSION))
+    session['transcription'] = {'text': "Hello everyone " * 400, 'words': []}
+    main.sessions.set(SESSION, session)
+    # The JSON download sets its own ETag (and only gzips itself), so the middleware leaves it alone
+    status, headers, body = raw_get(client, f"/api/download/{SESSION}/json/original", 'zstd')
+    assert status == 200
+    assert 'etag' in headers
+    assert 'content-encoding' not in headers
+    assert len(body) > main.GZIP_MIN_SIZE
+    assert json.loads(body)['text'].startswith('Hello everyone')
+
+
+def test_choose_content_encoding():
+    assert main.choose_content_encoding('') is None
+    assert main.choose_content_encoding('br, deflate') is None
+    assert main.choose_content_encoding('GZIP;q=1.0') == 'gzip'
@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests that subtitle_core and the API backend import without Streamlit and
+without loading heavy optional dependencies, which are imported lazily where
+they are used. Each check runs in a fresh interpreter.
+
+Run with: python -m pytest -q test_core_imports.py
+"""
+
+import sys
+import os
+import json
+import subprocess
+
+import pytest
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+BACKEND = os.path.join(ROOT, "subtitle-app", "backend")
+HEAVY_MODULES = ("streamlit", "cv2", "numpy", "librosa", "pandas", "PIL",
+                 "pytesseract", "deep_translator", "elevenlabs", "opentelemetry")
+
+
+def loaded_modules(statement: str, cwd: str = ROOT):
+    """Heavy modules present in sys.modules after running ``statement`` in a new interpreter"""
+    code = (f"import sys, json\nsys.path.insert(0, {ROOT!r})\n{statement}\n"
+            f"print(json.dumps([name for name in {HEAVY_MODULES!r} if name in sys.modules]))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=cwd, capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def test_core_import_loads_no_ui_or_heavy_dependencies():
+    assert loaded_modules("import subtitle_core") == []
+
+
+def test_backend_import_does_not_load_streamlit():
+    pytest.importorskip("fastapi")
+    assert loaded_modules("import main", cwd=BACKEND) == []
+
+
+def test_core_does_not_reference_streamlit():
+    package = os.path.join(ROOT, "subtitle_core")
+    for name in os.listdir(package):
+        if name.endswith(".py"):
+            with open(os.path.join(package, name), encoding='utf-8') as f:
+                assert "import streamlit" not in f.read(), name
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Tests for subtitle downloads streamed from the session
+(/api/download/{session_id}/{format}/{language}).
+
+Run with: python -m pytest -q test_downloads.py
+"""
+
+import sys
+import os
+import gzip
+import json
+
+# Add the current directory and the backend to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+
+import pytest
+
+pytest.importorskip("fastapi")
+from fastapi.testclient import TestClient
+
+import main
+from subtitle_core import render_srt_from_cues, srt_to_vtt
+
+SHORT_SRT = "1\n00:00:00,000 --> 00:00:01,500\nHello everyone\n\n"
+LONG_SRT = render_srt_from_cues([{'id': i, 'start': float(i), 'end': i + 0.8, 'text': f"Line number {i} of the lecture"}
+                                 for i in range(1, 200)])
+TRANSLATED = "1\n00:00:00,000 --> 00:00:01,500\nHola a todos\n\n"
+
+
+@pytest.fixture
+def client():
+    main.sessions.set('download-test', {
+        'filename': 'Vorlesung über Optimierung.mp4',
+        'srt_content': LONG_SRT,
+        'vtt_content': srt_to_vtt(SHORT_SRT),
+        'transcription': {'text': 'Hello everyone', 'words': []},
+        'translated_subtitles': {'Spanish': TRANSLATED},
+        'translated_vtt': {'Spanish': srt_to_vtt(TRANSLATED)},
+    })
+    return TestClient(main.app)
+
+
+def test_small_downloads_are_sent_uncompressed(client):
+    response = client.get("/api/download/download-test/vtt/original", headers={'Accept-Encoding': 'gzip'})
+
+    assert response.status_code == 200
+    assert response.text == srt_to_vtt(SHORT_SRT)
+    assert 'content-encoding' not in response.headers
+    etag = response.headers['etag']
+    assert etag.startswith('"') and etag.endswith('"') and not etag.endswith('-gzip"')
+    assert response.headers['content-type'] == "text/vtt; charset=utf-8"
+    assert response.headers['content-length'] == str(len(response.content))
+    assert response.headers['cache-control'] == 'private, no-cache'
+
+
+def test_large_downloads_are_gzipped_with_their_own_etag(client):
+    url = "/api/download/download-test/srt/original"
+    plain = client.get(url, headers={'Accept-Encoding': 'identity'})
+    gzipped = client.get(url, headers={'Accept-Encoding': 'gzip, deflate'})
+
+    assert plain.text == gzipped.text == LONG_SRT
+    assert 'content-encoding' not in plain.headers
+    assert gzipped.headers['content-encoding'] == 'gzip'
+    assert gzipped.headers['vary'] == 'Accept-Encoding'
+    # Same content, different representation: the ETags differ only by the suffix
+    assert gzipped.headers['etag'] == plain.headers['etag'][:-1] + '-gzip"'
+    # Content-Length is the size sent on the wire
+    assert int(gzipped.headers['content-length']) == len(gzip.compress(LONG_SRT.encode('utf-8'), compresslevel=6))
+    assert "filename*=UTF-8''Vorlesung%20%C3%BCber%20Optimierung.srt" in plain.headers['content-disposition']
+    assert 'filename="Vorlesung _ber Optimierung.srt"' in plain.headers['content-disposition']
+
+
+def test_matching_if_none_match_returns_304(client):
+    url = "/api/download/download-test/srt/original"
+    etag = client.get(url, headers={'Accept-Encoding': 'gzip'}).headers['etag']
+
+    for header in (etag, f"W/{etag}", f'"other", {etag}', "*"):
+        response = client.get(url, headers={'Accept-Encoding': 'gzip', 'If-None-Match': header})
+        assert response.status_code == 304, header
+        assert response.content == b""
+        assert response.headers['etag'] == etag
+
+    # The gzip ETag does not match the uncompressed representation
+    assert client.get(url, headers={'Accept-Encoding': 'identity', 'If-None-Match': etag}).status_code == 200
+    assert client.get(url, headers={'If-None-Match': '"stale"'}).status_code == 200
+
+
+def test_downloads_are_streamed_in_chunks(client, monkeypatch):
+    assert [len(chunk) for chunk in main.iter_chunks(b"x" * 150, 64)] == [64, 64, 22]
+    assert list(main.iter_chunks(b"")) == []
+
+    sizes = []
+    real_iter_chunks = main.iter_chunks
+
+    def small_chunks(data):
+        for chunk in real_iter_chunks(data, 1024):
+            sizes.append(len(chunk))
+            yield chunk
+    monkeypatch.setattr(main, "iter_chunks", small_chunks)
+    response = client.get("/api/download/download-test/srt/original", headers={'Accept-Encoding': 'identity'})
+
+    assert response.text == LONG_SRT
+    assert len(sizes) > 1 and sum(sizes) == len(LONG_SRT.encode('utf-8'))
+
+
+def test_translation_and_json_downloads(client):
+    translated = client.get("/api/download/download-test/srt/Spanish")
+    assert translated.text == TRANSLATED
+    assert "Vorlesung%20%C3%BCber%20Optimierung_Spanish.srt" in translated.headers['content-disposition']
+    assert json.loads(client.get("/api/download/download-test/json/original").text)['text'] == 'Hello everyone'
+
+    assert client.get("/api/download/download-test/srt/German").status_code == 404
+    assert client.get("/api/download/download-test/json/Spanish").status_code == 400
+    assert client.get("/api/download/missing/srt/original").status_code == 404
@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+"""
+Tests for the single-pass media ingest: the demuxer-to-decoder packet spool,
+and MediaIngest on a small clip generated with ffmpeg.
+
+Run with: python -m pytest -q test_media_ingest.py
+"""
+
+import sys
+import os
+import subprocess
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from subtitle_core import ExtractionScheduler, MediaIngest, find_ffmpeg
+from subtitle_core.ingest import _PacketSpool
+
+
+def test_spool_keeps_order_across_memory_and_spill_file():
+    spool = _PacketSpool(capacity=2)
+    for chunk in (b"a", b"bb", b"ccc", b"dddd"):
+        spool.put(chunk)
+    # The first two chunks fit in memory, the rest went to the file
+    assert spool.spilled_bytes == 7
+
+    assert spool.get() == b"a"
+    # Memory has room again, but the file is not drained: stay in order
+    spool.put(b"eeeee")
+    assert spool.spilled_bytes == 12
+    assert [spool.get() for _ in range(4)] == [b"bb", b"ccc", b"dddd", b"eeeee"]
+
+    # Drained: new chunks are kept in memory again
+    spool.put(b"f")
+    assert spool.spilled_bytes == 12
+    spool.finish()
+    assert spool.get() == b"f"
+    assert spool.get() is None
+    spool.close()
+
+
+def test_spool_get_blocks_until_put_or_finish():
+    spool = _PacketSpool(capacity=4)
+    received = []
+    reader = threading.Thread(target=lambda: received.extend(iter(spool.get, None)))
+    reader.start()
+
+    spool.put(b"one")
+    spool.put(b"two")
+    spool.finish()
+    reader.join(timeout=5)
+
+    assert not reader.is_alive()
+    assert received == [b"one", b"two"]
+
+
+def test_abandoned_spool_drops_chunks_and_wakes_the_reader():
+    spool = _PacketSpool(capacity=1)
+    spool.put(b"memory")
+    spool.put(b"spilled")
+    spool.abandon()
+    assert spool.get() is None
+    # Later chunks are ignored, so the demuxer can keep writing the audio
+    spool.put(b"late")
+    assert spool.spilled_bytes == len(b"spilled")
+
+    waiting = _PacketSpool(capacity=1)
+    result = []
+    reader = threading.Thread(target=lambda: result.append(waiting.get()))
+    reader.start()
+    waiting.abandon()
+    reader.join(timeout=5)
+    assert not reader.is_alive() and result == [None]
+
+
+@pytest.fixture(scope="module")
+def clip(tmp_path_factory):
+    """4 s, 320x240 at 10 fps, keyframe every 2 s, with an AAC sine tone"""
+    pytest.importorskip("numpy")
+    try:
+        ffmpeg_cmd = find_ffmpeg()
+    except FileNotFoundError:
+        pytest.skip("ffmpeg is not installed")
+    path = tmp_path_factory.mktemp("ingest") / "clip.mp4"
+    subprocess.run([ffmpeg_cmd, '-v', 'error', '-y',
+                    '-f', 'lavfi', '-i', 'testsrc2=size=320x240:rate=10',
+                    '-f', 'lavfi', '-i', 'sine=frequency=440:sample_rate=16000', '-t', '4',
+                    '-c:v', 'libx264', '-g', '20', '-bf', '2', '-pix_fmt', 'yuv420p',
+                    '-c:a', 'aac', '-b:a', '64k', str(path)], check=True, capture_output=True)
+    return path
+
+
+def test_ingest_produces_audio_and_timed_frames_and_releases_its_slot(clip):
+    scheduler = ExtractionScheduler(max_concurrent=1, ffmpeg_threads=1)
+
+    with MediaIngest(clip, interval=1.0, scheduler=scheduler) as ingest:
+        assert scheduler.stats()['running'] == 1
+        # The audio is ready once the file is demuxed, before any frame is read
+        audio = ingest.audio(timeout=30)
+        assert audio.profile == "stream_copy" and audio.mime_type == "audio/mp4" and audio.audio
+        frames = list(ingest.frames())
+
+    assert [timestamp for timestamp, _ in frames] == [0.0, 1.0, 2.0, 3.0]
+    assert all(frame.shape == (240, 320, 3) and frame.dtype.name == 'uint8' for _, frame in frames)
+    assert ingest.stats['frames'] == 4 and ingest.stats['audio_profile'] == "stream_copy"
+    stats = scheduler.stats()
+    assert (stats['running'], stats['completed'], stats['failed']) == (0, 1, 0)
+
+
+def test_ingest_closed_early_stops_ffmpeg_and_releases_its_slot(clip):
+    scheduler = ExtractionScheduler(max_concurrent=1, ffmpeg_threads=1)
+    ingest = MediaIngest(clip, interval=0.1, profile="speech_mp3", scheduler=scheduler).start()
+    frames = ingest.frames()
+    timestamp, _ = next(frames)
+    frames.close()
+    ingest.close()
+
+    assert timestamp == 0.0
+    assert ingest._decoder.poll() is not None and ingest._demuxer.poll() is not None
+    assert scheduler.stats()['running'] == 0
+    # The slot is free for the next job
+    with MediaIngest(clip, with_audio=False, scheduler=scheduler) as again:
+        assert len(list(again.frames())) == 4
+    assert scheduler.stats()['running'] == 0
+
+
+def test_ingest_rejects_input_without_video(tmp_path, clip):
+    audio_path = tmp_path / "tone.m4a"
+    subprocess.run([find_ffmpeg(), '-v', 'error', '-y', '-i', str(clip), '-vn', '-c:a', 'copy', str(audio_path)],
+                   check=True, capture_output=True)
+    scheduler = ExtractionScheduler(max_concurrent=1)
+
+    with pytest.raises(ValueError, match="No video stream"):
+        MediaIngest(audio_path, scheduler=scheduler).start()
+    # Probing fails before a slot is taken
+    assert scheduler.stats()['submitted'] == 0
+
+
+@pytest.mark.parametrize("sampling", ["all", "reference", "predicted"])
+def test_reduced_decode_modes_take_one_sample_per_interval(clip, sampling):
+    from subtitle_core import iter_sampled_frames
+
+    timestamps = [timestamp for timestamp, _ in iter_sampled_frames(str(clip), 1.0, sampling)]
+    # The first decoded frame of each second; B-frames may be skipped, so it can land later
+    assert [int(timestamp) for timestamp in timestamps] == [0, 1, 2, 3]
+    assert timestamps[0] == 0.0
+
+
+def test_keyframe_sampling_snaps_to_keyframes(clip):
+    from subtitle_core import VideoOCRProcessor
+
+    processor = VideoOCRProcessor(interval=1.0, sampling="keyframes")
+    frames = list(processor.extract_frames_from_video(str(clip)))
+    # The clip has a keyframe every 2 s: the samples at 1 s and 3 s have nothing to decode
+    assert [timestamp for timestamp, _ in frames] == [0.0, 2.0]
+    assert frames[0][1].shape == (240, 320, 3)
+
+
+def test_unknown_sampling_modes_are_rejected():
+    from subtitle_core import VideoOCRProcessor
+
+    with pytest.raises(ValueError, match="Unknown OCR sampling mode 'fast'"):
+        MediaIngest("clip.mp4", sampling="fast")
+    with pytest.raises(ValueError, match="Unknown OCR sampling mode 'fast'"):
+        VideoOCRProcessor(sampling="fast")
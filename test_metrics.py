@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Tests for the stage metrics registry, its Prometheus text output and the
+stage_timer context manager/decorator.
+
+Run with: python -m pytest -q test_metrics.py
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from subtitle_core import MetricsRegistry, metrics, record_cache, stage_timer
+from subtitle_core.metrics import STAGE_ERRORS, STAGE_SECONDS
+
+needs_metrics = pytest.mark.skipif(not metrics.enabled, reason="METRICS_ENABLED=0")
+
+
+def stage_row(stage: str):
+    rows = [row for row in metrics.summary() if row.get('stage') == stage]
+    return rows[0] if rows else None
+
+
+def stage_errors(stage: str) -> float:
+    for line in metrics.render_prometheus().splitlines():
+        if line.startswith(f'{STAGE_ERRORS}{{stage="{stage}"}} '):
+            return float(line.split()[-1])
+    return 0.0
+
+
+def test_render_prometheus_counters_histograms_and_gauges():
+    registry = MetricsRegistry(enabled=True)
+    registry.counter("jobs_total", "Jobs by result")
+    registry.histogram("job_seconds", "Job latency", buckets=(0.1, 1.0))
+    registry.inc("jobs_total", result="ok")
+    registry.inc("jobs_total", 2, result="ok")
+    registry.inc("jobs_total", result='bad "quote"\n')
+    for value in (0.05, 0.5, 0.7, 3.0):
+        registry.observe("job_seconds", value, stage="split")
+
+    text = registry.render_prometheus({'queue_depth': 3, 'hit_ratio': 0.25})
+    lines = text.splitlines()
+
+    assert text.endswith("\n")
+    assert lines[:4] == [
+        "# HELP jobs_total Jobs by result",
+        "# TYPE jobs_total counter",
+        'jobs_total{result="bad \\"quote\\"\\n"} 1',
+        'jobs_total{result="ok"} 3',
+    ]
+    assert lines[4:11] == [
+        "# HELP job_seconds Job latency",
+        "# TYPE job_seconds histogram",
+        # Buckets are cumulative and +Inf equals the count
+        'job_seconds_bucket{stage="split",le="0.1"} 1',
+        'job_seconds_bucket{stage="split",le="1"} 3',
+        'job_seconds_bucket{stage="split",le="+Inf"} 4',
+        'job_seconds_sum{stage="split"} 4.25',
+        'job_seconds_count{stage="split"} 4',
+    ]
+    assert lines[11:] == [
+        "# TYPE hit_ratio gauge",
+        "hit_ratio 0.25",
+        "# TYPE queue_depth gauge",
+        "queue_depth 3",
+    ]
+
+
+def test_render_prometheus_reports_cache_hit_ratio():
+    registry = MetricsRegistry(enabled=True)
+    registry.inc("subtitle_cache_requests_total", 3, cache="render", result="hit")
+    registry.inc("subtitle_cache_requests_total", cache="render", result="miss")
+
+    assert registry.cache_hit_rates() == {'render': 0.75}
+    assert 'subtitle_cache_hit_ratio{cache="render"} 0.75' in registry.render_prometheus().splitlines()
+
+
+def test_disabled_registry_records_nothing():
+    registry = MetricsRegistry(enabled=False)
+    registry.inc("jobs_total")
+    registry.observe("job_seconds", 1.0)
+    with registry.timer("job_seconds"):
+        pass
+    assert registry.render_prometheus() == "\n"
+    assert registry.summary("job_seconds") == []
+
+
+def test_summary_quantiles_use_bucket_bounds():
+    registry = MetricsRegistry(enabled=True)
+    registry.histogram("job_seconds", "Job latency", buckets=(0.1, 1.0, 10.0))
+    for value in (0.05, 0.06, 0.07, 0.5, 4.0):
+        registry.observe("job_seconds", value, stage="ocr")
+
+    row = registry.summary("job_seconds")[0]
+    assert (row['stage'], row['count'], row['max'], row['last']) == ('ocr', 5, 4.0, 4.0)
+    assert row['p50'] == 0.1
+    # Capped at the largest observation rather than the 10 s bucket bound
+    assert row['p95'] == 4.0
+    assert row['mean'] == pytest.approx(0.936)
+
+
+@needs_metrics
+def test_stage_timer_as_a_decorator():
+    @stage_timer("test_decorated_stage")
+    def work(value):
+        return value * 2
+
+    before = stage_row("test_decorated_stage")
+    assert work(2) == 4
+    assert work(3) == 6
+
+    row = stage_row("test_decorated_stage")
+    assert row['count'] - (before['count'] if before else 0) == 2
+    assert stage_errors("test_decorated_stage") == 0
+
+
+@needs_metrics
+def test_stage_timer_records_failures():
+    errors_before = stage_errors("test_failing_stage")
+    with pytest.raises(ValueError):
+        with stage_timer("test_failing_stage"):
+            raise ValueError("boom")
+
+    # The failed run is still timed and counted as an error
+    assert stage_row("test_failing_stage")['count'] >= 1
+    assert stage_errors("test_failing_stage") == errors_before + 1
+
+
+@needs_metrics
+def test_metrics_endpoint_serves_prometheus_text():
+    pytest.importorskip("fastapi")
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+    from fastapi.testclient import TestClient
+    import main
+
+    with stage_timer("test_endpoint_stage"):
+        pass
+    record_cache("test_endpoint_cache", hit=True)
+    response = TestClient(main.app).get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers['content-type'].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert f"# TYPE {STAGE_SECONDS} histogram" in lines
+    assert any(line.startswith(f'{STAGE_SECONDS}_count{{stage="test_endpoint_stage"}} ') for line in lines)
+    assert 'subtitle_cache_hit_ratio{cache="test_endpoint_cache"} 1' in lines
+    assert "# TYPE subtitle_extraction_queue_depth gauge" in lines
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Tests for coalescing OCR sightings into timed cues and merging them with audio subtitles.
+
+Run with: python -m pytest -q test_ocr_cues.py
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from subtitle_core import parse_srt_subtitles
+from subtitle_core.ocr import OCR_CUE_PREFIX, OCRLine, coalesce_ocr_cues, merge_ocr_cues, merge_ocr_subtitles
+
+
+def cue(start, end, text, confidence=90.0, **extra):
+    return {'id': 0, 'start': start, 'end': end, 'text': text, 'confidence': confidence, **extra}
+
+
+def test_runs_of_the_same_caption_are_merged_across_short_gaps():
+    cues = coalesce_ocr_cues([
+        cue(0.0, 3.0, "Gradient descent"),
+        cue(4.0, 6.0, "Gradient descent"),         # missed for one sample
+        cue(6.0, 9.0, "gradient  DESCENT"),        # same text, different case and spacing
+        cue(2.0, 5.0, "Learning rate"),
+        cue(12.0, 14.0, "Gradient descent"),       # shown again much later
+    ], max_gap=2.0)
+
+    assert [(c['id'], c['start'], c['end'], c['text']) for c in cues] == [
+        (1, 0.0, 9.0, "Gradient descent"),
+        (2, 2.0, 5.0, "Learning rate"),
+        (3, 12.0, 14.0, "Gradient descent"),
+    ]
+
+
+def test_text_is_chosen_by_vote_over_readings():
+    cues = coalesce_ocr_cues([
+        cue(0.0, 1.0, "Momentum", 80.0),
+        cue(1.0, 2.0, "Momentun", 99.0),           # one confident misread
+        cue(2.0, 3.0, "Momentum", 70.0),
+    ], max_gap=1.0)
+
+    assert len(cues) == 1
+    assert cues[0]['text'] == "Momentum"
+    assert cues[0]['confidence'] == 83.0
+    assert 'readings' not in cues[0] and 'key' not in cues[0]
+
+
+def test_readings_carried_by_tracked_cues_are_weighted_by_count():
+    cues = coalesce_ocr_cues([
+        cue(0.0, 4.0, "Questions?", readings={"Questions?": [3, 270.0], "Questlons?": [1, 95.0]}),
+        cue(5.0, 6.0, "Questlons?", 95.0),
+    ], max_gap=2.0)
+
+    assert [(c['start'], c['end'], c['text']) for c in cues] == [(0.0, 6.0, "Questions?")]
+    assert cues[0]['confidence'] == pytest.approx((270.0 + 95.0 + 95.0) / 5, abs=0.1)
+
+
+def test_different_captions_are_not_merged():
+    cues = coalesce_ocr_cues([cue(0.0, 2.0, "Chapter 1"), cue(2.0, 4.0, "Summary")], max_gap=2.0)
+    assert [c['text'] for c in cues] == ["Chapter 1", "Summary"]
+
+
+def test_merge_orders_by_start_with_audio_first_and_prefixes_on_screen_text():
+    audio = [cue(0.0, 2.0, "Hello everyone"), cue(4.0, 6.0, "[speaker_1] Let's begin")]
+    on_screen = [cue(4.0, 8.0, "Lecture 3"), cue(1.0, 3.0, f"{OCR_CUE_PREFIX} Already labelled")]
+
+    merged = merge_ocr_cues(audio, on_screen)
+
+    assert [(c['id'], c['start'], c['text']) for c in merged] == [
+        (1, 0.0, "Hello everyone"),
+        (2, 1.0, f"{OCR_CUE_PREFIX} Already labelled"),
+        (3, 4.0, "[speaker_1] Let's begin"),
+        (4, 4.0, f"{OCR_CUE_PREFIX} Lecture 3"),
+    ]
+    # Inputs are not modified
+    assert on_screen[0]['text'] == "Lecture 3"
+    assert merge_ocr_cues(audio, on_screen, prefix="")[3]['text'] == "Lecture 3"
+
+
+def test_merge_ocr_subtitles_renumbers_the_srt():
+    srt = ("1\n00:00:00,000 --> 00:00:02,000\nHello everyone\n\n"
+           "2\n00:00:05,000 --> 00:00:07,500\nSee the slide\n\n")
+    merged = parse_srt_subtitles(merge_ocr_subtitles(srt, [cue(3.0, 9.0, "Gradient descent")]))
+
+    assert [(c['id'], c['start'], c['end'], c['text']) for c in merged] == [
+        (1, 0.0, 2.0, "Hello everyone"),
+        (2, 3.0, 9.0, f"{OCR_CUE_PREFIX} Gradient descent"),
+        (3, 5.0, 7.5, "See the slide"),
+    ]
+    assert merge_ocr_subtitles(srt, []) == srt
+
+
+class SlideRecognizer:
+    """Reads a slide's text from the brightness of the crop (no OCR engine needed)"""
+
+    TEXTS = {60: "Gradient descent", 120: "Learning rate", 180: "Learning rale"}
+
+    def __call__(self, image):
+        text = self.TEXTS.get(int(image.max()))
+        return [OCRLine(text, 90.0, (0, 0, image.shape[1], image.shape[0]))] if text else []
+
+
+def test_processor_turns_samples_into_coalesced_cues():
+    np = pytest.importorskip("numpy")
+    pytest.importorskip("cv2")
+    from subtitle_core import VideoOCRProcessor
+
+    def frame(value):
+        image = np.zeros((240, 320, 3), np.uint8)
+        if value:
+            image[100:140, 40:280] = value
+        return image
+
+    # Slide A, one sample where OCR sees nothing, slide A again, then slide B
+    # with one misread sample
+    samples = [60, 60, 60, 0, 60, 60, 120, 180, 120, 120]
+    processor = VideoOCRProcessor(interval=1.0, recognizer=SlideRecognizer(), workers=1, min_confidence=0)
+    cues = processor.process_frames((float(t), frame(value)) for t, value in enumerate(samples))
+
+    assert [(c['start'], c['end'], c['text']) for c in cues] == [
+        (0.0, 6.0, "Gradient descent"),
+        (6.0, 10.0, "Learning rate"),
+    ]
+
+
+def test_merge_ocr_translations_translates_on_screen_text_per_language(monkeypatch):
+    import subtitle_core.translator as translator
+    from subtitle_core import merge_ocr_translations
+
+    def fake_translate(srt_content, target_language, service, api_key):
+        if target_language == "German":
+            raise RuntimeError("service unavailable")
+        # Labels in brackets are kept, like speaker labels
+        return srt_content.replace("Gradient descent", "Descenso de gradiente")
+    monkeypatch.setattr(translator, "translate_subtitles_preserve_structure", fake_translate)
+
+    translated = {'Spanish': "1\n00:00:00,000 --> 00:00:02,000\nHola a todos\n\n",
+                  'German': "1\n00:00:00,000 --> 00:00:02,000\nHallo zusammen\n\n"}
+    merged = merge_ocr_translations(translated, [cue(1.0, 4.0, "Gradient descent")])
+
+    spanish = parse_srt_subtitles(merged['Spanish'])
+    assert [(c['start'], c['text']) for c in spanish] == [
+        (0.0, "Hola a todos"), (1.0, f"{OCR_CUE_PREFIX} Descenso de gradiente")]
+    # A failed language keeps the on-screen text untranslated
+    assert parse_srt_subtitles(merged['German'])[1]['text'] == f"{OCR_CUE_PREFIX} Gradient descent"
+    assert merge_ocr_translations(translated, []) == translated
+
+
+def test_transcribe_endpoint_adds_on_screen_text(monkeypatch):
+    pytest.importorskip("fastapi")
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+    from fastapi.testclient import TestClient
+    import main
+
+    class FakeGenerator:
+        def __init__(self, api_key):
+            pass
+
+        def create_transcription(self, audio, **options):
+            return {'language_code': 'en', 'text': 'Hello everyone',
+                    'words': [{'text': 'Hello', 'start': 0.0, 'end': 0.5, 'type': 'word'},
+                              {'text': 'everyone', 'start': 0.6, 'end': 2.0, 'type': 'word'}]}
+
+    class FakeProcessor:
+        def process_video_bytes(self, video_bytes, suffix):
+            assert video_bytes == b"video" and suffix == ".mp4"
+            return [cue(1.0, 4.0, "Gradient descent")]
+
+    monkeypatch.setattr(main, "ElevenLabsSubtitleGenerator", FakeGenerator)
+    monkeypatch.setattr(main, "VideoOCRProcessor", FakeProcessor)
+    client = TestClient(main.app)
+
+    response = client.post("/api/transcribe?include=srt", files={'file': ("talk.mp4", b"video", "video/mp4")},
+                           data={'api_key': 'key', 'ocr': 'true'})
+    assert response.status_code == 200
+    data = response.json()['data']
+    assert data['on_screen_cues'] == 1
+    assert [c['text'] for c in parse_srt_subtitles(data['srt_content'])] == \
+        ["Hello everyone", f"{OCR_CUE_PREFIX} Gradient descent"]
+
+    # Re-rendering the stored words keeps the on-screen text
+    rendered = client.post(f"/api/session/{data['session_id']}/render", data={'segmentation': 'compact'})
+    assert f"{OCR_CUE_PREFIX} Gradient descent" in rendered.json()['data']['srt_content']
+
+    audio_only = client.post("/api/transcribe", files={'file': ("talk.mp3", b"audio", "audio/mpeg")},
+                             data={'api_key': 'key', 'ocr': 'true'})
+    assert audio_only.status_code == 400
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+"""
+Tests for OCR change detection, text-region detection and the shared-memory
+worker pool, on synthetic frames (no OCR engine needed).
+
+Run with: python -m pytest -q test_ocr_detection.py
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+
+from subtitle_core import FrameChangeDetector
+
+WIDTH, HEIGHT = 320, 240
+BACKGROUND = 40
+
+
+def blank_frame():
+    return np.full((HEIGHT, WIDTH, 3), BACKGROUND, np.uint8)
+
+
+def test_change_detection_reports_only_the_tiles_that_changed():
+    detector = FrameChangeDetector(grid=(4, 4), padding=8)
+    frame = blank_frame()
+
+    # The first sample has no predecessor: everything is new
+    assert detector.changed_boxes(frame) == [(0, 0, WIDTH, HEIGHT)]
+    assert detector.changed_boxes(frame.copy()) == []
+
+    # Sensor noise of a couple of grey levels is not a change
+    noisy = np.clip(frame.astype(np.int16) + np.random.default_rng(0).integers(-2, 3, frame.shape), 0, 255)
+    noisy = noisy.astype(np.uint8)
+    assert detector.changed_boxes(noisy) == []
+
+    # Text in the bottom-right tile (80 x 60 px) marks that tile, padded by 8 px
+    captioned = noisy.copy()
+    cv2.putText(captioned, "Hi", (250, 220), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    assert detector.changed_boxes(captioned) == [(240 - 8, 180 - 8, 80 + 8, 60 + 8)]
+
+    # A coloured patch with little luma contrast is caught by the pixel difference
+    coloured = captioned.copy()
+    coloured[10:40, 10:60] = (BACKGROUND, BACKGROUND, 200)
+    assert detector.changed_boxes(coloured) == [(0, 0, 80 + 8, 60 + 8)]
+
+    # reset() forgets the previous sample
+    detector.reset()
+    assert detector.changed_boxes(coloured) == [(0, 0, WIDTH, HEIGHT)]
+
+
+def test_adjacent_changed_tiles_form_one_box():
+    detector = FrameChangeDetector(grid=(4, 4), padding=0)
+    frame = blank_frame()
+    detector.changed_boxes(frame)
+
+    banner = frame.copy()
+    cv2.putText(banner, "Gradient descent", (10, 225), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    boxes = detector.changed_boxes(banner)
+
+    assert len(boxes) == 1
+    x, y, width, height = boxes[0]
+    assert (y, height) == (180, 60)
+    assert x == 0 and width >= 240
+
+
+class ShapeRecognizer:
+    """Reports the size and brightest value of the image it was given (picklable, for worker processes)"""
+
+    def __call__(self, image):
+        from subtitle_core import OCRLine
+        height, width = image.shape[:2]
+        return [OCRLine(f"{width}x{height}:{int(image.max())}", 90.0, (0, 0, width, height))]
+
+
+def test_worker_pool_returns_each_result_and_replaces_outgrown_slots():
+    from multiprocessing import shared_memory
+    from subtitle_core import OCRWorkerPool
+
+    images = [np.full((20, 30, 3), 7, np.uint8),
+              np.full((400, 600, 3), 9, np.uint8),      # larger than the 64 KiB block: replaced
+              np.full((10, 10, 3), 11, np.uint8)]        # fits in the replaced block
+    with OCRWorkerPool(ShapeRecognizer(), workers=1, slots_per_worker=1) as pool:
+        texts = [pool.submit(image).result()[0].text for image in images]
+        names = [memory.name for memory in pool._memory]
+        # Results come back in submission order even with more work queued than slots
+        futures = [pool.submit(np.full((5, 5 + i, 3), i, np.uint8)) for i in range(6)]
+        assert [future.result()[0].text for future in futures] == [f"{5 + i}x5:{i}" for i in range(6)]
+
+    assert texts == ["30x20:7", "600x400:9", "10x10:11"]
+    # close() unlinks every block
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            shared_memory.SharedMemory(name=name)
+
+
+class BrightnessRecognizer:
+    """Reads a slide's text from the brightness of the crop (picklable)"""
+
+    TEXTS = {200: "Gradient descent", 120: "Learning rate"}
+
+    def __call__(self, image):
+        from subtitle_core import OCRLine
+        text = self.TEXTS.get(int(image.max()))
+        return [OCRLine(text, 90.0, (0, 0, image.shape[1], image.shape[0]))] if text else []
+
+
+def test_worker_pool_cues_match_in_process_ocr():
+    from subtitle_core import VideoOCRProcessor
+
+    def frames():
+        for timestamp, value in enumerate([200, 200, 0, 120, 120, 200, 0]):
+            frame = blank_frame()
+            if value:
+                frame[100:140, 40:280] = value
+            yield float(timestamp), frame
+
+    cues = {}
+    for workers in (1, 2):
+        processor = VideoOCRProcessor(interval=1.0, recognizer=BrightnessRecognizer(), workers=workers,
+                                      min_confidence=0)
+        cues[workers] = processor.process_frames(frames())
+    assert cues[2] == cues[1]
+    assert [(c['start'], c['end'], c['text']) for c in cues[2]] == [
+        (0.0, 2.0, "Gradient descent"), (3.0, 5.0, "Learning rate"), (5.0, 6.0, "Gradient descent")]
+
+
+def test_text_region_detector_finds_caption_lines_only():
+    from subtitle_core import TextRegionDetector
+
+    detector = TextRegionDetector(padding=0)
+    frame = blank_frame()
+    assert detector.detect(frame) == []
+
+    cv2.putText(frame, "Gradient descent", (20, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+    # A flat block is an edge-only outline, not text
+    frame[20:120, 200:300] = 160
+    boxes = detector.detect(frame)
+
+    assert len(boxes) == 1
+    x, y, width, height = boxes[0]
+    # The caption starts at x=20 with its baseline at y=200 and is about 190 px wide
+    assert 15 <= x <= 25 and 175 <= y <= 190 and y + height >= 200
+    assert 180 <= width <= 210
+
+
+def test_text_regions_are_detected_on_a_downscaled_copy():
+    from subtitle_core import TextRegionDetector
+
+    frame = np.full((1080, 1920, 3), BACKGROUND, np.uint8)
+    cv2.putText(frame, "Learning rate schedules", (200, 900), cv2.FONT_HERSHEY_SIMPLEX, 2.5, (255, 255, 255), 6)
+    width, _ = cv2.getTextSize("Learning rate schedules", cv2.FONT_HERSHEY_SIMPLEX, 2.5, 6)[0]
+    boxes = {max_width: TextRegionDetector(max_width=max_width, padding=0).detect(frame) for max_width in (960, 480)}
+
+    assert len(boxes[960]) == len(boxes[480]) == 1
+    # Boxes come back in full-resolution pixels whatever the detection scale
+    for x, y, box_width, box_height in (boxes[960][0], boxes[480][0]):
+        assert abs(x - 200) <= 8 and abs(box_width - width) <= 16
+        assert y < 900 < y + box_height
+
+
+def test_unchanged_text_crops_reuse_their_ocr_result():
+    from subtitle_core import OCRLine, VideoOCRProcessor
+
+    calls = []
+
+    def recognizer(image):
+        calls.append(image.shape)
+        return [OCRLine("Gradient descent", 90.0, (0, 0, image.shape[1], image.shape[0]))]
+
+    def frames():
+        # A pointer moves under a caption that stays on screen
+        for timestamp in range(4):
+            frame = blank_frame()
+            cv2.putText(frame, "Gradient descent", (20, 200), cv2.FONT_HERSHEY_SIMPLEX, 0.8, (255, 255, 255), 2)
+            cv2.circle(frame, (40 + 30 * timestamp, 225), 4, (0, 0, 255), -1)
+            yield float(timestamp), frame
+
+    processor = VideoOCRProcessor(interval=1.0, recognizer=recognizer, workers=1, min_confidence=0,
+                                  text_regions=True)
+    cues = processor.process_frames(frames())
+
+    assert [(c['start'], c['end'], c['text']) for c in cues] == [(0.0, 4.0, "Gradient descent")]
+    # Only the caption is OCR'd, and only once
+    assert len(calls) == 1
+    assert (processor.stats['ocr_regions'], processor.stats['reused_regions']) == (4, 3)
+    assert processor.stats['ocr_pixel_share'] < 0.05
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Tests for the chunked translate-while-transcribing pipeline, with stubbed
+transcription and translation services.
+
+Run with: python -m pytest -q test_pipeline.py
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import subtitle_core.pipeline as pipeline
+from subtitle_core import parse_srt_subtitles, render_srt_from_cues
+from subtitle_core.pipeline import AudioChunk, offset_words, transcribe_and_translate
+
+CHUNK_SECONDS = 10.0
+CHUNK_TEXT = "Welcome to the course. Today we look at gradient descent and learning rates."
+
+
+def chunk_words(text: str = CHUNK_TEXT, speaker: str = 'speaker_0'):
+    """Words (with spacing entries) timed from 0 within a chunk"""
+    words = []
+    for index, token in enumerate(text.split()):
+        start = round(index * 0.6, 3)
+        words.append({'text': token, 'start': start, 'end': round(start + 0.5, 3), 'type': 'word',
+                      'speaker_id': speaker,
+                      'characters': [{'text': token[0], 'start': start, 'end': round(start + 0.1, 3)}]})
+        words.append({'text': ' ', 'start': round(start + 0.5, 3), 'end': round(start + 0.6, 3),
+                      'type': 'spacing', 'speaker_id': speaker})
+    return words[:-1]
+
+
+class FakeGenerator:
+    """Returns the same transcript for every chunk; optionally fails or reports trimming"""
+
+    def __init__(self, fail_on: int = None, trimmed_chunks=()):
+        self.calls = 0
+        self.fail_on = fail_on
+        self.trimmed_chunks = trimmed_chunks
+
+    def create_transcription(self, audio, **options):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise RuntimeError("transcription service unavailable")
+        result = {'language_code': 'en', 'text': CHUNK_TEXT, 'words': chunk_words()}
+        if self.calls in self.trimmed_chunks:
+            result['silence_trimming'] = {'original_duration': CHUNK_SECONDS, 'uploaded_duration': 7.5}
+        return result
+
+
+def fake_translate(srt_content, target_language, service, api_key):
+    """Tags every cue with the language, keeping ids and timings (slow, like a real service)"""
+    time.sleep(0.01)
+    cues = parse_srt_subtitles(srt_content)
+    for cue in cues:
+        cue['text'] = f"{target_language}: {cue['text']}"
+    return render_srt_from_cues(cues, start_index=cues[0]['id'])
+
+
+@pytest.fixture
+def chunks(monkeypatch):
+    def split(audio_bytes, chunk_seconds, profile, scheduler=None):
+        return [AudioChunk(b"chunk", f"chunk{index}.mp3", "audio/mpeg", index * CHUNK_SECONDS)
+                for index in range(4)]
+    monkeypatch.setattr(pipeline, "split_audio_chunks", split)
+    monkeypatch.setattr(pipeline, "translate_subtitles_preserve_structure", fake_translate)
+
+
+def translation_threads():
+    return [thread for thread in threading.enumerate() if thread.name.startswith("translate-")]
+
+
+def test_offset_words_shifts_words_and_characters_without_mutating():
+    words = chunk_words("Hello there")
+    shifted = offset_words(words, 120.0)
+
+    assert [word['start'] for word in shifted] == [120.0, 120.5, 120.6]
+    assert shifted[2]['characters'][0] == {'text': 't', 'start': 120.6, 'end': 120.7}
+    assert words[2]['start'] == 0.6
+    assert words[2]['characters'][0]['start'] == 0.6
+    assert offset_words(words, 0.0) is words
+
+
+def test_cues_are_numbered_in_order_across_chunks(chunks):
+    progress = []
+    result = transcribe_and_translate(FakeGenerator(), b"audio", ['Spanish', 'German'],
+                                      on_progress=lambda done, total: progress.append((done, total)))
+
+    assert progress == [(1, 4), (2, 4), (3, 4), (4, 4)]
+    starts = [word['start'] for word in result.transcription['words']]
+    assert starts == sorted(starts)
+    assert starts[0] == 0.0 and max(starts) >= 3 * CHUNK_SECONDS
+    assert result.transcription['text'] == " ".join([CHUNK_TEXT] * 4)
+
+    cues = parse_srt_subtitles(result.srt_content)
+    assert [cue['id'] for cue in cues] == list(range(1, len(cues) + 1))
+    assert all(earlier['end'] <= later['start'] for earlier, later in zip(cues, cues[1:]))
+    # Every chunk's words land in cues at that chunk's offset
+    assert {int(cue['start'] // CHUNK_SECONDS) for cue in cues} == {0, 1, 2, 3}
+
+    assert result.errors == {}
+    for language in ('Spanish', 'German'):
+        translated = parse_srt_subtitles(result.translated_subtitles[language])
+        assert [cue['id'] for cue in translated] == [cue['id'] for cue in cues]
+        # The stub re-renders the SRT, which can move a timestamp by a millisecond
+        assert [cue['start'] for cue in translated] == pytest.approx([cue['start'] for cue in cues], abs=0.002)
+        assert all(cue['text'] == f"{language}: {original['text']}" for cue, original in zip(translated, cues))
+    assert not translation_threads()
+
+
+def test_silence_trimming_is_summed_when_only_later_chunks_report_it(chunks):
+    result = transcribe_and_translate(FakeGenerator(trimmed_chunks=(2, 4)), b"audio", [])
+    assert result.transcription['silence_trimming'] == {'original_duration': 20.0, 'uploaded_duration': 15.0}
+
+    untrimmed = transcribe_and_translate(FakeGenerator(), b"audio", [])
+    assert 'silence_trimming' not in untrimmed.transcription
+
+
+def test_failed_chunk_stops_translation_workers(chunks):
+    generator = FakeGenerator(fail_on=3)
+    with pytest.raises(RuntimeError, match="unavailable"):
+        transcribe_and_translate(generator, b"audio", ['Spanish', 'French'])
+    assert generator.calls == 3
+    assert not translation_threads()
+
+
+def test_split_takes_a_scheduler_slot():
+    from subtitle_core import ExtractionScheduler, find_ffmpeg
+    try:
+        ffmpeg_cmd = find_ffmpeg()
+    except FileNotFoundError:
+        pytest.skip("ffmpeg is not installed")
+    import subprocess
+    audio = subprocess.run([ffmpeg_cmd, '-f', 'lavfi', '-i', 'sine=frequency=440:duration=5',
+                            '-f', 'wav', 'pipe:1'], capture_output=True, check=True).stdout
+
+    scheduler = ExtractionScheduler(max_concurrent=1, ffmpeg_threads=1)
+    split = pipeline.split_audio_chunks(audio, 2.0, "speech_mp3", scheduler)
+
+    assert [round(chunk.offset) for chunk in split] == [0, 2, 4]
+    stats = scheduler.stats()
+    assert (stats['submitted'], stats['completed'], stats['running']) == (1, 1, 0)
+
+
+def backend_client():
+    pytest.importorskip("fastapi")
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+    from fastapi.testclient import TestClient
+    import main
+    return main, TestClient(main.app)
+
+
+def test_transcribe_endpoint_runs_the_pipeline_off_the_event_loop(monkeypatch):
+    import asyncio
+    main, client = backend_client()
+    calls = []
+
+    def fake_pipeline(generator, audio, languages, *args, **options):
+        # Worker threads of the threadpool have no running event loop
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        calls.append((languages, options['scheduler']))
+        words = chunk_words("Hello there")
+        srt = render_srt_from_cues([{'id': 1, 'start': 0.0, 'end': 1.1, 'text': 'Hello there'}])
+        return pipeline.PipelineResult({'text': 'Hello there', 'words': words}, srt, {'Spanish': srt}, {}, {})
+    monkeypatch.setattr(main, "transcribe_and_translate", fake_pipeline)
+
+    response = client.post("/api/transcribe", files={'file': ("talk.mp3", b"audio", "audio/mpeg")},
+                           data={'api_key': 'key', 'translate_to': '["Spanish"]'})
+    assert response.status_code == 200
+    assert response.json()['data']['translated_languages'] == ['Spanish']
+    assert calls == [(['Spanish'], main.extraction_scheduler)]
+
+
+@pytest.mark.parametrize("translate_to", ['not json', '{"lang": "Spanish"}', '"Spanish"', '[1, 2]'])
+def test_transcribe_endpoint_rejects_malformed_translate_to(monkeypatch, translate_to):
+    main, client = backend_client()
+    response = client.post("/api/transcribe", files={'file': ("talk.mp3", b"audio", "audio/mpeg")},
+                           data={'api_key': 'key', 'translate_to': translate_to})
+    assert response.status_code == 400
+    assert "translate_to" in response.json()['detail']
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Tests for the profiling hook: profile output files, worker-thread sampling and
+the backend middleware writing profiles off the event loop.
+
+Run with: python -m pytest -q test_profiling.py
+"""
+
+import sys
+import os
+import time
+import asyncio
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import subtitle_core.profiling as profiling
+from subtitle_core import bind_context, profile_run, set_profile_key
+
+
+def busy(seconds: float = 0.1):
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        pass
+
+
+def test_sample_profile_writes_folded_stacks_and_summary(tmp_path):
+    with profile_run("talk one", "sample", str(tmp_path)) as profile:
+        set_profile_key("session/42")
+        busy()
+
+    assert profile.name.startswith("session_42-")
+    assert sorted(os.path.basename(path) for path in profile.paths) == [
+        f"{profile.name}.folded", f"{profile.name}.summary.json"]
+    assert all(os.path.exists(path) for path in profile.paths)
+    assert profile.summary['mode'] == "sample"
+    assert profile.summary['samples'] > 0
+    assert "test_profiling:busy" in (tmp_path / f"{profile.name}.folded").read_text(encoding='utf-8')
+
+
+def test_bound_worker_threads_are_sampled(tmp_path):
+    with profile_run("worker", "sample", str(tmp_path)) as profile:
+        thread = threading.Thread(target=bind_context(busy), name="translate-Spanish")
+        thread.start()
+        thread.join()
+
+    folded = (tmp_path / f"{profile.name}.folded").read_text(encoding='utf-8')
+    assert any(line.startswith("translate-Spanish;") and "busy" in line for line in folded.splitlines())
+
+
+def test_deferred_write(tmp_path):
+    with profile_run("deferred", "cprofile", str(tmp_path), write=False) as profile:
+        busy(0.01)
+
+    assert profile.paths == [] and list(tmp_path.iterdir()) == []
+    # The slot is free again before the files are written
+    with profile_run("next", "cprofile", str(tmp_path), write=False) as other:
+        assert other is not None
+
+    paths = profile.write()
+    assert [os.path.splitext(path)[1] for path in paths] == [".prof", ".json"]
+    assert profile.summary['wall_seconds'] >= 0.01
+
+
+def test_overlapping_profile_is_skipped(tmp_path):
+    with profile_run("first", "sample", str(tmp_path)) as first:
+        with profile_run("second", "sample", str(tmp_path)) as second:
+            assert second is None
+    assert first is not None
+
+
+def test_middleware_writes_the_profile_off_the_event_loop(monkeypatch, tmp_path):
+    pytest.importorskip("fastapi")
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+    from fastapi.testclient import TestClient
+    import main
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(main, "PROFILE_ALLOW_QUERY", True)
+    writes = []
+    original_write = profiling.Profile.write
+
+    def write(self):
+        try:
+            asyncio.get_running_loop()
+            writes.append("event loop")
+        except RuntimeError:
+            writes.append("worker thread")
+        return original_write(self)
+    monkeypatch.setattr(profiling.Profile, "write", write)
+
+    response = TestClient(main.app).get("/api/languages?profile=sample")
+
+    assert response.status_code == 200
+    assert writes == ["worker thread"]
+    name = response.headers['X-Profile']
+    assert "/" not in name
+    assert (tmp_path / "profiles" / f"{name}.folded").exists()
@@ -0,0 +1,176 @@
+#!/usr/bin/env python3
+"""
+Tests for the ffmpeg extraction scheduler: queue limits, slot accounting and
+the backend's 503 response when the queue is full. Extraction is stubbed, so
+ffmpeg is not needed.
+
+Run with: python -m pytest -q test_scheduler.py
+"""
+
+import sys
+import os
+import time
+import threading
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import subtitle_core.scheduler as scheduler_module
+from subtitle_core import ExtractedAudio, ExtractionScheduler, SchedulerFull
+
+
+class BlockingExtraction:
+    """Stands in for extract_audio; every call waits until ``finish`` is set"""
+
+    def __init__(self):
+        self.finish = threading.Event()
+        self.calls = []
+
+    def __call__(self, video_bytes, profile=None, **options):
+        self.calls.append((video_bytes, profile, options))
+        self.finish.wait(5)
+        if video_bytes == b"broken":
+            raise RuntimeError("ffmpeg failed")
+        return ExtractedAudio(b"audio:" + video_bytes, "audio.mp3", "audio/mpeg", profile or "legacy_mp3")
+
+
+def wait_for(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def extraction(monkeypatch):
+    stub = BlockingExtraction()
+    monkeypatch.setattr(scheduler_module, "extract_audio", stub)
+    return stub
+
+
+def test_full_queue_rejects_submissions(extraction):
+    scheduler = ExtractionScheduler(max_concurrent=1, ffmpeg_threads=3, max_queue=1)
+    try:
+        running = scheduler.submit(b"first")
+        wait_for(lambda: scheduler.stats()['running'] == 1)
+        waiting = scheduler.submit(b"second", "opus_speech")
+        assert scheduler.stats()['queue_depth'] == 1
+
+        with pytest.raises(SchedulerFull):
+            scheduler.submit(b"third")
+        stats = scheduler.stats()
+        assert (stats['submitted'], stats['rejected'], stats['queue_depth'], stats['running']) == (2, 1, 1, 1)
+
+        extraction.finish.set()
+        assert running.result(5).audio == b"audio:first"
+        assert waiting.result(5).audio == b"audio:second"
+    finally:
+        extraction.finish.set()
+        scheduler.shutdown()
+
+    stats = scheduler.stats()
+    assert (stats['completed'], stats['failed'], stats['queue_depth'], stats['running']) == (2, 0, 0, 0)
+    # The per-process thread cap and the profile reach extract_audio
+    assert extraction.calls[0][2] == {'threads': 3}
+    assert extraction.calls[1][1] == "opus_speech"
+
+
+def test_failed_extraction_is_counted(extraction):
+    extraction.finish.set()
+    scheduler = ExtractionScheduler(max_concurrent=1, max_queue=4)
+    try:
+        with pytest.raises(RuntimeError):
+            scheduler.extract(b"broken")
+        assert scheduler.extract(b"ok").audio == b"audio:ok"
+    finally:
+        scheduler.shutdown()
+
+    stats = scheduler.stats()
+    assert (stats['submitted'], stats['completed'], stats['failed'], stats['running']) == (2, 1, 1, 0)
+
+
+def test_acquire_and_release_account_for_slots():
+    scheduler = ExtractionScheduler(max_concurrent=2, max_queue=4)
+    try:
+        first = scheduler.acquire()
+        second = scheduler.acquire()
+        stats = scheduler.stats()
+        assert (stats['submitted'], stats['running'], stats['queue_depth']) == (2, 2, 0)
+
+        scheduler.release(first)
+        scheduler.release(second, succeeded=False)
+        stats = scheduler.stats()
+        assert (stats['completed'], stats['failed'], stats['running']) == (1, 1, 0)
+        assert stats['run_seconds_p95'] >= 0.0
+    finally:
+        scheduler.shutdown()
+
+
+def test_acquire_waits_for_a_free_slot():
+    scheduler = ExtractionScheduler(max_concurrent=1, max_queue=4)
+    token = scheduler.acquire()
+    acquired = threading.Event()
+
+    def second_process():
+        second = scheduler.acquire()
+        acquired.set()
+        scheduler.release(second)
+
+    thread = threading.Thread(target=second_process)
+    thread.start()
+    wait_for(lambda: scheduler.stats()['queue_depth'] == 1)
+    assert not acquired.is_set()
+
+    scheduler.release(token)
+    thread.join(5)
+    assert acquired.is_set()
+    stats = scheduler.stats()
+    assert (stats['completed'], stats['queue_depth'], stats['running']) == (2, 0, 0)
+    assert stats['wait_seconds_max'] > 0.0
+    scheduler.shutdown()
+
+
+def test_acquire_rejects_when_the_queue_is_full():
+    scheduler = ExtractionScheduler(max_concurrent=1, max_queue=0)
+    with pytest.raises(SchedulerFull):
+        scheduler.acquire()
+    stats = scheduler.stats()
+    assert (stats['submitted'], stats['rejected'], stats['running']) == (0, 1, 0)
+    scheduler.shutdown()
+
+
+def test_slot_releases_on_success_and_on_error():
+    scheduler = ExtractionScheduler(max_concurrent=1, max_queue=4)
+    with scheduler.slot():
+        assert scheduler.stats()['running'] == 1
+    with pytest.raises(ValueError):
+        with scheduler.slot():
+            raise ValueError("ffmpeg exited with an error")
+
+    stats = scheduler.stats()
+    assert (stats['submitted'], stats['completed'], stats['failed'], stats['running']) == (2, 1, 1, 0)
+    scheduler.shutdown()
+
+
+def test_transcribe_endpoint_returns_503_when_the_queue_is_full(monkeypatch):
+    pytest.importorskip("fastapi")
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+    from fastapi.testclient import TestClient
+    import main
+
+    full = ExtractionScheduler(max_concurrent=1, max_queue=0)
+    monkeypatch.setattr(main, "extraction_scheduler", full)
+    client = TestClient(main.app)
+    try:
+        response = client.post("/api/transcribe", files={'file': ("talk.mp4", b"video", "video/mp4")},
+                               data={'api_key': 'key'})
+        stats = client.get("/api/extraction/stats").json()['data']
+    finally:
+        full.shutdown()
+
+    assert response.status_code == 503
+    assert response.headers['retry-after'] == '5'
+    assert "queue is full" in response.json()['detail']
+    assert stats['rejected'] == 1
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Tests for policy-driven subtitle segmentation, in one pass and incrementally.
+
+Run with: python -m pytest -q test_segmentation.py
+"""
+
+import sys
+import os
+import random
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+from subtitle_core import (
+    SEGMENTATION_PRESETS,
+    IncrementalSegmenter,
+    SegmentationPolicy,
+    build_segmentation_policy,
+    generate_srt_subtitles,
+    render_srt_from_cues,
+    segment_words,
+    validate_speaker_names,
+)
+
+
+def legacy_cues(words):
+    """The segmentation used before policies existed: 8 words or 5 s per cue, split on speaker change"""
+    cues, segment, start, end, speaker = [], [], None, None, None
+
+    def emit():
+        prefix = f"[{speaker}] " if speaker != 'speaker_0' else ""
+        cues.append({'id': len(cues) + 1, 'start': start, 'end': end, 'text': f"{prefix}{' '.join(segment)}"})
+
+    for word in words:
+        if word.get('type') != 'word':
+            continue
+        word_start = word.get('start', 0)
+        speaker_id = word.get('speaker_id', 'speaker_0')
+        if segment and (len(segment) >= 8 or word_start - start > 5.0 or speaker != speaker_id):
+            emit()
+            segment = []
+        if not segment:
+            start, speaker = word_start, speaker_id
+        segment.append(word.get('text', ''))
+        end = word.get('end', word_start)
+    if segment:
+        emit()
+    return cues
+
+
+def random_transcript(seed: int, count: int = 400):
+    """Words with spacing, audio events, pauses, punctuation and speaker turns"""
+    rng = random.Random(seed)
+    vocabulary = ["the", "gradient", "descent", "learning", "rate.", "so", "what", "happens?", "right!",
+                  "momentum", "we", "update", "weights,", "and", "then"]
+    words, now, speaker = [], 0.0, 'speaker_0'
+    for _ in range(count):
+        if rng.random() < 0.05:
+            speaker = rng.choice(['speaker_0', 'speaker_1', 'speaker_2'])
+        now += rng.choice([0.05, 0.1, 0.2, 0.3, 1.2, 3.0])
+        duration = rng.uniform(0.1, 0.9)
+        if rng.random() < 0.03:
+            words.append({'text': '(laughter)', 'start': now, 'end': now + duration, 'type': 'audio_event',
+                          'speaker_id': speaker})
+        else:
+            words.append({'text': rng.choice(vocabulary), 'start': round(now, 3), 'end': round(now + duration, 3),
+                          'type': 'word', 'speaker_id': speaker})
+        now += duration
+        words.append({'text': ' ', 'start': now, 'end': now, 'type': 'spacing', 'speaker_id': speaker})
+    return words
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_legacy_preset_matches_the_original_segmentation(seed):
+    words = random_transcript(seed)
+    assert segment_words(words, "legacy") == legacy_cues(words)
+
+
+def test_legacy_srt_is_unchanged():
+    words = random_transcript(99)
+    transcription = {'text': '', 'words': words}
+    assert generate_srt_subtitles(transcription, "legacy") == render_srt_from_cues(legacy_cues(words))
+    # Words without speaker ids are treated as speaker_0 and get no label
+    unlabelled = [{key: value for key, value in word.items() if key != 'speaker_id'} for word in words]
+    assert segment_words(unlabelled, "legacy") == legacy_cues(unlabelled)
+    assert not any(cue['text'].startswith('[') for cue in segment_words(unlabelled, "legacy"))
+
+
+@pytest.mark.parametrize("preset", ["readable", "compact"])
+def test_readable_presets_respect_their_limits(preset):
+    policy = SEGMENTATION_PRESETS[preset]
+    cues = segment_words(random_transcript(7, 1000), preset)
+
+    assert [cue['id'] for cue in cues] == list(range(1, len(cues) + 1))
+    for cue in cues:
+        lines = cue['text'].split('\n')
+        assert len(lines) <= policy.max_lines
+        # A single word longer than a line cannot be wrapped
+        assert all(len(line) <= policy.max_chars_per_line or ' ' not in line for line in lines)
+        assert cue['end'] > cue['start']
+    for earlier, later in zip(cues, cues[1:]):
+        assert later['start'] - earlier['end'] >= policy.min_gap - 1e-6
+
+
+@pytest.mark.parametrize("preset", sorted(SEGMENTATION_PRESETS))
+@pytest.mark.parametrize("seed", range(5))
+def test_incremental_segmenter_matches_a_single_pass(preset, seed):
+    words = random_transcript(seed, 600)
+    expected = segment_words(words, preset)
+
+    rng = random.Random(seed)
+    segmenter = IncrementalSegmenter(preset)
+    cues, position = [], 0
+    while position < len(words):
+        size = rng.randint(1, 80)
+        cues.extend(segmenter.feed_many(words[position:position + size]))
+        position += size
+        # Cues returned so far are final: they never change as more words arrive
+        assert cues == expected[:len(cues)]
+    cues.extend(segmenter.flush())
+
+    assert cues == expected
+    assert segmenter.flush() == []
+
+
+def spoken(texts, start: float = 0.0, step: float = 0.5):
+    return [{'text': text, 'start': start + index * step, 'end': start + index * step + 0.4, 'type': 'word'}
+            for index, text in enumerate(texts)]
+
+
+def test_incremental_segmenter_returns_cues_as_soon_as_they_finish():
+    segmenter = IncrementalSegmenter("legacy", start_index=5)
+    words = spoken([f"w{index}" for index in range(9)])
+    # Nothing is finished until the ninth word starts a new cue
+    assert all(segmenter.feed(word) == [] for word in words[:8])
+    assert segmenter.feed({'text': ' ', 'start': 3.9, 'end': 3.9, 'type': 'spacing'}) == []
+
+    assert segmenter.feed(words[8]) == [{'id': 5, 'start': 0.0, 'end': 3.9, 'text': "w0 w1 w2 w3 w4 w5 w6 w7"}]
+    assert segmenter.flush() == [{'id': 6, 'start': 4.0, 'end': 4.4, 'text': "w8"}]
+
+
+def test_incremental_segmenter_holds_a_cue_when_timing_depends_on_the_next():
+    segmenter = IncrementalSegmenter("readable")
+    first = spoken(["Hello", "everyone."])
+    second = spoken(["Welcome", "back."], start=3.0)
+    third = spoken(["Today", "compilers."], start=6.0)
+
+    assert segmenter.feed_many(first) == []
+    # The first cue is finished by the pause, but its end may still be extended
+    assert segmenter.feed_many(second) == []
+    released = segmenter.feed_many(third)
+    assert [cue['text'] for cue in released] == ["Hello everyone."]
+    assert [cue['text'] for cue in segmenter.flush()] == ["Welcome back.", "Today compilers."]
+
+
+def test_build_segmentation_policy_applies_and_converts_overrides():
+    policy = build_segmentation_policy("readable", max_lines=1, max_cps=20, break_on_pause=None,
+                                       speaker_labels="always", break_on_speaker=False)
+    assert policy == SEGMENTATION_PRESETS["readable"]._replace(
+        max_lines=1, max_cps=20.0, break_on_pause=None, speaker_labels="always", break_on_speaker=False)
+    assert isinstance(policy.max_cps, float)
+    # Whole floats are accepted for integer fields (JSON has a single number type)
+    assert build_segmentation_policy(max_words=12.0).max_words == 12
+    assert isinstance(build_segmentation_policy(max_words=12.0).max_words, int)
+    assert build_segmentation_policy("legacy") == SegmentationPolicy()
+
+
+@pytest.mark.parametrize("overrides, message", [
+    ({'max_words': 0}, "max_words must be an integer of at least 1"),
+    ({'max_words': 2.5}, "max_words must be an integer"),
+    ({'max_words': True}, "max_words must be an integer"),
+    ({'max_words': "8"}, "max_words must be an integer"),
+    ({'max_lines': None}, "max_lines must be an integer of at least 1$"),
+    ({'max_chars_per_line': -1}, "max_chars_per_line must be an integer"),
+    ({'max_duration': -0.5}, "max_duration must be a non-negative number or null"),
+    ({'min_gap': None}, "min_gap must be a non-negative number$"),
+    ({'max_cps': [17]}, "max_cps must be a non-negative number"),
+    ({'break_on_punctuation': 1}, "break_on_punctuation must be true or false"),
+    ({'speaker_labels': "sometimes"}, "speaker_labels must be one of"),
+    ({'max_words': 8, 'font_size': 12}, "Unknown segmentation options: font_size"),
+])
+def test_build_segmentation_policy_rejects_invalid_options(overrides, message):
+    with pytest.raises(ValueError, match=message):
+        build_segmentation_policy("legacy", **overrides)
+
+
+def test_build_segmentation_policy_rejects_unknown_presets():
+    with pytest.raises(ValueError, match="Unknown segmentation preset 'tiny'"):
+        build_segmentation_policy("tiny")
+
+
+def test_validate_speaker_names():
+    assert validate_speaker_names(None) is None
+    assert validate_speaker_names({'speaker_1': 'Alice'}) == {'speaker_1': 'Alice'}
+    for invalid in (["Alice"], {'speaker_1': 5}, {1: 'Alice'}, "Alice"):
+        with pytest.raises(ValueError, match="speaker_names"):
+            validate_speaker_names(invalid)
+
+
+def test_render_endpoint_rejects_invalid_options():
+    pytest.importorskip("fastapi")
+    sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+    from fastapi.testclient import TestClient
+    import main
+
+    main.sessions.set('render-test', {'filename': 'talk.mp3', 'srt_content': '',
+                                      'word_table': main.pack_transcription({'words': random_transcript(3, 50)})})
+    client = TestClient(main.app)
+    url = "/api/session/render-test/render"
+
+    for form in ({'options': '{"max_words": -1}'}, {'options': '[1, 2]'}, {'options': 'not json'},
+                 {'speaker_names': '{"speaker_1": 7}'}, {'segmentation': 'tiny'}):
+        response = client.post(url, data=form)
+        assert response.status_code == 400, form
+
+    response = client.post(url, data={'segmentation': 'readable', 'options': '{"max_lines": 1}'})
+    assert response.status_code == 200
+    assert response.json()['data']['policy']['max_lines'] == 1
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Tests for the FastAPI backend's session stores (LRU/TTL eviction, SQLite persistence).
+
+Run with: python -m pytest -q test_session_store.py
+"""
+
+import sys
+import os
+
+# Add the current directory and the backend to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+
+import pytest
+
+import session_store
+from session_store import MemorySessionStore, SQLiteSessionStore
+
+
+class FakeClock:
+    """Stands in for the time module inside session_store"""
+
+    def __init__(self, now: float = 1000.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(session_store, "time", fake)
+    return fake
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def make_store(request, tmp_path):
+    def make(**options):
+        if request.param == "memory":
+            return MemorySessionStore(**options)
+        return SQLiteSessionStore(str(tmp_path / "sessions.db"), **options)
+    return make
+
+
+def test_round_trip_returns_copies(make_store):
+    store = make_store()
+    data = {'filename': 'talk.mp4', 'translations': {'Spanish': "1\n00:00:00,000 --> 00:00:01,000\nHola\n\n"}}
+    store['abc'] = data
+    assert 'abc' in store
+    assert store['abc'] == data
+
+    copy = store['abc']
+    copy['filename'] = 'changed.mp4'
+    assert store['abc']['filename'] == 'talk.mp4'
+
+    del store['abc']
+    assert store.get('abc') is None
+    with pytest.raises(KeyError):
+        store['abc']
+
+
+def test_lru_eviction_by_entries(make_store, clock):
+    store = make_store(max_entries=2)
+    store.set('a', {'n': 1})
+    clock.now += 1
+    store.set('b', {'n': 2})
+    clock.now += 1
+    # Reading 'a' makes 'b' the least recently used session
+    assert store.get('a') == {'n': 1}
+    clock.now += 1
+    store.set('c', {'n': 3})
+
+    assert store.get('b') is None
+    assert store.get('a') == {'n': 1}
+    assert store.get('c') == {'n': 3}
+    assert store.stats()['evictions'] == 1
+
+
+def test_lru_eviction_by_bytes(make_store, clock):
+    payload = 'x' * 1000
+    store = make_store(max_bytes=2500)
+    for index, session_id in enumerate(('a', 'b', 'c')):
+        clock.now += 1
+        store.set(session_id, {'payload': payload, 'index': index})
+
+    assert store.get('a') is None
+    assert store.get('b')['index'] == 1
+    assert store.get('c')['index'] == 2
+    assert store.stats()['bytes'] <= 2500
+
+
+def test_newest_session_is_kept_even_if_over_the_byte_limit(make_store, clock):
+    store = make_store(max_bytes=10)
+    store.set('big', {'payload': 'x' * 100})
+    assert store.get('big') == {'payload': 'x' * 100}
+
+
+def test_ttl_expiry_and_sliding_expiration(make_store, clock):
+    store = make_store(ttl_seconds=60)
+    store.set('a', {'n': 1})
+    store.set('b', {'n': 2})
+
+    clock.now += 45
+    assert store.get('a') == {'n': 1}  # refreshed for another 60 s
+    clock.now += 45
+    assert store.get('b') is None
+    assert store.get('a') == {'n': 1}
+    clock.now += 61
+    assert store.get('a') is None
+    assert store.stats()['expirations'] == 2
+
+
+def test_sqlite_store_persists_across_instances(tmp_path):
+    path = str(tmp_path / "sessions.db")
+    data = {'filename': 'lecture.mp4', 'srt_content': "1\n00:00:00,000 --> 00:00:02,000\nHello\n\n"}
+    SQLiteSessionStore(path).set('persisted', data)
+
+    reopened = SQLiteSessionStore(path)
+    assert reopened.get('persisted') == data
+    assert reopened.stats()['entries'] == 1
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Tests for request tracing: span nesting, correlation attributes and context
+propagation to worker threads through bind_context.
+
+Run with: python -m pytest -q test_tracing.py
+"""
+
+import sys
+import os
+import json
+import threading
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import pytest
+
+import subtitle_core.tracing as tracing
+from subtitle_core import (
+    InMemorySpanExporter,
+    bind_context,
+    configure_tracing,
+    current_span,
+    set_trace_attributes,
+    stage_timer,
+    start_span,
+)
+
+
+@pytest.fixture
+def exporter():
+    previous = tracing.get_tracer()
+    exporter = InMemorySpanExporter()
+    configure_tracing(exporter=exporter)
+    yield exporter
+    tracing._tracer = previous
+
+
+def spans_by_name(exporter):
+    return {span['name']: span for span in exporter.spans}
+
+
+def test_nested_spans_share_a_trace(exporter):
+    with start_span("request", route="/api/transcribe") as request:
+        with start_span("extract_audio") as child:
+            assert current_span() is child
+        assert current_span() is request
+
+    spans = spans_by_name(exporter)
+    assert [span['name'] for span in exporter.spans] == ["extract_audio", "request"]
+    assert spans['request']['parentSpanId'] is None
+    assert spans['extract_audio']['parentSpanId'] == spans['request']['spanId']
+    assert spans['extract_audio']['traceId'] == spans['request']['traceId']
+    assert spans['request']['attributes'] == {'route': "/api/transcribe"}
+    assert spans['request']['durationMs'] >= 0
+
+
+def test_bind_context_keeps_the_parent_span_on_another_thread(exporter):
+    def work():
+        with start_span("translate", language="Spanish"):
+            pass
+
+    with start_span("request"):
+        bound = bind_context(work)
+        thread = threading.Thread(target=bound)
+        thread.start()
+        thread.join()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(bind_context(work)).result()
+
+    request = spans_by_name(exporter)['request']
+    children = [span for span in exporter.spans if span['name'] == "translate"]
+    assert len(children) == 2
+    for child in children:
+        assert child['parentSpanId'] == request['spanId']
+        assert child['traceId'] == request['traceId']
+    assert children[0]['spanId'] != children[1]['spanId']
+
+
+def test_unbound_thread_starts_a_new_trace(exporter):
+    def work():
+        with start_span("orphan"):
+            pass
+
+    with start_span("request"):
+        thread = threading.Thread(target=work)
+        thread.start()
+        thread.join()
+
+    spans = spans_by_name(exporter)
+    assert spans['orphan']['parentSpanId'] is None
+    assert spans['orphan']['traceId'] != spans['request']['traceId']
+
+
+def test_correlation_attributes_reach_later_spans_and_threads(exporter):
+    def ocr():
+        with start_span("ocr"):
+            pass
+
+    def request():
+        with start_span("request") as span:
+            set_trace_attributes(session_id="abc", missing=None)
+            assert span.attributes['session_id'] == "abc"
+            with start_span("render", format="srt"):
+                pass
+            thread = threading.Thread(target=bind_context(ocr))
+            thread.start()
+            thread.join()
+
+    # Run in a copy so the correlation attributes do not leak into other tests
+    contextvars.copy_context().run(request)
+
+    spans = spans_by_name(exporter)
+    assert spans['request']['attributes'] == {'session_id': "abc"}
+    assert spans['render']['attributes'] == {'session_id': "abc", 'format': "srt"}
+    assert spans['ocr']['attributes'] == {'session_id': "abc"}
+    with start_span("next_request"):
+        pass
+    assert 'session_id' not in spans_by_name(exporter)['next_request']['attributes']
+
+
+def test_failed_span_records_the_exception(exporter):
+    with pytest.raises(RuntimeError):
+        with start_span("translate"):
+            raise RuntimeError("service unavailable")
+
+    span = exporter.spans[0]
+    assert span['status'] == {'code': "ERROR", 'message': "service unavailable"}
+    assert span['events'][0]['name'] == "exception"
+    assert span['events'][0]['attributes'] == {
+        'exception.type': "RuntimeError",
+        'exception.message': "service unavailable",
+    }
+
+
+def test_stage_timer_opens_a_span_of_the_stage_name(exporter):
+    @stage_timer("segment_words", preset="default")
+    def segment():
+        return current_span()
+
+    with start_span("request"):
+        span = segment()
+
+    spans = spans_by_name(exporter)
+    assert span.name == "segment_words"
+    assert spans['segment_words']['parentSpanId'] == spans['request']['spanId']
+    assert spans['segment_words']['attributes'] == {'preset': "default"}
+
+
+def test_tracing_off_uses_the_noop_span():
+    previous = tracing.get_tracer()
+    configure_tracing("off")
+    try:
+        with start_span("request") as span:
+            assert span is tracing.NOOP_SPAN
+            assert not span.is_recording()
+            assert current_span() is tracing.NOOP_SPAN
+        with pytest.raises(ValueError):
+            configure_tracing("zipkin")
+    finally:
+        tracing._tracer = previous
+
+
+def test_file_exporter_writes_json_lines(tmp_path):
+    previous = tracing.get_tracer()
+    path = tmp_path / "traces.jsonl"
+    configure_tracing("file", path=str(path))
+    try:
+        with start_span("request"):
+            with start_span("transcribe"):
+                pass
+        configure_tracing("off")
+    finally:
+        tracing._tracer = previous
+
+    spans = [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+    assert [span['name'] for span in spans] == ["transcribe", "request"]
+    assert spans[0]['parentSpanId'] == spans[1]['spanId']
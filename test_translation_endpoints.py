@@ -0,0 +1,46 @@
+#!/usr/bin/env python3
+"""
+Tests for pointing the Google translation service at another URL
+(GOOGLE_TRANSLATE_URL), using the benchmark suite's local mock server.
+
+Run with: python -m pytest -q test_translation_endpoints.py
+"""
+
+import sys
+import os
+
+# Add the current directory and the benchmark helpers to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+
+import pytest
+
+pytest.importorskip("deep_translator")
+
+import subtitle_core.translator as translator
+from subtitle_core import SubtitleTranslator, check_translation_service_status
+from mock_services import MockServices
+
+
+@pytest.fixture
+def google_mock(monkeypatch):
+    with MockServices() as services:
+        monkeypatch.setattr(translator, "GOOGLE_TRANSLATE_URL", services.environment()["GOOGLE_TRANSLATE_URL"])
+        yield services
+
+
+def test_google_translator_defaults_to_google():
+    assert translator._google_translator("en", "es")._base_url.startswith("https://translate.google.")
+
+
+def test_google_translate_url_override(google_mock):
+    google = translator._google_translator("en", "es")
+    assert google._base_url == f"{google_mock.url}/google/m"
+
+    assert SubtitleTranslator("google_free").translate_text_google_free("See you tomorrow", "es") == "es: See you tomorrow"
+    assert google_mock.stats()['google']['requests'] == 1
+
+
+def test_service_status_uses_the_override(google_mock):
+    assert check_translation_service_status("google_free")
+    assert google_mock.stats()['google']['requests'] == 1
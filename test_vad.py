@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Tests for silence trimming: speech detection, the trimmed-to-original offset
+map and remapping of transcription timestamps.
+
+Run with: python -m pytest -q test_vad.py
+"""
+
+import io
+import sys
+import os
+import wave
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import numpy as np
+import pytest
+
+from subtitle_core import ExtractionScheduler, find_ffmpeg
+from subtitle_core.vad import (
+    OffsetMap,
+    compress_silence,
+    detect_speech_regions,
+    remap_transcription,
+    trim_silence,
+)
+
+SAMPLE_RATE = 16000
+FRAME = SAMPLE_RATE * 30 // 1000
+
+
+def signal(*parts):
+    """Concatenate (seconds, is_tone) parts into a mono signal with a faint noise floor"""
+    rng = np.random.default_rng(0)
+    pieces = []
+    for seconds, is_tone in parts:
+        count = int(seconds * SAMPLE_RATE)
+        piece = rng.normal(0, 0.001, count)
+        if is_tone:
+            piece += 0.5 * np.sin(2 * np.pi * 220 * np.arange(count) / SAMPLE_RATE)
+        pieces.append(piece)
+    return np.concatenate(pieces).astype(np.float32)
+
+
+def three_span_map():
+    """Regions at 1-2 s, 5-6 s and 10-11 s with 0.3 s of silence kept between them"""
+    samples = np.zeros(1200, dtype=np.float32)
+    _, offset_map = compress_silence(samples, [(100, 200), (500, 600), (1000, 1100)], sample_rate=100)
+    return offset_map
+
+
+def test_compress_silence_builds_spans():
+    samples = np.arange(1200, dtype=np.float32)
+    trimmed, offset_map = compress_silence(samples, [(100, 200), (500, 600), (1000, 1100)], sample_rate=100)
+    assert offset_map.spans == [(0.0, 1.0, 1.0), (1.3, 5.0, 1.0), (2.6, 10.0, 1.0)]
+    assert len(trimmed) == 360
+    assert offset_map.trimmed_duration == pytest.approx(3.6)
+    # Speech is copied unchanged, the kept silence is zeros
+    assert trimmed[0] == 100 and trimmed[99] == 199
+    assert not trimmed[100:130].any()
+    assert trimmed[130] == 500
+
+
+def test_offset_map_remaps_across_several_removed_gaps():
+    offset_map = three_span_map()
+    assert offset_map.to_original(0.5) == pytest.approx(1.5)
+    assert offset_map.to_original(1.8) == pytest.approx(5.5)
+    assert offset_map.to_original(3.1) == pytest.approx(10.5)
+
+
+def test_offset_map_at_region_boundaries():
+    offset_map = three_span_map()
+    assert offset_map.to_original(0.0) == pytest.approx(1.0)
+    assert offset_map.to_original(1.3) == pytest.approx(5.0)
+    assert offset_map.to_original(2.6) == pytest.approx(10.0)
+    # The end of a span stays with that span
+    assert offset_map.to_original(2.3) == pytest.approx(6.0)
+    # Inserted silence maps into the original silence after the previous span
+    assert offset_map.to_original(1.1) == pytest.approx(2.1)
+    assert offset_map.to_original(2.5) == pytest.approx(6.2)
+
+
+def test_offset_map_round_trips_and_handles_no_spans():
+    offset_map = three_span_map()
+    restored = OffsetMap.from_dict(offset_map.to_dict())
+    assert restored.spans == offset_map.spans
+    assert restored.to_original(1.8) == pytest.approx(5.5)
+
+    assert OffsetMap([]).to_original(4.2) == 4.2
+    assert OffsetMap([]).trimmed_duration == 0.0
+
+
+def test_remap_transcription_moves_words_and_characters():
+    transcription = {
+        'text': 'one two',
+        'language_code': 'en',
+        'words': [
+            {'text': 'one', 'start': 0.2, 'end': 0.6, 'type': 'word',
+             'characters': [{'text': 'o', 'start': 0.2, 'end': 0.3}]},
+            {'text': ' ', 'start': 0.6, 'end': 1.5, 'type': 'spacing'},
+            {'text': 'two', 'start': 1.5, 'end': 2.7, 'type': 'word'},
+            {'text': '(music)', 'start': None, 'end': None, 'type': 'audio_event'},
+        ],
+    }
+    remapped = remap_transcription(transcription, three_span_map())
+
+    words = remapped['words']
+    assert (words[0]['start'], words[0]['end']) == (1.2, 1.6)
+    assert (words[0]['characters'][0]['start'], words[0]['characters'][0]['end']) == (1.2, 1.3)
+    # A word spanning a removed gap keeps its start and end in their own regions
+    assert (words[2]['start'], words[2]['end']) == (5.2, 10.1)
+    assert words[3]['start'] is None
+    assert remapped['language_code'] == 'en'
+    # The input is left untouched
+    assert transcription['words'][0]['start'] == 0.2
+    assert transcription['words'][0]['characters'][0]['start'] == 0.2
+
+
+def test_detect_speech_regions_finds_tones_between_silences():
+    samples = signal((1.0, False), (1.0, True), (2.0, False), (1.0, True), (1.0, False))
+    regions = detect_speech_regions(samples, SAMPLE_RATE)
+
+    assert len(regions) == 2
+    expected = [(0.8, 2.2), (3.8, 5.2)]  # Each tone plus 200 ms of padding
+    for (start, end), (expected_start, expected_end) in zip(regions, expected):
+        assert abs(start - expected_start * SAMPLE_RATE) <= FRAME
+        assert abs(end - expected_end * SAMPLE_RATE) <= FRAME
+
+
+def test_detect_speech_regions_bridges_short_pauses_and_drops_bursts():
+    samples = signal((1.0, False), (0.6, True), (0.3, False), (0.6, True),
+                     (2.0, False), (0.06, True), (2.0, False))
+    regions = detect_speech_regions(samples, SAMPLE_RATE)
+
+    assert len(regions) == 1
+    start, end = regions[0]
+    assert abs(start - 0.8 * SAMPLE_RATE) <= FRAME
+    assert abs(end - 2.7 * SAMPLE_RATE) <= FRAME
+
+
+def test_detect_speech_regions_on_short_input():
+    assert detect_speech_regions(np.zeros(0, dtype=np.float32), SAMPLE_RATE) == []
+    assert detect_speech_regions(np.zeros(100, dtype=np.float32), SAMPLE_RATE) == [(0, 100)]
+
+
+def wav_bytes(samples) -> bytes:
+    buffer = io.BytesIO()
+    with wave.open(buffer, 'wb') as wav_file:
+        wav_file.setnchannels(1)
+        wav_file.setsampwidth(2)
+        wav_file.setframerate(SAMPLE_RATE)
+        wav_file.writeframes((np.clip(samples, -1.0, 1.0) * 32767).astype('<i2').tobytes())
+    return buffer.getvalue()
+
+
+def test_trim_silence_runs_ffmpeg_in_scheduler_slots():
+    try:
+        find_ffmpeg()
+    except FileNotFoundError:
+        pytest.skip("ffmpeg is not installed")
+
+    audio = wav_bytes(signal((3.0, False), (1.0, True), (3.0, False), (1.0, True), (3.0, False)))
+    scheduler = ExtractionScheduler(max_concurrent=1, ffmpeg_threads=1)
+    try:
+        trimmed = trim_silence(audio, SAMPLE_RATE, scheduler=scheduler)
+        stats = scheduler.stats()
+    finally:
+        scheduler.shutdown()
+
+    assert trimmed is not None
+    assert trimmed.original_duration == pytest.approx(11.0, abs=0.01)
+    assert trimmed.trimmed_duration < 4.0
+    assert len(trimmed.offset_map.spans) == 2
+    assert trimmed.offset_map.to_original(trimmed.offset_map.spans[1][0]) == pytest.approx(6.8, abs=0.05)
+    # One slot for the decode, one for the encode, both given back
+    assert (stats['submitted'], stats['completed'], stats['failed'], stats['running']) == (2, 2, 0, 0)
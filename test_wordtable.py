@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Tests for the columnar WordTable transcript format and its use in sessions.
+
+Run with: python -m pytest -q test_wordtable.py
+"""
+
+import sys
+import os
+import io
+import json
+
+# Add the current directory and the backend to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+
+import numpy as np
+import pytest
+
+from subtitle_core import WordTable, segment_words
+from subtitle_core.wordtable import transcription_words
+from session_store import SQLiteSessionStore, pack_transcription, transcription_dict, unpack_transcription
+
+TRANSCRIPTION = {
+    'language_code': 'de',
+    'language_probability': 0.98,
+    'text': 'Grüß Gott (applause) Bonjour 東京',
+    'words': [
+        {'text': 'Grüß', 'start': 0.0, 'end': 0.42, 'type': 'word', 'speaker_id': 'speaker_0',
+         'characters': [{'text': 'G', 'start': 0.0, 'end': 0.1}]},
+        {'text': ' ', 'start': 0.42, 'end': 0.5, 'type': 'spacing', 'speaker_id': 'speaker_0'},
+        {'text': 'Gott', 'start': 0.5, 'end': 0.91, 'type': 'word', 'speaker_id': 'speaker_0'},
+        {'text': '(applause)', 'start': 1.0, 'end': 2.5, 'type': 'audio_event'},
+        {'text': 'Bonjour', 'start': 2.6, 'end': 3.1, 'type': 'word', 'speaker_id': 'speaker_1', 'logprob': -0.2},
+        {'text': '東京', 'start': 3.2, 'type': 'word', 'speaker_id': None},
+    ],
+}
+
+
+def test_round_trip_restores_the_transcription():
+    table = WordTable.from_transcription(TRANSCRIPTION)
+
+    assert len(table) == 6
+    assert table.to_transcription() == TRANSCRIPTION
+    assert table.get('language_code') == 'de'
+    assert table.duration == 3.1
+    assert table.speaker_ids() == ['speaker_0', 'speaker_1']
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_npz_file_round_trip(tmp_path, compress):
+    path = tmp_path / "words.npz"
+    WordTable.from_transcription(TRANSCRIPTION).save(str(path), compress=compress)
+
+    # Plain arrays only: loading must not need pickle
+    with np.load(str(path), allow_pickle=False) as data:
+        assert {'start', 'end', 'kind', 'speaker', 'text_offsets', 'text_data', 'header'} <= set(data.files)
+        assert data['start'].dtype == np.float64
+
+    assert WordTable.load(str(path)).to_transcription() == TRANSCRIPTION
+    assert WordTable.from_bytes(WordTable.from_transcription(TRANSCRIPTION).to_bytes(compress)).to_transcription() \
+        == TRANSCRIPTION
+
+
+def test_empty_transcription():
+    table = WordTable.from_bytes(WordTable.from_transcription({'text': ''}).to_bytes())
+    assert len(table) == 0
+    assert table.to_transcription() == {'text': '', 'words': []}
+    assert table.duration == 0.0
+
+
+def test_unsupported_version_is_rejected():
+    buffer = io.BytesIO(WordTable.from_transcription(TRANSCRIPTION).to_bytes())
+    with np.load(buffer) as data:
+        arrays = {name: data[name] for name in data.files}
+    header = json.loads(arrays['header'].tobytes().decode('utf-8'))
+    header['version'] = 99
+    arrays['header'] = np.frombuffer(json.dumps(header).encode('utf-8'), dtype=np.uint8)
+    rewritten = io.BytesIO()
+    np.savez(rewritten, **arrays)
+
+    with pytest.raises(ValueError, match="Unsupported word table version: 99"):
+        WordTable.from_bytes(rewritten.getvalue())
+
+
+def test_table_segments_like_the_dict():
+    table = WordTable.from_transcription(TRANSCRIPTION)
+    for preset in ("legacy", "readable"):
+        assert segment_words(transcription_words(table), preset) == \
+            segment_words(transcription_words(TRANSCRIPTION), preset)
+
+
+def test_packed_session_round_trips_through_sqlite(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / "sessions.db"))
+    store.set('session', {'filename': 'talk.mp4', 'word_table': pack_transcription(TRANSCRIPTION)})
+
+    session_data = store.get('session')
+    assert isinstance(unpack_transcription(session_data), WordTable)
+    assert transcription_dict(session_data) == TRANSCRIPTION
+
+    # Sessions written before WordTable keep the plain dict
+    store.set('old', {'filename': 'talk.mp4', 'transcription': TRANSCRIPTION})
+    assert unpack_transcription(store.get('old')) == TRANSCRIPTION
+    assert transcription_dict(store.get('old')) == TRANSCRIPTION
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Tests for the session ZIP export (/api/export/{session_id}).
+
+Run with: python -m pytest -q test_zip_export.py
+"""
+
+import sys
+import os
+import io
+import json
+import zipfile
+
+# Add the current directory and the backend to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "subtitle-app", "backend"))
+
+import pytest
+
+import zip_export
+from session_store import pack_transcription
+from zip_export import session_export_entries, stream_zip
+
+SRT = (
+    "1\n00:00:00,000 --> 00:00:01,500\nHello everyone\n\n"
+    "2\n00:00:01,600 --> 00:00:03,000\n[speaker_1] Welcome back\n\n"
+)
+TRANSLATED = {
+    'Spanish': (
+        "1\n00:00:00,000 --> 00:00:01,500\nHola a todos\n\n"
+        "2\n00:00:01,600 --> 00:00:03,000\n[speaker_1] Bienvenidos de nuevo\n\n"
+    ),
+    'German': (
+        "1\n00:00:00,000 --> 00:00:01,500\nHallo zusammen\n\n"
+        "2\n00:00:01,600 --> 00:00:03,000\n[speaker_1] Willkommen zurück\n\n"
+    ),
+}
+TRANSCRIPTION = {
+    'language_code': 'en',
+    'text': 'Hello everyone Welcome back',
+    'words': [
+        {'text': 'Hello', 'start': 0.0, 'end': 0.5, 'type': 'word', 'speaker_id': 'speaker_0'},
+        {'text': 'everyone', 'start': 0.6, 'end': 1.5, 'type': 'word', 'speaker_id': 'speaker_0'},
+        {'text': 'Welcome', 'start': 1.6, 'end': 2.2, 'type': 'word', 'speaker_id': 'speaker_1'},
+        {'text': 'back', 'start': 2.3, 'end': 3.0, 'type': 'word', 'speaker_id': 'speaker_1'},
+    ],
+}
+
+
+def read_archive(session_data, filename_base="lecture"):
+    data = b"".join(stream_zip(session_export_entries(session_data, filename_base)))
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.testzip() is None
+        return {name: archive.read(name).decode('utf-8') for name in archive.namelist()}
+
+
+def test_archive_contains_every_format_and_translation():
+    files = read_archive({'srt_content': SRT, 'transcription': TRANSCRIPTION, 'translated_subtitles': TRANSLATED})
+
+    assert sorted(files) == sorted([
+        "lecture.srt", "lecture.vtt", "lecture.json",
+        "translations/lecture_Spanish.srt", "translations/lecture_Spanish.vtt",
+        "translations/lecture_German.srt", "translations/lecture_German.vtt",
+    ])
+    assert files["lecture.srt"] == SRT
+    assert files["lecture.vtt"].startswith("WEBVTT\n\n1\n00:00:00.000 --> 00:00:01.500\nHello everyone\n")
+    assert json.loads(files["lecture.json"]) == TRANSCRIPTION
+    assert files["translations/lecture_German.srt"] == TRANSLATED['German']
+    assert "Willkommen zurück" in files["translations/lecture_German.vtt"]
+
+
+def test_json_entry_is_unpacked_from_a_word_table():
+    files = read_archive({'srt_content': SRT, 'word_table': pack_transcription(TRANSCRIPTION)})
+
+    exported = json.loads(files["lecture.json"])
+    assert [word['text'] for word in exported['words']] == ['Hello', 'everyone', 'Welcome', 'back']
+    assert exported['words'][2]['speaker_id'] == 'speaker_1'
+    assert sorted(files) == ["lecture.json", "lecture.srt", "lecture.vtt"]
+
+
+def test_archive_is_streamed_in_chunks(monkeypatch):
+    monkeypatch.setattr(zip_export, "ZIP_CHUNK_SIZE", 1024)
+    long_srt = "".join(f"{i}\n00:00:{i % 60:02d},000 --> 00:00:{i % 60:02d},500\nLine number {i} of the lecture\n\n"
+                       for i in range(1, 2000))
+    rendered = []
+
+    def render():
+        rendered.append(True)
+        return long_srt
+
+    chunks = stream_zip([("a.srt", render), ("b.srt", render)])
+    first = next(chunks)
+    # The second entry is only rendered once the first has been written
+    assert first and len(rendered) == 1
+    data = first + b"".join(chunks)
+    assert len(rendered) == 2
+    with zipfile.ZipFile(io.BytesIO(data)) as archive:
+        assert archive.read("b.srt").decode('utf-8') == long_srt
+
+
+def test_export_endpoint():
+    pytest.importorskip("fastapi")
+    from fastapi.testclient import TestClient
+    import main
+
+    main.sessions.set('zip-test', {'filename': 'lecture.mp4', 'srt_content': SRT,
+                                   'transcription': TRANSCRIPTION, 'translated_subtitles': TRANSLATED})
+    client = TestClient(main.app)
+
+    response = client.get("/api/export/zip-test")
+    assert response.status_code == 200
+    assert response.headers['content-type'] == 'application/zip'
+    assert 'lecture_subtitles.zip' in response.headers['content-disposition']
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        assert "translations/lecture_Spanish.vtt" in archive.namelist()
+
+    assert client.get("/api/export/missing").status_code == 404